@@ -29,6 +29,12 @@ Provides system-wide accessibility features including:
 - Voice control for all applications via FARA layer
 - Helper AI with conversational interaction
 - Push-to-talk voice input (Hold Super key)
+- Streaming voice pipeline with offline Whisper (ONNX) recognition
+- Sentence-streamed speech output with push-to-talk barge-in
+- Event-driven active-window tracking for instant context lookups
+- Trained local intent classifier with slot extraction
+- Bounded conversation memory with episode summaries
+- Indexed mind map graph with batched append-log persistence
 - Support for 1,600+ languages including 100+ Indian dialects
 - Zork-style interface for EVERY application
 - Om Vinayaka Accessibility Knowledge Base AI (THE CORE)
@@ -37,6 +43,7 @@ Provides system-wide accessibility features including:
 - Context-Aware Summary Engine to prevent AI hallucinations
 - Idle Mode Self-Improvement System
 - Auto Dynamic Memory Backups
+- Unified ranked knowledge search across all app knowledge
 
 Om Vinayaka AI Features:
 - Automatic Zork UX Generation: Every app gets a text adventure interface
@@ -163,6 +170,63 @@ from .feature_discovery import (
     DISCOVERY_VERSION,
 )
 
+from .knowledge_search import (
+    KnowledgeSearchEngine,
+    KnowledgeDocument,
+    SearchHit,
+    get_knowledge_search,
+    KNOWLEDGE_SEARCH_VERSION,
+)
+
+from .voice_pipeline import (
+    VoicePipeline,
+    AudioRingBuffer,
+    AudioSource,
+    MicrophoneSource,
+    WavFileSource,
+    EnergyVAD,
+    ASRBackend,
+    WhisperOnnxBackend,
+    SpeechRecognitionBackend,
+    create_default_backend,
+    VOICE_PIPELINE_VERSION,
+)
+
+from .speech_queue import (
+    SpeechQueue,
+    SentenceSplitter,
+    iter_sentences,
+    SPEECH_QUEUE_VERSION,
+)
+
+from .window_focus import (
+    WindowFocusTracker,
+    FocusInfo,
+    FocusSource,
+    X11FocusSource,
+    XpropFocusSource,
+    WindowManagerFocusSource,
+    create_default_focus_source,
+    WINDOW_FOCUS_VERSION,
+)
+
+from .intent_classifier import (
+    IntentClassifier,
+    extract_features,
+    label_for_action,
+    INTENT_CLASSIFIER_VERSION,
+)
+
+from .conversation_memory import (
+    ConversationMemory,
+    CONVERSATION_MEMORY_VERSION,
+)
+
+from .graph_store import (
+    GraphStore,
+    GRAPH_STORE_VERSION,
+)
+
 from .unified_app_knowledge import (
     UnifiedAppCreator,
     UnifiedAppKnowledgeBase,
@@ -254,6 +318,56 @@ __all__ = [
     'get_feature_discovery',
     'DISCOVERY_VERSION',
     
+    # Unified Knowledge Search (BM25 across all knowledge sources)
+    'KnowledgeSearchEngine',
+    'KnowledgeDocument',
+    'SearchHit',
+    'get_knowledge_search',
+    'KNOWLEDGE_SEARCH_VERSION',
+    
+    # Streaming Voice Pipeline (ring buffer, VAD, offline ASR)
+    'VoicePipeline',
+    'AudioRingBuffer',
+    'AudioSource',
+    'MicrophoneSource',
+    'WavFileSource',
+    'EnergyVAD',
+    'ASRBackend',
+    'WhisperOnnxBackend',
+    'SpeechRecognitionBackend',
+    'create_default_backend',
+    'VOICE_PIPELINE_VERSION',
+    
+    # Streaming Speech Output (sentence chunks, barge-in)
+    'SpeechQueue',
+    'SentenceSplitter',
+    'iter_sentences',
+    'SPEECH_QUEUE_VERSION',
+    
+    # Window Focus Tracking (cached active-window context)
+    'WindowFocusTracker',
+    'FocusInfo',
+    'FocusSource',
+    'X11FocusSource',
+    'XpropFocusSource',
+    'WindowManagerFocusSource',
+    'create_default_focus_source',
+    'WINDOW_FOCUS_VERSION',
+    
+    # Intent Classification (hashed n-gram model, slots, confidence)
+    'IntentClassifier',
+    'extract_features',
+    'label_for_action',
+    'INTENT_CLASSIFIER_VERSION',
+    
+    # Conversation Memory (recent ring, segment log, episodes)
+    'ConversationMemory',
+    'CONVERSATION_MEMORY_VERSION',
+    
+    # Graph Store (mind map adjacency maps + append log)
+    'GraphStore',
+    'GRAPH_STORE_VERSION',
+    
     # Unified FARA + Zork Knowledge System
     'UnifiedAppCreator',
     'UnifiedAppKnowledgeBase',
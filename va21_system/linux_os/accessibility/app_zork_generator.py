@@ -22,14 +22,21 @@ Om Vinayaka - May obstacles be removed from your computing journey.
 import os
 import sys
 import json
+import bisect
 import hashlib
 import subprocess
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Set
 from dataclasses import dataclass, field
 from pathlib import Path
 from enum import Enum
 
+try:
+    from .knowledge_search import KnowledgeSearchEngine, get_knowledge_search, SOURCE_ZORK
+except ImportError:
+    from knowledge_search import KnowledgeSearchEngine, get_knowledge_search, SOURCE_ZORK
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # APP INTERFACE STRUCTURES
@@ -605,9 +612,21 @@ class AccessibilityKnowledgeBase:
     - Mind maps for app relationships
     - LangChain-compatible vector storage
     - Searchable action database
+    
+    Command search is served from a resident inverted index
+    (token -> (app, command, action)) built once at startup and kept
+    current by store_interface, so lookups never touch the disk.
+    Parsed interfaces are kept in an LRU cache. Commands are also
+    registered (one document per app action) in the shared
+    KnowledgeSearchEngine.
     """
     
-    def __init__(self, vault_path: Optional[str] = None):
+    INTERFACE_CACHE_SIZE = 64
+    
+    def __init__(self, vault_path: Optional[str] = None,
+                 cache_size: int = INTERFACE_CACHE_SIZE,
+                 search_engine: Optional[KnowledgeSearchEngine] = None):
+        self.search_engine = search_engine or get_knowledge_search()
         self.vault_path = vault_path or os.path.expanduser("~/.va21/accessibility_vault")
         self.apps_path = os.path.join(self.vault_path, "apps")
         self.mindmaps_path = os.path.join(self.vault_path, "mindmaps")
@@ -619,6 +638,19 @@ class AccessibilityKnowledgeBase:
         
         # Load index
         self.app_index = self._load_index()
+        
+        # LRU cache of parsed interfaces (app_id -> AppZorkInterface)
+        self.cache_size = cache_size
+        self._interface_cache: 'OrderedDict[str, AppZorkInterface]' = OrderedDict()
+        
+        # Resident command index
+        self._app_commands: Dict[str, Dict[str, str]] = {}  # app_id -> {cmd: action}
+        self._app_order: Dict[str, int] = {}  # app_id -> position (result ordering)
+        self._command_index: Dict[str, Set[Tuple[str, str]]] = {}  # token -> {(app_id, cmd)}
+        # Sorted (suffix, token) for every suffix of every indexed token;
+        # a range of it answers "tokens containing x". Rebuilt lazily.
+        self._suffix_index: Optional[List[Tuple[str, str]]] = None
+        self._build_command_index()
     
     def _load_index(self) -> Dict[str, Dict]:
         """Load the app index."""
@@ -664,6 +696,10 @@ class AccessibilityKnowledgeBase:
             }
             self._save_index()
             
+            # Keep resident structures current
+            self._cache_interface(interface)
+            self._index_commands(interface.app_id, interface.commands)
+            
             return True
         except Exception as e:
             print(f"Error storing interface: {e}")
@@ -774,7 +810,19 @@ This app has been analyzed and a Zork-style interface has been generated.
             f.write(content)
     
     def get_interface(self, app_id: str) -> Optional[AppZorkInterface]:
-        """Retrieve an app interface from the knowledge base."""
+        """Retrieve an app interface (LRU-cached, disk on miss)."""
+        cached = self._interface_cache.get(app_id)
+        if cached is not None:
+            self._interface_cache.move_to_end(app_id)
+            return cached
+        
+        interface = self._read_interface(app_id)
+        if interface:
+            self._cache_interface(interface)
+        return interface
+    
+    def _read_interface(self, app_id: str) -> Optional[AppZorkInterface]:
+        """Read and parse an interface from disk."""
         app_dir = os.path.join(self.apps_path, app_id)
         interface_file = os.path.join(app_dir, "interface.json")
         
@@ -788,6 +836,84 @@ This app has been analyzed and a Zork-style interface has been generated.
         except Exception:
             return None
     
+    def _cache_interface(self, interface: AppZorkInterface):
+        """Put an interface in the LRU cache, evicting the oldest."""
+        self._interface_cache[interface.app_id] = interface
+        self._interface_cache.move_to_end(interface.app_id)
+        while len(self._interface_cache) > self.cache_size:
+            self._interface_cache.popitem(last=False)
+    
+    # ─────────────────────────────────────────────────────────────────────────
+    # Command index
+    # ─────────────────────────────────────────────────────────────────────────
+    
+    @staticmethod
+    def _tokenize(text: str) -> List[str]:
+        """Split a command or action into lowercase tokens."""
+        return text.lower().split()
+    
+    def _build_command_index(self):
+        """Build the command index from every stored interface (startup)."""
+        self._app_commands.clear()
+        self._app_order.clear()
+        self._command_index.clear()
+        self._suffix_index = None
+        
+        for app_id in self.app_index:
+            interface = self._read_interface(app_id)
+            if not interface:
+                continue
+            if len(self._interface_cache) < self.cache_size:
+                self._cache_interface(interface)
+            self._index_commands(app_id, interface.commands)
+    
+    def _index_commands(self, app_id: str, commands: Dict[str, str]):
+        """(Re)index one app's commands."""
+        self._unindex_commands(app_id)
+        
+        self._app_commands[app_id] = dict(commands)
+        self._app_order.setdefault(app_id, len(self._app_order))
+        for cmd, action in commands.items():
+            for token in set(self._tokenize(cmd) + self._tokenize(action)):
+                postings = self._command_index.get(token)
+                if postings is None:
+                    postings = self._command_index[token] = set()
+                    self._suffix_index = None  # New token
+                postings.add((app_id, cmd))
+        
+        # Shared search: one document per action with all its phrasings
+        app_name = self.app_index.get(app_id, {}).get('app_name', app_id)
+        phrasings: Dict[str, List[str]] = {}
+        for cmd, action in commands.items():
+            phrasings.setdefault(action, []).append(cmd)
+        for action, cmds in phrasings.items():
+            self.search_engine.add_document(
+                doc_id=f"{SOURCE_ZORK}:{app_id}:{action}",
+                source=SOURCE_ZORK,
+                title=f"{app_name}: {action}",
+                text="\n".join(cmds),
+                metadata={'app_id': app_id, 'app_name': app_name, 'action': action},
+            )
+    
+    def _unindex_commands(self, app_id: str):
+        """Remove one app's commands from the index."""
+        old_commands = self._app_commands.pop(app_id, None)
+        if not old_commands:
+            return
+        
+        for action in set(old_commands.values()):
+            self.search_engine.remove_document(f"{SOURCE_ZORK}:{app_id}:{action}")
+        
+        for cmd, action in old_commands.items():
+            for token in set(self._tokenize(cmd) + self._tokenize(action)):
+                postings = self._command_index.get(token)
+                if postings is None:
+                    continue
+                postings.discard((app_id, cmd))
+                if not postings:
+                    del self._command_index[token]
+                    self._suffix_index = None
+    
     def _dict_to_interface(self, data: Dict) -> AppZorkInterface:
         """Convert dictionary to interface object."""
         rooms = {}
@@ -821,19 +947,89 @@ This app has been analyzed and a Zork-style interface has been generated.
                 return self.get_interface(app_id)
         return None
     
+    def _tokens_containing(self, fragment: str) -> List[str]:
+        """Indexed tokens that contain fragment (binary search on suffixes)."""
+        if self._suffix_index is None:
+            self._suffix_index = sorted(
+                (token[i:], token)
+                for token in self._command_index
+                for i in range(len(token))
+            )
+        suffixes = self._suffix_index
+        start = bisect.bisect_left(suffixes, (fragment,))
+        end = bisect.bisect_left(suffixes, (fragment + "\U0010ffff",), start)
+        return list({token for _, token in suffixes[start:end]})
+    
     def search_commands(self, query: str) -> List[Tuple[str, str, str]]:
-        """Search for commands across all apps."""
-        results = []
+        """
+        Search for commands across all apps.
+        
+        Matches when the query is a substring of the command or its
+        action. Candidates come from the in-memory token index and are
+        then verified: a query word between two others must be a whole
+        indexed token (one dict lookup); the first and last words may be
+        cut off, so they are looked up in the suffix index.
+        """
         query_lower = query.lower()
+        query_tokens = self._tokenize(query_lower)
         
-        for app_id in self.app_index:
-            interface = self.get_interface(app_id)
-            if interface:
-                for cmd, action in interface.commands.items():
-                    if query_lower in cmd.lower() or query_lower in action.lower():
-                        results.append((interface.app_name, cmd, action))
+        if not query_tokens:
+            # Empty/whitespace query - every command is a candidate
+            candidates = {
+                (app_id, cmd)
+                for app_id, commands in self._app_commands.items()
+                for cmd in commands
+            }
+        else:
+            postings_per_token = []
+            last = len(query_tokens) - 1
+            for position, query_token in enumerate(query_tokens):
+                if 0 < position < last:
+                    matched = self._command_index.get(query_token, set())
+                else:
+                    matched = set()
+                    for token in self._tokens_containing(query_token):
+                        matched |= self._command_index[token]
+                if not matched:
+                    return []
+                postings_per_token.append(matched)
+            postings_per_token.sort(key=len)
+            candidates = postings_per_token[0].intersection(*postings_per_token[1:])
+        
+        results = []
+        for app_id, cmd in candidates:
+            action = self._app_commands.get(app_id, {}).get(cmd)
+            if action is None:
+                continue
+            if query_lower in cmd.lower() or query_lower in action.lower():
+                results.append((app_id, cmd, action))
+        
+        # Same order as a full scan: app registration order, then command order
+        positions = {
+            app_id: {c: i for i, c in enumerate(self._app_commands[app_id])}
+            for app_id in {r[0] for r in results}
+        }
+        results.sort(key=lambda r: (self._app_order.get(r[0], 0), positions[r[0]][r[1]]))
         
-        return results
+        return [
+            (self.app_index.get(app_id, {}).get('app_name', app_id), cmd, action)
+            for app_id, cmd, action in results
+        ]
+    
+    def remove_interface(self, app_id: str) -> bool:
+        """
+        Drop an app from the index, command index and cache.
+        
+        Its vault files (interface.json, note) stay on disk.
+        """
+        if app_id not in self.app_index:
+            return False
+        del self.app_index[app_id]
+        self._save_index()
+        self._unindex_commands(app_id)
+        self._app_order.pop(app_id, None)
+        self._interface_cache.pop(app_id, None)
+        return True
     
     def list_apps(self) -> List[Dict]:
         """List all apps in the knowledge base."""
@@ -883,6 +1079,16 @@ class AppZorkManager:
         
         return interface
     
+    def unregister_app(self, app_name: str) -> bool:
+        """
+        Forget an app's Zork interface.
+        Called when the app is uninstalled.
+        """
+        for app_id, info in list(self.knowledge_base.app_index.items()):
+            if info['app_name'].lower() == app_name.lower():
+                return self.knowledge_base.remove_interface(app_id)
+        return False
+    
     def get_app_interface(self, app_name: str) -> Optional[AppZorkInterface]:
         """Get or create interface for an app."""
         interface = self.knowledge_base.get_interface_by_name(app_name)
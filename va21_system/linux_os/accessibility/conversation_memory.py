@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+VA21 OS - Conversation Memory
+==============================
+
+🙏 OM VINAYAKA - REMEMBER WITHOUT GROWING 🙏
+
+Bounded, tiered storage for Om Vinayaka's conversation history.
+
+A session that runs for weeks must not keep every turn in RAM or
+re-scan all of them for a status call. Turns move through three tiers:
+
+1. Recent ring: the last RECENT_TURNS turns, in memory
+2. Segment log: older turns appended to rotating JSON-lines segments
+3. Episodes: every EPISODE_TURNS user turns are summarized (through the
+   Summary Engine's extractive summarizer) into one compact record
+
+Rolling statistics (turns, clarifications, actions, per-app counts) are
+updated as turns arrive, so status and introspection are O(1).
+
+Om Vinayaka - May obstacles be removed from your computing journey.
+
+License: Om Vinayaka Prayaga Vaibhav Inventions License
+Copyright (c) 2024-2025 Prayaga Vaibhav
+"""
+
+import os
+import json
+import threading
+from collections import Counter, deque
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+CONVERSATION_MEMORY_VERSION = "1.0.0"
+
+# Turns kept in memory
+RECENT_TURNS = 200
+# Turns per on-disk segment file
+SEGMENT_TURNS = 5000
+# User turns summarized into one episode
+EPISODE_TURNS = 50
+# Episode records kept in memory (all are on disk)
+RECENT_EPISODES = 20
+# Apps/actions tracked individually in the rolling statistics
+MAX_TRACKED_KEYS = 100
+
+EPISODE_SUMMARY_RATIO = 0.3
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONVERSATION MEMORY
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ConversationMemory:
+    """
+    Recent-turn ring + segment log + episode summaries.
+
+    Args:
+        storage_path: Directory for segments, episodes and statistics
+        summary_engine: SummaryEngine used to summarize episodes (optional)
+    """
+
+    def __init__(self, storage_path: str, summary_engine=None,
+                 recent_turns: int = RECENT_TURNS,
+                 segment_turns: int = SEGMENT_TURNS,
+                 episode_turns: int = EPISODE_TURNS):
+        self.storage_path = storage_path
+        self.segments_path = os.path.join(storage_path, "segments")
+        self.episodes_file = os.path.join(storage_path, "episodes.jsonl")
+        self.stats_file = os.path.join(storage_path, "stats.json")
+        os.makedirs(self.segments_path, exist_ok=True)
+
+        self.summary_engine = summary_engine
+        self.segment_turns = segment_turns
+        self.episode_turns = episode_turns
+
+        self._lock = threading.RLock()
+        self._recent: deque = deque(maxlen=recent_turns)
+        self._episode_buffer: List[Dict] = []
+        self.episodes: deque = deque(maxlen=RECENT_EPISODES)
+        self._segment_handle = None
+
+        self.stats = {
+            'turns': 0,
+            'user_turns': 0,
+            'clarifications_needed': 0,
+            'successful_actions': 0,
+            'archived_turns': 0,
+            'segment_index': 0,
+            'segment_turns': 0,
+            'episodes': 0,
+            'apps': {},
+            'actions': {},
+            'first_turn': None,
+            'last_turn': None,
+        }
+        self._load()
+
+    def _load(self):
+        """Restore rolling statistics and recent episodes."""
+        try:
+            if os.path.exists(self.stats_file):
+                with open(self.stats_file, 'r') as f:
+                    self.stats.update(json.load(f))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[ConversationMemory] Could not load statistics: {e}")
+        try:
+            if os.path.exists(self.episodes_file):
+                with open(self.episodes_file, 'r') as f:
+                    for line in f:
+                        if line.strip():
+                            self.episodes.append(json.loads(line))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[ConversationMemory] Could not load episodes: {e}")
+
+    def _save_stats(self):
+        tmp_path = self.stats_file + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.stats, f)
+        os.replace(tmp_path, self.stats_file)
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Recording
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def add_turn(self, role: str, content: str, **fields) -> Dict:
+        """Append a turn. Returns the stored turn dict."""
+        now = datetime.now().isoformat()
+        turn = {'role': role, 'content': content, 'timestamp': now}
+        turn.update(fields)
+
+        with self._lock:
+            stats = self.stats
+            turn['turn_id'] = stats['turns']
+            stats['turns'] += 1
+            stats['first_turn'] = stats['first_turn'] or now
+            stats['last_turn'] = now
+            if role == 'user':
+                stats['user_turns'] += 1
+                app = fields.get('app_context')
+                if app:
+                    self._count(stats['apps'], app)
+
+            if len(self._recent) == self._recent.maxlen:
+                self._archive(self._recent[0])
+            self._recent.append(turn)
+
+            if role == 'user':
+                # Closed on the next user turn, so outcomes are recorded by then
+                if len(self._episode_buffer) >= self.episode_turns:
+                    self._close_episode()
+                self._episode_buffer.append(turn)
+        return turn
+
+    def record_outcome(self, turn: Dict, needed_clarification: bool = False,
+                       action: Optional[str] = None):
+        """Attach the response outcome to a turn and update the statistics."""
+        with self._lock:
+            turn['needed_clarification'] = needed_clarification
+            turn['action'] = action
+            turn['action_successful'] = bool(action)
+            if needed_clarification:
+                self.stats['clarifications_needed'] += 1
+            if action:
+                self.stats['successful_actions'] += 1
+                self._count(self.stats['actions'], action.split(':', 1)[0])
+
+    def _count(self, counter: Dict[str, int], key: str):
+        """Increment a bounded counter (the rarest key makes room)."""
+        if key not in counter and len(counter) >= MAX_TRACKED_KEYS:
+            del counter[min(counter, key=counter.get)]
+        counter[key] = counter.get(key, 0) + 1
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Tiers
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def _archive(self, turn: Dict):
+        """Spill a turn leaving the ring to the current segment."""
+        stats = self.stats
+        try:
+            if self._segment_handle is None or stats['segment_turns'] >= self.segment_turns:
+                self._rotate_segment()
+            self._segment_handle.write(json.dumps(turn, default=str) + "\n")
+            self._segment_handle.flush()
+            stats['segment_turns'] += 1
+            stats['archived_turns'] += 1
+        except OSError as e:
+            print(f"[ConversationMemory] Could not archive turn: {e}")
+
+    def _rotate_segment(self):
+        """Open the current segment (after a restart) or start the next one."""
+        if self._segment_handle is not None:
+            self._segment_handle.close()
+        if self.stats['segment_turns'] >= self.segment_turns:
+            self.stats['segment_index'] += 1
+            self.stats['segment_turns'] = 0
+        path = os.path.join(self.segments_path, f"segment_{self.stats['segment_index']:06d}.jsonl")
+        self._segment_handle = open(path, 'a')
+
+    def _close_episode(self):
+        """Summarize the buffered user turns into an episode record."""
+        turns, self._episode_buffer = self._episode_buffer, []
+        text = " ".join(t['content'].strip().rstrip('.!?') + "." for t in turns if t['content'].strip())
+        if self.summary_engine:
+            summary = self.summary_engine.summarizer.summarize(text, EPISODE_SUMMARY_RATIO)
+        else:
+            summary = text[:500]
+
+        apps = Counter(t.get('app_context') for t in turns if t.get('app_context'))
+        actions = Counter(t['action'].split(':', 1)[0] for t in turns if t.get('action'))
+        episode = {
+            'episode_id': self.stats['episodes'],
+            'start_turn': turns[0]['turn_id'],
+            'end_turn': turns[-1]['turn_id'],
+            'start_time': turns[0]['timestamp'],
+            'end_time': turns[-1]['timestamp'],
+            'user_turns': len(turns),
+            'clarifications': sum(1 for t in turns if t.get('needed_clarification')),
+            'top_apps': apps.most_common(3),
+            'top_actions': actions.most_common(5),
+            'summary': summary,
+        }
+        self.stats['episodes'] += 1
+        self.episodes.append(episode)
+        try:
+            with open(self.episodes_file, 'a') as f:
+                f.write(json.dumps(episode) + "\n")
+            self._save_stats()
+        except OSError as e:
+            print(f"[ConversationMemory] Could not save episode: {e}")
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Reading
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def recent(self, n: int = None) -> List[Dict]:
+        """The last n turns (all in-memory turns by default), oldest first."""
+        with self._lock:
+            turns = list(self._recent)
+        return turns[-n:] if n else turns
+
+    def iter_archived(self) -> Iterator[Dict]:
+        """Stream every archived turn from the segment log, oldest first."""
+        with self._lock:
+            if self._segment_handle:
+                self._segment_handle.flush()
+        for name in sorted(os.listdir(self.segments_path)):
+            with open(os.path.join(self.segments_path, name), 'r') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def __len__(self) -> int:
+        return self.stats['turns']
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.recent())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Rolling statistics (constant time)."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['apps'] = dict(Counter(self.stats['apps']).most_common(5))
+            stats['actions'] = dict(Counter(self.stats['actions']).most_common(5))
+            stats['in_memory_turns'] = len(self._recent)
+            return stats
+
+    def close(self):
+        """Spill the ring to disk and persist statistics."""
+        with self._lock:
+            while self._recent:
+                self._archive(self._recent.popleft())
+            if self._segment_handle:
+                self._segment_handle.close()
+                self._segment_handle = None
+            try:
+                self._save_stats()
+            except OSError as e:
+                print(f"[ConversationMemory] Could not save statistics: {e}")
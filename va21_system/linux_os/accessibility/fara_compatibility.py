@@ -60,12 +60,27 @@ import json
 import hashlib
 import subprocess
 import threading
+import time
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Set, Tuple
+from typing import Dict, List, Optional, Any, Set, Tuple, Callable
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
 from enum import Enum
 
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+    WATCHDOG_AVAILABLE = False
+
+try:
+    from .knowledge_search import KnowledgeSearchEngine, get_knowledge_search, SOURCE_FARA
+except ImportError:
+    from knowledge_search import KnowledgeSearchEngine, get_knowledge_search, SOURCE_FARA
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONSTANTS
@@ -84,6 +99,16 @@ DESKTOP_FILE_PATHS = [
     os.path.expanduser("~/.local/share/flatpak/exports/share/applications"),
 ]
 
+# Desktop file change handling
+DESKTOP_MANIFEST_FILE = "_desktop_manifest.json"
+DESKTOP_EVENT_DEBOUNCE = 0.3  # Seconds of quiet before a changed file is processed
+POLL_FALLBACK_INTERVAL = 30  # Seconds between scans when watchdog is unavailable
+DESKTOP_DIR_CHECK_INTERVAL = 60  # Seconds between checks for desktop dirs that appeared or vanished
+
+# Bulk import (first boot)
+BULK_IMPORT_STATE_FILE = "_bulk_import_state.json"
+BULK_IMPORT_BATCH_SIZE = 100  # Profiles per knowledge base commit
+
 # Wine app locations
 WINE_APP_PATHS = [
     os.path.expanduser("~/.wine/drive_c/Program Files"),
@@ -650,15 +675,21 @@ class FARAKnowledgeBase:
     
     Stores all generated FARA profiles in an Obsidian-compatible format
     for integration with Om Vinayaka's learning system.
+    Profiles are also registered in the shared KnowledgeSearchEngine.
     """
     
-    def __init__(self, kb_path: str = None):
+    def __init__(self, kb_path: str = None,
+                 search_engine: Optional[KnowledgeSearchEngine] = None):
         self.kb_path = kb_path or DEFAULT_FARA_KNOWLEDGE_BASE
         os.makedirs(self.kb_path, exist_ok=True)
+        self.search_engine = search_engine or get_knowledge_search()
         
         # Index of profiles
         self.profiles: Dict[str, FARAProfile] = {}
         self._load_index()
+        
+        for profile in self.profiles.values():
+            self._register_search_document(profile)
     
     def _load_index(self):
         """Load profile index from disk."""
@@ -698,6 +729,50 @@ class FARAKnowledgeBase:
         
         # Update index
         self._save_index()
+        self._register_search_document(profile)
+    
+    def save_profiles(self, profiles: List[FARAProfile]):
+        """
+        Save many FARA profiles with a single index commit.
+        
+        Used by bulk import so N profiles cost one _fara_index.json
+        rewrite instead of N.
+        """
+        if not profiles:
+            return
+        
+        for profile in profiles:
+            self.profiles[profile.profile_id] = profile
+            
+            json_file = os.path.join(self.kb_path, f"{profile.profile_id}.json")
+            with open(json_file, 'w') as f:
+                json.dump(asdict(profile), f, indent=2)
+            
+            self._save_obsidian_note(profile)
+            self._register_search_document(profile)
+        
+        self._save_index()
+    
+    def _register_search_document(self, profile: FARAProfile):
+        """Register (or refresh) a profile in the shared search index."""
+        parts = [profile.app_category.replace('_', ' '), profile.framework]
+        parts.extend(f"{cmd} {action}" for cmd, action in profile.voice_commands.items())
+        parts.extend(
+            f"{a.get('action_name', '')} {a.get('description', '')}"
+            for a in profile.actions
+        )
+        
+        self.search_engine.add_document(
+            doc_id=f"{SOURCE_FARA}:{profile.profile_id}",
+            source=SOURCE_FARA,
+            title=profile.app_name,
+            text="\n".join(parts),
+            metadata={
+                'profile_id': profile.profile_id,
+                'app_name': profile.app_name,
+                'category': profile.app_category,
+            },
+        )
     
     def _save_obsidian_note(self, profile: FARAProfile):
         """Save profile as Obsidian-compatible markdown note."""
@@ -782,6 +857,22 @@ tags:
         
         return None
     
+    def remove_profile(self, app_name: str) -> Optional[FARAProfile]:
+        """Delete an app's profile (files, index entry, search document)."""
+        profile = next((p for p in self.profiles.values()
+                        if p.app_name.lower() == app_name.lower()), None)
+        if profile is None:
+            return None
+        
+        del self.profiles[profile.profile_id]
+        for ext in ("json", "md"):
+            path = os.path.join(self.kb_path, f"{profile.profile_id}.{ext}")
+            if os.path.exists(path):
+                os.remove(path)
+        self.search_engine.remove_document(f"{SOURCE_FARA}:{profile.profile_id}")
+        self._save_index()
+        return profile
+    
     def get_all_profiles(self) -> List[FARAProfile]:
         """Get all FARA profiles."""
         return list(self.profiles.values())
@@ -792,6 +883,111 @@ tags:
                 if p.app_category.lower() == category.lower()]
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# APP INSTALL WATCHER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class DesktopFileManifest:
+    """
+    Persisted (path, mtime) manifest of parsed .desktop files.
+    
+    Lets a cold start parse only desktop files that are new or changed
+    since the last run, and remembers which app each file belonged to
+    so delete events can be reported.
+    """
+    
+    def __init__(self, manifest_path: str):
+        self.manifest_path = manifest_path
+        self.entries: Dict[str, Dict] = {}  # path -> {'mtime', 'app_name'}
+        self._lock = threading.Lock()
+        self._load()
+    
+    def _load(self):
+        """Load the manifest from disk."""
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, 'r') as f:
+                    self.entries = json.load(f).get('entries', {})
+            except Exception as e:
+                print(f"[FARA Creator] Error loading desktop manifest: {e}")
+    
+    def save(self):
+        """Save the manifest atomically."""
+        with self._lock:
+            data = {
+                'entries': dict(self.entries),
+                'updated_at': datetime.now().isoformat(),
+                'version': FARA_VERSION
+            }
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.manifest_path)
+    
+    def is_changed(self, path: str, mtime: float) -> bool:
+        """Check whether a desktop file is new or modified."""
+        with self._lock:
+            entry = self.entries.get(path)
+        return entry is None or entry.get('mtime') != mtime
+    
+    def update(self, path: str, mtime: float, app_name: Optional[str]):
+        """Record a parsed desktop file."""
+        with self._lock:
+            self.entries[path] = {'mtime': mtime, 'app_name': app_name}
+    
+    def remove(self, path: str) -> Optional[Dict]:
+        """Forget a desktop file, returning its last entry."""
+        with self._lock:
+            return self.entries.pop(path, None)
+    
+    def has_app(self, app_name: str) -> bool:
+        """Whether any recorded desktop file belongs to app_name."""
+        app_lower = app_name.lower()
+        with self._lock:
+            return any((entry.get('app_name') or '').lower() == app_lower
+                       for entry in self.entries.values())
+    
+    def paths_in(self, directory: str) -> Set[str]:
+        """Paths recorded for one directory."""
+        with self._lock:
+            return {p for p in self.entries if os.path.dirname(p) == directory}
+
+
+class DesktopFileEventHandler(FileSystemEventHandler):
+    """
+    Forwards watchdog (inotify) events for .desktop files to the
+    FARA creator's debounced work queue.
+    
+    Package managers often write a temporary file and rename it into
+    place, so moves are treated as delete + create.
+    """
+    
+    def __init__(self, enqueue: Callable[[str, str], None]):
+        super().__init__()
+        self._enqueue = enqueue
+    
+    def _forward(self, path: str, kind: str):
+        if path.endswith('.desktop'):
+            self._enqueue(path, kind)
+    
+    def on_created(self, event):
+        if not event.is_directory:
+            self._forward(event.src_path, 'created')
+    
+    def on_modified(self, event):
+        if not event.is_directory:
+            self._forward(event.src_path, 'modified')
+    
+    def on_deleted(self, event):
+        if not event.is_directory:
+            self._forward(event.src_path, 'deleted')
+    
+    def on_moved(self, event):
+        if not event.is_directory:
+            self._forward(event.src_path, 'deleted')
+            self._forward(event.dest_path, 'created')
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # AUTOMATIC FARA LAYER CREATOR
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -804,7 +1000,8 @@ class AutomaticFARALayerCreator:
     when it's installed, just like the Automatic Zork UX Creator.
     
     Features:
-    - Monitors for new app installations
+    - Monitors for new app installations (inotify via watchdog, with a
+      persisted desktop-file manifest and a debounced work queue)
     - Analyzes app UI and capabilities
     - Generates FARA profiles automatically
     - Integrates with Om Vinayaka AI
@@ -829,9 +1026,19 @@ class AutomaticFARALayerCreator:
         self.known_apps: Set[str] = set()
         self._load_known_apps()
         
-        # Monitoring thread
+        # Desktop files already parsed (path -> mtime)
+        self.desktop_manifest = DesktopFileManifest(
+            os.path.join(self.profiles_path, DESKTOP_MANIFEST_FILE)
+        )
+        
+        # Monitoring: watchdog observer (or polling fallback) + debounced work queue
         self._monitor_thread = None
         self._monitoring = False
+        self._observer = None
+        self._event_handler = None
+        self._watches: Dict[str, Any] = {}  # desktop dir -> watchdog ObservedWatch
+        self._pending_changes: Dict[str, Tuple[float, str]] = {}  # path -> (due, kind)
+        self._work_cond = threading.Condition()
         
         # Om Vinayaka integration callback
         self._om_vinayaka_callback = None
@@ -849,49 +1056,184 @@ class AutomaticFARALayerCreator:
         self._om_vinayaka_callback = callback
     
     def start_monitoring(self):
-        """Start monitoring for new app installations."""
+        """
+        Start monitoring for new app installations.
+        
+        Reconciles the desktop manifest once (parsing only new or changed
+        files), then reacts to inotify events through watchdog. Without
+        watchdog it falls back to a manifest-based poll.
+        
+        Desktop dirs that do not exist yet (e.g. ~/.local/share/applications
+        before the first user install, flatpak exports before flatpak is
+        set up) are checked for on a slow timer and watched once they appear.
+        """
         if self._monitoring:
             return
         
         self._monitoring = True
         self._monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self._monitor_thread.start()
-        print("[FARA Creator] Started monitoring for new app installations")
+        
+        if WATCHDOG_AVAILABLE:
+            self._observer = Observer()
+            self._event_handler = DesktopFileEventHandler(self._enqueue_desktop_change)
+            self._update_desktop_watches()
+            self._observer.start()
+            print("[FARA Creator] Started monitoring for new app installations (inotify)")
+        else:
+            print("[FARA Creator] Started monitoring for new app installations (polling)")
+        
+        # Cold start: only new/changed desktop files get parsed
+        self._scan_for_new_apps()
     
     def stop_monitoring(self):
         """Stop monitoring for new app installations."""
         self._monitoring = False
+        if self._observer:
+            self._observer.stop()
+            self._observer.join(timeout=2)
+            self._observer = None
+            self._watches.clear()
+        with self._work_cond:
+            self._work_cond.notify_all()
         if self._monitor_thread:
             self._monitor_thread.join(timeout=2)
         print("[FARA Creator] Stopped monitoring")
     
+    def _update_desktop_watches(self) -> bool:
+        """
+        Watch desktop dirs that exist and drop watches on vanished ones.
+        
+        Returns True if a new dir is now watched (it needs a scan, since
+        files may have been written before the watch was added).
+        """
+        added = False
+        for desktop_dir in DESKTOP_FILE_PATHS:
+            exists = os.path.isdir(desktop_dir)
+            watch = self._watches.get(desktop_dir)
+            if exists and watch is None:
+                try:
+                    self._watches[desktop_dir] = self._observer.schedule(
+                        self._event_handler, desktop_dir, recursive=False
+                    )
+                    added = True
+                except OSError as e:
+                    print(f"[FARA Creator] Cannot watch {desktop_dir}: {e}")
+            elif not exists and watch is not None:
+                del self._watches[desktop_dir]
+                try:
+                    self._observer.unschedule(watch)
+                except (KeyError, OSError):
+                    pass
+        return added
+    
+    def _enqueue_desktop_change(self, path: str, kind: str):
+        """Queue a desktop file change; repeated events restart its debounce."""
+        with self._work_cond:
+            self._pending_changes[path] = (time.monotonic() + DESKTOP_EVENT_DEBOUNCE, kind)
+            self._work_cond.notify()
+    
     def _monitor_loop(self):
-        """Monitor loop for new app installations."""
-        import time
+        """Work loop: process debounced desktop file changes."""
+        poll_interval = DESKTOP_DIR_CHECK_INTERVAL if WATCHDOG_AVAILABLE else POLL_FALLBACK_INTERVAL
+        next_poll = time.monotonic() + poll_interval
         
         while self._monitoring:
+            with self._work_cond:
+                now = time.monotonic()
+                due = {
+                    path: kind for path, (deadline, kind) in self._pending_changes.items()
+                    if deadline <= now
+                }
+                for path in due:
+                    del self._pending_changes[path]
+                
+                if not due:
+                    deadlines = [d for d, _ in self._pending_changes.values()]
+                    deadlines.append(next_poll)
+                    self._work_cond.wait(max(min(deadlines) - now, 0))
+            
             try:
-                # Scan for new desktop files
-                self._scan_for_new_apps()
-                time.sleep(30)  # Check every 30 seconds
+                if due:
+                    self._process_desktop_changes(due)
+                elif time.monotonic() >= next_poll:
+                    next_poll = time.monotonic() + poll_interval
+                    if not WATCHDOG_AVAILABLE:
+                        self._scan_for_new_apps()
+                    elif self._observer and self._update_desktop_watches():
+                        self._scan_for_new_apps()
             except Exception as e:
                 print(f"[FARA Creator] Monitor error: {e}")
-                time.sleep(60)
     
     def _scan_for_new_apps(self):
-        """Scan for newly installed apps."""
+        """Queue desktop files that are new, changed or gone since the manifest."""
         for desktop_dir in DESKTOP_FILE_PATHS:
-            if os.path.exists(desktop_dir):
-                for file in os.listdir(desktop_dir):
-                    if file.endswith('.desktop'):
-                        self._check_desktop_file(os.path.join(desktop_dir, file))
+            seen = set()
+            if os.path.isdir(desktop_dir):
+                try:
+                    with os.scandir(desktop_dir) as entries:
+                        for entry in entries:
+                            if not entry.name.endswith('.desktop'):
+                                continue
+                            seen.add(entry.path)
+                            try:
+                                mtime = entry.stat().st_mtime
+                            except OSError:
+                                continue
+                            if self.desktop_manifest.is_changed(entry.path, mtime):
+                                self._enqueue_desktop_change(entry.path, 'modified')
+                except OSError as e:
+                    print(f"[FARA Creator] Error scanning {desktop_dir}: {e}")
+            
+            for path in self.desktop_manifest.paths_in(desktop_dir) - seen:
+                self._enqueue_desktop_change(path, 'deleted')
+    
+    def _process_desktop_changes(self, changes: Dict[str, str]):
+        """Apply a batch of debounced desktop file changes."""
+        deleted = [path for path, kind in changes.items()
+                   if kind == 'deleted' or not os.path.exists(path)]
+        # New and changed files first, so a desktop file that moved within
+        # the batch is recorded before its old path is checked for uninstall
+        for path in [p for p in changes if p not in deleted] + deleted:
+            if path in deleted:
+                entry = self.desktop_manifest.remove(path)
+                app_name = entry.get('app_name') if entry else None
+                # Another desktop file (e.g. the system copy behind a removed
+                # ~/.local override) still provides the app
+                if not app_name or self.desktop_manifest.has_app(app_name):
+                    continue
+                self.remove_app(app_name)
+                if self._om_vinayaka_callback:
+                    self._om_vinayaka_callback({
+                        'event': 'app_uninstalled',
+                        'app_name': app_name,
+                        'desktop_file': path
+                    })
+                continue
+            
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                continue
+            if not self.desktop_manifest.is_changed(path, mtime):
+                continue
+            
+            app_info = self._check_desktop_file(path)
+            self.desktop_manifest.update(
+                path, mtime, app_info.get('name') if app_info else None
+            )
+        
+        try:
+            self.desktop_manifest.save()
+        except Exception as e:
+            print(f"[FARA Creator] Error saving desktop manifest: {e}")
     
-    def _check_desktop_file(self, desktop_file: str):
-        """Check if a desktop file represents a new app."""
+    def _check_desktop_file(self, desktop_file: str) -> Optional[Dict]:
+        """Check if a desktop file represents a new app. Returns its parsed info."""
         try:
             app_info = self._parse_desktop_file(desktop_file)
             if not app_info:
-                return
+                return None
             
             app_name = app_info.get('name', '').lower()
             if app_name and app_name not in self.known_apps:
@@ -903,8 +1245,10 @@ class AutomaticFARALayerCreator:
                     executable=app_info.get('exec'),
                     category=app_info.get('category')
                 )
+            return app_info
         except Exception as e:
             print(f"[FARA Creator] Error checking {desktop_file}: {e}")
+            return None
     
     def _parse_desktop_file(self, desktop_file: str) -> Optional[Dict]:
         """Parse a .desktop file to extract app info."""
@@ -934,6 +1278,18 @@ class AutomaticFARALayerCreator:
         except Exception:
             return None
     
+    def remove_app(self, app_name: str):
+        """
+        Forget an uninstalled app: its profile goes and a reinstall is
+        detected as a new app.
+        """
+        self.known_apps.discard(app_name.lower())
+        try:
+            self.knowledge_base.remove_profile(app_name)
+        except OSError as e:
+            print(f"[FARA Creator] Error removing profile for {app_name}: {e}")
+        print(f"[FARA Creator] App uninstalled: {app_name}")
+    
     def create_profile_for_app(self, app_name: str, 
                                 desktop_file: str = None,
                                 executable: str = None,
@@ -963,6 +1319,34 @@ class AutomaticFARALayerCreator:
         """
         print(f"[FARA Creator] Creating profile for: {app_name}")
         
+        profile = self._build_profile(
+            app_name, desktop_file, executable, category, is_wine_app
+        )
+        
+        # Save profile
+        self.knowledge_base.save_profile(profile)
+        self.known_apps.add(app_name.lower())
+        
+        # Notify Om Vinayaka AI
+        self._notify_profile_created(profile)
+        
+        print(f"[FARA Creator] Profile created: {profile.profile_id}")
+        print(f"[FARA Creator]   - Actions: {len(profile.actions)}")
+        print(f"[FARA Creator]   - Voice commands: {len(profile.voice_commands)}")
+        print(f"[FARA Creator]   - Framework: {profile.framework}")
+        
+        return profile
+    
+    def _build_profile(self, app_name: str,
+                       desktop_file: str = None,
+                       executable: str = None,
+                       category: str = None,
+                       is_wine_app: bool = False) -> FARAProfile:
+        """
+        Analyze an app and build its FARA profile without saving it.
+        
+        Used by bulk import, which commits profiles in batches.
+        """
         # Generate profile ID
         profile_id = hashlib.sha256(app_name.lower().encode()).hexdigest()[:12]
         
@@ -992,7 +1376,7 @@ class AutomaticFARALayerCreator:
         is_legacy = framework in [AppFramework.GTK2, AppFramework.QT4]
         
         # Create profile
-        profile = FARAProfile(
+        return FARAProfile(
             profile_id=profile_id,
             app_name=app_name,
             app_executable=executable or app_name.lower(),
@@ -1007,27 +1391,18 @@ class AutomaticFARALayerCreator:
             automation_patterns=automation_patterns,
             om_vinayaka_enabled=True
         )
-        
-        # Save profile
-        self.knowledge_base.save_profile(profile)
-        self.known_apps.add(app_name.lower())
-        
-        # Notify Om Vinayaka AI
+    
+    def _notify_profile_created(self, profile: FARAProfile):
+        """Tell Om Vinayaka AI about a new profile."""
         if self._om_vinayaka_callback:
             self._om_vinayaka_callback({
                 'event': 'fara_profile_created',
-                'app_name': app_name,
-                'profile_id': profile_id,
-                'actions_count': len(actions),
-                'voice_commands_count': len(voice_commands)
+                'app_name': profile.app_name,
+                'profile_id': profile.profile_id,
+                'desktop_file': profile.desktop_file,
+                'actions_count': len(profile.actions),
+                'voice_commands_count': len(profile.voice_commands)
             })
-        
-        print(f"[FARA Creator] Profile created: {profile_id}")
-        print(f"[FARA Creator]   - Actions: {len(actions)}")
-        print(f"[FARA Creator]   - Voice commands: {len(voice_commands)}")
-        print(f"[FARA Creator]   - Framework: {framework.value}")
-        
-        return profile
     
     def _detect_framework(self, app_name: str, executable: str = None,
                           is_wine: bool = False) -> AppFramework:
@@ -1128,46 +1503,137 @@ class AutomaticFARALayerCreator:
             is_wine_app=True
         )
     
-    def scan_all_installed_apps(self) -> List[FARAProfile]:
-        """Scan all installed apps and create FARA profiles."""
+    def scan_all_installed_apps(self, batch_size: int = BULK_IMPORT_BATCH_SIZE,
+                                progress_callback: Callable[[int, int, str], None] = None,
+                                resume: bool = True) -> List[FARAProfile]:
+        """
+        Scan all installed apps and create FARA profiles (bulk import).
+        
+        Profiles are committed to the knowledge base one batch at a time
+        (one index write per batch). Desktop files whose profile was
+        built are checkpointed, so an interrupted import resumes where
+        it stopped and retries the ones that failed.
+        
+        Args:
+            batch_size: Profiles per knowledge base commit
+            progress_callback: Called as (done, total, app_name)
+            resume: Continue from the last checkpoint if one exists
+        
+        Returns:
+            Newly created profiles
+        """
         created_profiles = []
         
         print("[FARA Creator] Scanning all installed applications...")
         
+        state_file = os.path.join(self.profiles_path, BULK_IMPORT_STATE_FILE)
+        completed = self._load_bulk_import_state(state_file) if resume else set()
+        if completed:
+            print(f"[FARA Creator] Resuming bulk import ({len(completed)} files already done)")
+        
+        # Parse desktop files up front (cheap) and keep only new apps
+        candidates = []
+        pending_names = set()
         for desktop_dir in DESKTOP_FILE_PATHS:
-            if not os.path.exists(desktop_dir):
+            if not os.path.isdir(desktop_dir):
                 continue
             
-            for file in os.listdir(desktop_dir):
-                if not file.endswith('.desktop'):
-                    continue
-                
-                desktop_file = os.path.join(desktop_dir, file)
-                app_info = self._parse_desktop_file(desktop_file)
-                
-                if not app_info or not app_info.get('name'):
-                    continue
-                
+            with os.scandir(desktop_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith('.desktop') or entry.path in completed:
+                        continue
+                    
+                    app_info = self._parse_desktop_file(entry.path)
+                    try:
+                        self.desktop_manifest.update(
+                            entry.path, entry.stat().st_mtime,
+                            app_info.get('name') if app_info else None
+                        )
+                    except OSError:
+                        pass
+                    
+                    if not app_info or not app_info.get('name'):
+                        completed.add(entry.path)
+                        continue
+                    
+                    name_key = app_info['name'].lower()
+                    
+                    # Skip if already have profile (or queued from another file)
+                    if name_key in self.known_apps or name_key in pending_names:
+                        completed.add(entry.path)
+                        continue
+                    
+                    pending_names.add(name_key)
+                    candidates.append((entry.path, app_info))
+        
+        total = len(candidates)
+        done = 0
+        
+        for start in range(0, total, batch_size):
+            batch = candidates[start:start + batch_size]
+            
+            built = []
+            succeeded = []
+            for desktop_file, app_info in batch:
                 app_name = app_info['name']
-                
-                # Skip if already have profile
-                if app_name.lower() in self.known_apps:
-                    continue
-                
                 try:
-                    profile = self.create_profile_for_app(
-                        app_name=app_name,
-                        desktop_file=desktop_file,
-                        executable=app_info.get('exec'),
-                        category=app_info.get('category')
-                    )
-                    created_profiles.append(profile)
+                    built.append(self._build_profile(
+                        app_name,
+                        desktop_file,
+                        app_info.get('exec'),
+                        app_info.get('category')
+                    ))
+                    succeeded.append(desktop_file)
                 except Exception as e:
                     print(f"[FARA Creator] Error creating profile for {app_name}: {e}")
+                done += 1
+                if progress_callback:
+                    progress_callback(done, total, app_name)
+            
+            # One knowledge base commit per batch
+            self.knowledge_base.save_profiles(built)
+            for profile in built:
+                self.known_apps.add(profile.app_name.lower())
+                self._notify_profile_created(profile)
+            created_profiles.extend(built)
+            
+            # Failed files stay out of the checkpoint, so a resumed import retries them
+            completed.update(succeeded)
+            self._save_bulk_import_state(state_file, completed)
+            print(f"[FARA Creator] Bulk import: {done}/{total} apps processed")
+        
+        try:
+            self.desktop_manifest.save()
+        except Exception as e:
+            print(f"[FARA Creator] Error saving desktop manifest: {e}")
+        
+        # Finished - the next import starts fresh
+        if os.path.exists(state_file):
+            os.remove(state_file)
         
         print(f"[FARA Creator] Created {len(created_profiles)} new profiles")
         return created_profiles
     
+    def _load_bulk_import_state(self, state_file: str) -> Set[str]:
+        """Load desktop files completed by an interrupted bulk import."""
+        if os.path.exists(state_file):
+            try:
+                with open(state_file, 'r') as f:
+                    return set(json.load(f).get('completed', []))
+            except Exception as e:
+                print(f"[FARA Creator] Error loading bulk import state: {e}")
+        return set()
+    
+    def _save_bulk_import_state(self, state_file: str, completed: Set[str]):
+        """Checkpoint bulk import progress atomically."""
+        tmp_file = state_file + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump({
+                'completed': sorted(completed),
+                'updated_at': datetime.now().isoformat()
+            }, f)
+        os.replace(tmp_file, state_file)
+    
     def get_profile(self, app_name: str) -> Optional[FARAProfile]:
         """Get FARA profile for an app."""
         return self.knowledge_base.get_profile(app_name)
@@ -1256,6 +1722,9 @@ class AutomaticFARALayerCreator:
         return {
             'version': self.VERSION,
             'monitoring': self._monitoring,
+            'watch_mode': 'inotify' if WATCHDOG_AVAILABLE else 'polling',
+            'watched_dirs': list(self._watches),
+            'tracked_desktop_files': len(self.desktop_manifest.entries),
             'known_apps': len(self.known_apps),
             'profiles_count': len(self.knowledge_base.profiles),
             'wine_profiles': len([p for p in self.knowledge_base.profiles.values() 
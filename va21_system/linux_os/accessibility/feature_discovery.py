@@ -35,6 +35,11 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 
+try:
+    from .knowledge_search import KnowledgeSearchEngine, get_knowledge_search, SOURCE_FEATURES
+except ImportError:
+    from knowledge_search import KnowledgeSearchEngine, get_knowledge_search, SOURCE_FEATURES
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONSTANTS
@@ -146,11 +151,43 @@ class FeatureDatabase:
     - Traditional Linux equivalents
     - Tutorial links
     - Discovery hints
+    
+    Features are registered in the shared KnowledgeSearchEngine.
     """
     
-    def __init__(self):
+    def __init__(self, search_engine: Optional[KnowledgeSearchEngine] = None):
         self.features: Dict[str, Feature] = {}
+        self.search_engine = search_engine or get_knowledge_search()
         self._load_default_features()
+        
+        for feature in self.features.values():
+            self._register_search_document(feature)
+    
+    def add_feature(self, feature: Feature):
+        """Add or replace a feature."""
+        self.features[feature.feature_id] = feature
+        self._register_search_document(feature)
+    
+    def _register_search_document(self, feature: Feature):
+        """Register (or refresh) a feature in the shared search index."""
+        parts = [feature.description]
+        parts.extend(feature.voice_commands)
+        parts.extend(feature.keyboard_shortcuts)
+        for extra in (feature.menu_path, feature.linux_equivalent,
+                      feature.traditional_workflow, feature.discovery_hint):
+            if extra:
+                parts.append(extra)
+        
+        self.search_engine.add_document(
+            doc_id=f"{SOURCE_FEATURES}:{feature.feature_id}",
+            source=SOURCE_FEATURES,
+            title=feature.name,
+            text="\n".join(parts),
+            metadata={
+                'feature_id': feature.feature_id,
+                'category': feature.category.value,
+            },
+        )
     
     def _load_default_features(self):
         """Load default VA21 features."""
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+VA21 OS - Embedded Graph Store
+===============================
+
+🙏 OM VINAYAKA - EVERYTHING CONNECTED 🙏
+
+A small in-memory graph with an append-only log, used by the
+Accessibility Mind Map.
+
+Nodes live in a dict keyed by ID; edges are kept in outgoing and
+incoming adjacency maps keyed by (neighbor, relationship), so a
+duplicate edge is a no-op and a neighborhood query touches only that
+node's edges. Nodes are also indexed by type and category.
+
+Persistence is a JSON snapshot (same {nodes, edges} layout as the old
+mindmap_index.json) plus a JSON-lines mutation log. Mutations are
+buffered and appended in batches; when the log grows large it is
+folded into a fresh snapshot.
+
+Om Vinayaka - May obstacles be removed from your computing journey.
+
+License: Om Vinayaka Prayaga Vaibhav Inventions License
+Copyright (c) 2024-2025 Prayaga Vaibhav
+"""
+
+import os
+import json
+import atexit
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+GRAPH_STORE_VERSION = "1.0.0"
+
+# Buffered mutations written together
+FLUSH_BATCH = 256
+# Seconds before a partial batch is written anyway
+FLUSH_INTERVAL = 2.0
+# Log entries before the log is folded into the snapshot
+COMPACT_THRESHOLD = 5000
+
+# Node fields that get an index
+INDEXED_FIELDS = ('type', 'category')
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# GRAPH STORE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class GraphStore:
+    """
+    Adjacency-map graph with field indexes and batched append-log persistence.
+
+    Args:
+        snapshot_path: JSON snapshot ({"nodes": {...}, "edges": [...]})
+        log_path: Mutation log (default: snapshot path with .log)
+    """
+
+    def __init__(self, snapshot_path: str, log_path: str = None):
+        self.snapshot_path = snapshot_path
+        self.log_path = log_path or os.path.splitext(snapshot_path)[0] + ".log"
+
+        self.nodes: Dict[str, Dict] = {}
+        self._out: Dict[str, Dict[Tuple[str, str], Dict]] = {}
+        self._in: Dict[str, Dict[Tuple[str, str], Dict]] = {}
+        self._index: Dict[str, Dict[str, Dict[str, None]]] = {f: {} for f in INDEXED_FIELDS}
+        self._edge_count = 0
+
+        self._lock = threading.RLock()
+        self._pending: List[str] = []
+        self._log_entries = 0
+        self._timer: Optional[threading.Timer] = None
+
+        self._load()
+        atexit.register(self.flush)
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Loading
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def _load(self):
+        """Load the snapshot, then replay the log on top of it."""
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, 'r') as f:
+                    data = json.load(f)
+                for node_id, node in data.get('nodes', {}).items():
+                    self._apply_node(node_id, node)
+                for edge in data.get('edges', []):
+                    self._apply_edge(edge)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"[GraphStore] Could not load snapshot: {e}")
+
+        if os.path.exists(self.log_path):
+            try:
+                with open(self.log_path, 'r') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            break  # Torn final write
+                        self._replay(entry)
+                        self._log_entries += 1
+            except OSError as e:
+                print(f"[GraphStore] Could not replay log: {e}")
+
+    def _replay(self, entry: Dict):
+        op = entry.get('op')
+        if op == 'node':
+            self._apply_node(entry['id'], entry['data'])
+        elif op == 'edge':
+            self._apply_edge(entry['data'])
+        elif op == 'remove_node':
+            self._apply_remove_node(entry['id'])
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # In-memory mutations
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def _apply_node(self, node_id: str, data: Dict):
+        old = self.nodes.get(node_id)
+        if old is not None:
+            self._unindex(node_id, old)
+        self.nodes[node_id] = data
+        for field in INDEXED_FIELDS:
+            value = data.get(field)
+            if value is not None:
+                self._index[field].setdefault(value, {})[node_id] = None
+
+    def _unindex(self, node_id: str, data: Dict):
+        for field in INDEXED_FIELDS:
+            bucket = self._index[field].get(data.get(field))
+            if bucket is not None:
+                bucket.pop(node_id, None)
+
+    def _apply_edge(self, edge: Dict) -> bool:
+        source, target, relationship = edge['source'], edge['target'], edge.get('relationship', '')
+        out = self._out.setdefault(source, {})
+        if (target, relationship) in out:
+            return False
+        out[(target, relationship)] = edge
+        self._in.setdefault(target, {})[(source, relationship)] = edge
+        self._edge_count += 1
+        return True
+
+    def _apply_remove_node(self, node_id: str):
+        data = self.nodes.pop(node_id, None)
+        if data is not None:
+            self._unindex(node_id, data)
+        for (target, relationship) in list(self._out.pop(node_id, {})):
+            self._in.get(target, {}).pop((node_id, relationship), None)
+            self._edge_count -= 1
+        for (source, relationship) in list(self._in.pop(node_id, {})):
+            if source != node_id:  # Self-loops were dropped above
+                self._out.get(source, {}).pop((node_id, relationship), None)
+                self._edge_count -= 1
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Public mutations
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def put_node(self, node_id: str, data: Dict):
+        """Insert or replace a node."""
+        with self._lock:
+            self._apply_node(node_id, data)
+            self._log({'op': 'node', 'id': node_id, 'data': data})
+
+    def add_node_if_missing(self, node_id: str, data: Dict) -> bool:
+        """Insert a node unless it exists. Returns True if added."""
+        with self._lock:
+            if node_id in self.nodes:
+                return False
+            self.put_node(node_id, data)
+            return True
+
+    def add_edge(self, source: str, target: str, relationship: str, **fields) -> bool:
+        """Add an edge; an identical (source, target, relationship) is ignored."""
+        edge = {'source': source, 'target': target, 'relationship': relationship}
+        edge.update(fields)
+        with self._lock:
+            if not self._apply_edge(edge):
+                return False
+            self._log({'op': 'edge', 'data': edge})
+            return True
+
+    def remove_node(self, node_id: str):
+        """Remove a node and all its edges."""
+        with self._lock:
+            if node_id in self.nodes or node_id in self._out or node_id in self._in:
+                self._apply_remove_node(node_id)
+                self._log({'op': 'remove_node', 'id': node_id})
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Queries
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def get_node(self, node_id: str) -> Optional[Dict]:
+        return self.nodes.get(node_id)
+
+    def find(self, field: str, value) -> List[str]:
+        """IDs of nodes whose indexed field equals value (insertion order)."""
+        return list(self._index[field].get(value, ()))
+
+    def neighbors(self, node_id: str, relationship: str = None,
+                  direction: str = 'out') -> List[str]:
+        """IDs adjacent to a node ('out', 'in' or 'both')."""
+        with self._lock:
+            result = []
+            if direction in ('out', 'both'):
+                result.extend(t for (t, r) in self._out.get(node_id, ())
+                              if relationship is None or r == relationship)
+            if direction in ('in', 'both'):
+                result.extend(s for (s, r) in self._in.get(node_id, ())
+                              if relationship is None or r == relationship)
+            return result
+
+    def iter_edges(self) -> Iterator[Dict]:
+        for edges in self._out.values():
+            yield from edges.values()
+
+    @property
+    def edge_count(self) -> int:
+        return self._edge_count
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Persistence
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def _log(self, entry: Dict):
+        self._pending.append(json.dumps(entry, default=str))
+        if len(self._pending) >= FLUSH_BATCH:
+            self.flush()
+        elif self._timer is None:
+            self._timer = threading.Timer(FLUSH_INTERVAL, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Append buffered mutations to the log (compacting if it is large)."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            try:
+                os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+                with open(self.log_path, 'a') as f:
+                    f.write("\n".join(pending) + "\n")
+                self._log_entries += len(pending)
+            except OSError as e:
+                print(f"[GraphStore] Could not write log: {e}")
+                self._pending = pending + self._pending
+                return
+            if self._log_entries >= COMPACT_THRESHOLD:
+                self.compact()
+
+    def compact(self):
+        """Write a fresh snapshot and truncate the log."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            # Buffered mutations are already applied in memory
+            pending, self._pending = self._pending, []
+            tmp_path = self.snapshot_path + ".tmp"
+            try:
+                with open(tmp_path, 'w') as f:
+                    json.dump({
+                        'nodes': self.nodes,
+                        'edges': list(self.iter_edges()),
+                        'updated_at': datetime.now().isoformat()
+                    }, f, indent=2)
+                os.replace(tmp_path, self.snapshot_path)
+                # The snapshot now holds everything the log did (replaying
+                # the log over it again after a crash here is harmless)
+                open(self.log_path, 'w').close()
+                self._log_entries = 0
+            except OSError as e:
+                print(f"[GraphStore] Could not write snapshot: {e}")
+                self._pending = pending + self._pending
+
+    def get_stats(self) -> Dict:
+        return {
+            'nodes': len(self.nodes),
+            'edges': self._edge_count,
+            'pending_writes': len(self._pending),
+            'log_entries': self._log_entries,
+        }
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+VA21 OS - Local Intent Classifier
+==================================
+
+🙏 OM VINAYAKA - UNDERSTAND, THEN ACT 🙏
+
+A small trained model that routes user requests in microseconds.
+
+Text is turned into hashed character n-gram and word features and
+scored by a multinomial logistic regression (one weight row per hashed
+feature). The model starts from a built-in seed corpus, replays the
+Self-Learning Engine's command patterns, and keeps learning online from
+every request that ends in an action. Slots (destination, control,
+query, tool) are extracted after classification; a low confidence or a
+missing required slot means "fall back" to the rule set.
+
+Features:
+- Character 3/4-grams + word uni/bigrams, hashed (stable crc32)
+- Softmax linear model, NumPy when installed, pure Python otherwise
+- Incremental SGD updates; labels can be added at any time
+- Slot extraction for navigation, system control, search and CLI tools
+- Confidence score with a configurable fallback threshold
+
+Om Vinayaka - May obstacles be removed from your computing journey.
+
+License: Om Vinayaka Prayaga Vaibhav Inventions License
+Copyright (c) 2024-2025 Prayaga Vaibhav
+"""
+
+import re
+import math
+import zlib
+import random
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+NUMPY_AVAILABLE = False
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    pass
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+INTENT_CLASSIFIER_VERSION = "1.0.0"
+
+# Hashed feature space (power of two)
+FEATURE_DIM = 1 << 16
+# Below this probability the caller should use its fallback
+CONFIDENCE_THRESHOLD = 0.5
+LEARNING_RATE = 0.5
+SEED_EPOCHS = 25
+# Learned patterns replayed at most this many times (by frequency)
+MAX_PATTERN_REPLAY = 3
+
+UNKNOWN_LABEL = "unknown"
+
+# control -> phrases that name it
+SYSTEM_CONTROLS = {
+    'volume': ['volume', 'sound', 'mute', 'unmute', 'louder', 'quieter'],
+    'brightness': ['brightness', 'brighter', 'dimmer', 'dim the', 'screen light'],
+    'wifi': ['wifi', 'wi-fi', 'wireless'],
+    'bluetooth': ['bluetooth'],
+    'shutdown': ['shutdown', 'shut down', 'power off', 'turn off the computer'],
+    'restart': ['restart', 'reboot'],
+    'sleep': ['sleep', 'suspend'],
+    'lock': ['lock'],
+}
+
+_NAV_PREFIX_RE = re.compile(
+    r'^(?:please\s+)?(?:go\s+to|navigate\s+to|navigate|take\s+me\s+to|show\s+me|'
+    r'switch\s+to|open\s+up|open|bring\s+up)\s+', re.IGNORECASE
+)
+_SEARCH_PREFIX_RE = re.compile(
+    r'^.*?\b(?:search\s+(?:the\s+\w+\s+)?for|search|find|look\s+for|look\s+up)\s+', re.IGNORECASE
+)
+_ARTICLE_RE = re.compile(r'^(?:the|my|a|an)\s+', re.IGNORECASE)
+# "show me how to ..." asks for instructions, it names no place
+_QUESTION_WORD_RE = re.compile(r'^(?:how|what|why|where|when|who|which)\b', re.IGNORECASE)
+_WORD_RE = re.compile(r"[\w'-]+")
+
+# Seed corpus: a few phrasings per label so the model works on day one
+SEED_EXAMPLES: Dict[str, List[str]] = {
+    'app_action:save': ["save", "save my work", "save this file", "store this",
+                        "keep this document", "save the document please", "preserve my changes"],
+    'app_action:open': ["open a file", "open this", "load the file", "open the document",
+                        "load my project", "open it", "open the selected file"],
+    'app_action:close': ["close this", "exit", "quit the app", "close the window",
+                         "leave this app", "quit"],
+    'app_action:copy': ["copy", "copy this", "copy the text", "duplicate this file", "copy that"],
+    'app_action:paste': ["paste", "paste it here", "paste the text", "put it here"],
+    'app_action:delete': ["delete", "delete this file", "remove this", "erase that",
+                          "delete the selected text", "delete my documents folder",
+                          "remove the downloads folder"],
+    'app_action:undo': ["undo", "undo that", "revert my change", "undo the last change"],
+    'app_action:redo': ["redo", "redo that", "repeat that", "redo the last change"],
+    'app_action:search': ["search for cats", "find the word hello", "look for my report",
+                          "search the web for news", "find files named budget",
+                          "look up the weather"],
+    'app_action:create': ["create a new document", "new file", "make a folder",
+                          "create a note", "make a new spreadsheet"],
+    'navigation': ["go to downloads", "navigate to documents", "take me to settings",
+                   "show me my photos", "open the downloads folder", "open settings",
+                   "go to the home folder", "switch to the browser", "open my music folder",
+                   "take me to the terminal", "go to my desktop"],
+    'system_control': ["turn up the volume", "volume down", "mute the sound",
+                       "make the screen brighter", "dim the screen", "turn on wifi",
+                       "disconnect wifi", "turn off bluetooth", "shut down the computer",
+                       "restart the computer", "reboot", "put the computer to sleep",
+                       "lock the screen", "set brightness to half"],
+    'question': ["what is this", "how do I save a file", "where am I", "why did that happen",
+                 "when was this file changed", "who sent this email", "what can I do here",
+                 "how does this work", "what does this button do?",
+                 "show me how to save", "show me how to copy a file",
+                 "show me what this button does"],
+    'help': ["help", "help me", "I need help", "help with email", "can you help me",
+             "I'm stuck, help"],
+    'cli_tool': ["ask gemini about python", "ask codex to explain this code",
+                 "use aider to fix the bug", "ask claude a question", "cody write a test",
+                 "gh-copilot suggest a command"],
+    UNKNOWN_LABEL: ["hello", "thank you", "blah blah", "the cat sat on the mat",
+                    "good morning", "I like music", "okay", "hmm"],
+}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FEATURES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def extract_features(text: str, dim: int = FEATURE_DIM) -> Dict[int, float]:
+    """Hashed, L2-normalized n-gram features of a request."""
+    text = " ".join(text.lower().split())
+    counts: Dict[int, float] = {}
+    mask = dim - 1
+
+    def add(feature: str):
+        index = zlib.crc32(feature.encode('utf-8')) & mask
+        counts[index] = counts.get(index, 0.0) + 1.0
+
+    padded = f" {text} "
+    for n in (3, 4):
+        for i in range(len(padded) - n + 1):
+            add("c" + padded[i:i + n])
+    words = _WORD_RE.findall(text)
+    for i, word in enumerate(words):
+        add("w:" + word)
+        if i:
+            add("b:" + words[i - 1] + " " + word)
+    add("bias")
+
+    norm = math.sqrt(sum(v * v for v in counts.values())) or 1.0
+    return {index: value / norm for index, value in counts.items()}
+
+
+def label_for_action(action: str) -> Optional[str]:
+    """Training label for an action string produced by OmVinayakaAI."""
+    if not action:
+        return None
+    if action.startswith('navigate:'):
+        return 'navigation'
+    if action.startswith('cli:'):
+        return 'cli_tool'
+    if action in SYSTEM_CONTROLS:
+        return 'system_control'
+    if re.fullmatch(r'[a-z_]+', action):
+        return f'app_action:{action}'
+    return None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SLOT EXTRACTION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def extract_control(text: str) -> Optional[str]:
+    text = text.lower()
+    for control, phrases in SYSTEM_CONTROLS.items():
+        if any(phrase in text for phrase in phrases):
+            return control
+    return None
+
+
+def extract_destination(text: str) -> Optional[str]:
+    """Place named after a navigation verb; None without a verb or place."""
+    text = text.strip()
+    match = _NAV_PREFIX_RE.match(text)
+    if not match:
+        return None
+    destination = _ARTICLE_RE.sub('', text[match.end():]).strip().rstrip('.!?')
+    if not destination or _QUESTION_WORD_RE.match(destination):
+        return None
+    return destination
+
+
+def extract_query(text: str) -> str:
+    match = _SEARCH_PREFIX_RE.match(text)
+    query = text[match.end():] if match else text
+    return query.strip().rstrip('.!?')
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# INTENT CLASSIFIER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class IntentClassifier:
+    """
+    Hashed n-gram softmax classifier with slot extraction.
+
+    classify() returns an intent dict in OmVinayakaAI's format, or
+    None when the caller should fall back to its rules.
+    """
+
+    def __init__(self, cli_tools: List[str] = None,
+                 threshold: float = CONFIDENCE_THRESHOLD,
+                 dim: int = FEATURE_DIM, seed: bool = True):
+        self.cli_tools = sorted(cli_tools or [], key=len, reverse=True)
+        self.threshold = threshold
+        self.dim = dim
+        self.labels: List[str] = []
+        self._label_index: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+        if NUMPY_AVAILABLE:
+            self._weights = np.zeros((dim, 0), dtype=np.float32)
+            self._bias = np.zeros(0, dtype=np.float32)
+        else:
+            self._weights: Dict[int, List[float]] = {}
+            self._bias: List[float] = []
+
+        self.stats = {'classified': 0, 'fallbacks': 0, 'updates': 0}
+
+        if seed:
+            self.train([(text, label) for label, texts in SEED_EXAMPLES.items() for text in texts],
+                       epochs=SEED_EPOCHS)
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Model
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def _ensure_label(self, label: str) -> int:
+        index = self._label_index.get(label)
+        if index is None:
+            index = len(self.labels)
+            self.labels.append(label)
+            self._label_index[label] = index
+            if NUMPY_AVAILABLE:
+                self._weights = np.hstack([self._weights, np.zeros((self.dim, 1), dtype=np.float32)])
+                self._bias = np.append(self._bias, np.float32(0))
+            else:
+                self._bias.append(0.0)
+        return index
+
+    def _probabilities(self, features: Dict[int, float]):
+        """Softmax over labels for a feature vector."""
+        if NUMPY_AVAILABLE:
+            indices = np.fromiter(features.keys(), dtype=np.int64, count=len(features))
+            values = np.fromiter(features.values(), dtype=np.float32, count=len(features))
+            scores = values @ self._weights[indices] + self._bias
+            scores = np.exp(scores - scores.max())
+            return scores / scores.sum()
+
+        scores = list(self._bias)
+        n_labels = len(scores)
+        for index, value in features.items():
+            row = self._weights.get(index)
+            if row:
+                for j in range(min(n_labels, len(row))):
+                    scores[j] += value * row[j]
+        top = max(scores)
+        exps = [math.exp(s - top) for s in scores]
+        total = sum(exps)
+        return [e / total for e in exps]
+
+    def _update(self, features: Dict[int, float], label_index: int, lr: float):
+        """One SGD step on the cross-entropy loss."""
+        probs = self._probabilities(features)
+        if NUMPY_AVAILABLE:
+            grad = probs.astype(np.float32)
+            grad[label_index] -= 1.0
+            indices = np.fromiter(features.keys(), dtype=np.int64, count=len(features))
+            values = np.fromiter(features.values(), dtype=np.float32, count=len(features))
+            self._weights[indices] -= lr * np.outer(values, grad)
+            self._bias -= lr * grad
+            return
+
+        grad = list(probs)
+        grad[label_index] -= 1.0
+        n_labels = len(grad)
+        for index, value in features.items():
+            row = self._weights.get(index)
+            if row is None:
+                row = self._weights[index] = [0.0] * n_labels
+            elif len(row) < n_labels:
+                row.extend([0.0] * (n_labels - len(row)))
+            step = lr * value
+            for j in range(n_labels):
+                row[j] -= step * grad[j]
+        for j in range(n_labels):
+            self._bias[j] -= lr * grad[j]
+
+    def train(self, examples: List[Tuple[str, str]], epochs: int = 1,
+              lr: float = LEARNING_RATE):
+        """Batch training (shuffled SGD) on (text, label) pairs."""
+        with self._lock:
+            featurized = [(extract_features(text, self.dim), self._ensure_label(label))
+                          for text, label in examples]
+            rng = random.Random(0)
+            for _ in range(epochs):
+                rng.shuffle(featurized)
+                for features, label_index in featurized:
+                    self._update(features, label_index, lr)
+            self.stats['updates'] += len(featurized) * epochs
+
+    def learn(self, text: str, label: str, lr: float = LEARNING_RATE):
+        """Online update from one confirmed request."""
+        if not text or not label:
+            return
+        with self._lock:
+            self._update(extract_features(text, self.dim), self._ensure_label(label), lr)
+            self.stats['updates'] += 1
+
+    def learn_patterns(self, patterns: Iterable) -> int:
+        """
+        Train on Self-Learning Engine command patterns.
+
+        Args:
+            patterns: CommandPattern-like objects (pattern, action, frequency)
+
+        Returns:
+            Number of patterns used
+        """
+        examples = []
+        for pattern in patterns:
+            label = label_for_action(getattr(pattern, 'action', ''))
+            if not label:
+                continue
+            repeats = min(max(getattr(pattern, 'frequency', 1), 1), MAX_PATTERN_REPLAY)
+            examples.extend([(pattern.pattern, label)] * repeats)
+        if examples:
+            self.train(examples, epochs=1)
+        return len(examples)
+
+    def predict(self, text: str, top_k: int = 1) -> List[Tuple[str, float]]:
+        """Most likely labels with their probabilities."""
+        with self._lock:
+            if not self.labels:
+                return []
+            probs = self._probabilities(extract_features(text, self.dim))
+            ranked = sorted(range(len(self.labels)), key=lambda j: probs[j], reverse=True)
+            return [(self.labels[j], float(probs[j])) for j in ranked[:top_k]]
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Intents
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def classify(self, user_input: str) -> Optional[Dict]:
+        """
+        Intent dict with slots and 'confidence', or None to fall back.
+        """
+        self.stats['classified'] += 1
+        predictions = self.predict(user_input)
+        if not predictions:
+            self.stats['fallbacks'] += 1
+            return None
+        label, confidence = predictions[0]
+
+        intent = None
+        if confidence >= self.threshold and label != UNKNOWN_LABEL:
+            intent = self._fill_slots(label, user_input)
+        if intent is None:
+            self.stats['fallbacks'] += 1
+            return None
+        intent['confidence'] = confidence
+        intent['source'] = 'classifier'
+        return intent
+
+    def _fill_slots(self, label: str, user_input: str) -> Optional[Dict]:
+        """Intent for a label; None if a required slot is missing."""
+        input_lower = user_input.lower().strip()
+
+        if label.startswith('app_action:'):
+            intent = {'type': 'app_action', 'action': label.split(':', 1)[1],
+                      'full_input': user_input}
+            if intent['action'] == 'search':
+                intent['query'] = extract_query(user_input)
+            return intent
+
+        if label == 'navigation':
+            destination = extract_destination(user_input)
+            if not destination:
+                return None
+            return {'type': 'navigation', 'destination': destination.lower()}
+
+        if label == 'system_control':
+            control = extract_control(input_lower)
+            if not control:
+                return None
+            return {'type': 'system_control', 'control': control, 'full_input': user_input}
+
+        if label == 'cli_tool':
+            tool = next((t for t in self.cli_tools if t in input_lower), None)
+            if not tool:
+                return None
+            return {'type': 'cli_tool', 'tool': tool,
+                    'query': " ".join(input_lower.replace(tool, '').split())}
+
+        if label == 'question':
+            return {'type': 'question', 'question': user_input}
+
+        if label == 'help':
+            return {'type': 'help', 'topic': input_lower.replace('help', '').strip(' ,.!?')}
+
+        return None
+
+    def get_status(self) -> Dict:
+        return {
+            'labels': len(self.labels),
+            'backend': 'numpy' if NUMPY_AVAILABLE else 'python',
+            'threshold': self.threshold,
+            **self.stats,
+        }
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+VA21 OS - Unified Knowledge Search
+===================================
+
+🙏 OM VINAYAKA - ONE INDEX FOR ALL APP KNOWLEDGE 🙏
+
+A shared, fully local retrieval engine. Every knowledge source registers
+its documents here instead of running its own linear substring scan:
+
+- Unified App Knowledge (FARA + Zork profiles)
+- Feature Discovery database
+- Accessibility Knowledge Base (Zork commands)
+- FARA Knowledge Base (voice control profiles)
+
+Features:
+1. Tokenization with stopword removal ("how do I ..." questions)
+2. BM25 ranking over an incremental inverted index
+3. Incremental inserts, updates and removals
+4. Optional embedding rerank (e.g. OllamaProvider.generate_embedding)
+5. One query(text, filters) API with source attribution on every hit
+
+Om Vinayaka - May obstacles be removed from finding answers.
+
+License: Om Vinayaka Prayaga Vaibhav Inventions License
+Copyright (c) 2024-2025 Prayaga Vaibhav
+"""
+
+import re
+import math
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Any, Callable, Iterable
+from dataclasses import dataclass, field
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+KNOWLEDGE_SEARCH_VERSION = "1.0.0"
+
+# Registered knowledge sources
+SOURCE_UNIFIED = "unified_app_knowledge"
+SOURCE_FEATURES = "feature_discovery"
+SOURCE_ZORK = "zork_commands"
+SOURCE_FARA = "fara_profiles"
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Title tokens count this many times (simple field boost)
+TITLE_BOOST = 2
+
+# How many BM25 candidates the embedding reranker looks at
+RERANK_DEPTH = 30
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "with",
+    "is", "are", "be", "it", "this", "that", "my", "me", "i", "you", "your",
+    "how", "do", "does", "can", "what", "where", "when", "which", "please",
+    "want", "would", "like", "should", "could", "will", "by", "at", "from",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split on non-alphanumerics, drop stopwords, fold plurals."""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# DATA STRUCTURES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class KnowledgeDocument:
+    """A document registered by a knowledge source."""
+    doc_id: str
+    source: str
+    title: str
+    text: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class SearchHit:
+    """A ranked search result with source attribution."""
+    doc_id: str
+    source: str
+    title: str
+    score: float
+    snippet: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# KNOWLEDGE SEARCH ENGINE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class KnowledgeSearchEngine:
+    """
+    Shared BM25 search engine for all accessibility knowledge.
+
+    Documents are upserted by ID; statistics (document frequency,
+    average length) are maintained incrementally so inserts never
+    trigger a rebuild.
+    """
+
+    VERSION = KNOWLEDGE_SEARCH_VERSION
+
+    def __init__(self, embedder: Optional[Callable[[str], List[float]]] = None,
+                 k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.embedder = embedder
+
+        self.documents: Dict[str, KnowledgeDocument] = {}
+        self._term_freqs: Dict[str, Counter] = {}          # doc_id -> term counts
+        self._doc_lengths: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}     # term -> {doc_id: tf}
+        self._total_length = 0
+
+        # doc_id -> (text hash, embedding)
+        self._embedding_cache: Dict[str, tuple] = {}
+
+        self._lock = threading.RLock()
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Indexing
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def add_document(self, doc_id: str, source: str, title: str, text: str,
+                     metadata: Optional[Dict[str, Any]] = None):
+        """Insert or replace a document."""
+        doc = KnowledgeDocument(doc_id, source, title, text, dict(metadata or {}))
+        terms = Counter(tokenize(title) * TITLE_BOOST + tokenize(text))
+
+        with self._lock:
+            self._remove_locked(doc_id)
+
+            self.documents[doc_id] = doc
+            self._term_freqs[doc_id] = terms
+            length = sum(terms.values())
+            self._doc_lengths[doc_id] = length
+            self._total_length += length
+            for term, tf in terms.items():
+                self._postings.setdefault(term, {})[doc_id] = tf
+
+    def add_documents(self, documents: Iterable[KnowledgeDocument]):
+        """Insert or replace several documents."""
+        for doc in documents:
+            self.add_document(doc.doc_id, doc.source, doc.title, doc.text, doc.metadata)
+
+    def remove_document(self, doc_id: str) -> bool:
+        """Remove a document. Returns False if it was not indexed."""
+        with self._lock:
+            return self._remove_locked(doc_id)
+
+    def remove_source(self, source: str, **metadata) -> int:
+        """Remove every document from a source (optionally matching metadata)."""
+        with self._lock:
+            doomed = [
+                doc_id for doc_id, doc in self.documents.items()
+                if doc.source == source and self._matches(doc, metadata)
+            ]
+            for doc_id in doomed:
+                self._remove_locked(doc_id)
+            return len(doomed)
+
+    def _remove_locked(self, doc_id: str) -> bool:
+        """Remove a document (caller holds the lock)."""
+        if doc_id not in self.documents:
+            return False
+
+        for term in self._term_freqs.pop(doc_id):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        self._embedding_cache.pop(doc_id, None)
+        del self.documents[doc_id]
+        return True
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Querying
+    # ─────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _matches(doc: KnowledgeDocument, filters: Optional[Dict[str, Any]]) -> bool:
+        """
+        Check a document against filters.
+
+        Keys are "source" or metadata keys; values may be a single value
+        or a list/set/tuple of accepted values.
+        """
+        if not filters:
+            return True
+        for key, wanted in filters.items():
+            value = doc.source if key == "source" else doc.metadata.get(key)
+            if isinstance(wanted, (list, set, tuple, frozenset)):
+                if value not in wanted:
+                    return False
+            elif value != wanted:
+                return False
+        return True
+
+    def query(self, text: str, filters: Optional[Dict[str, Any]] = None,
+              top_k: int = 10, rerank: bool = False) -> List[SearchHit]:
+        """
+        Ranked search across every registered source.
+
+        Args:
+            text: Free-text query ("how do I save in gedit?")
+            filters: e.g. {"source": SOURCE_FARA} or {"app_name": "gedit"}
+            top_k: Maximum number of hits
+            rerank: Rerank the BM25 candidates with the embedder, if set
+
+        Returns:
+            Hits sorted by descending score
+        """
+        terms = tokenize(text)
+        if not terms:
+            return []
+
+        with self._lock:
+            doc_count = len(self.documents)
+            if doc_count == 0:
+                return []
+            avg_length = self._total_length / doc_count
+
+            scores: Dict[str, float] = {}
+            for term in set(terms):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+            ranked = sorted(
+                (
+                    (score, doc_id) for doc_id, score in scores.items()
+                    if self._matches(self.documents[doc_id], filters)
+                ),
+                reverse=True,
+            )
+            depth = max(top_k, RERANK_DEPTH) if (rerank and self.embedder) else top_k
+            candidates = [(score, self.documents[doc_id]) for score, doc_id in ranked[:depth]]
+
+        if rerank and self.embedder and candidates:
+            candidates = self._rerank(text, candidates)
+
+        return [
+            SearchHit(
+                doc_id=doc.doc_id,
+                source=doc.source,
+                title=doc.title,
+                score=round(score, 4),
+                snippet=doc.text[:200],
+                metadata=dict(doc.metadata),
+            )
+            for score, doc in candidates[:top_k]
+        ]
+
+    def _rerank(self, text: str, candidates: List[tuple]) -> List[tuple]:
+        """Blend normalized BM25 with embedding cosine similarity."""
+        query_vector = self.embedder(text)
+        if not query_vector:
+            return candidates
+
+        top_score = candidates[0][0] or 1.0
+        reranked = []
+        for score, doc in candidates:
+            vector = self._document_embedding(doc)
+            similarity = _cosine(query_vector, vector) if vector else 0.0
+            reranked.append((0.5 * score / top_score + 0.5 * similarity, doc))
+
+        reranked.sort(key=lambda item: item[0], reverse=True)
+        return reranked
+
+    def _document_embedding(self, doc: KnowledgeDocument) -> List[float]:
+        """Embedding for a document, cached until its text changes."""
+        content = f"{doc.title}\n{doc.text}"
+        key = hash(content)
+        cached = self._embedding_cache.get(doc.doc_id)
+        if cached and cached[0] == key:
+            return cached[1]
+        vector = self.embedder(content) or []
+        self._embedding_cache[doc.doc_id] = (key, vector)
+        return vector
+
+    def set_embedder(self, embedder: Optional[Callable[[str], List[float]]]):
+        """Set (or clear) the embedding function used for reranking."""
+        with self._lock:
+            self.embedder = embedder
+            self._embedding_cache.clear()
+
+    def get_stats(self) -> Dict:
+        """Index statistics."""
+        with self._lock:
+            by_source = Counter(doc.source for doc in self.documents.values())
+            return {
+                'version': self.VERSION,
+                'documents': len(self.documents),
+                'terms': len(self._postings),
+                'by_source': dict(by_source),
+                'embedder': self.embedder is not None,
+            }
+
+
+def _cosine(a: List[float], b: List[float]) -> float:
+    """Cosine similarity of two vectors."""
+    if len(a) != len(b):
+        return 0.0
+    dot = sum(x * y for x, y in zip(a, b))
+    norm_a = math.sqrt(sum(x * x for x in a))
+    norm_b = math.sqrt(sum(y * y for y in b))
+    if norm_a == 0 or norm_b == 0:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SINGLETON
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_knowledge_search_instance = None
+
+
+def get_knowledge_search() -> KnowledgeSearchEngine:
+    """Get the shared KnowledgeSearchEngine singleton."""
+    global _knowledge_search_instance
+    if _knowledge_search_instance is None:
+        _knowledge_search_instance = KnowledgeSearchEngine()
+    return _knowledge_search_instance
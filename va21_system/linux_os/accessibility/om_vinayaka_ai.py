@@ -100,6 +100,13 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from enum import Enum
 
+try:
+    from .conversation_memory import ConversationMemory
+    from .graph_store import GraphStore
+except ImportError:
+    from conversation_memory import ConversationMemory
+    from graph_store import GraphStore
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONSTANTS
@@ -362,62 +369,43 @@ class AccessibilityMindMap:
         self.mindmap_path = mindmap_path or DEFAULT_MINDMAP_PATH
         os.makedirs(self.mindmap_path, exist_ok=True)
         
-        self.nodes: Dict[str, Dict] = {}
-        self.edges: List[Dict] = []
-        
-        self._load_mindmap()
+        # Indexed graph; mindmap_index.json stays the snapshot format
+        self.graph = GraphStore(os.path.join(self.mindmap_path, "mindmap_index.json"))
     
-    def _load_mindmap(self):
-        """Load existing mind map from disk."""
-        index_file = os.path.join(self.mindmap_path, "mindmap_index.json")
-        if os.path.exists(index_file):
-            try:
-                with open(index_file, 'r') as f:
-                    data = json.load(f)
-                    self.nodes = data.get('nodes', {})
-                    self.edges = data.get('edges', [])
-            except Exception:
-                pass
+    @property
+    def nodes(self) -> Dict[str, Dict]:
+        return self.graph.nodes
+    
+    @property
+    def edges(self) -> List[Dict]:
+        return list(self.graph.iter_edges())
     
-    def _save_mindmap(self):
-        """Save mind map to disk."""
-        index_file = os.path.join(self.mindmap_path, "mindmap_index.json")
-        with open(index_file, 'w') as f:
-            json.dump({
-                'nodes': self.nodes,
-                'edges': self.edges,
-                'updated_at': datetime.now().isoformat()
-            }, f, indent=2)
+    def flush(self):
+        """Write buffered mind map changes to disk."""
+        self.graph.flush()
     
     def add_app_node(self, app_id: str, app_name: str, category: str, 
                      zork_interface_id: str = None):
         """Add an application node to the mind map."""
         node_id = f"app_{app_id}"
-        self.nodes[node_id] = {
+        self.graph.put_node(node_id, {
             'type': 'application',
             'id': app_id,
             'name': app_name,
             'category': category,
             'zork_interface_id': zork_interface_id,
             'created_at': datetime.now().isoformat()
-        }
+        })
         
         # Connect to category node
         category_node_id = f"category_{category}"
-        if category_node_id not in self.nodes:
-            self.nodes[category_node_id] = {
-                'type': 'category',
-                'name': category,
-                'created_at': datetime.now().isoformat()
-            }
-        
-        self.edges.append({
-            'source': node_id,
-            'target': category_node_id,
-            'relationship': 'belongs_to'
+        self.graph.add_node_if_missing(category_node_id, {
+            'type': 'category',
+            'name': category,
+            'created_at': datetime.now().isoformat()
         })
         
-        self._save_mindmap()
+        self.graph.add_edge(node_id, category_node_id, 'belongs_to')
         
         # Create Obsidian-style markdown note
         self._create_app_note(app_id, app_name, category)
@@ -455,26 +443,20 @@ See [[{category}]] for related applications.
         app_node = f"app_{app_id}"
         feature_node = f"feature_{feature}"
         
-        if feature_node not in self.nodes:
-            self.nodes[feature_node] = {
-                'type': 'accessibility_feature',
-                'name': feature,
-                'created_at': datetime.now().isoformat()
-            }
-        
-        self.edges.append({
-            'source': app_node,
-            'target': feature_node,
-            'relationship': 'supports'
+        self.graph.add_node_if_missing(feature_node, {
+            'type': 'accessibility_feature',
+            'name': feature,
+            'created_at': datetime.now().isoformat()
         })
         
-        self._save_mindmap()
+        self.graph.add_edge(app_node, feature_node, 'supports')
     
     def get_apps_by_category(self, category: str) -> List[Dict]:
         """Get all apps in a category."""
+        nodes = self.graph.nodes
         return [
-            node for node in self.nodes.values()
-            if node.get('type') == 'application' and node.get('category') == category
+            nodes[node_id] for node_id in self.graph.find('category', category)
+            if nodes[node_id].get('type') == 'application'
         ]
     
     def get_related_apps(self, app_id: str) -> List[Dict]:
@@ -483,18 +465,15 @@ See [[{category}]] for related applications.
         if not app_node:
             return []
         
-        category = app_node.get('category')
         return [
-            node for node in self.nodes.values()
-            if node.get('type') == 'application' 
-            and node.get('category') == category
-            and node.get('id') != app_id
+            node for node in self.get_apps_by_category(app_node.get('category'))
+            if node.get('id') != app_id
         ]
     
     def get_graph(self) -> Dict:
         """Get the complete mind map graph for visualization."""
         return {
-            'nodes': list(self.nodes.values()),
+            'nodes': list(self.graph.nodes.values()),
             'edges': self.edges
         }
 
@@ -648,6 +627,10 @@ class OmVinayakaAI:
         self.learning_engine = None
         self._init_learning_engine()
         
+        # Initialize local intent classifier (trained from learned patterns)
+        self.intent_classifier = None
+        self._init_intent_classifier()
+        
         # Initialize Summary Engine for context management
         self.summary_engine = None
         self._init_summary_engine()
@@ -684,9 +667,14 @@ class OmVinayakaAI:
         # State
         self.is_active = False
         self.current_context: Dict = {}
-        self.conversation_history: List[Dict] = []
         self.pending_clarification = None
         
+        # Bounded conversation memory (recent ring, segment log, episode summaries)
+        self.conversation = ConversationMemory(
+            os.path.join(self.knowledge_base_path, "conversation"),
+            summary_engine=self.summary_engine
+        )
+        
         # Registered apps with Zork interfaces
         self.registered_apps: Dict[str, str] = {}  # app_name -> interface_id
         
@@ -754,6 +742,17 @@ class OmVinayakaAI:
             print(f"[Om Vinayaka] Self-learning not available: {e}")
             self.learning_engine = None
     
+    def _init_intent_classifier(self):
+        """Initialize the local intent classifier and replay learned patterns."""
+        try:
+            from .intent_classifier import IntentClassifier
+            self.intent_classifier = IntentClassifier(cli_tools=CLI_TOOLS_TO_WRAP)
+            if self.learning_engine:
+                self.intent_classifier.learn_patterns(self.learning_engine.command_patterns.values())
+        except ImportError as e:
+            print(f"[Om Vinayaka] Intent classifier not available: {e}")
+            self.intent_classifier = None
+    
     def _init_summary_engine(self):
         """Initialize the Summary Engine for context management."""
         try:
@@ -829,7 +828,7 @@ class OmVinayakaAI:
             
             # Set callback for FARA events
             self.fara_creator.set_om_vinayaka_callback(
-                self._on_fara_profile_created
+                self._on_fara_event
             )
             
             # Start monitoring for new app installations
@@ -908,12 +907,38 @@ class OmVinayakaAI:
         if feature_id:
             print(f"[Om Vinayaka] 🎯 User discovered feature: {feature_id}")
     
+    def _on_fara_event(self, event: Dict):
+        """Route FARA creator events by type."""
+        if event.get('event') == 'app_uninstalled':
+            self._on_app_uninstalled(event)
+        else:
+            self._on_fara_profile_created(event)
+    
+    def _on_app_uninstalled(self, event: Dict):
+        """Handle app uninstall events."""
+        app_name = event.get('app_name')
+        if app_name:
+            print(f"[Om Vinayaka] 🗑️ {app_name} was uninstalled")
+            
+            if self.app_zork_manager:
+                try:
+                    self.app_zork_manager.unregister_app(app_name)
+                except Exception as e:
+                    print(f"[Om Vinayaka] Removing Zork interface for {app_name} failed: {e}")
+    
     def _on_fara_profile_created(self, event: Dict):
         """Handle FARA profile creation events."""
         app_name = event.get('app_name')
         actions_count = event.get('actions_count', 0)
         if app_name:
             print(f"[Om Vinayaka] 🎮 FARA profile created for {app_name} ({actions_count} actions)")
+            
+            # Give the new app its Zork interface right away
+            if self.app_zork_manager:
+                try:
+                    self.app_zork_manager.register_app(app_name, event.get('desktop_file'))
+                except Exception as e:
+                    print(f"[Om Vinayaka] Zork interface for {app_name} failed: {e}")
     
     def _on_idle_start(self):
         """Called when idle mode starts."""
@@ -980,6 +1005,10 @@ class OmVinayakaAI:
         if self.idle_mode_manager:
             self.idle_mode_manager.stop()
         
+        # Spill recent turns to disk
+        self.conversation.close()
+        self.mind_map.flush()
+        
         print("[Om Vinayaka] Accessibility AI deactivated")
     
     def _get_welcome_message(self) -> str:
@@ -1166,14 +1195,25 @@ What would you like to accomplish today?
         if self.persistent_memory:
             self.persistent_memory.record_activity('interaction')
         
-        # Add to conversation history
-        self.conversation_history.append({
-            'role': 'user',
-            'content': user_input,
-            'app_context': current_app,
-            'timestamp': datetime.now().isoformat()
-        })
+        # Add to conversation memory
+        turn = self.conversation.add_turn('user', user_input, app_context=current_app)
+        
+        result = self._respond(user_input, current_app)
         
+        self.conversation.record_outcome(
+            turn,
+            needed_clarification=bool(result.get('needs_clarification')),
+            action=result.get('action')
+        )
+        return result
+    
+    @property
+    def conversation_history(self) -> List[Dict]:
+        """Recent conversation turns (older ones are in the segment log)."""
+        return self.conversation.recent()
+    
+    def _respond(self, user_input: str, current_app: str = None) -> Dict[str, Any]:
+        """Work out the response to a (security-checked) user input."""
         # Check for pending clarification response
         if self.pending_clarification:
             result = self._handle_clarification_response(user_input, current_app)
@@ -1254,10 +1294,48 @@ What would you like to accomplish today?
                 })
                 self.persistent_memory.record_activity('pattern')
         
+        # Keep training the intent classifier, but never on its own unchecked
+        # guesses: only when the rules decided or agreed with it (confirmed
+        # dangerous actions are learned in _handle_clarification_response)
+        if result.get('action') and (intent.get('source') != 'classifier'
+                                     or intent.get('rules_agree')):
+            self._train_intent_classifier(user_input, result['action'])
+        
         return result
     
+    def _train_intent_classifier(self, user_input: str, action: str):
+        """Online update of the intent classifier from a trusted outcome."""
+        if self.intent_classifier and user_input and action:
+            from .intent_classifier import label_for_action
+            self.intent_classifier.learn(user_input, label_for_action(action))
+    
     def _understand_intent(self, user_input: str, current_app: str = None) -> Dict:
-        """Understand the user's intent from their input."""
+        """
+        Understand the user's intent from their input.
+        
+        The trained classifier answers when it is confident; otherwise
+        the keyword rules below decide (and an unknown result leads to a
+        clarification question).
+        """
+        rules_intent = self._match_intent_rules(user_input, current_app)
+        if self.intent_classifier:
+            intent = self.intent_classifier.classify(user_input)
+            if intent is not None:
+                intent['rules_agree'] = self._same_intent(intent, rules_intent)
+                return intent
+        return rules_intent
+    
+    @staticmethod
+    def _same_intent(intent: Dict, other: Dict) -> bool:
+        """Whether two intents would lead to the same kind of action."""
+        if intent.get('type') != other.get('type'):
+            return False
+        key = {'app_action': 'action', 'system_control': 'control',
+               'cli_tool': 'tool'}.get(intent['type'])
+        return key is None or intent.get(key) == other.get(key)
+    
+    def _match_intent_rules(self, user_input: str, current_app: str = None) -> Dict:
+        """Keyword cascade used when the classifier is unsure."""
         input_lower = user_input.lower().strip()
         
         # CLI tool detection
@@ -1361,7 +1439,8 @@ What would you like to accomplish today?
             self.pending_clarification = {
                 'type': 'confirm',
                 'action': action,
-                'context': current_app
+                'context': current_app,
+                'input': intent.get('full_input')
             }
             return {
                 'response': f"You want to {action}. This may have permanent effects. Are you sure?",
@@ -1440,6 +1519,20 @@ What would you like to accomplish today?
         # How do I?
         if 'how do i' in question:
             task = question.replace('how do i', '').strip().rstrip('?')
+            
+            # One indexed lookup across FARA, Zork, feature and unified knowledge
+            hits = self.search_knowledge(task, top_k=1)
+            if hits:
+                hit = hits[0]
+                return {
+                    'response': f"Here's what I found for '{task}': {hit.title}. {hit.snippet.splitlines()[0] if hit.snippet else ''}".strip(),
+                    'action': None,
+                    'needs_clarification': False,
+                    'clarification_question': None,
+                    'source': hit.source,
+                    'doc_id': hit.doc_id,
+                }
+            
             return {
                 'response': f"To {task}, just tell me what you want to accomplish. For example, say 'I want to {task}' and I'll guide you step by step.",
                 'action': None,
@@ -1454,6 +1547,19 @@ What would you like to accomplish today?
             'clarification_question': "What specifically would you like to know?"
         }
     
+    def search_knowledge(self, text: str, filters: Dict = None,
+                         top_k: int = 5) -> List:
+        """
+        Ranked search across every registered knowledge source.
+        
+        Returns SearchHit objects with source attribution.
+        """
+        try:
+            from .knowledge_search import get_knowledge_search
+            return get_knowledge_search().query(text, filters=filters, top_k=top_k)
+        except ImportError:
+            return []
+    
     def _handle_system_control(self, intent: Dict) -> Dict:
         """Handle system control requests."""
         control = intent.get('control', '')
@@ -1578,6 +1684,8 @@ What would you like to do?
         if clarification.get('type') == 'confirm':
             if any(w in input_lower for w in ['yes', 'yeah', 'sure', 'ok', 'confirm', 'proceed']):
                 action = clarification.get('action')
+                # The user confirmed what the original request meant
+                self._train_intent_classifier(clarification.get('input'), action)
                 return {
                     'response': f"Confirmed. Executing {action}...",
                     'action': action,
@@ -1606,8 +1714,8 @@ What would you like to do?
                 'clarification_question': None
             }
         
-        # Default: process as new request
-        return self.process_user_input(user_input, current_app)
+        # Default: process as new request (already checked and recorded)
+        return self._respond(user_input, current_app)
     
     def get_app_description(self, app_name: str) -> str:
         """Get a Zork-style description of an application."""
@@ -1703,7 +1811,7 @@ What would you like to accomplish?
             'version': OM_VINAYAKA_VERSION,
             'is_active': self.is_active,
             'registered_apps': len(self.registered_apps),
-            'conversation_length': len(self.conversation_history),
+            'conversation_length': len(self.conversation),
             'mind_map_nodes': len(self.mind_map.nodes),
             'cli_tools_supported': len(self.terminal_adapter.tool_interfaces),
             'learning_engine': self.learning_engine is not None,
@@ -1731,6 +1839,9 @@ What would you like to accomplish?
             status['patterns_learned'] = learning_stats.get('patterns_learned', 0)
             status['total_interactions'] = learning_stats.get('total_interactions', 0)
         
+        if self.intent_classifier:
+            status['intent_classifier'] = self.intent_classifier.get_status()
+        
         # Add summary engine stats if available
         if self.summary_engine:
             summary_stats = self.summary_engine.get_statistics()
@@ -1904,22 +2015,17 @@ What would you like to accomplish?
     
     def _analyze_behavior(self) -> Dict:
         """Analyze Om Vinayaka's behavior patterns."""
+        # Rolling statistics - no scan over the conversation
+        stats = self.conversation.get_stats()
         analysis = {
-            'total_conversations': len(self.conversation_history),
-            'clarifications_needed': 0,
-            'successful_actions': 0,
+            'total_conversations': stats['user_turns'],
+            'clarifications_needed': stats['clarifications_needed'],
+            'successful_actions': stats['successful_actions'],
             'behavior_insights': [],
         }
         
-        # Analyze conversation history
-        for conv in self.conversation_history:
-            if conv.get('needed_clarification'):
-                analysis['clarifications_needed'] += 1
-            if conv.get('action_successful'):
-                analysis['successful_actions'] += 1
-        
         # Generate behavior insights
-        total = max(len(self.conversation_history), 1)
+        total = max(stats['user_turns'], 1)
         clarification_rate = analysis['clarifications_needed'] / total
         
         if clarification_rate > 0.3:
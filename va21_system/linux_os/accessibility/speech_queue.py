@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+VA21 OS - Streaming Speech Queue
+=================================
+
+🙏 OM VINAYAKA - SPEAK WHILE THINKING 🙏
+
+Sentence-chunked text-to-speech for streamed AI responses.
+
+A token stream (e.g. AIProvider.stream) is consumed on a producer
+thread and cut at sentence boundaries; each finished sentence is queued
+and spoken by a single speech worker while the model keeps generating
+the next one. Time-to-first-audio is the first sentence, not the whole
+answer - which matters most for blind users.
+
+Features:
+- Incremental sentence splitter (abbreviation-aware, long-run cutoff)
+- One speech worker thread (TTS engines are not thread-safe)
+- Barge-in: cancel() drops queued sentences, stops the current one and
+  abandons the token stream, e.g. when push-to-talk is pressed again
+- Light Markdown cleanup so symbols are not read aloud
+
+Om Vinayaka - May obstacles be removed from your computing journey.
+
+License: Om Vinayaka Prayaga Vaibhav Inventions License
+Copyright (c) 2024-2025 Prayaga Vaibhav
+"""
+
+import re
+import queue
+import threading
+from typing import Callable, Iterable, Iterator, List, Optional
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+SPEECH_QUEUE_VERSION = "1.0.0"
+
+# A run without a sentence boundary is cut at a comma/space past this length
+MAX_SENTENCE_CHARS = 220
+# Fragments shorter than this are joined to the next sentence
+MIN_SENTENCE_CHARS = 12
+
+# Words ending in "." that do not end a sentence
+ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "e.g",
+    "i.e", "fig", "no", "vol", "approx", "dept", "inc", "ltd", "co",
+}
+
+# Sentence punctuation (plus closing quotes/brackets) followed by whitespace,
+# or a line break
+_BOUNDARY_RE = re.compile(r'[.!?…]+["\')\]]*(?=\s)|\n')
+_LAST_WORD_RE = re.compile(r'([\w.]+)$')
+_MARKDOWN_RE = re.compile(r'[*_`#>]+|\[([^\]]*)\]\([^)]*\)')
+_LIST_MARKER_RE = re.compile(r'^\s*(?:[-+•]|\d+[.)])\s+')
+
+
+def clean_for_speech(text: str) -> str:
+    """Drop Markdown symbols and list markers (keeping link text)."""
+    text = _LIST_MARKER_RE.sub('', text)
+    text = _MARKDOWN_RE.sub(lambda m: m.group(1) or " ", text)
+    return " ".join(text.split())
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SENTENCE SPLITTER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class SentenceSplitter:
+    """
+    Incremental sentence segmentation of a token stream.
+
+    feed() returns the sentences completed by a token; flush() returns
+    whatever is left at the end of the stream.
+    """
+
+    def __init__(self, max_chars: int = MAX_SENTENCE_CHARS,
+                 min_chars: int = MIN_SENTENCE_CHARS):
+        self.max_chars = max_chars
+        self.min_chars = min_chars
+        self._buffer = ""
+        self._scan_from = 0
+
+    def feed(self, token: str) -> List[str]:
+        self._buffer += token
+        sentences = []
+        while True:
+            cut = self._find_boundary()
+            if cut is None:
+                break
+            sentence = self._buffer[:cut].strip()
+            self._buffer = self._buffer[cut:]
+            self._scan_from = 0
+            if sentence:
+                sentences.append(sentence)
+        return sentences
+
+    def flush(self) -> List[str]:
+        rest = self._buffer.strip()
+        self._buffer = ""
+        self._scan_from = 0
+        return [rest] if rest else []
+
+    def _find_boundary(self) -> Optional[int]:
+        """End index of the first complete sentence in the buffer, if any."""
+        buffer = self._buffer
+        for match in _BOUNDARY_RE.finditer(buffer, self._scan_from):
+            end = match.end()
+            if len(buffer[:end].strip()) < self.min_chars and match.group() != "\n":
+                continue
+            if match.group().startswith("."):
+                word = _LAST_WORD_RE.search(buffer[:match.start()])
+                if word and word.group(1).lower().rstrip(".") in ABBREVIATIONS:
+                    continue
+            return end
+
+        # Remember how far we scanned (a boundary needs the next character)
+        self._scan_from = max(0, len(buffer) - 4)
+
+        if len(buffer) > self.max_chars:
+            cut = max(buffer.rfind(", ", 0, self.max_chars), buffer.rfind(" ", 0, self.max_chars))
+            return cut + 1 if cut > 0 else self.max_chars
+        return None
+
+
+def iter_sentences(tokens: Iterable[str]) -> Iterator[str]:
+    """Sentences of a token stream, yielded as soon as each one completes."""
+    splitter = SentenceSplitter()
+    for token in tokens:
+        yield from splitter.feed(token)
+    yield from splitter.flush()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SPEECH QUEUE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class SpeechQueue:
+    """
+    Ordered, cancellable speech output.
+
+    Args:
+        synthesize: Speaks one sentence and returns when it is done
+        stop_playback: Interrupts the sentence being spoken (barge-in)
+    """
+
+    def __init__(self, synthesize: Callable[[str], None],
+                 stop_playback: Optional[Callable[[], None]] = None):
+        self.synthesize = synthesize
+        self.stop_playback = stop_playback
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._generation = 0
+        self._pending = 0          # Queued sentences + running producers
+        self._speaking = False
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+
+        self.stats = {'sentences': 0, 'cancelled': 0}
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Input
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def speak(self, text: str) -> int:
+        """Queue text (split into sentences). Returns its generation."""
+        self._ensure_worker()
+        with self._cond:
+            generation = self._generation
+            for sentence in iter_sentences([text]):
+                self._put(sentence, generation)
+        return generation
+
+    def speak_stream(self, tokens: Iterable[str],
+                     on_token: Optional[Callable[[str], None]] = None) -> int:
+        """
+        Speak a token stream sentence by sentence as it is generated.
+
+        The stream is consumed on its own thread; on_token (if given)
+        sees every token, e.g. to echo the response on screen.
+        """
+        self._ensure_worker()
+        with self._cond:
+            generation = self._generation
+            self._pending += 1
+
+        def produce():
+            splitter = SentenceSplitter()
+            try:
+                for token in tokens:
+                    if generation != self._generation:
+                        break  # Barge-in: stop pulling from the model
+                    if on_token:
+                        on_token(token)
+                    for sentence in splitter.feed(token):
+                        self._put(sentence, generation)
+                else:
+                    for sentence in splitter.flush():
+                        self._put(sentence, generation)
+            except Exception as e:
+                print(f"[SpeechQueue] Token stream error: {e}")
+            finally:
+                close = getattr(tokens, "close", None)
+                if close:
+                    try:
+                        close()
+                    except Exception:
+                        pass
+                with self._cond:
+                    self._pending -= 1
+                    self._cond.notify_all()
+
+        threading.Thread(target=produce, daemon=True, name="va21-speech-producer").start()
+        return generation
+
+    def _put(self, sentence: str, generation: int):
+        text = clean_for_speech(sentence)
+        if not text:
+            return
+        with self._cond:
+            if generation != self._generation:
+                return
+            self._pending += 1
+        self._queue.put((generation, text))
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Control
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def cancel(self):
+        """Barge-in: drop everything queued and stop the current sentence."""
+        with self._cond:
+            self._generation += 1
+            speaking = self._speaking
+            dropped = 0
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                dropped += 1
+            self._pending -= dropped
+            if dropped or speaking:
+                self.stats['cancelled'] += 1
+            self._cond.notify_all()
+        if speaking and self.stop_playback:
+            try:
+                self.stop_playback()
+            except Exception:
+                pass
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until everything queued so far has been spoken."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending == 0, timeout)
+
+    @property
+    def is_speaking(self) -> bool:
+        return self._speaking
+
+    @property
+    def busy(self) -> bool:
+        return self._pending > 0
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Worker
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def _ensure_worker(self):
+        with self._cond:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, daemon=True,
+                                                name="va21-speech-worker")
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            generation, text = self._queue.get()
+            with self._cond:
+                if generation != self._generation:
+                    self._pending -= 1
+                    self._cond.notify_all()
+                    continue
+                self._speaking = True
+            try:
+                self.synthesize(text)
+                self.stats['sentences'] += 1
+            except Exception as e:
+                print(f"[SpeechQueue] Synthesis error: {e}")
+            finally:
+                with self._cond:
+                    self._speaking = False
+                    self._pending -= 1
+                    self._cond.notify_all()
@@ -40,6 +40,11 @@ from dataclasses import dataclass, field, asdict
 from pathlib import Path
 from enum import Enum
 
+try:
+    from .knowledge_search import KnowledgeSearchEngine, get_knowledge_search, SOURCE_UNIFIED
+except ImportError:
+    from knowledge_search import KnowledgeSearchEngine, get_knowledge_search, SOURCE_UNIFIED
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONSTANTS
@@ -148,10 +153,14 @@ class UnifiedAppKnowledgeBase:
     - Mind maps (Mermaid diagrams)
     - Wiki-style [[links]] between apps and concepts
     - LangChain-compatible structure for semantic search
+    
+    Every profile is also registered in the shared KnowledgeSearchEngine.
     """
     
-    def __init__(self, kb_path: str = None):
+    def __init__(self, kb_path: str = None,
+                 search_engine: Optional[KnowledgeSearchEngine] = None):
         self.kb_path = kb_path or DEFAULT_UNIFIED_KB_PATH
+        self.search_engine = search_engine or get_knowledge_search()
         
         # Create directory structure
         self.profiles_path = os.path.join(self.kb_path, "profiles")
@@ -169,6 +178,9 @@ class UnifiedAppKnowledgeBase:
         self.profiles: Dict[str, UnifiedAppProfile] = {}
         self._load_index()
         
+        for profile in self.profiles.values():
+            self._register_search_document(profile)
+        
         print(f"[UnifiedKB] Knowledge base initialized at {self.kb_path}")
     
     def _load_index(self):
@@ -228,9 +240,31 @@ class UnifiedAppKnowledgeBase:
         
         # Update index
         self._save_index()
+        self._register_search_document(profile)
         
         return note_path
     
+    def _register_search_document(self, profile: UnifiedAppProfile):
+        """Register (or refresh) a profile in the shared search index."""
+        parts = [profile.app_category.replace('_', ' ')]
+        parts.extend(f"{cmd} {action}" for cmd, action in profile.voice_commands.items())
+        parts.extend(f"{cmd} {action}" for cmd, action in profile.zork_actions.items())
+        parts.extend(menu.get('menu_name', '') for menu in profile.menus)
+        parts.extend(profile.usage_tips)
+        
+        self.search_engine.add_document(
+            doc_id=f"{SOURCE_UNIFIED}:{profile.profile_id}",
+            source=SOURCE_UNIFIED,
+            title=profile.app_name,
+            text="\n".join(parts),
+            metadata={
+                'profile_id': profile.profile_id,
+                'app_name': profile.app_name,
+                'category': profile.app_category,
+                'note_path': profile.obsidian_note_path,
+            },
+        )
+    
     def _save_obsidian_note(self, profile: UnifiedAppProfile) -> str:
         """Save main profile as Obsidian markdown note."""
         note_path = os.path.join(self.profiles_path, f"{profile.app_name.lower().replace(' ', '_')}.md")
@@ -577,7 +611,8 @@ tags:
         """
         Search the knowledge base for relevant information.
         
-        This is LangChain-compatible for semantic search.
+        This is LangChain-compatible for semantic search. For ranked
+        search across every knowledge source use search_engine.query().
         """
         results = []
         query_lower = query.lower()
@@ -24,6 +24,7 @@ import sys
 import subprocess
 import threading
 import json
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Callable
 from dataclasses import dataclass, field
@@ -53,6 +54,28 @@ try:
 except ImportError:
     pass
 
+# Streaming voice pipeline (capture thread, VAD, pluggable offline ASR)
+try:
+    from .voice_pipeline import (
+        VoicePipeline, MicrophoneSource, AudioSource, ASRBackend, create_default_backend
+    )
+except ImportError:
+    from voice_pipeline import (
+        VoicePipeline, MicrophoneSource, AudioSource, ASRBackend, create_default_backend
+    )
+
+# Sentence-chunked speech output with barge-in
+try:
+    from .speech_queue import SpeechQueue
+except ImportError:
+    from speech_queue import SpeechQueue
+
+# Event-driven active-window tracking
+try:
+    from .window_focus import WindowFocusTracker, FocusSource, FocusInfo
+except ImportError:
+    from window_focus import WindowFocusTracker, FocusSource, FocusInfo
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # APPLICATION CONTEXT
@@ -102,12 +125,34 @@ class SystemWideFARALayer:
     - Interact with GUI elements
     - Manage files and system settings
     - Control media and system functions
+    
+    With focus tracking started, the active-window context is rebuilt
+    on focus-change events and get_current_context() just returns it.
     """
     
+    # Keyword sets for app type detection (first match wins)
+    APP_KEYWORDS = {
+        AppType.ZORK_SHELL: {'zork', 'boot chamber', 'research lab', 'guardian sanctum'},
+        AppType.TERMINAL: {'terminal', 'bash', 'shell', 'konsole', 'xterm'},
+        AppType.FILE_MANAGER: {'file', 'nautilus', 'thunar', 'dolphin', 'files'},
+        AppType.TEXT_EDITOR: {'editor', 'vim', 'nano', 'gedit', 'kate', 'notepad'},
+        AppType.WEB_BROWSER: {'firefox', 'chrome', 'chromium', 'browser', 'safari'},
+        AppType.SETTINGS: {'setting', 'preference', 'config', 'control center'},
+        AppType.RESEARCH_SUITE: {'research'},
+        AppType.WRITING_SUITE: {'writing', 'document', 'writer', 'word'},
+        AppType.OBSIDIAN_VAULT: {'vault', 'obsidian', 'note'},
+    }
+    
+    # (window class, title) -> AppType entries kept
+    APP_TYPE_CACHE_SIZE = 512
+    
     def __init__(self):
         self.action_history = []
         self.current_app_context: Optional[ApplicationContext] = None
         self.available_apps = self._detect_installed_apps()
+        self.focus_tracker: Optional[WindowFocusTracker] = None
+        self._app_type_cache: OrderedDict = OrderedDict()
+        self._context_lock = threading.Lock()
     
     def _detect_installed_apps(self) -> Dict[str, str]:
         """Detect installed applications."""
@@ -125,8 +170,45 @@ class SystemWideFARALayer:
         }
         return apps
     
+    def start_focus_tracking(self, source: FocusSource = None) -> bool:
+        """
+        Keep the active-window context current from focus events.
+        
+        Args:
+            source: Focus source (default: X11 events, then `xprop -spy`)
+            
+        Returns:
+            False if no source can run here (polling is used instead)
+        """
+        if self.focus_tracker is not None:
+            return True
+        tracker = WindowFocusTracker(source)
+        tracker.add_listener(self._on_focus_change)
+        if not tracker.start():
+            return False
+        self.focus_tracker = tracker
+        return True
+    
+    def stop_focus_tracking(self):
+        if self.focus_tracker:
+            self.focus_tracker.stop()
+            self.focus_tracker = None
+        self.current_app_context = None
+    
+    def _on_focus_change(self, info: FocusInfo):
+        """Focus moved (or the title changed): rebuild the cached context."""
+        context = self._build_context(info.title or "VA21 OS", info.wm_class)
+        with self._context_lock:
+            self.current_app_context = context
+    
     def get_current_context(self) -> ApplicationContext:
         """Get context about the currently active application."""
+        # Cached from focus events - no lookup needed
+        if self.focus_tracker is not None and self.focus_tracker.is_live:
+            with self._context_lock:
+                if self.current_app_context is not None:
+                    return self.current_app_context
+        
         # Try to detect active window
         try:
             # On Linux, try to get active window info
@@ -138,8 +220,11 @@ class SystemWideFARALayer:
         except (subprocess.TimeoutExpired, FileNotFoundError):
             window_title = "VA21 OS"
         
-        # Detect app type from window title
-        app_type = self._detect_app_type(window_title)
+        return self._build_context(window_title)
+    
+    def _build_context(self, window_title: str, wm_class: str = "") -> ApplicationContext:
+        """Context for a window, from its title and (if known) window class."""
+        app_type = self._classify_window(wm_class, window_title)
         
         return ApplicationContext(
             app_type=app_type,
@@ -150,24 +235,35 @@ class SystemWideFARALayer:
             current_content=""
         )
     
+    def _classify_window(self, wm_class: str, window_title: str) -> AppType:
+        """
+        Memoized app type detection.
+        
+        The title decides as before; the window class is the fallback
+        when the title matches nothing (e.g. "Untitled - Mousepad").
+        """
+        key = (wm_class, window_title)
+        with self._context_lock:
+            app_type = self._app_type_cache.get(key)
+            if app_type is not None:
+                self._app_type_cache.move_to_end(key)
+                return app_type
+        
+        app_type = self._detect_app_type(window_title)
+        if app_type == AppType.UNKNOWN and wm_class:
+            app_type = self._detect_app_type(wm_class)
+        
+        with self._context_lock:
+            self._app_type_cache[key] = app_type
+            if len(self._app_type_cache) > self.APP_TYPE_CACHE_SIZE:
+                self._app_type_cache.popitem(last=False)
+        return app_type
+    
     def _detect_app_type(self, window_title: str) -> AppType:
         """Detect application type from window title."""
         title_lower = window_title.lower()
         
-        # Optimized app type detection using keyword sets
-        app_keywords = {
-            AppType.ZORK_SHELL: {'zork', 'boot chamber', 'research lab', 'guardian sanctum'},
-            AppType.TERMINAL: {'terminal', 'bash', 'shell', 'konsole', 'xterm'},
-            AppType.FILE_MANAGER: {'file', 'nautilus', 'thunar', 'dolphin', 'files'},
-            AppType.TEXT_EDITOR: {'editor', 'vim', 'nano', 'gedit', 'kate', 'notepad'},
-            AppType.WEB_BROWSER: {'firefox', 'chrome', 'chromium', 'browser', 'safari'},
-            AppType.SETTINGS: {'setting', 'preference', 'config', 'control center'},
-            AppType.RESEARCH_SUITE: {'research'},
-            AppType.WRITING_SUITE: {'writing', 'document', 'writer', 'word'},
-            AppType.OBSIDIAN_VAULT: {'vault', 'obsidian', 'note'},
-        }
-        
-        for app_type, keywords in app_keywords.items():
+        for app_type, keywords in self.APP_KEYWORDS.items():
             if any(kw in title_lower for kw in keywords):
                 return app_type
         
@@ -380,10 +476,18 @@ class SystemWideHelperAI:
     - Works with any application
     - Explains what's happening in plain language
     - Supports 1,600+ languages
+    
+    With an AI provider (anything with the AIProvider.stream interface),
+    requests the rules cannot answer are streamed from the model via
+    process_request_stream().
     """
     
-    def __init__(self, fara_layer: SystemWideFARALayer):
+    # Conversation turns sent to the model with a streamed request
+    STREAM_HISTORY_TURNS = 6
+    
+    def __init__(self, fara_layer: SystemWideFARALayer, ai_provider=None):
         self.fara = fara_layer
+        self.ai_provider = ai_provider
         self.conversation_history = []
         self.pending_clarification = None
         self.user_preferences = {}
@@ -433,6 +537,72 @@ class SystemWideHelperAI:
         else:
             return self._ask_clarification(user_input, context)
     
+    def process_request_stream(self, user_input: str, context: ApplicationContext) -> Dict[str, Any]:
+        """
+        Like process_request(), but lets the AI provider answer open questions.
+        
+        The returned dict has an extra 'stream' key: None when the rule
+        response stands, otherwise an iterator of response tokens that
+        replaces 'response' (which is kept as the fallback text). Actions,
+        confirmations and follow-up prompts always come from the rules.
+        """
+        response = self.process_request(user_input, context)
+        response['stream'] = None
+        
+        open_question = (response['needs_clarification'] and not response['action']
+                         and self.pending_clarification in (None, 'general'))
+        if not open_question or not self.ai_provider or not getattr(self.ai_provider, 'is_available', True):
+            return response
+        
+        stream = self._stream_answer(context)
+        if stream is not None:
+            self.pending_clarification = None
+            response['stream'] = stream
+            response['needs_clarification'] = False
+            response['clarification_question'] = None
+        return response
+    
+    def _stream_answer(self, context: ApplicationContext):
+        """Token generator for the model's answer to the latest user turn."""
+        try:
+            from ..agents.ai_providers import Message
+        except ImportError:
+            try:
+                from agents.ai_providers import Message
+            except ImportError as e:
+                print(f"[HelperAI] AI provider unavailable: {e}")
+                return None
+        
+        system_prompt = (
+            "You are VA21's accessibility assistant. Answers are spoken aloud to a "
+            "user who may be blind, so reply in short plain sentences without "
+            f"formatting. The user is in {context.app_name} "
+            f"(window: {context.window_title})."
+        )
+        if context.available_actions:
+            system_prompt += " Available actions: " + ", ".join(context.available_actions[:10]) + "."
+        messages = [Message(role='system', content=system_prompt)]
+        for turn in self.conversation_history[-self.STREAM_HISTORY_TURNS:]:
+            messages.append(Message(role=turn['role'], content=turn['content']))
+        
+        def generate():
+            parts = []
+            try:
+                for token in self.ai_provider.stream(messages):
+                    parts.append(token)
+                    yield token
+            finally:
+                # Also runs when a barge-in closes the stream early
+                if parts:
+                    self.conversation_history.append({
+                        'role': 'assistant',
+                        'content': "".join(parts),
+                        'timestamp': datetime.now().isoformat(),
+                        'context': context.app_name
+                    })
+        
+        return generate()
+    
     def _understand_intent(self, input_lower: str, context: ApplicationContext) -> Dict[str, Any]:
         """Understand the user's intent from their input."""
         
@@ -719,7 +889,6 @@ class IntelligentScreenReader:
     
     def __init__(self):
         self.tts_engine = None
-        self.speaking = False
         self.speech_rate = 150
         
         if TTS_AVAILABLE:
@@ -729,31 +898,46 @@ class IntelligentScreenReader:
                 self.tts_engine.setProperty('volume', 0.9)
             except Exception:
                 pass
+        
+        # All engine calls happen on the queue's worker thread
+        self.speech_queue = SpeechQueue(self._synthesize, self._stop_engine)
+    
+    @property
+    def speaking(self) -> bool:
+        return self.speech_queue.is_speaking
     
     def speak(self, text: str, wait: bool = True):
-        """Speak text using TTS."""
+        """Speak text using TTS (queued after anything already playing)."""
+        self.speech_queue.speak(text)
+        if wait:
+            self.speech_queue.wait()
+    
+    def speak_stream(self, tokens, on_token: Callable[[str], None] = None):
+        """
+        Speak a streamed response sentence by sentence as it arrives.
+        
+        Returns immediately; stop() cancels both speech and the stream.
+        """
+        self.speech_queue.speak_stream(tokens, on_token)
+    
+    def stop(self):
+        """Stop speaking and drop everything queued (barge-in)."""
+        self.speech_queue.cancel()
+    
+    def _synthesize(self, sentence: str):
+        """Speak one sentence, blocking until it has been played."""
         if not self.tts_engine:
-            print(f"🔊 [Would speak]: {text}")
+            print(f"🔊 [Would speak]: {sentence}")
             return
-        
-        self.speaking = True
         try:
-            self.tts_engine.say(text)
-            if wait:
-                self.tts_engine.runAndWait()
+            self.tts_engine.say(sentence)
+            self.tts_engine.runAndWait()
         except Exception:
-            print(f"🔊 [TTS Error]: {text}")
-        finally:
-            self.speaking = False
+            print(f"🔊 [TTS Error]: {sentence}")
     
-    def stop(self):
-        """Stop speaking."""
-        if self.tts_engine and self.speaking:
-            try:
-                self.tts_engine.stop()
-            except Exception:
-                pass
-        self.speaking = False
+    def _stop_engine(self):
+        if self.tts_engine:
+            self.tts_engine.stop()
     
     def describe_context(self, context: ApplicationContext) -> str:
         """Describe the current application context in natural language."""
@@ -797,29 +981,45 @@ class VoiceController:
     
     Integrates with Helper AI for conversational interaction
     and FARA layer for action execution across all apps.
+    
+    Audio flows through a persistent VoicePipeline: the microphone is
+    captured continuously into a ring buffer, VAD ends the utterance,
+    and the ASR backend (offline Whisper when installed) produces
+    interim and final transcripts. Both the audio source and the
+    backend can be swapped (e.g. a WAV file and a fake backend).
     """
     
     def __init__(self, helper_ai: SystemWideHelperAI, screen_reader: IntelligentScreenReader,
-                 fara_layer: SystemWideFARALayer):
+                 fara_layer: SystemWideFARALayer, audio_source: AudioSource = None,
+                 asr_backend: ASRBackend = None):
         self.helper_ai = helper_ai
         self.screen_reader = screen_reader
         self.fara = fara_layer
         self.is_listening = False
         self.super_pressed = False
+        self._listen_lock = threading.Lock()
+        self._listen_generation = 0
         self.recognizer = None
-        self.microphone = None
         self.action_callback = None  # Callback to execute actions
+        self.partial_callback: Optional[Callable[[str], None]] = None
         
         if VOICE_AVAILABLE:
             self.recognizer = sr.Recognizer()
-            try:
-                self.microphone = sr.Microphone()
-            except OSError:
-                self.microphone = None
+        
+        self.audio_source = audio_source
+        if self.audio_source is None and VOICE_AVAILABLE:
+            self.audio_source = MicrophoneSource()
+        self.asr_backend = asr_backend or create_default_backend(self.recognizer)
+        
+        self.pipeline: Optional[VoicePipeline] = None
+        self.partial_transcript = ""
+        self._context: Optional[ApplicationContext] = None
+        self._context_thread: Optional[threading.Thread] = None
     
     def start(self, action_callback: Callable = None):
         """Start listening for voice input."""
         self.action_callback = action_callback
+        self._start_pipeline()
         
         if KEYBOARD_AVAILABLE:
             self._start_keyboard_listener()
@@ -829,6 +1029,25 @@ class VoiceController:
         self.is_listening = False
         if hasattr(self, 'keyboard_listener'):
             self.keyboard_listener.stop()
+        if self.pipeline:
+            self.pipeline.stop()
+            self.pipeline = None
+    
+    def _start_pipeline(self):
+        """Open the audio source and start the capture/recognition threads."""
+        if self.pipeline or not self.audio_source or not self.asr_backend:
+            return
+        pipeline = VoicePipeline(self.audio_source, self.asr_backend)
+        pipeline.on_speech_start = self._on_speech_start
+        pipeline.on_partial = self._on_partial
+        pipeline.on_final = self._on_final
+        pipeline.on_error = self._on_error
+        try:
+            pipeline.start()
+        except Exception as e:
+            print(f"\n🎤 Voice input unavailable: {e}")
+            return
+        self.pipeline = pipeline
     
     def _start_keyboard_listener(self):
         """Start listening for Super key."""
@@ -856,53 +1075,113 @@ class VoiceController:
     
     def _start_listening(self):
         """Start capturing voice."""
-        if not VOICE_AVAILABLE or not self.microphone:
+        if not self.pipeline:
             return
         
-        self.is_listening = True
-        self.screen_reader.speak("I'm listening. What would you like to do?", wait=False)
+        # Barge-in: pressing push-to-talk silences the current answer
+        self.screen_reader.stop()
+        
+        with self._listen_lock:
+            self.is_listening = True
+            self._listen_generation += 1
+            generation = self._listen_generation
+        self.partial_transcript = ""
+        self._context = None
+        
+        # Capture opens only once the prompt has finished playing, otherwise
+        # the VAD picks the prompt up from the speakers as the user's command
+        self.screen_reader.speak("Listening.", wait=False)
+        threading.Thread(target=self._activate_after_prompt, args=(generation,),
+                         daemon=True).start()
+    
+    def _activate_after_prompt(self, generation: int):
+        """Open the utterance window once the listening prompt is spoken."""
+        self.screen_reader.speech_queue.wait()
+        with self._listen_lock:
+            # Key already released, or pressed again meanwhile
+            if not self.is_listening or generation != self._listen_generation:
+                return
+            self.pipeline.activate(preroll=False)
         print("\n🎤 Voice active - speak now...")
-        
-        def capture():
-            try:
-                with self.microphone as source:
-                    self.recognizer.adjust_for_ambient_noise(source, duration=0.2)
-                    audio = self.recognizer.listen(source, timeout=10)
-                
-                if self.is_listening:
-                    try:
-                        text = self.recognizer.recognize_google(audio)
-                        print(f"\n🎤 Heard: {text}")
-                        self._process_voice_input(text)
-                    except sr.UnknownValueError:
-                        self.screen_reader.speak("I didn't catch that. Could you say it again?")
-                    except sr.RequestError as e:
-                        self.screen_reader.speak("Voice recognition is having trouble. You can type instead.")
-            except Exception as e:
-                print(f"\n🎤 Error: {e}")
-        
-        threading.Thread(target=capture, daemon=True).start()
     
     def _stop_listening(self):
         """Stop capturing voice."""
-        self.is_listening = False
+        with self._listen_lock:
+            self.is_listening = False
+            if self.pipeline:
+                self.pipeline.release()
         print("🎤 Voice stopped")
     
+    # ─────────────────────────────────────────────────────────────────────────
+    # Pipeline callbacks
+    # ─────────────────────────────────────────────────────────────────────────
+    
+    def _on_speech_start(self):
+        """Speech detected: look up the active app while the user talks."""
+        def fetch():
+            self._context = self.fara.get_current_context()
+        self._context_thread = threading.Thread(target=fetch, daemon=True)
+        self._context_thread.start()
+    
+    def _on_partial(self, text: str):
+        """Interim transcript while the user is still speaking."""
+        self.partial_transcript = text
+        print(f"\r🎤 ... {text}", end="", flush=True)
+        if self.partial_callback:
+            self.partial_callback(text)
+    
+    def _on_final(self, text: str):
+        """Final transcript of an utterance."""
+        self.is_listening = False
+        if not text:
+            self.screen_reader.speak("I didn't catch that. Could you say it again?")
+            return
+        print(f"\n🎤 Heard: {text}")
+        self._process_voice_input(text)
+    
+    def _on_error(self, error: Exception):
+        self.is_listening = False
+        print(f"\n🎤 Error: {error}")
+        self.screen_reader.speak("Voice recognition is having trouble. You can type instead.")
+    
+    def _current_context(self) -> ApplicationContext:
+        """Context fetched during speech, or a fresh lookup."""
+        if self._context_thread is not None:
+            self._context_thread.join(timeout=2)
+            self._context_thread = None
+        context, self._context = self._context, None
+        return context or self.fara.get_current_context()
+    
     def _process_voice_input(self, text: str):
         """Process voice input through Helper AI."""
         # Get current context
-        context = self.fara.get_current_context()
+        context = self._current_context()
         
         # Process through Helper AI
-        response = self.helper_ai.process_request(text, context)
+        response = self.helper_ai.process_request_stream(text, context)
         
-        # Speak the response
-        self.screen_reader.speak(response['response'], wait=False)
-        print(f"\n🤖 Helper AI: {response['response']}")
+        # Speak the response - streamed answers start with their first sentence
+        if response['stream'] is not None:
+            print("\n🤖 Helper AI: ", end="", flush=True)
+            self.screen_reader.speak_stream(
+                response['stream'], on_token=lambda token: print(token, end="", flush=True)
+            )
+        else:
+            self.screen_reader.speak(response['response'], wait=False)
+            print(f"\n🤖 Helper AI: {response['response']}")
         
         # Execute action if there is one
         if response['action'] and self.action_callback:
             self.action_callback(response['action'])
+    
+    def get_status(self) -> Dict:
+        """Voice input status."""
+        return {
+            'listening': self.is_listening,
+            'backend': self.asr_backend.name if self.asr_backend else None,
+            'offline': self.asr_backend.offline if self.asr_backend else None,
+            'pipeline': self.pipeline.get_stats() if self.pipeline else None,
+        }
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -935,9 +1214,12 @@ class VA21AccessibilitySystem:
     completely isolated from this user-facing system.
     """
     
-    def __init__(self):
+    def __init__(self, ai_provider=None, focus_source: FocusSource = None):
         self.fara = SystemWideFARALayer()
-        self.helper_ai = SystemWideHelperAI(self.fara)
+        self.focus_source = focus_source
+        if ai_provider is None:
+            ai_provider = self._default_ai_provider()
+        self.helper_ai = SystemWideHelperAI(self.fara, ai_provider)
         self.screen_reader = IntelligentScreenReader()
         self.voice_controller = VoiceController(
             self.helper_ai,
@@ -949,6 +1231,19 @@ class VA21AccessibilitySystem:
         # Initialize Om Vinayaka AI (lazy import to avoid circular dependencies)
         self.om_vinayaka = None
     
+    @staticmethod
+    def _default_ai_provider():
+        """Best available provider (local Ollama first), or None."""
+        try:
+            from ..agents.ai_providers import get_ai_provider
+        except ImportError:
+            try:
+                from agents.ai_providers import get_ai_provider
+            except ImportError as e:
+                print(f"[VA21 Accessibility] AI provider unavailable: {e}")
+                return None
+        return get_ai_provider("auto")
+    
     def _init_om_vinayaka(self):
         """Initialize Om Vinayaka AI if not already initialized."""
         if self.om_vinayaka is None:
@@ -967,6 +1262,7 @@ class VA21AccessibilitySystem:
     def start(self, action_callback: Callable = None):
         """Start the accessibility system."""
         self.action_callback = action_callback
+        self.fara.start_focus_tracking(self.focus_source)
         self.voice_controller.start(action_callback)
         
         # Initialize Om Vinayaka AI
@@ -991,6 +1287,7 @@ class VA21AccessibilitySystem:
     def stop(self):
         """Stop the accessibility system."""
         self.voice_controller.stop()
+        self.fara.stop_focus_tracking()
         if self.om_vinayaka:
             self.om_vinayaka.deactivate()
         self.screen_reader.speak("Accessibility system stopped.")
@@ -1047,6 +1344,8 @@ class VA21AccessibilitySystem:
             'voice_available': VOICE_AVAILABLE,
             'keyboard_available': KEYBOARD_AVAILABLE,
             'tts_available': TTS_AVAILABLE,
+            'voice_input': self.voice_controller.get_status(),
+            'focus_tracking': self.fara.focus_tracker.get_status() if self.fara.focus_tracker else None,
         }
         
         if self.om_vinayaka:
@@ -0,0 +1,890 @@
+#!/usr/bin/env python3
+"""
+VA21 OS - Streaming Voice Pipeline
+===================================
+
+🙏 OM VINAYAKA - HEAR THE USER AS THEY SPEAK 🙏
+
+Low-latency, offline speech input for the VoiceController:
+
+    audio source ──► capture thread ──► ring buffer ──► VAD / endpointer
+                                                            │
+                                        ASR backend ◄───────┘
+                                   (interim + final hypotheses)
+
+- One persistent capture thread per source (no thread per key press)
+- Ring buffer with pre-roll, so the first syllable after push-to-talk
+  is never lost
+- Energy VAD with an adaptive noise floor (WebRTC VAD when installed)
+  replaces the per-press adjust_for_ambient_noise() calibration
+- The utterance ends on trailing silence, or at once on key release
+- Pluggable ASR backends fed with partial audio chunks:
+    * WhisperOnnxBackend - Whisper via onnxruntime, fully offline
+    * SpeechRecognitionBackend - the previous Google recognizer, used
+      only when no offline model is installed
+- Audio sources: microphone, or a WAV file for tests and replays
+
+Om Vinayaka - May obstacles be removed from your computing journey.
+
+License: Om Vinayaka Prayaga Vaibhav Inventions License
+Copyright (c) 2024-2025 Prayaga Vaibhav
+"""
+
+import os
+import glob
+import math
+import time
+import wave
+import queue
+import base64
+import threading
+from abc import ABC, abstractmethod
+from array import array
+from typing import Callable, List, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import onnxruntime as ort
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+try:
+    import webrtcvad
+    WEBRTCVAD_AVAILABLE = True
+except ImportError:
+    WEBRTCVAD_AVAILABLE = False
+
+try:
+    import speech_recognition as sr
+    VOICE_AVAILABLE = True
+except ImportError:
+    VOICE_AVAILABLE = False
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+VOICE_PIPELINE_VERSION = "1.0.0"
+
+# Audio format used throughout the pipeline: 16 kHz mono signed 16-bit PCM
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+FRAME_MS = 30
+FRAME_SAMPLES = SAMPLE_RATE * FRAME_MS // 1000
+FRAME_BYTES = FRAME_SAMPLES * SAMPLE_WIDTH
+
+# Ring buffer capacity and pre-roll kept before push-to-talk / speech start
+RING_SECONDS = 30
+PREROLL_MS = 300
+
+# Endpointing
+SPEECH_START_MS = 90         # Voiced audio needed to start an utterance
+END_SILENCE_MS = 600         # Trailing silence that ends it
+MAX_UTTERANCE_MS = 15000     # Hard cap per utterance
+NO_SPEECH_TIMEOUT_MS = 10000 # Give up if nothing is said after activation
+
+# Energy VAD
+VAD_MIN_ENERGY = 300.0       # RMS floor (16-bit scale)
+VAD_NOISE_RATIO = 3.0        # Speech must be this much louder than noise
+VAD_NOISE_ADAPT = 0.05       # Noise-floor EMA rate on non-speech frames
+
+# Whisper
+DEFAULT_WHISPER_MODEL_DIR = os.environ.get("VA21_WHISPER_MODEL_DIR", "/va21/models/whisper")
+WHISPER_CHUNK_SECONDS = 30
+WHISPER_N_FFT = 400
+WHISPER_HOP = 160
+PARTIAL_INTERVAL_MS = 600    # New audio between interim decodes
+
+
+def _ms_to_frames(ms: int) -> int:
+    return max(1, ms // FRAME_MS)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RING BUFFER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class AudioRingBuffer:
+    """
+    Fixed-capacity ring of audio frames.
+
+    Frames are addressed by an ever-increasing sequence number. Readers
+    keep their own cursor; a reader that falls more than the capacity
+    behind skips ahead to the oldest frame still held.
+    """
+
+    def __init__(self, capacity_frames: int = _ms_to_frames(RING_SECONDS * 1000)):
+        self.capacity = capacity_frames
+        self._slots: List[Optional[bytes]] = [None] * capacity_frames
+        self._next_seq = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.overruns = 0
+
+    @property
+    def head(self) -> int:
+        """Sequence number the next written frame will get."""
+        return self._next_seq
+
+    def write(self, frame: bytes):
+        with self._cond:
+            self._slots[self._next_seq % self.capacity] = frame
+            self._next_seq += 1
+            self._cond.notify_all()
+
+    def close(self):
+        """Wake readers; no more frames will arrive."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def reopen(self):
+        with self._cond:
+            self._closed = False
+
+    def read(self, cursor: int, timeout: float = 0.1):
+        """
+        Frames from `cursor` up to the newest one.
+
+        Returns:
+            (frames, next_cursor); frames is empty on timeout, and None
+            once the buffer is closed and drained
+        """
+        with self._cond:
+            if cursor >= self._next_seq:
+                if self._closed:
+                    return None, cursor
+                self._cond.wait(timeout)
+            oldest = max(0, self._next_seq - self.capacity)
+            if cursor < oldest:
+                self.overruns += oldest - cursor
+                cursor = oldest
+            frames = [self._slots[seq % self.capacity] for seq in range(cursor, self._next_seq)]
+            return frames, self._next_seq
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# AUDIO SOURCES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class AudioSource(ABC):
+    """Produces 16 kHz mono PCM16 frames of FRAME_BYTES each."""
+
+    def open(self):
+        pass
+
+    @abstractmethod
+    def read_frame(self) -> Optional[bytes]:
+        """Next frame (blocking); None at end of stream."""
+        pass
+
+    def close(self):
+        pass
+
+
+class MicrophoneSource(AudioSource):
+    """Live microphone through speech_recognition's PyAudio stream."""
+
+    def __init__(self, device_index: int = None):
+        self.device_index = device_index
+        self._mic = None
+        self._stream = None
+
+    def open(self):
+        if not VOICE_AVAILABLE:
+            raise RuntimeError("speech_recognition is not installed")
+        self._mic = sr.Microphone(device_index=self.device_index,
+                                  sample_rate=SAMPLE_RATE, chunk_size=FRAME_SAMPLES)
+        self._stream = self._mic.__enter__().stream
+
+    def read_frame(self) -> Optional[bytes]:
+        data = self._stream.read(FRAME_SAMPLES)
+        if len(data) < FRAME_BYTES:
+            data = data.ljust(FRAME_BYTES, b"\0")
+        return data
+
+    def close(self):
+        if self._mic is not None:
+            try:
+                self._mic.__exit__(None, None, None)
+            except Exception:
+                pass
+            self._mic = None
+            self._stream = None
+
+
+class WavFileSource(AudioSource):
+    """
+    Replays a PCM16 WAV file (tests, recorded commands).
+
+    Stereo is down-mixed and other sample rates are resampled (nearest
+    sample). With realtime=True frames are paced like a live microphone.
+    """
+
+    def __init__(self, path: str, realtime: bool = False):
+        self.path = path
+        self.realtime = realtime
+        self._samples: Optional[array] = None
+        self._pos = 0
+        self._next_time = 0.0
+
+    def open(self):
+        with wave.open(self.path, 'rb') as wav:
+            if wav.getsampwidth() != SAMPLE_WIDTH:
+                raise ValueError("Only 16-bit PCM WAV files are supported")
+            channels = wav.getnchannels()
+            rate = wav.getframerate()
+            raw = array('h')
+            raw.frombytes(wav.readframes(wav.getnframes()))
+
+        if channels > 1:
+            raw = array('h', (
+                sum(raw[i:i + channels]) // channels for i in range(0, len(raw), channels)
+            ))
+        if rate != SAMPLE_RATE:
+            step = rate / SAMPLE_RATE
+            raw = array('h', (raw[int(i * step)] for i in range(int(len(raw) / step))))
+        self._samples = raw
+        self._pos = 0
+        self._next_time = time.monotonic()
+
+    def read_frame(self) -> Optional[bytes]:
+        if self._samples is None or self._pos >= len(self._samples):
+            return None
+        frame = self._samples[self._pos:self._pos + FRAME_SAMPLES]
+        self._pos += FRAME_SAMPLES
+        if self.realtime:
+            self._next_time += FRAME_MS / 1000.0
+            delay = self._next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        return frame.tobytes().ljust(FRAME_BYTES, b"\0")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# VOICE ACTIVITY DETECTION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def frame_rms(frame: bytes) -> float:
+    """Root-mean-square level of a PCM16 frame."""
+    samples = array('h')
+    samples.frombytes(frame)
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+
+class EnergyVAD:
+    """
+    Frame-level speech detector.
+
+    Speech must stand VAD_NOISE_RATIO above a noise floor that keeps
+    adapting on non-speech frames. When WebRTC VAD is installed its
+    decision is combined with the energy test.
+    """
+
+    def __init__(self, aggressiveness: int = 2):
+        self.noise_floor = VAD_MIN_ENERGY / VAD_NOISE_RATIO
+        self._webrtc = webrtcvad.Vad(aggressiveness) if WEBRTCVAD_AVAILABLE else None
+
+    def is_speech(self, frame: bytes) -> bool:
+        energy = frame_rms(frame)
+        voiced = energy > max(VAD_MIN_ENERGY, self.noise_floor * VAD_NOISE_RATIO)
+        if voiced and self._webrtc is not None:
+            try:
+                voiced = self._webrtc.is_speech(frame, SAMPLE_RATE)
+            except Exception:
+                pass
+        if not voiced:
+            self.noise_floor += VAD_NOISE_ADAPT * (energy - self.noise_floor)
+        return voiced
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ASR BACKENDS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ASRBackend(ABC):
+    """
+    Speech recognizer fed incrementally with PCM16 audio.
+
+    One utterance at a time: start_utterance(), any number of
+    accept_audio() calls (each may return an interim hypothesis),
+    then finish() for the final text or cancel().
+    """
+
+    name = "base"
+    offline = True
+
+    def is_available(self) -> bool:
+        return True
+
+    @abstractmethod
+    def start_utterance(self):
+        """Begin a new utterance."""
+        pass
+
+    @abstractmethod
+    def accept_audio(self, pcm: bytes) -> Optional[str]:
+        """Add audio; return a new interim hypothesis, if any."""
+        pass
+
+    @abstractmethod
+    def finish(self) -> str:
+        """Final transcript of the utterance ("" if nothing recognized)."""
+        pass
+
+    def cancel(self):
+        pass
+
+
+class SpeechRecognitionBackend(ASRBackend):
+    """
+    The previous Google Web Speech recognizer, wrapped as a backend.
+
+    Network-bound and final-only; used only when no offline model is
+    installed.
+    """
+
+    name = "google"
+    offline = False
+
+    def __init__(self, recognizer=None):
+        self.recognizer = recognizer or (sr.Recognizer() if VOICE_AVAILABLE else None)
+        self._audio = bytearray()
+
+    def is_available(self) -> bool:
+        return self.recognizer is not None
+
+    def start_utterance(self):
+        self._audio = bytearray()
+
+    def accept_audio(self, pcm: bytes) -> Optional[str]:
+        self._audio.extend(pcm)
+        return None
+
+    def finish(self) -> str:
+        if not self._audio:
+            return ""
+        audio = sr.AudioData(bytes(self._audio), SAMPLE_RATE, SAMPLE_WIDTH)
+        self._audio = bytearray()
+        try:
+            return self.recognizer.recognize_google(audio)
+        except sr.UnknownValueError:
+            return ""
+
+    def cancel(self):
+        self._audio = bytearray()
+
+
+def _hz_to_mel(freq):
+    """Slaney mel scale (as used by Whisper's filterbank)."""
+    freq = np.asanyarray(freq, dtype=np.float64)
+    f_sp = 200.0 / 3
+    mels = freq / f_sp
+    min_log_hz = 1000.0
+    min_log_mel = min_log_hz / f_sp
+    logstep = math.log(6.4) / 27.0
+    log_t = freq >= min_log_hz
+    mels[log_t] = min_log_mel + np.log(freq[log_t] / min_log_hz) / logstep
+    return mels
+
+
+def _mel_to_hz(mels):
+    mels = np.asanyarray(mels, dtype=np.float64)
+    f_sp = 200.0 / 3
+    freqs = f_sp * mels
+    min_log_hz = 1000.0
+    min_log_mel = min_log_hz / f_sp
+    logstep = math.log(6.4) / 27.0
+    log_t = mels >= min_log_mel
+    freqs[log_t] = min_log_hz * np.exp(logstep * (mels[log_t] - min_log_mel))
+    return freqs
+
+
+def whisper_mel_filters(n_mels: int, n_fft: int = WHISPER_N_FFT,
+                        sample_rate: int = SAMPLE_RATE):
+    """Slaney-normalized triangular mel filterbank, shape (n_mels, n_fft//2 + 1)."""
+    fft_freqs = np.linspace(0, sample_rate / 2, 1 + n_fft // 2)
+    mel_freqs = _mel_to_hz(np.linspace(_hz_to_mel(0.0), _hz_to_mel(sample_rate / 2), n_mels + 2))
+    fdiff = np.diff(mel_freqs)
+    ramps = mel_freqs[:, None] - fft_freqs[None, :]
+    lower = -ramps[:-2] / fdiff[:-1, None]
+    upper = ramps[2:] / fdiff[1:, None]
+    weights = np.maximum(0, np.minimum(lower, upper))
+    weights *= (2.0 / (mel_freqs[2:n_mels + 2] - mel_freqs[:n_mels]))[:, None]
+    return weights.astype(np.float32)
+
+
+def whisper_log_mel(pcm: bytes, filters) -> "np.ndarray":
+    """
+    Whisper input features for up to 30 s of PCM16 audio.
+
+    Audio is zero-padded to 30 s, as Whisper expects. Returns an array
+    of shape (1, n_mels, 3000).
+    """
+    n_samples = SAMPLE_RATE * WHISPER_CHUNK_SECONDS
+    audio = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+    audio = audio[-n_samples:]
+    audio = np.pad(audio, (0, n_samples - len(audio)))
+
+    padded = np.pad(audio, WHISPER_N_FFT // 2, mode="reflect")
+    frames = np.lib.stride_tricks.sliding_window_view(padded, WHISPER_N_FFT)[::WHISPER_HOP]
+    window = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(WHISPER_N_FFT) / WHISPER_N_FFT)).astype(np.float32)
+    magnitudes = np.abs(np.fft.rfft(frames * window, axis=-1)[:-1]) ** 2
+
+    mel = filters @ magnitudes.T.astype(np.float32)
+    log_spec = np.log10(np.maximum(mel, 1e-10))
+    log_spec = np.maximum(log_spec, log_spec.max() - 8.0)
+    log_spec = (log_spec + 4.0) / 4.0
+    return log_spec[None, :, :].astype(np.float32)
+
+
+class WhisperOnnxBackend(ASRBackend):
+    """
+    Offline Whisper recognition through onnxruntime.
+
+    Expects an encoder/decoder ONNX export with a tokens table, as
+    produced by the sherpa-onnx Whisper export script:
+
+        <model_dir>/*encoder*.onnx   (metadata: n_mels, sot_sequence, eot, ...)
+        <model_dir>/*decoder*.onnx   (self-attention KV cache in/out)
+        <model_dir>/*tokens*.txt     ("<base64 token> <id>" per line)
+
+    int8 variants are preferred when present. Whisper is not a
+    streaming model, so interim hypotheses come from re-decoding the
+    audio so far every PARTIAL_INTERVAL_MS of new speech.
+    """
+
+    name = "whisper-onnx"
+    offline = True
+
+    def __init__(self, model_dir: str = DEFAULT_WHISPER_MODEL_DIR,
+                 partial_interval_ms: int = PARTIAL_INTERVAL_MS,
+                 num_threads: int = 2):
+        self.model_dir = model_dir
+        self.partial_interval_bytes = SAMPLE_RATE * SAMPLE_WIDTH * partial_interval_ms // 1000
+        self.num_threads = num_threads
+        self._encoder = None
+        self._decoder = None
+        self._tokens = {}
+        self._filters = None
+        self._audio = bytearray()
+        self._decoded_len = 0
+        self._lock = threading.Lock()
+
+        self._files = self._find_files(model_dir)
+
+    @staticmethod
+    def _find_files(model_dir: str):
+        def pick(pattern):
+            matches = sorted(glob.glob(os.path.join(model_dir, pattern)))
+            int8 = [m for m in matches if "int8" in os.path.basename(m)]
+            return (int8 or matches or [None])[0]
+        return pick("*encoder*.onnx"), pick("*decoder*.onnx"), pick("*tokens*.txt")
+
+    def is_available(self) -> bool:
+        return ONNX_AVAILABLE and NUMPY_AVAILABLE and all(self._files)
+
+    def _ensure_loaded(self):
+        """Load the ONNX sessions on first use."""
+        if self._encoder is not None:
+            return
+        encoder_path, decoder_path, tokens_path = self._files
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.num_threads
+        options.inter_op_num_threads = 1
+        providers = ["CPUExecutionProvider"]
+        self._encoder = ort.InferenceSession(encoder_path, sess_options=options, providers=providers)
+        self._decoder = ort.InferenceSession(decoder_path, sess_options=options, providers=providers)
+
+        meta = self._encoder.get_modelmeta().custom_metadata_map
+        self.n_mels = int(meta.get("n_mels", 80))
+        self.n_text_layer = int(meta["n_text_layer"])
+        self.n_text_ctx = int(meta["n_text_ctx"])
+        self.n_text_state = int(meta["n_text_state"])
+        self.eot = int(meta["eot"])
+        self.sot_sequence = [int(t) for t in meta["sot_sequence"].split(",")]
+        self.sot_sequence.append(int(meta["no_timestamps"]))
+
+        with open(tokens_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2:
+                    self._tokens[int(parts[1])] = base64.b64decode(parts[0])
+                elif len(parts) == 1:  # Token that decodes to whitespace
+                    self._tokens[int(parts[0])] = b" "
+
+        self._filters = whisper_mel_filters(self.n_mels)
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Streaming interface
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def start_utterance(self):
+        with self._lock:
+            self._ensure_loaded()
+            self._audio = bytearray()
+            self._decoded_len = 0
+
+    def accept_audio(self, pcm: bytes) -> Optional[str]:
+        with self._lock:
+            self._audio.extend(pcm)
+            if len(self._audio) - self._decoded_len < self.partial_interval_bytes:
+                return None
+            self._decoded_len = len(self._audio)
+            return self._transcribe(bytes(self._audio))
+
+    def finish(self) -> str:
+        with self._lock:
+            audio, self._audio = bytes(self._audio), bytearray()
+            return self._transcribe(audio) if audio else ""
+
+    def cancel(self):
+        with self._lock:
+            self._audio = bytearray()
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Decoding
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def _transcribe(self, pcm: bytes) -> str:
+        """Greedy Whisper decode of the most recent 30 s of audio."""
+        mel = whisper_log_mel(pcm, self._filters)
+        encoder_outputs = [o.name for o in self._encoder.get_outputs()]
+        cross_k, cross_v = self._encoder.run(
+            encoder_outputs, {self._encoder.get_inputs()[0].name: mel}
+        )
+
+        cache_shape = (self.n_text_layer, 1, self.n_text_ctx, self.n_text_state)
+        self_k = np.zeros(cache_shape, dtype=np.float32)
+        self_v = np.zeros(cache_shape, dtype=np.float32)
+        decoder_inputs = [i.name for i in self._decoder.get_inputs()]
+        decoder_outputs = [o.name for o in self._decoder.get_outputs()]
+
+        def step(tokens: List[int], offset: int):
+            return self._decoder.run(decoder_outputs, dict(zip(decoder_inputs, [
+                np.array([tokens], dtype=np.int64), self_k, self_v,
+                cross_k, cross_v, np.array([offset], dtype=np.int64),
+            ])))
+
+        logits, self_k, self_v = step(self.sot_sequence, 0)
+        offset = len(self.sot_sequence)
+        token = int(logits[0, -1].argmax())
+
+        result: List[int] = []
+        max_tokens = self.n_text_ctx - offset
+        while token != self.eot and len(result) < max_tokens:
+            result.append(token)
+            logits, self_k, self_v = step([token], offset)
+            offset += 1
+            token = int(logits[0, -1].argmax())
+
+        text = b"".join(self._tokens.get(t, b"") for t in result)
+        return text.decode('utf-8', errors='ignore').strip()
+
+
+def create_default_backend(recognizer=None,
+                           model_dir: str = DEFAULT_WHISPER_MODEL_DIR) -> Optional[ASRBackend]:
+    """Offline Whisper if its model is installed, else the Google recognizer."""
+    whisper = WhisperOnnxBackend(model_dir)
+    if whisper.is_available():
+        return whisper
+    fallback = SpeechRecognitionBackend(recognizer)
+    if fallback.is_available():
+        print("[VoicePipeline] No offline Whisper model found; using online recognizer")
+        return fallback
+    return None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# VOICE PIPELINE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class VoicePipeline:
+    """
+    Capture → ring buffer → VAD/endpointing → ASR.
+
+    With push-to-talk, activate() opens an utterance window (including
+    PREROLL_MS of audio from before the press) and release() ends it
+    immediately. With always_on=True, every detected utterance is
+    transcribed.
+
+    Callbacks (all optional):
+        on_speech_start()      speech detected in an active window
+        on_partial(text)       interim hypothesis
+        on_final(text)         final transcript ("" if nothing recognized)
+        on_error(exception)    backend failure
+
+    on_final and on_error run on a separate worker, so slow command
+    handling never stalls capture.
+    """
+
+    def __init__(self, source: AudioSource, backend: ASRBackend,
+                 always_on: bool = False):
+        self.source = source
+        self.backend = backend
+        self.always_on = always_on
+        self.ring = AudioRingBuffer()
+        self.vad = EnergyVAD()
+
+        self.on_speech_start: Optional[Callable[[], None]] = None
+        self.on_partial: Optional[Callable[[str], None]] = None
+        self.on_final: Optional[Callable[[str], None]] = None
+        self.on_error: Optional[Callable[[Exception], None]] = None
+
+        self._running = False
+        self._active = False
+        self._release_requested = False
+        self._activate_seq: Optional[int] = None
+        self._utterance_error: Optional[Exception] = None
+        self._capture_thread = None
+        self._process_thread = None
+        self._results: "queue.Queue" = queue.Queue()
+        self._result_thread = None
+        self._idle = threading.Event()
+        self._idle.set()
+
+        self.latest_partial = ""
+        self.stats = {'utterances': 0, 'partials': 0, 'last_final_latency_ms': None}
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Lifecycle
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def start(self):
+        """Open the source and start the capture and processing threads."""
+        if self._running:
+            return
+        self.source.open()
+        self.ring.reopen()
+        self._running = True
+        self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True,
+                                                name="va21-voice-capture")
+        self._process_thread = threading.Thread(target=self._process_loop, daemon=True,
+                                                name="va21-voice-process")
+        self._result_thread = threading.Thread(target=self._result_loop, daemon=True,
+                                               name="va21-voice-results")
+        self._capture_thread.start()
+        self._process_thread.start()
+        self._result_thread.start()
+
+    def stop(self):
+        """Stop all threads and close the source."""
+        self._running = False
+        self.ring.close()
+        for thread in (self._capture_thread, self._process_thread):
+            if thread is not None:
+                thread.join(timeout=2)
+        self._results.put(None)
+        if self._result_thread is not None:
+            self._result_thread.join(timeout=2)
+        self.source.close()
+
+    def wait_idle(self, timeout: float = None) -> bool:
+        """Block until the current utterance and its callbacks are done."""
+        return self._idle.wait(timeout)
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Push-to-talk
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def activate(self, preroll: bool = True):
+        """Key pressed: start listening (with pre-roll from the ring).
+
+        Pass preroll=False when the speakers were just playing a prompt,
+        so its tail isn't transcribed as the start of the command.
+        """
+        self._idle.clear()
+        self._release_requested = False
+        rewind = _ms_to_frames(PREROLL_MS) if preroll else 0
+        self._activate_seq = max(0, self.ring.head - rewind)
+        self._active = True
+
+    def release(self):
+        """Key released: end the utterance now."""
+        if self._active:
+            self._release_requested = True
+
+    @property
+    def active(self) -> bool:
+        return self._active
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Threads
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def _capture_loop(self):
+        try:
+            while self._running:
+                frame = self.source.read_frame()
+                if frame is None:
+                    break
+                self.ring.write(frame)
+        except Exception as e:
+            print(f"[VoicePipeline] Capture error: {e}")
+        finally:
+            self.ring.close()
+
+    def _process_loop(self):
+        cursor = 0
+        start_frames = _ms_to_frames(SPEECH_START_MS)
+        end_frames = _ms_to_frames(END_SILENCE_MS)
+        max_frames = _ms_to_frames(MAX_UTTERANCE_MS)
+        timeout_frames = _ms_to_frames(NO_SPEECH_TIMEOUT_MS)
+        preroll_frames = _ms_to_frames(PREROLL_MS)
+
+        in_speech = False
+        voiced_run = 0
+        silence_run = 0
+        utterance_frames = 0
+        waited_frames = 0
+        pending: List[bytes] = []   # Pre-roll/onset audio not yet sent to the backend
+
+        def reset():
+            nonlocal in_speech, voiced_run, silence_run, utterance_frames, waited_frames
+            in_speech = False
+            voiced_run = silence_run = utterance_frames = waited_frames = 0
+            pending.clear()
+
+        while True:
+            if self._activate_seq is not None:
+                # New push-to-talk window: rewind to the pre-roll
+                cursor, self._activate_seq = self._activate_seq, None
+                reset()
+
+            frames, cursor = self.ring.read(cursor)
+            if frames is None:
+                if in_speech:
+                    self._end_utterance()
+                elif self._active:
+                    self._end_window()
+                break
+
+            listening = self._active or self.always_on
+            for frame in frames:
+                if not listening:
+                    break
+
+                voiced = self.vad.is_speech(frame)
+                if not in_speech:
+                    pending.append(frame)
+                    if len(pending) > preroll_frames + start_frames:
+                        pending.pop(0)
+                    voiced_run = voiced_run + 1 if voiced else 0
+                    waited_frames += 1
+                    if voiced_run >= start_frames:
+                        in_speech = True
+                        self._begin_utterance(pending)
+                        pending.clear()
+                        utterance_frames = voiced_run
+                    elif self._active and waited_frames >= timeout_frames:
+                        self._end_window()
+                        reset()
+                        break
+                    continue
+
+                utterance_frames += 1
+                silence_run = 0 if voiced else silence_run + 1
+                self._feed(frame)
+                if silence_run >= end_frames or utterance_frames >= max_frames:
+                    self._end_utterance()
+                    reset()
+                    if self._active:
+                        break  # One utterance per push-to-talk window
+
+            if self._release_requested:
+                self._release_requested = False
+                if in_speech:
+                    self._end_utterance()
+                elif self._active:
+                    self._end_window()
+                reset()
+
+    def _begin_utterance(self, onset: List[bytes]):
+        self.latest_partial = ""
+        self._utterance_error = None
+        try:
+            self.backend.start_utterance()
+        except Exception as e:
+            self._utterance_error = e
+            return
+        if self.on_speech_start:
+            try:
+                self.on_speech_start()
+            except Exception as e:
+                print(f"[VoicePipeline] Speech-start callback error: {e}")
+        self._feed(b"".join(onset))
+
+    def _feed(self, pcm: bytes):
+        if self._utterance_error is not None:
+            return
+        try:
+            partial = self.backend.accept_audio(pcm)
+        except Exception as e:
+            self._utterance_error = e
+            return
+        if partial and partial != self.latest_partial:
+            self.latest_partial = partial
+            self.stats['partials'] += 1
+            if self.on_partial:
+                try:
+                    self.on_partial(partial)
+                except Exception as e:
+                    print(f"[VoicePipeline] Partial callback error: {e}")
+
+    def _end_utterance(self):
+        """Finalize the current utterance and hand it to the result worker."""
+        self._active = False
+        self.stats['utterances'] += 1
+        ended = time.monotonic()
+        if self._utterance_error is not None:
+            self._results.put(("error", self._utterance_error))
+            return
+        try:
+            text = self.backend.finish()
+        except Exception as e:
+            self._results.put(("error", e))
+            return
+        self.stats['last_final_latency_ms'] = round((time.monotonic() - ended) * 1000, 1)
+        self._results.put(("final", text))
+
+    def _end_window(self):
+        """Push-to-talk window closed without any speech."""
+        self._active = False
+        self._results.put(("final", ""))
+
+    def _result_loop(self):
+        while True:
+            item = self._results.get()
+            if item is None:
+                return
+            kind, value = item
+            try:
+                if kind == "final" and self.on_final:
+                    self.on_final(value)
+                elif kind == "error" and self.on_error:
+                    self.on_error(value)
+            except Exception as e:
+                print(f"[VoicePipeline] Result callback error: {e}")
+            finally:
+                if self._results.empty() and not self._active:
+                    self._idle.set()
+
+    def get_stats(self) -> dict:
+        """Pipeline statistics."""
+        return {
+            **self.stats,
+            'backend': self.backend.name,
+            'offline': self.backend.offline,
+            'ring_overruns': self.ring.overruns,
+            'noise_floor': round(self.vad.noise_floor, 1),
+            'webrtcvad': WEBRTCVAD_AVAILABLE,
+        }
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+VA21 OS - Window Focus Tracker
+===============================
+
+🙏 OM VINAYAKA - ALWAYS KNOW WHERE YOU ARE 🙏
+
+Event-driven tracking of the active window.
+
+Instead of spawning `xdotool` every time the accessibility layer needs
+context, a focus source pushes focus changes as they happen and the
+tracker keeps the latest one. Looking up the active window is then a
+field read.
+
+Sources:
+- X11FocusSource: _NET_ACTIVE_WINDOW / _NET_WM_NAME PropertyNotify events
+  (python-xlib)
+- XpropFocusSource: `xprop -spy` on the root window and the focused
+  window's title (no Python deps)
+- WindowManagerFocusSource: VA21 TilingWindowManager focus hooks
+
+Om Vinayaka - May obstacles be removed from your computing journey.
+
+License: Om Vinayaka Prayaga Vaibhav Inventions License
+Copyright (c) 2024-2025 Prayaga Vaibhav
+"""
+
+import os
+import re
+import select
+import shutil
+import subprocess
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+XLIB_AVAILABLE = False
+try:
+    from Xlib import X, display as xdisplay
+    XLIB_AVAILABLE = True
+except ImportError:
+    pass
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+WINDOW_FOCUS_VERSION = "1.0.0"
+
+# How often the X11 event loop wakes up to check for stop()
+X11_POLL_INTERVAL = 0.5
+
+
+@dataclass(frozen=True)
+class FocusInfo:
+    """The focused window as reported by a focus source."""
+    window_id: str = ""
+    wm_class: str = ""
+    title: str = ""
+
+
+FocusCallback = Callable[[FocusInfo], None]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FOCUS SOURCES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class FocusSource(ABC):
+    """
+    Pushes focus changes to a callback.
+
+    start() raises if the source cannot run here; the callback may be
+    called from a background thread.
+    """
+
+    name = "none"
+
+    def __init__(self):
+        self.running = False
+
+    @abstractmethod
+    def start(self, callback: FocusCallback):
+        """Begin pushing focus changes to callback."""
+        pass
+
+    def stop(self):
+        self.running = False
+
+
+class X11FocusSource(FocusSource):
+    """Active-window changes from X11 PropertyNotify events (python-xlib)."""
+
+    name = "x11"
+
+    def __init__(self, display_name: str = None):
+        super().__init__()
+        self.display_name = display_name
+        self._display = None
+        self._thread: Optional[threading.Thread] = None
+        self._active = None
+
+    def start(self, callback: FocusCallback):
+        if not XLIB_AVAILABLE:
+            raise RuntimeError("python-xlib is not installed")
+        self._display = xdisplay.Display(self.display_name)
+        self._root = self._display.screen().root
+        self._atom_active = self._display.intern_atom('_NET_ACTIVE_WINDOW')
+        self._atom_name = self._display.intern_atom('_NET_WM_NAME')
+        self._atom_utf8 = self._display.intern_atom('UTF8_STRING')
+        self._root.change_attributes(event_mask=X.PropertyChangeMask)
+        self._callback = callback
+        self.running = True
+
+        self._emit_active()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="va21-x11-focus")
+        self._thread.start()
+
+    def stop(self):
+        self.running = False
+        if self._thread:
+            self._thread.join(timeout=X11_POLL_INTERVAL * 2)
+            self._thread = None
+        if self._display:
+            self._display.close()
+            self._display = None
+
+    def _run(self):
+        display = self._display
+        while self.running:
+            try:
+                readable, _, _ = select.select([display], [], [], X11_POLL_INTERVAL)
+                if not readable:
+                    continue
+                while display.pending_events():
+                    event = display.next_event()
+                    if event.type != X.PropertyNotify:
+                        continue
+                    if event.atom == self._atom_active:
+                        self._emit_active()
+                    elif (event.atom in (self._atom_name, X.Atom.WM_NAME)
+                          and self._active is not None and event.window.id == self._active.id):
+                        self._emit(self._active)  # Title changed (e.g. browser tab)
+            except Exception as e:
+                if self.running:
+                    print(f"[WindowFocus] X11 event loop stopped: {e}")
+                self.running = False
+
+    def _emit_active(self):
+        prop = self._root.get_full_property(self._atom_active, X.AnyPropertyType)
+        window_id = prop.value[0] if prop and len(prop.value) else 0
+        if not window_id:
+            self._active = None
+            self._callback(FocusInfo())
+            return
+        window = self._display.create_resource_object('window', window_id)
+        try:
+            # Follow title changes of the focused window
+            window.change_attributes(event_mask=X.PropertyChangeMask)
+        except Exception:
+            pass
+        self._active = window
+        self._emit(window)
+
+    def _emit(self, window):
+        try:
+            wm_class = window.get_wm_class() or ()
+            name = window.get_full_property(self._atom_name, self._atom_utf8)
+            if name:
+                title = name.value.decode('utf-8', 'replace') if isinstance(name.value, bytes) else str(name.value)
+            else:
+                title = window.get_wm_name() or ""
+        except Exception:
+            return  # Window vanished between the event and the query
+        self._callback(FocusInfo(
+            window_id=hex(window.id),
+            wm_class=wm_class[-1] if wm_class else "",
+            title=title,
+        ))
+
+
+class XpropFocusSource(FocusSource):
+    """
+    Active-window changes from `xprop -root -spy _NET_ACTIVE_WINDOW`.
+
+    A second `xprop -id <window> -spy` follows the focused window's
+    title (e.g. browser tab switches), restarted on every focus change.
+    """
+
+    name = "xprop"
+
+    _ACTIVE_RE = re.compile(r'window id # (0x[0-9a-fA-F]+)')
+    _CLASS_RE = re.compile(r'^WM_CLASS\(\w+\) = (.*)$', re.MULTILINE)
+    _NAME_RE = re.compile(r'^(_NET_WM_NAME|WM_NAME)\(\w+\) = "(.*)"$', re.MULTILINE)
+
+    def __init__(self):
+        super().__init__()
+        self._proc: Optional[subprocess.Popen] = None
+        self._thread: Optional[threading.Thread] = None
+        self._title_proc: Optional[subprocess.Popen] = None
+        self._title_lock = threading.Lock()
+        self._active: Optional[FocusInfo] = None
+        self._lock = threading.Lock()
+
+    def start(self, callback: FocusCallback):
+        if not shutil.which('xprop'):
+            raise RuntimeError("xprop is not installed")
+        self._proc = subprocess.Popen(
+            ['xprop', '-root', '-spy', '_NET_ACTIVE_WINDOW'],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        )
+        self._callback = callback
+        self.running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="va21-xprop-focus")
+        self._thread.start()
+
+    def stop(self):
+        self.running = False
+        self._follow_title(None)
+        if self._proc:
+            self._terminate(self._proc)
+            self._proc = None
+
+    @staticmethod
+    def _terminate(proc: subprocess.Popen):
+        proc.terminate()
+        try:
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+    def _run(self):
+        for line in self._proc.stdout:
+            if not self.running:
+                break
+            match = self._ACTIVE_RE.search(line)
+            window_id = match.group(1) if match else ""
+            if not window_id or int(window_id, 16) == 0:
+                info = FocusInfo()
+            else:
+                info = self._describe(window_id)
+            with self._lock:
+                self._active = info if info.window_id else None
+            self._callback(info)
+            self._follow_title(info.window_id or None)
+        self.running = False
+        self._follow_title(None)
+
+    def _follow_title(self, window_id: Optional[str]):
+        """Spy on the title of window_id (None stops following)."""
+        with self._title_lock:
+            if self._title_proc:
+                self._terminate(self._title_proc)
+                self._title_proc = None
+            if not window_id or not self.running:
+                return
+            try:
+                proc = subprocess.Popen(
+                    ['xprop', '-id', window_id, '-spy', '_NET_WM_NAME', 'WM_NAME'],
+                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+                )
+            except OSError:
+                return
+            self._title_proc = proc
+        threading.Thread(target=self._run_title, args=(proc, window_id), daemon=True,
+                         name="va21-xprop-title").start()
+
+    def _run_title(self, proc: subprocess.Popen, window_id: str):
+        has_net_name = False
+        for line in proc.stdout:
+            match = self._NAME_RE.match(line.rstrip('\n'))
+            if not match:
+                continue
+            prop, title = match.groups()
+            if prop == '_NET_WM_NAME':
+                has_net_name = True
+            elif has_net_name:
+                continue  # WM_NAME is the legacy copy; _NET_WM_NAME wins
+            with self._lock:
+                active = self._active
+                if active is None or active.window_id != window_id or active.title == title:
+                    continue  # Focus moved on, or nothing changed
+                info = self._active = FocusInfo(window_id, active.wm_class, title)
+            self._callback(info)
+
+    def _describe(self, window_id: str) -> FocusInfo:
+        try:
+            result = subprocess.run(
+                ['xprop', '-id', window_id, 'WM_CLASS', '_NET_WM_NAME', 'WM_NAME'],
+                capture_output=True, text=True, timeout=2
+            )
+            output = result.stdout
+        except (subprocess.TimeoutExpired, OSError):
+            output = ""
+        wm_class = ""
+        match = self._CLASS_RE.search(output)
+        if match:
+            parts = re.findall(r'"([^"]*)"', match.group(1))
+            wm_class = parts[-1] if parts else ""
+        match = self._NAME_RE.search(output)
+        return FocusInfo(window_id=window_id, wm_class=wm_class,
+                         title=match.group(2) if match else "")
+
+
+class WindowManagerFocusSource(FocusSource):
+    """Focus changes from the VA21 TilingWindowManager's focus hooks."""
+
+    name = "va21-wm"
+
+    def __init__(self, window_manager):
+        super().__init__()
+        self.window_manager = window_manager
+
+    def start(self, callback: FocusCallback):
+        self._callback = callback
+        self.window_manager.add_focus_listener(self._on_focus)
+        self.running = True
+        wm = self.window_manager
+        self._on_focus(wm.windows.get(wm.focused_window) if wm.focused_window else None)
+
+    def stop(self):
+        self.running = False
+        self.window_manager.remove_focus_listener(self._on_focus)
+
+    def _on_focus(self, window):
+        if window is None:
+            self._callback(FocusInfo())
+        else:
+            self._callback(FocusInfo(window_id=window.id, wm_class=window.app_id, title=window.title))
+
+
+def create_default_focus_source() -> Optional[FocusSource]:
+    """Best focus source for this session, or None (no X display)."""
+    if not os.environ.get('DISPLAY'):
+        return None
+    if XLIB_AVAILABLE:
+        return X11FocusSource()
+    if shutil.which('xprop'):
+        return XpropFocusSource()
+    return None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FOCUS TRACKER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class WindowFocusTracker:
+    """
+    Keeps the currently focused window up to date from a focus source.
+
+    Listeners are called (on the source's thread) only when the
+    focused window or its title actually changes.
+    """
+
+    def __init__(self, source: FocusSource = None):
+        self.source = source or create_default_focus_source()
+        self.current: Optional[FocusInfo] = None
+        self._listeners: List[FocusCallback] = []
+        self._lock = threading.Lock()
+        self.stats = {'focus_events': 0, 'focus_changes': 0}
+
+    def add_listener(self, callback: FocusCallback):
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: FocusCallback):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def start(self) -> bool:
+        """Start the focus source. Returns False if none can run here."""
+        if self.source is None:
+            return False
+        try:
+            self.source.start(self._on_focus)
+        except Exception as e:
+            print(f"[WindowFocus] Focus tracking unavailable ({self.source.name}): {e}")
+            return False
+        return True
+
+    def stop(self):
+        if self.source:
+            self.source.stop()
+
+    @property
+    def is_live(self) -> bool:
+        """True while focus events are arriving (the cache is trustworthy)."""
+        return self.source is not None and self.source.running
+
+    def _on_focus(self, info: FocusInfo):
+        with self._lock:
+            self.stats['focus_events'] += 1
+            if info == self.current:
+                return
+            self.current = info
+            self.stats['focus_changes'] += 1
+            listeners = list(self._listeners)
+        for callback in listeners:
+            try:
+                callback(info)
+            except Exception as e:
+                print(f"[WindowFocus] Listener error: {e}")
+
+    def get_status(self) -> dict:
+        return {
+            'source': self.source.name if self.source else None,
+            'live': self.is_live,
+            'current': self.current.title if self.current else None,
+            **self.stats,
+        }
@@ -396,8 +396,9 @@ class APIProvider(AIProvider):
     """
     
     def __init__(self, config: ProviderConfig):
-        super().__init__(config)
+        # Set before the base __init__, which checks availability
         self.endpoint = API_ENDPOINTS.get(config.provider_type.value, '')
+        super().__init__(config)
     
     def _check_availability(self) -> bool:
         """Check if API is available (has valid key)."""
@@ -3,4 +3,5 @@
 VA21 Journalism Toolkit - Professional tools for journalists.
 """
 from .journalism_toolkit import JournalismToolkit, get_journalism_toolkit
+from .journalism_store import JournalismStore
 __version__ = "1.0.0"
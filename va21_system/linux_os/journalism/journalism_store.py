@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+VA21 Research OS - Journalism Store
+=====================================
+
+SQLite persistence for the Journalism Toolkit.
+
+Each story, source and FOIA request is one row: the full record as
+JSON plus the columns that queries filter and sort on. A mutation
+rewrites only its own row, inside a transaction, so a crash can never
+leave a half-written file behind.
+
+Features:
+- Indexed columns: story status, deadline, desk; story <-> source links;
+  source confidentiality; FOIA status and response deadline
+- Atomic transactions (nested blocks join the outer one)
+- Deadline and statistics queries answered by the indexes
+- WAL journal with full fsync on commit
+
+Om Vinayaka - Truth is the highest dharma.
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HELPERS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _timestamp(value) -> Optional[float]:
+    """Sortable timestamp for an ISO string or datetime (None stays None)."""
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.timestamp()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# JOURNALISM STORE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class JournalismStore:
+    """
+    Row-per-record SQLite store for stories, sources and FOIA requests.
+
+    Records are plain JSON-serializable dicts with datetimes as ISO
+    strings; the store derives its index columns from them.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._conn = sqlite3.connect(db_path, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=FULL;
+            CREATE TABLE IF NOT EXISTS stories (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                desk TEXT,
+                deadline REAL,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS story_sources (
+                story_id TEXT NOT NULL,
+                source_id TEXT NOT NULL,
+                PRIMARY KEY (story_id, source_id)
+            );
+            CREATE TABLE IF NOT EXISTS sources (
+                id TEXT PRIMARY KEY,
+                alias TEXT NOT NULL,
+                confidentiality TEXT NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS foia_requests (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                response_deadline REAL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_stories_status ON stories(status);
+            CREATE INDEX IF NOT EXISTS idx_stories_deadline ON stories(deadline);
+            CREATE INDEX IF NOT EXISTS idx_stories_desk ON stories(desk);
+            CREATE INDEX IF NOT EXISTS idx_story_sources_source ON story_sources(source_id);
+            CREATE INDEX IF NOT EXISTS idx_sources_alias ON sources(alias COLLATE NOCASE);
+            CREATE INDEX IF NOT EXISTS idx_sources_confidentiality ON sources(confidentiality);
+            CREATE INDEX IF NOT EXISTS idx_foia_status ON foia_requests(status);
+            CREATE INDEX IF NOT EXISTS idx_foia_deadline ON foia_requests(response_deadline);
+        """)
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Transactions
+    # ─────────────────────────────────────────────────────────────────────────
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run a block of changes atomically.
+
+        Nested blocks join the outermost transaction; if any block
+        raises, every change since the outermost BEGIN is rolled back.
+        """
+        with self._lock:
+            if self._depth == 0:
+                self._conn.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._conn.execute("COMMIT")
+
+    def is_empty(self) -> bool:
+        """True if nothing has been stored yet."""
+        with self._lock:
+            for table in ("stories", "sources", "foia_requests"):
+                if self._conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone():
+                    return False
+            return True
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Records
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def put_story(self, record: Dict):
+        """Insert or replace a story and its source links."""
+        with self.transaction():
+            self._conn.execute(
+                "INSERT OR REPLACE INTO stories (id, status, desk, deadline, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (record["id"], record["status"], record.get("desk", ""),
+                 _timestamp(record.get("deadline")), json.dumps(record, default=str))
+            )
+            self._conn.execute("DELETE FROM story_sources WHERE story_id = ?", (record["id"],))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO story_sources (story_id, source_id) VALUES (?, ?)",
+                [(record["id"], source_id) for source_id in record.get("sources", [])]
+            )
+
+    def delete_story(self, story_id: str):
+        with self.transaction():
+            self._conn.execute("DELETE FROM stories WHERE id = ?", (story_id,))
+            self._conn.execute("DELETE FROM story_sources WHERE story_id = ?", (story_id,))
+
+    def put_source(self, record: Dict):
+        """Insert or replace a source."""
+        with self.transaction():
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sources (id, alias, confidentiality, data) VALUES (?, ?, ?, ?)",
+                (record["id"], record["alias"], record["confidentiality"],
+                 json.dumps(record, default=str))
+            )
+
+    def put_foia(self, record: Dict):
+        """Insert or replace a FOIA request."""
+        with self.transaction():
+            self._conn.execute(
+                "INSERT OR REPLACE INTO foia_requests (id, status, response_deadline, data) "
+                "VALUES (?, ?, ?, ?)",
+                (record["id"], record["status"], _timestamp(record.get("response_deadline")),
+                 json.dumps(record, default=str))
+            )
+
+    def load_all(self) -> Dict[str, List[Dict]]:
+        """
+        Every stored record, by kind.
+
+        Returns:
+            {"stories": [...], "sources": [...], "foia_requests": [...]}
+        """
+        result = {}
+        with self._lock:
+            for table in ("stories", "sources", "foia_requests"):
+                result[table] = [
+                    json.loads(data)
+                    for (data,) in self._conn.execute(f"SELECT data FROM {table} ORDER BY rowid")
+                ]
+        return result
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Indexed queries
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def stories_by_deadline(self, exclude_statuses: List[str]) -> List[Tuple[str, float]]:
+        """(story ID, deadline timestamp) for open stories, soonest first."""
+        placeholders = ",".join("?" * len(exclude_statuses)) or "''"
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT id, deadline FROM stories WHERE deadline IS NOT NULL "
+                f"AND status NOT IN ({placeholders}) ORDER BY deadline",
+                list(exclude_statuses)
+            ).fetchall()
+
+    def story_ids_by_status(self, status: str) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT id FROM stories WHERE status = ? ORDER BY rowid", (status,)
+            )]
+
+    def story_ids_by_source(self, source_id: str) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT story_id FROM story_sources WHERE source_id = ?", (source_id,)
+            )]
+
+    def source_id_by_alias(self, alias: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM sources WHERE alias = ? COLLATE NOCASE LIMIT 1", (alias,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def foia_due(self, before: datetime) -> List[str]:
+        """IDs of open FOIA requests whose response is due before a time."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT id FROM foia_requests WHERE response_deadline IS NOT NULL "
+                "AND response_deadline < ? AND status NOT IN ('completed', 'denied') "
+                "ORDER BY response_deadline",
+                (before.timestamp(),)
+            )]
+
+    def get_counts(self, open_after: datetime, exclude_statuses: List[str]) -> Dict:
+        """Grouped counts for the statistics view."""
+        placeholders = ",".join("?" * len(exclude_statuses)) or "''"
+        with self._lock:
+            conn = self._conn
+            return {
+                "stories_by_status": dict(conn.execute(
+                    "SELECT status, COUNT(*) FROM stories GROUP BY status"
+                ).fetchall()),
+                "sources_by_confidentiality": dict(conn.execute(
+                    "SELECT confidentiality, COUNT(*) FROM sources GROUP BY confidentiality"
+                ).fetchall()),
+                "foia_by_status": dict(conn.execute(
+                    "SELECT status, COUNT(*) FROM foia_requests GROUP BY status"
+                ).fetchall()),
+                "pending_deadlines": conn.execute(
+                    f"SELECT COUNT(*) FROM stories WHERE deadline > ? "
+                    f"AND status NOT IN ({placeholders})",
+                    [open_after.timestamp()] + list(exclude_statuses)
+                ).fetchone()[0],
+            }
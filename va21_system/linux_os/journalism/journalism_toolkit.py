@@ -20,6 +20,7 @@ Features:
 - Freedom of Press Tools
 - FOIA Request Manager
 - Legal Review Checklist
+- Indexed, transactional SQLite store
 
 Om Vinayaka - Truth is the highest dharma.
 """
@@ -27,11 +28,17 @@ Om Vinayaka - Truth is the highest dharma.
 import os
 import json
 import hashlib
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from enum import Enum
 
+try:
+    from .journalism_store import JournalismStore
+except ImportError:
+    from journalism_store import JournalismStore
+
 
 class SourceConfidentiality(Enum):
     """Source confidentiality levels."""
@@ -202,6 +209,45 @@ class FOIARequest:
     appeal_notes: str = ""
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# RECORD CONVERSION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_DATETIME_TYPES = (datetime, Optional[datetime])
+
+# Statuses whose deadlines no longer matter
+CLOSED_STATUSES = [StoryStatus.PUBLISHED.value, StoryStatus.KILLED.value]
+
+
+def _to_record(obj) -> Dict:
+    """Dataclass -> JSON-ready dict (enums by value, datetimes as ISO)."""
+    record = {}
+    for f in fields(obj):
+        value = getattr(obj, f.name)
+        if isinstance(value, Enum):
+            value = value.value
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        record[f.name] = value
+    return record
+
+
+def _from_record(cls, data: Dict):
+    """JSON dict -> dataclass; unknown keys are ignored, missing ones defaulted."""
+    kwargs = {}
+    for f in fields(cls):
+        if f.name not in data:
+            continue
+        value = data[f.name]
+        if value is not None:
+            if isinstance(f.type, type) and issubclass(f.type, Enum):
+                value = f.type(value)
+            elif f.type in _DATETIME_TYPES and isinstance(value, str):
+                value = datetime.fromisoformat(value)
+        kwargs[f.name] = value
+    return cls(**kwargs)
+
+
 class JournalismToolkit:
     """
     VA21 Journalism Toolkit
@@ -235,6 +281,9 @@ class JournalismToolkit:
         self.interviews: Dict[str, Interview] = {}
         self.foia_requests: Dict[str, FOIARequest] = {}
         
+        # Row-per-record store with indexes on status, deadline and source
+        self.store = JournalismStore(os.path.join(data_path, "journalism.db"))
+        
         # Load existing data
         self._load_data()
         
@@ -243,42 +292,80 @@ class JournalismToolkit:
     def _load_data(self):
         """Load existing data."""
         stories_file = os.path.join(self.data_path, "stories.json")
-        if os.path.exists(stories_file):
-            try:
-                with open(stories_file, 'r') as f:
-                    data = json.load(f)
+        if os.path.exists(stories_file) and self.store.is_empty():
+            self._migrate_stories_file(stories_file)
+        
+        self.stories.clear()
+        self.sources.clear()
+        self.foia_requests.clear()
+        
+        records = self.store.load_all()
+        for cls, kind, target in ((Story, "stories", self.stories),
+                                  (Source, "sources", self.sources),
+                                  (FOIARequest, "foia_requests", self.foia_requests)):
+            for record in records[kind]:
+                try:
+                    obj = _from_record(cls, record)
+                    target[obj.id] = obj
+                except Exception as e:
+                    print(f"[JournalismToolkit] Error loading {kind} record {record.get('id')}: {e}")
+    
+    def _migrate_stories_file(self, stories_file: str):
+        """One-time import of stories.json from older versions."""
+        try:
+            with open(stories_file, 'r') as f:
+                data = json.load(f)
+            with self.store.transaction():
                 for story_data in data:
-                    story = Story(
-                        id=story_data["id"],
-                        headline=story_data["headline"],
-                        slug=story_data.get("slug", ""),
-                        status=StoryStatus(story_data.get("status", "idea")),
-                        reporter=story_data.get("reporter", ""),
-                        pitch=story_data.get("pitch", ""),
-                        sources=story_data.get("sources", []),
-                        tags=story_data.get("tags", []),
-                    )
-                    self.stories[story.id] = story
-            except:
-                pass
-    
-    def _save_data(self):
-        """Save data to disk."""
-        stories_file = os.path.join(self.data_path, "stories.json")
-        stories_data = []
-        for story in self.stories.values():
-            stories_data.append({
-                "id": story.id,
-                "headline": story.headline,
-                "slug": story.slug,
-                "status": story.status.value,
-                "reporter": story.reporter,
-                "pitch": story.pitch,
-                "sources": story.sources,
-                "tags": story.tags,
-            })
-        with open(stories_file, 'w') as f:
-            json.dump(stories_data, f, indent=2)
+                    story = _from_record(Story, dict({"slug": ""}, **story_data))
+                    self.store.put_story(_to_record(story))
+            os.replace(stories_file, stories_file + ".migrated")
+        except Exception as e:
+            print(f"[JournalismToolkit] Error migrating {stories_file}: {e}")
+    
+    def _save_story(self, story: Story):
+        """Persist one story (its row and source links only)."""
+        self.store.put_story(_to_record(story))
+    
+    def _save_foia(self, request: FOIARequest):
+        """Persist one FOIA request."""
+        self.store.put_foia(_to_record(request))
+    
+    @staticmethod
+    def _source_record(source: Source) -> Dict:
+        """
+        Stored form of a source.
+        
+        Protected sources keep only their alias and the non-identifying
+        reliability counters.
+        """
+        if source.confidentiality in [SourceConfidentiality.CONFIDENTIAL,
+                                       SourceConfidentiality.OFF_RECORD]:
+            return {
+                "id": source.id,
+                "name": source.name,  # Already a hash for protected sources
+                "alias": source.alias,
+                "confidentiality": source.confidentiality.value,
+                "reliability_score": source.reliability_score,
+                "times_cited": source.times_cited,
+                "verified_claims": source.verified_claims,
+            }
+        return _to_record(source)
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Apply several changes atomically.
+        
+        If the block raises, the store rolls back and in-memory records
+        are reloaded from it.
+        """
+        try:
+            with self.store.transaction():
+                yield self
+        except BaseException:
+            self._load_data()
+            raise
     
     # ═══════════════════════════════════════════════════════════════════════════
     # SOURCE MANAGEMENT
@@ -332,6 +419,8 @@ class JournalismToolkit:
     
     def _save_source(self, source: Source):
         """Save source with appropriate security."""
+        self.store.put_source(self._source_record(source))
+        
         # Confidential sources are saved separately with encryption
         if source.confidentiality in [SourceConfidentiality.CONFIDENTIAL,
                                        SourceConfidentiality.OFF_RECORD]:
@@ -346,10 +435,8 @@ class JournalismToolkit:
     
     def get_source_by_alias(self, alias: str) -> Optional[Source]:
         """Find source by alias."""
-        for source in self.sources.values():
-            if source.alias.lower() == alias.lower():
-                return source
-        return None
+        source_id = self.store.source_id_by_alias(alias)
+        return self.sources.get(source_id) if source_id else None
     
     def update_source_reliability(self, source_id: str, verified_claim: bool) -> bool:
         """Update source reliability based on claim verification."""
@@ -366,6 +453,7 @@ class JournalismToolkit:
             ratio = source.verified_claims / source.times_cited
             source.reliability_score = min(10, max(1, int(ratio * 10)))
         
+        self._save_source(source)
         return True
     
     # ═══════════════════════════════════════════════════════════════════════════
@@ -400,7 +488,7 @@ class JournalismToolkit:
         )
         
         self.stories[story_id] = story
-        self._save_data()
+        self._save_story(story)
         
         print(f"[JournalismToolkit] Created story: {headline}")
         return story
@@ -429,7 +517,7 @@ class JournalismToolkit:
             if not story.legal_reviewed:
                 warnings.append("⚠️ Legal review not completed")
         
-        self._save_data()
+        self._save_story(story)
         
         message = f"Status: {old_status.value} → {status.value}"
         if warnings:
@@ -443,20 +531,27 @@ class JournalismToolkit:
             return False
         
         self.stories[story_id].deadline = deadline
-        self._save_data()
+        self._save_story(self.stories[story_id])
         return True
     
     def get_stories_by_deadline(self) -> List[Tuple[Story, timedelta]]:
         """Get stories sorted by deadline urgency."""
         now = datetime.now()
-        with_deadlines = []
-        
-        for story in self.stories.values():
-            if story.deadline and story.status not in [StoryStatus.PUBLISHED, StoryStatus.KILLED]:
-                time_left = story.deadline - now
-                with_deadlines.append((story, time_left))
-        
-        return sorted(with_deadlines, key=lambda x: x[1])
+        return [
+            (self.stories[story_id], self.stories[story_id].deadline - now)
+            for story_id, _ in self.store.stories_by_deadline(CLOSED_STATUSES)
+            if story_id in self.stories
+        ]
+    
+    def get_stories_by_status(self, status: StoryStatus) -> List[Story]:
+        """Stories currently in a pipeline stage."""
+        return [self.stories[story_id] for story_id in self.store.story_ids_by_status(status.value)
+                if story_id in self.stories]
+    
+    def get_stories_by_source(self, source_id: str) -> List[Story]:
+        """Stories that cite a source."""
+        return [self.stories[story_id] for story_id in self.store.story_ids_by_source(source_id)
+                if story_id in self.stories]
     
     def add_source_to_story(self, story_id: str, source_id: str) -> bool:
         """Link a source to a story."""
@@ -465,7 +560,7 @@ class JournalismToolkit:
         
         if source_id not in self.stories[story_id].sources:
             self.stories[story_id].sources.append(source_id)
-            self._save_data()
+            self._save_story(self.stories[story_id])
         return True
     
     # ═══════════════════════════════════════════════════════════════════════════
@@ -489,7 +584,7 @@ class JournalismToolkit:
         }
         
         self.stories[story_id].facts.append(fact)
-        self._save_data()
+        self._save_story(self.stories[story_id])
         
         return fact_id
     
@@ -504,7 +599,7 @@ class JournalismToolkit:
                 fact["verified"] = verified
                 fact["rating"] = rating
                 fact["notes"] = notes
-                self._save_data()
+                self._save_story(self.stories[story_id])
                 return True
         
         return False
@@ -627,6 +722,7 @@ class JournalismToolkit:
         )
         
         self.foia_requests[foia_id] = request
+        self._save_foia(request)
         return request
     
     def submit_foia(self, foia_id: str) -> Tuple[bool, str]:
@@ -640,9 +736,16 @@ class JournalismToolkit:
         
         # Calculate expected response deadline (usually 20 business days)
         req.response_deadline = datetime.now() + timedelta(days=30)
+        self._save_foia(req)
         
         return True, f"Submitted. Response expected by {req.response_deadline.strftime('%Y-%m-%d')}"
     
+    def get_foia_due(self, within_days: int = 7) -> List[FOIARequest]:
+        """Open FOIA requests whose response is due within the given days."""
+        before = datetime.now() + timedelta(days=within_days)
+        return [self.foia_requests[foia_id] for foia_id in self.store.foia_due(before)
+                if foia_id in self.foia_requests]
+    
     def get_foia_template(self, agency_type: str = "federal") -> str:
         """Get FOIA request template."""
         templates = {
@@ -770,24 +873,22 @@ Sincerely,
     
     def get_statistics(self) -> Dict:
         """Get journalism toolkit statistics."""
+        counts = self.store.get_counts(datetime.now(), CLOSED_STATUSES)
         return {
             "total_stories": len(self.stories),
             "total_sources": len(self.sources),
             "total_interviews": len(self.interviews),
             "total_foia": len(self.foia_requests),
             "stories_by_status": {
-                status.value: len([s for s in self.stories.values() if s.status == status])
+                status.value: counts["stories_by_status"].get(status.value, 0)
                 for status in StoryStatus
             },
             "sources_by_confidentiality": {
-                conf.value: len([s for s in self.sources.values() if s.confidentiality == conf])
+                conf.value: counts["sources_by_confidentiality"].get(conf.value, 0)
                 for conf in SourceConfidentiality
             },
-            "pending_deadlines": len([
-                s for s in self.stories.values()
-                if s.deadline and s.deadline > datetime.now() and 
-                s.status not in [StoryStatus.PUBLISHED, StoryStatus.KILLED]
-            ]),
+            "foia_by_status": counts["foia_by_status"],
+            "pending_deadlines": counts["pending_deadlines"],
         }
 
 
@@ -5,10 +5,12 @@ VA21 Obsidian Integration - Knowledge management for VA21 Research OS.
 Features:
 - Markdown-based notes with [[wiki-links]]
 - Knowledge graph
+- Related-note suggestions (vector index)
 - AI-assisted research
 - Sensitive content protection
 """
 
-from .vault_manager import ObsidianVault, get_vault, Note, SensitivityLevel
+from .vault_manager import ObsidianVault, get_vault, Note, SensitivityLevel, LinkGraph
+from .note_vectors import NoteVectorIndex
 
 __version__ = "1.0.0"
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+VA21 Research OS - Note Vector Index
+======================================
+
+Local vector index over Obsidian note chunks, used for related-note
+and link suggestions.
+
+Notes are split into word chunks and embedded either with a
+caller-supplied embedder (e.g. OllamaProvider.generate_embedding) or,
+when none is available, with a hashed TF-IDF vector. Updates are
+incremental: only notes whose text changed are re-embedded, and only
+when the index is next queried.
+
+Features:
+- Chunked note embeddings with per-chunk caching
+- Hashed TF-IDF fallback (no model, no network)
+- Top-k cosine search (NumPy when installed, pure Python otherwise)
+- Note-level scores aggregated from the best-matching chunk
+
+Om Vinayaka - Knowledge flows freely, wisdom grows eternally.
+"""
+
+import re
+import math
+import hashlib
+import threading
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+HASH_DIM = 1024           # Hashed TF-IDF dimensions
+CHUNK_WORDS = 200         # Words per chunk
+MAX_CHUNKS_PER_NOTE = 32  # Long notes are represented by their first chunks
+
+_TOKEN_RE = re.compile(r"[a-z0-9]{2,}")
+_STOPWORDS = {
+    "the", "and", "for", "with", "that", "this", "from", "are", "was", "were",
+    "but", "not", "you", "your", "have", "has", "had", "its", "our", "can",
+    "will", "into", "than", "then", "them", "they", "their", "there", "what",
+    "which", "when", "where", "who", "how", "all", "any", "also", "been", "being",
+}
+
+
+def _tokens(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+@lru_cache(maxsize=65536)
+def _bucket(token: str) -> Tuple[int, float]:
+    """Hashed feature index and sign for a token."""
+    digest = hashlib.blake2b(token.encode(), digest_size=4).digest()
+    value = int.from_bytes(digest, 'big')
+    return value % HASH_DIM, 1.0 if value & 0x80000000 else -1.0
+
+
+# Model embeddings are dense lists; hashed TF vectors are sparse {index: value}
+Vector = Union[List[float], Dict[int, float]]
+
+
+def _normalize(vector: List[float]) -> List[float]:
+    norm = math.sqrt(sum(x * x for x in vector))
+    if norm == 0:
+        return vector
+    return [x / norm for x in vector]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# NOTE VECTOR INDEX
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class NoteVectorIndex:
+    """
+    Chunk-level vector index for vault notes.
+
+    Notes are queued with update_note()/remove_note() and embedded
+    lazily on the next query, so saving a note never waits on a model.
+    With the hashed TF-IDF fallback, chunk vectors hold term frequencies
+    and IDF weights are applied at query time, so adding notes never
+    invalidates existing vectors.
+    """
+
+    def __init__(self, embedder: Optional[Callable[[str], List[float]]] = None):
+        self.embedder = embedder
+        self._lock = threading.RLock()
+
+        # note_id -> text waiting to be embedded (None = remove)
+        self._pending: Dict[str, Optional[str]] = {}
+
+        # note_id -> row numbers; rows hold one chunk vector each
+        self._note_rows: Dict[str, List[int]] = {}
+        self._row_note: List[Optional[str]] = []
+        self._row_vectors: List[Optional[Vector]] = []
+        self._free_rows: List[int] = []
+
+        # Chunk embedding cache: chunk hash -> vector (saves model calls)
+        self._chunk_cache: Dict[str, List[float]] = {}
+
+        # Hashed TF-IDF document frequencies per feature
+        self._doc_freq = [0] * HASH_DIM
+        self._chunk_count = 0
+
+        self._matrix = None       # NumPy matrix of row vectors (lazy)
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Updates
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def update_note(self, note_id: str, text: str):
+        """Queue a note for (re-)embedding."""
+        with self._lock:
+            self._pending[note_id] = text
+
+    def remove_note(self, note_id: str):
+        """Queue a note for removal."""
+        with self._lock:
+            self._pending[note_id] = None
+
+    def set_embedder(self, embedder: Optional[Callable[[str], List[float]]],
+                     texts: Dict[str, str]):
+        """Switch embedder and re-queue every note (vectors are not comparable)."""
+        with self._lock:
+            self.embedder = embedder
+            self._note_rows.clear()
+            self._row_note.clear()
+            self._row_vectors.clear()
+            self._free_rows.clear()
+            self._chunk_cache.clear()
+            self._doc_freq = [0] * HASH_DIM
+            self._chunk_count = 0
+            self._matrix = None
+            self._pending = dict(texts)
+
+    def _flush(self):
+        """Embed queued notes (caller holds the lock)."""
+        while self._pending:
+            note_id, text = self._pending.popitem()
+            self._drop_rows(note_id)
+            if not text:
+                continue
+
+            rows = []
+            for chunk in self._chunk(text):
+                vector = self._embed_chunk(chunk)
+                if vector is None:
+                    continue
+                row = self._free_rows.pop() if self._free_rows else len(self._row_vectors)
+                if row == len(self._row_vectors):
+                    self._row_vectors.append(vector)
+                    self._row_note.append(note_id)
+                else:
+                    self._row_vectors[row] = vector
+                    self._row_note[row] = note_id
+                rows.append(row)
+            if rows:
+                self._note_rows[note_id] = rows
+            self._matrix = None
+
+    def _drop_rows(self, note_id: str):
+        for row in self._note_rows.pop(note_id, []):
+            vector = self._row_vectors[row]
+            if self.embedder is None and vector is not None:
+                self._count_features(vector, -1)
+            self._row_vectors[row] = None
+            self._row_note[row] = None
+            self._free_rows.append(row)
+            self._matrix = None
+
+    @staticmethod
+    def _chunk(text: str) -> List[str]:
+        words = text.split()
+        return [
+            " ".join(words[i:i + CHUNK_WORDS])
+            for i in range(0, min(len(words), CHUNK_WORDS * MAX_CHUNKS_PER_NOTE), CHUNK_WORDS)
+        ]
+
+    def _embed_chunk(self, chunk: str) -> Optional[Vector]:
+        if self.embedder is None:
+            vector = self._hashed_tf(chunk)
+            if not vector:
+                return None
+            self._count_features(vector, 1)
+            return vector
+
+        key = hashlib.sha1(chunk.encode('utf-8')).hexdigest()
+        vector = self._chunk_cache.get(key)
+        if vector is None:
+            try:
+                vector = self.embedder(chunk) or []
+            except Exception as e:
+                print(f"[Obsidian] Embedding failed: {e}")
+                vector = []
+            if not vector:
+                return None
+            vector = _normalize([float(x) for x in vector])
+            self._chunk_cache[key] = vector
+        return vector
+
+    @staticmethod
+    def _hashed_tf(text: str) -> Dict[int, float]:
+        """Signed, sublinear hashed term frequencies (sparse)."""
+        vector: Dict[int, float] = {}
+        for token, count in Counter(_tokens(text)).items():
+            index, sign = _bucket(token)
+            vector[index] = vector.get(index, 0.0) + sign * (1.0 + math.log(count))
+        return {index: value for index, value in vector.items() if value}
+
+    def _count_features(self, vector: Dict[int, float], delta: int):
+        for index in vector:
+            self._doc_freq[index] += delta
+        self._chunk_count += delta
+
+    def _idf(self) -> List[float]:
+        n = self._chunk_count
+        return [math.log((1 + n) / (1 + df)) + 1.0 for df in self._doc_freq]
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Search
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def related(self, note_id: str, top_k: int = 5,
+                exclude: Optional[Set[str]] = None) -> List[Tuple[str, float]]:
+        """Notes most similar to a stored note (best chunk per note)."""
+        with self._lock:
+            self._flush()
+            rows = self._note_rows.get(note_id)
+            if not rows:
+                return []
+            if self.embedder is None:
+                query: Vector = {}
+                for row in rows:
+                    for i, value in self._row_vectors[row].items():
+                        query[i] = query.get(i, 0.0) + value
+            else:
+                query = [0.0] * len(self._row_vectors[rows[0]])
+                for row in rows:
+                    for i, value in enumerate(self._row_vectors[row]):
+                        query[i] += value
+            skip = set(exclude or ())
+            skip.add(note_id)
+            return self._search_locked(query, top_k, skip)
+
+    def search(self, text: str, top_k: int = 5,
+               exclude: Optional[Set[str]] = None) -> List[Tuple[str, float]]:
+        """Notes most similar to free text."""
+        with self._lock:
+            self._flush()
+            if self.embedder is None:
+                query = self._hashed_tf(text)
+            else:
+                query = self._embed_chunk(text) or []
+            if not query:
+                return []
+            return self._search_locked(query, top_k, set(exclude or ()))
+
+    def _search_locked(self, query: Vector, top_k: int,
+                       skip: Set[str]) -> List[Tuple[str, float]]:
+        if not self._note_rows:
+            return []
+        weights = self._idf() if self.embedder is None else None
+
+        if NUMPY_AVAILABLE:
+            scores = self._scores_numpy(query, weights)
+        else:
+            scores = self._scores_python(query, weights)
+
+        best: Dict[str, float] = {}
+        for row, score in scores:
+            owner = self._row_note[row]
+            if owner is None or owner in skip:
+                continue
+            if score > best.get(owner, 0.0):
+                best[owner] = score
+
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)
+        return [(owner, round(score, 4)) for owner, score in ranked[:top_k]]
+
+    def _scores_numpy(self, query: Vector, weights: Optional[List[float]]):
+        dim = HASH_DIM if isinstance(query, dict) else len(query)
+        if self._matrix is None:
+            matrix = np.zeros((len(self._row_vectors), dim), dtype=np.float32)
+            for row, vector in enumerate(self._row_vectors):
+                if isinstance(vector, dict):
+                    for i, value in vector.items():
+                        matrix[row, i] = value
+                elif vector is not None and len(vector) == dim:
+                    matrix[row] = vector
+            self._matrix = matrix
+        matrix = self._matrix
+        q = np.zeros(dim, dtype=np.float32)
+        if isinstance(query, dict):
+            for i, value in query.items():
+                q[i] = value
+        else:
+            q[:] = query
+        if weights is not None:
+            w = np.asarray(weights, dtype=np.float32)
+            matrix = matrix * w
+            q = q * w
+        norms = np.linalg.norm(matrix, axis=1)
+        norms[norms == 0] = 1.0
+        q_norm = np.linalg.norm(q) or 1.0
+        scores = (matrix @ q) / (norms * q_norm)
+        return enumerate(scores.tolist())
+
+    def _scores_python(self, query: Vector, weights: Optional[List[float]]):
+        if weights is not None:
+            # Sparse hashed TF-IDF
+            weighted = {i: q * weights[i] for i, q in query.items()}
+            q_norm = math.sqrt(sum(q * q for q in weighted.values())) or 1.0
+            for row, vector in enumerate(self._row_vectors):
+                if vector is None:
+                    continue
+                dot = sum(v * weights[i] * weighted[i] for i, v in vector.items() if i in weighted)
+                if not dot:
+                    continue
+                norm = math.sqrt(sum((v * weights[i]) ** 2 for i, v in vector.items()))
+                yield row, dot / (norm * q_norm)
+            return
+
+        # Dense model embeddings (stored normalized)
+        q_norm = math.sqrt(sum(q * q for q in query)) or 1.0
+        for row, vector in enumerate(self._row_vectors):
+            if vector is None or len(vector) != len(query):
+                continue
+            yield row, sum(v * q for v, q in zip(vector, query)) / q_norm
+
+    def get_stats(self) -> Dict:
+        """Index statistics."""
+        with self._lock:
+            return {
+                'notes': len(self._note_rows),
+                'chunks': len(self._row_vectors) - len(self._free_rows),
+                'pending': len(self._pending),
+                'embedder': 'model' if self.embedder else 'hashed_tfidf',
+                'numpy': NUMPY_AVAILABLE,
+            }
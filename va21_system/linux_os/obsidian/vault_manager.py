@@ -22,11 +22,16 @@ import re
 import json
 import hashlib
 from datetime import datetime
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from pathlib import Path
 from enum import Enum
 
+try:
+    from .note_vectors import NoteVectorIndex
+except ImportError:
+    from note_vectors import NoteVectorIndex
+
 
 class SensitivityLevel(Enum):
     """Sensitivity levels for content."""
@@ -68,6 +73,138 @@ class ResearchSession:
     status: str = "active"  # active, completed, archived
 
 
+def normalize_link(link: str) -> str:
+    """
+    Normalize a [[wiki-link]] target for resolution.
+    
+    Drops the display alias ([[Note|shown]]) and heading/block anchors
+    ([[Note#Section]]), then case-folds.
+    """
+    target = link.split('|', 1)[0].split('#', 1)[0]
+    return target.strip().casefold()
+
+
+class LinkGraph:
+    """
+    Resolved, bidirectional link graph keyed by note ID.
+    
+    Maintained incrementally as notes are created, saved and renamed:
+    - Titles and aliases resolve through a case-folded name index
+    - Outgoing and incoming adjacency sets give O(degree) link and
+      backlink queries
+    - Links to notes that do not exist yet are tracked as dangling and
+      resolved as soon as a matching note appears
+    """
+    
+    def __init__(self):
+        self.names: Dict[str, List[str]] = {}        # folded title/alias -> note_ids
+        self.note_names: Dict[str, Set[str]] = {}    # note_id -> folded names
+        self.note_links: Dict[str, List[str]] = {}   # note_id -> normalized link targets
+        self.outgoing: Dict[str, Set[str]] = {}      # note_id -> linked note_ids
+        self.incoming: Dict[str, Set[str]] = {}      # note_id -> linking note_ids
+        self.referrers: Dict[str, Set[str]] = {}     # normalized target -> source note_ids
+        self.dangling: Dict[str, Set[str]] = {}      # unresolved target -> source note_ids
+    
+    def resolve(self, link: str) -> Optional[str]:
+        """Resolve a link target to a note ID (first registered wins)."""
+        ids = self.names.get(normalize_link(link))
+        return ids[0] if ids else None
+    
+    def add_note(self, note_id: str, title: str, links: List[str],
+                 aliases: List[str] = None):
+        """Add or refresh a note: its names first, then its links."""
+        self.set_names(note_id, title, aliases)
+        self.set_links(note_id, links)
+    
+    def set_names(self, note_id: str, title: str, aliases: List[str] = None):
+        """Register a note's title and aliases, re-pointing affected links."""
+        new_names = {normalize_link(n) for n in [title] + list(aliases or []) if n and n.strip()}
+        old_names = self.note_names.get(note_id, set())
+        
+        for name in old_names - new_names:
+            ids = self.names.get(name, [])
+            if note_id in ids:
+                ids.remove(note_id)
+            if not ids:
+                self.names.pop(name, None)
+            self._relink_name(name)
+        
+        for name in new_names - old_names:
+            ids = self.names.setdefault(name, [])
+            if note_id not in ids:
+                ids.append(note_id)
+            self._relink_name(name)
+        
+        self.note_names[note_id] = new_names
+    
+    def set_links(self, note_id: str, links: List[str]):
+        """Replace a note's outgoing links."""
+        self._drop_links(note_id)
+        
+        targets = [normalize_link(l) for l in links]
+        self.note_links[note_id] = targets
+        self.outgoing[note_id] = set()
+        for target in targets:
+            self.referrers.setdefault(target, set()).add(note_id)
+            self._link(note_id, target)
+    
+    def remove_note(self, note_id: str):
+        """Remove a note; links pointing at it become dangling."""
+        self._drop_links(note_id)
+        self.note_links.pop(note_id, None)
+        self.outgoing.pop(note_id, None)
+        self.set_names(note_id, "", [])
+        self.note_names.pop(note_id, None)
+        self.incoming.pop(note_id, None)
+    
+    def linked(self, note_id: str) -> List[str]:
+        """Resolved link targets in link order (duplicates removed)."""
+        seen = []
+        for target in self.note_links.get(note_id, []):
+            ids = self.names.get(target)
+            if ids and ids[0] not in seen:
+                seen.append(ids[0])
+        return seen
+    
+    def backlinks(self, note_id: str) -> Set[str]:
+        """IDs of notes linking to this note."""
+        return self.incoming.get(note_id, set())
+    
+    def dangling_links(self) -> Dict[str, Set[str]]:
+        """Unresolved link targets and the notes that use them."""
+        return self.dangling
+    
+    def _link(self, source_id: str, target: str):
+        """Add one link edge, or record it as dangling."""
+        ids = self.names.get(target)
+        if ids:
+            target_id = ids[0]
+            self.outgoing.setdefault(source_id, set()).add(target_id)
+            self.incoming.setdefault(target_id, set()).add(source_id)
+        else:
+            self.dangling.setdefault(target, set()).add(source_id)
+    
+    def _drop_links(self, note_id: str):
+        """Remove a note's outgoing edges and dangling entries."""
+        for target_id in self.outgoing.get(note_id, set()):
+            sources = self.incoming.get(target_id)
+            if sources:
+                sources.discard(note_id)
+        for target in self.note_links.get(note_id, []):
+            for index in (self.referrers, self.dangling):
+                sources = index.get(target)
+                if sources:
+                    sources.discard(note_id)
+                    if not sources:
+                        del index[target]
+        self.outgoing[note_id] = set()
+    
+    def _relink_name(self, name: str):
+        """Re-resolve every link using a name whose owner changed."""
+        for source_id in list(self.referrers.get(name, set())):
+            self.set_links(source_id, self.note_links.get(source_id, []))
+
+
 class ObsidianVault:
     """
     VA21 Obsidian-Style Knowledge Vault
@@ -110,7 +247,16 @@ class ObsidianVault:
         # Index
         self.notes_index: Dict[str, Note] = {}
         self.tags_index: Dict[str, Set[str]] = {}  # tag -> note_ids
-        self.links_graph: Dict[str, Set[str]] = {}  # note_id -> linked_note_ids
+        self.link_graph = LinkGraph()
+        self.links_graph: Dict[str, Set[str]] = self.link_graph.outgoing  # note_id -> linked_note_ids
+        
+        # Vector index over note chunks (related notes / link suggestions)
+        self.note_vectors = NoteVectorIndex(self._detect_embedder())
+        
+        # Callbacks notified with each created/saved Note
+        self._change_listeners: List[Callable[[Note], None]] = []
+        # Callbacks notified with the ID of each deleted note
+        self._delete_listeners: List[Callable[[str], None]] = []
         
         # Research sessions
         self.research_sessions: Dict[str, ResearchSession] = {}
@@ -205,9 +351,8 @@ class ObsidianVault:
                     self.tags_index[tag] = set()
                 self.tags_index[tag].add(note_id)
             
-            self.links_graph[note_id] = set()
-            for link in links:
-                self.links_graph[note_id].add(link)
+            self.link_graph.add_note(note_id, title, links, self._parse_aliases(metadata))
+            self.note_vectors.update_note(note_id, self._vector_text(note))
             
             return note
             
@@ -215,6 +360,14 @@ class ObsidianVault:
             print(f"[Obsidian] Error loading {filepath}: {e}")
             return None
     
+    @staticmethod
+    def _parse_aliases(metadata: Dict) -> List[str]:
+        """Parse the 'aliases' frontmatter field ([a, b] or a, b)."""
+        raw = metadata.get('aliases', '')
+        if isinstance(raw, list):
+            return [str(a).strip() for a in raw if str(a).strip()]
+        return [a.strip() for a in raw.replace('[', '').replace(']', '').split(',') if a.strip()]
+    
     def create_note(self, title: str, content: str = "", 
                     tags: List[str] = None, sensitivity: SensitivityLevel = None,
                     template: str = None) -> Note:
@@ -293,6 +446,11 @@ sensitivity: {sensitivity.value}
                 self.tags_index[tag] = set()
             self.tags_index[tag].add(note_id)
         
+        # Resolves the new note's links and any dangling links to it
+        self.link_graph.add_note(note_id, title, note.links)
+        self.note_vectors.update_note(note_id, self._vector_text(note))
+        self._notify_change(note)
+        
         print(f"[Obsidian] Created note: {title}")
         return note
     
@@ -371,6 +529,117 @@ sensitivity: {note.sensitivity.value}
         
         with open(note.path, 'w', encoding='utf-8') as f:
             f.write(full_content)
+        
+        # Content may have gained or lost links
+        note.links = re.findall(r'\[\[([^\]]+)\]\]', note.content)
+        self.link_graph.add_note(note.id, note.title, note.links,
+                                 self._parse_aliases(note.metadata))
+        self.note_vectors.update_note(note.id, self._vector_text(note))
+        self._notify_change(note)
+    
+    def add_change_listener(self, callback: Callable[[Note], None]):
+        """Register a callback invoked whenever a note is created or saved."""
+        if callback not in self._change_listeners:
+            self._change_listeners.append(callback)
+    
+    def remove_change_listener(self, callback: Callable[[Note], None]):
+        """Unregister a change callback."""
+        if callback in self._change_listeners:
+            self._change_listeners.remove(callback)
+    
+    def _notify_change(self, note: Note):
+        """Notify change listeners about a note."""
+        for callback in list(self._change_listeners):
+            try:
+                callback(note)
+            except Exception as e:
+                print(f"[Obsidian] Change listener error: {e}")
+    
+    def add_delete_listener(self, callback: Callable[[str], None]):
+        """Register a callback invoked with a note's ID when it is deleted."""
+        if callback not in self._delete_listeners:
+            self._delete_listeners.append(callback)
+    
+    def remove_delete_listener(self, callback: Callable[[str], None]):
+        """Unregister a delete callback."""
+        if callback in self._delete_listeners:
+            self._delete_listeners.remove(callback)
+    
+    def delete_note(self, note_id: str) -> bool:
+        """
+        Delete a note and its file.
+        
+        Links pointing at the note become dangling.
+        
+        Returns:
+            Success status
+        """
+        note = self.notes_index.pop(note_id, None)
+        if note is None:
+            return False
+        
+        try:
+            os.remove(note.path)
+        except FileNotFoundError:
+            pass
+        
+        for tag in note.tags:
+            note_ids = self.tags_index.get(tag)
+            if note_ids:
+                note_ids.discard(note_id)
+                if not note_ids:
+                    del self.tags_index[tag]
+        self.link_graph.remove_note(note_id)
+        self.note_vectors.remove_note(note_id)
+        
+        for callback in list(self._delete_listeners):
+            try:
+                callback(note_id)
+            except Exception as e:
+                print(f"[Obsidian] Delete listener error: {e}")
+        
+        print(f"[Obsidian] Deleted note: {note.title}")
+        return True
+    
+    def rename_note(self, note_id: str, new_title: str,
+                    update_links: bool = True) -> bool:
+        """
+        Rename a note.
+        
+        The file and note ID stay the same. With update_links, [[links]]
+        to the old title in other notes are rewritten to the new title
+        (only the notes found through backlinks are touched).
+        
+        Returns:
+            Success status
+        """
+        if note_id not in self.notes_index:
+            return False
+        
+        note = self.notes_index[note_id]
+        old_title = note.title
+        referrers = list(self.link_graph.backlinks(note_id))
+        
+        note.title = new_title
+        note.modified_at = datetime.now()
+        self._save_note(note)
+        
+        if update_links and old_title.casefold() != new_title.casefold():
+            pattern = re.compile(
+                r'\[\[\s*' + re.escape(old_title) + r'\s*((?:[|#][^\]]*)?)\]\]',
+                re.IGNORECASE
+            )
+            for source_id in referrers:
+                source = self.notes_index.get(source_id)
+                if not source:
+                    continue
+                updated = pattern.sub(lambda m: f"[[{new_title}{m.group(1)}]]", source.content)
+                if updated != source.content:
+                    source.content = updated
+                    self._save_note(source)
+        
+        print(f"[Obsidian] Renamed '{old_title}' to '{new_title}'")
+        return True
     
     def search(self, query: str, include_sensitive: bool = False) -> List[Note]:
         """
@@ -464,31 +733,29 @@ sensitivity: {note.sensitivity.value}
         if note_id not in self.notes_index:
             return []
         
-        note = self.notes_index[note_id]
-        linked = []
-        
-        for link_title in note.links:
-            # Find note by title
-            for n in self.notes_index.values():
-                if n.title.lower() == link_title.lower():
-                    linked.append(n)
-                    break
-        
-        return linked
+        return [
+            self.notes_index[target_id]
+            for target_id in self.link_graph.linked(note_id)
+            if target_id in self.notes_index
+        ]
     
     def get_backlinks(self, note_id: str) -> List[Note]:
         """Get notes that link to this note."""
         if note_id not in self.notes_index:
             return []
         
-        note = self.notes_index[note_id]
-        backlinks = []
-        
-        for other_note in self.notes_index.values():
-            if note.title.lower() in [l.lower() for l in other_note.links]:
-                backlinks.append(other_note)
-        
-        return backlinks
+        return [
+            self.notes_index[source_id]
+            for source_id in self.link_graph.backlinks(note_id)
+            if source_id in self.notes_index
+        ]
+    
+    def get_dangling_links(self) -> Dict[str, List[str]]:
+        """Get unresolved link targets and the IDs of notes using them."""
+        return {
+            target: sorted(sources)
+            for target, sources in self.link_graph.dangling_links().items()
+        }
     
     def get_knowledge_graph(self) -> Dict:
         """
@@ -499,10 +766,11 @@ sensitivity: {note.sensitivity.value}
         """
         nodes = []
         edges = []
+        hidden = {SensitivityLevel.CONFIDENTIAL, SensitivityLevel.REDACTED}
         
         for note_id, note in self.notes_index.items():
             # Skip highly sensitive notes
-            if note.sensitivity in [SensitivityLevel.CONFIDENTIAL, SensitivityLevel.REDACTED]:
+            if note.sensitivity in hidden:
                 continue
             
             nodes.append({
@@ -512,15 +780,14 @@ sensitivity: {note.sensitivity.value}
                 "sensitivity": note.sensitivity.value
             })
             
-            # Add edges for links
-            for link_title in note.links:
-                for target_note in self.notes_index.values():
-                    if target_note.title.lower() == link_title.lower():
-                        edges.append({
-                            "source": note_id,
-                            "target": target_note.id
-                        })
-                        break
+            # Add edges for resolved links
+            for target_id in self.link_graph.outgoing.get(note_id, ()):
+                target = self.notes_index.get(target_id)
+                if target and target.sensitivity not in hidden:
+                    edges.append({
+                        "source": note_id,
+                        "target": target_id
+                    })
         
         return {"nodes": nodes, "edges": edges}
     
@@ -593,40 +860,74 @@ sensitivity: {note.sensitivity.value}
         except Exception as e:
             return f"Summarization failed: {e}"
     
-    def ai_suggest_links(self, note_id: str) -> List[str]:
+    def _detect_embedder(self) -> Optional[Callable[[str], List[float]]]:
+        """Use the helper AI's embedding model if it has a live one."""
+        generate = getattr(self.helper_ai, 'generate_embedding', None)
+        if generate and getattr(self.helper_ai, 'is_available', False):
+            return generate
+        return None
+    
+    @staticmethod
+    def _vector_text(note: Note) -> str:
+        """Text embedded for a note: title and tags weigh in with the body."""
+        return f"{note.title}\n{' '.join(note.tags)}\n{note.content}"
+    
+    def set_embedder(self, embedder: Optional[Callable[[str], List[float]]]):
         """
-        Use AI to suggest related notes to link.
+        Switch the embedding function (None = hashed TF-IDF).
+        
+        Every note is re-embedded on the next query.
+        """
+        self.note_vectors.set_embedder(embedder, {
+            note_id: self._vector_text(note)
+            for note_id, note in self.notes_index.items()
+        })
+    
+    def get_related_notes(self, note_id: str, top_k: int = 5,
+                          include_linked: bool = True) -> List[Tuple[Note, float]]:
+        """
+        Find notes semantically related to a note.
         
         Args:
             note_id: Note ID
+            top_k: Maximum number of results
+            include_linked: Include notes the note already links to
             
         Returns:
-            List of suggested note titles to link
+            List of (Note, similarity) pairs, most similar first
         """
         if note_id not in self.notes_index:
             return []
         
-        note = self.notes_index[note_id]
-        suggestions = []
+        hidden = {SensitivityLevel.CONFIDENTIAL, SensitivityLevel.REDACTED}
+        exclude = {
+            other_id for other_id, other in self.notes_index.items()
+            if other.sensitivity in hidden
+        }
+        if not include_linked:
+            exclude.update(self.link_graph.outgoing.get(note_id, ()))
         
-        # Simple keyword-based suggestions
-        note_words = set(re.findall(r'\b\w+\b', note.content.lower()))
+        return [
+            (self.notes_index[other_id], score)
+            for other_id, score in self.note_vectors.related(note_id, top_k, exclude)
+            if other_id in self.notes_index
+        ]
+    
+    def ai_suggest_links(self, note_id: str, top_k: int = 5) -> List[str]:
+        """
+        Suggest related notes to link.
         
-        for other_note in self.notes_index.values():
-            if other_note.id == note_id:
-                continue
-            if other_note.title.lower() in [l.lower() for l in note.links]:
-                continue  # Already linked
-            
-            other_words = set(re.findall(r'\b\w+\b', other_note.title.lower()))
-            other_words.update(other_note.tags)
+        Args:
+            note_id: Note ID
+            top_k: Maximum number of suggestions
             
-            # Check for word overlap
-            overlap = note_words.intersection(other_words)
-            if len(overlap) >= 2:
-                suggestions.append(other_note.title)
-        
-        return suggestions[:5]
+        Returns:
+            List of suggested note titles to link
+        """
+        return [
+            note.title
+            for note, _ in self.get_related_notes(note_id, top_k, include_linked=False)
+        ]
     
     def get_stats(self) -> Dict:
         """Get vault statistics."""
@@ -640,6 +941,9 @@ sensitivity: {note.sensitivity.value}
         return {
             "total_notes": len(self.notes_index),
             "total_tags": len(self.tags_index),
+            "total_links": sum(len(t) for t in self.link_graph.outgoing.values()),
+            "dangling_links": len(self.link_graph.dangling),
+            "vector_index": self.note_vectors.get_stats(),
             "research_sessions": len(self.research_sessions),
             "sensitivity": sensitivity_counts
         }
@@ -748,12 +1052,39 @@ def create_default_templates(vault: ObsidianVault):
 
 _vault_instance = None
 
+def _default_embedder() -> Optional[Callable[[str], List[float]]]:
+    """Local Ollama's embedding model when it is running, else None."""
+    try:
+        from ..agents.ai_providers import OllamaProvider
+    except ImportError:
+        try:
+            from agents.ai_providers import OllamaProvider
+        except ImportError:
+            return None
+    provider = OllamaProvider()
+    return provider.generate_embedding if provider.is_available else None
+
 def get_vault(helper_ai=None) -> ObsidianVault:
-    """Get the Obsidian vault singleton."""
+    """
+    Get the Obsidian vault singleton.
+    
+    Embeddings come from helper_ai when it provides them, otherwise from
+    local Ollama; the hashed TF-IDF fallback is used when neither is live.
+    A helper_ai passed after the vault exists is adopted if it has none.
+    """
     global _vault_instance
     if _vault_instance is None:
         _vault_instance = ObsidianVault(helper_ai=helper_ai)
         create_default_templates(_vault_instance)
+        if _vault_instance.note_vectors.embedder is None:
+            embedder = _default_embedder()
+            if embedder:
+                _vault_instance.set_embedder(embedder)
+    elif helper_ai is not None and _vault_instance.helper_ai is None:
+        _vault_instance.helper_ai = helper_ai
+        embedder = _vault_instance._detect_embedder()
+        if embedder:
+            _vault_instance.set_embedder(embedder)
     return _vault_instance
 
 
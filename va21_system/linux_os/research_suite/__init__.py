@@ -3,4 +3,7 @@
 VA21 Research Suite - Comprehensive tools for academics and researchers.
 """
 from .research_tools import ResearchSuite, get_research_suite
+from .storage import ResearchStore
+from .reference_index import ReferenceIndex
+from .bib_parser import iter_bibtex, iter_ris, BibEntry
 __version__ = "1.0.0"
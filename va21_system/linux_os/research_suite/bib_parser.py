@@ -0,0 +1,542 @@
+#!/usr/bin/env python3
+"""
+VA21 Research OS - Bibliography Parser
+========================================
+
+Streaming parsers for BibTeX, BibLaTeX and RIS bibliography files.
+
+Files are read in fixed-size chunks and entries are yielded one at a
+time, so memory stays bounded by the largest single entry rather than
+the file size. The BibTeX tokenizer understands nested braces, quoted
+values, `#` concatenation and `@string` macros; `@comment` and
+`@preamble` blocks are skipped.
+
+Features:
+- iter_bibtex() / iter_ris(): entry generators over files or strings
+- Nested braces, @string macros, month macros, (...) delimited entries
+- Mapping of BibTeX/BibLaTeX/RIS fields onto ResearchSuite references
+- DOI and title normalization for de-duplication
+
+Om Vinayaka - Knowledge is the path to enlightenment.
+"""
+
+import io
+import re
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple, Union
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# Entries larger than this are skipped (corrupt file, runaway brace)
+MAX_ENTRY_SIZE = 4 * 1024 * 1024
+
+# Text kept between chunks so an '@type{' header is never split
+ENTRY_HEADER_TAIL = 256
+
+MONTH_MACROS = {
+    "jan": "1", "feb": "2", "mar": "3", "apr": "4", "may": "5", "jun": "6",
+    "jul": "7", "aug": "8", "sep": "9", "oct": "10", "nov": "11", "dec": "12",
+}
+
+# BibTeX/BibLaTeX entry type -> SourceType value
+BIBTEX_TYPES = {
+    "article": "journal_article",
+    "book": "book",
+    "inbook": "book_chapter",
+    "incollection": "book_chapter",
+    "inproceedings": "conference_paper",
+    "conference": "conference_paper",
+    "proceedings": "conference_paper",
+    "phdthesis": "dissertation",
+    "mastersthesis": "thesis",
+    "thesis": "thesis",
+    "techreport": "report",
+    "report": "report",
+    "online": "website",
+    "www": "website",
+    "electronic": "website",
+    "patent": "patent",
+    "dataset": "dataset",
+    "software": "software",
+    "unpublished": "preprint",
+}
+
+# RIS TY code -> SourceType value
+RIS_TYPES = {
+    "JOUR": "journal_article",
+    "JFULL": "journal_article",
+    "EJOUR": "journal_article",
+    "BOOK": "book",
+    "EBOOK": "book",
+    "CHAP": "book_chapter",
+    "ECHAP": "book_chapter",
+    "CONF": "conference_paper",
+    "CPAPER": "conference_paper",
+    "THES": "thesis",
+    "RPRT": "report",
+    "ELEC": "website",
+    "WEB": "website",
+    "DATA": "dataset",
+    "COMP": "software",
+    "PAT": "patent",
+    "NEWS": "newspaper",
+    "MGZN": "magazine",
+    "VIDEO": "video",
+    "CASE": "legal_case",
+    "GOVDOC": "government_document",
+}
+
+DEFAULT_SOURCE_TYPE = "journal_article"
+
+_FIELD_NAME_RE = re.compile(r'\s*([^\s=,{}"#()]+)\s*=\s*')
+_BARE_VALUE_RE = re.compile(r'\s*([^\s,#{}()"]+)')
+_SEPARATOR_RE = re.compile(r'[\s,]*')
+_ENTRY_START_RE = re.compile(r'@\s*[A-Za-z][\w:-]*\s*[{(]')
+_DELIMITER_RE = re.compile(r'[{}()]')
+_BRACE_RE = re.compile(r'[{}]')
+_QUOTE_RE = re.compile(r'[{}"]')
+_RIS_LINE_RE = re.compile(r'^([A-Z][A-Z0-9])  -\s?(.*)$')
+_LATEX_CMD_RE = re.compile(r'\\[a-zA-Z]+\s*|\\(.)')
+_YEAR_RE = re.compile(r'\d{4}')
+_WS_RE = re.compile(r'\s+')
+
+
+@dataclass
+class BibEntry:
+    """A raw bibliography entry."""
+    entry_type: str
+    key: str
+    fields: Dict[str, Union[str, List[str]]] = field(default_factory=dict)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# INPUT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _open_source(source: Union[str, TextIO]) -> TextIO:
+    """Accept a file object or a string of bibliography text."""
+    if isinstance(source, str):
+        return io.StringIO(source)
+    return source
+
+
+def open_bibliography(path: str) -> TextIO:
+    """Open a bibliography file for streaming (tolerant of bad bytes)."""
+    return open(path, 'r', encoding='utf-8', errors='replace')
+
+
+def detect_format(path_or_text: str) -> str:
+    """Guess 'bibtex' or 'ris' from a file extension or text sample."""
+    lowered = path_or_text.lower()
+    if lowered.endswith(('.ris', '.txt')) or _RIS_LINE_RE.match(path_or_text.lstrip()[:80]):
+        return "ris"
+    return "bibtex"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BIBTEX / BIBLATEX
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _iter_raw_entries(stream: TextIO) -> Iterator[str]:
+    """
+    Yield raw '@type{...}' blocks from a stream, chunk by chunk.
+
+    Only brace/paren depth is tracked here; the block itself is parsed
+    by _parse_entry once it is complete. Text between entries (comments,
+    stray '@' in e-mail addresses) is skipped.
+    """
+    buffer = ""
+    eof = False
+
+    while True:
+        start = _ENTRY_START_RE.search(buffer)
+        if not start:
+            if eof:
+                return
+            # Keep a tail in case an entry header straddles two chunks
+            buffer = buffer[-ENTRY_HEADER_TAIL:]
+            chunk = stream.read(READ_CHUNK_SIZE)
+            eof = not chunk
+            buffer += chunk
+            continue
+
+        buffer = buffer[start.start():]
+        opener = buffer[start.end() - start.start() - 1]
+        body_start = start.end() - start.start()
+
+        # Scan for the end of this entry, reading more input as needed
+        end = -1
+        while True:
+            depth = 1
+            for match in _DELIMITER_RE.finditer(buffer, body_start):
+                char = match.group()
+                if char == "{":
+                    depth += 1
+                elif char == "}":
+                    depth -= 1
+                    if opener == "{" and depth == 0:
+                        end = match.end()
+                        break
+                elif char == ")" and opener == "(" and depth == 1:
+                    end = match.end()
+                    break
+            if end >= 0 or eof or len(buffer) > MAX_ENTRY_SIZE:
+                break
+            chunk = stream.read(READ_CHUNK_SIZE)
+            eof = not chunk
+            buffer += chunk
+
+        if end < 0:
+            if eof:
+                return  # Truncated final entry
+            buffer = buffer[body_start:]  # Oversized: skip it
+            continue
+
+        yield buffer[:end]
+        buffer = buffer[end:]
+
+
+def _read_braced(text: str, pos: int) -> Tuple[str, int]:
+    """Read a {...} group starting at text[pos] == '{'; returns (inner, next pos)."""
+    depth = 0
+    for match in _BRACE_RE.finditer(text, pos):
+        if match.group() == "{":
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return text[pos + 1:match.start()], match.end()
+    return text[pos + 1:], len(text)
+
+
+def _read_quoted(text: str, pos: int) -> Tuple[str, int]:
+    """Read a "..." value (braces inside may contain quotes)."""
+    depth = 0
+    for match in _QUOTE_RE.finditer(text, pos + 1):
+        char = match.group()
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+        elif depth == 0:
+            return text[pos + 1:match.start()], match.end()
+    return text[pos + 1:], len(text)
+
+
+def _read_value(body: str, pos: int, macros: Dict[str, str]) -> Tuple[str, int]:
+    """Read a field value: parts joined with '#'."""
+    parts = []
+    while True:
+        while body[pos:pos + 1].isspace():
+            pos += 1
+        char = body[pos:pos + 1]
+        if char == "{":
+            part, pos = _read_braced(body, pos)
+        elif char == '"':
+            part, pos = _read_quoted(body, pos)
+        else:
+            match = _BARE_VALUE_RE.match(body, pos)
+            if not match:
+                break
+            token = match.group(1)
+            pos = match.end()
+            if token.isdigit():
+                part = token
+            else:
+                lowered = token.lower()
+                part = macros.get(lowered, MONTH_MACROS.get(lowered, token))
+        parts.append(part)
+
+        while body[pos:pos + 1].isspace():
+            pos += 1
+        if body[pos:pos + 1] != "#":
+            break
+        pos += 1
+        while body[pos:pos + 1].isspace():
+            pos += 1
+    return "".join(parts), pos
+
+
+def _parse_fields(body: str, pos: int, macros: Dict[str, str]) -> Dict[str, str]:
+    """Parse 'name = value, ...' assignments."""
+    fields = {}
+    while pos < len(body):
+        pos = _SEPARATOR_RE.match(body, pos).end()
+        match = _FIELD_NAME_RE.match(body, pos)
+        if not match:
+            break
+        name = match.group(1).lower()
+        value, pos = _read_value(body, match.end(), macros)
+        fields[name] = value
+    return fields
+
+
+def _parse_entry(raw: str, macros: Dict[str, str]) -> Optional[BibEntry]:
+    """Parse one raw '@type{...}' block; updates macros for @string."""
+    brace = min((i for i in (raw.find("{"), raw.find("(")) if i >= 0), default=-1)
+    if brace < 0:
+        return None
+    entry_type = raw[1:brace].strip().lower()
+    body = raw[brace + 1:-1]
+
+    if entry_type in ("comment", "preamble"):
+        return None
+    if entry_type == "string":
+        for name, value in _parse_fields(body, 0, macros).items():
+            macros[name] = value
+        return None
+
+    comma = body.find(",")
+    if comma < 0:
+        return BibEntry(entry_type, body.strip())
+    return BibEntry(entry_type, body[:comma].strip(), _parse_fields(body, comma + 1, macros))
+
+
+def iter_bibtex(source: Union[str, TextIO]) -> Iterator[BibEntry]:
+    """
+    Stream entries from BibTeX/BibLaTeX text or a file object.
+
+    Args:
+        source: Bibliography text, or an open file
+
+    Yields:
+        BibEntry objects in file order (@string macros applied)
+    """
+    stream = _open_source(source)
+    macros: Dict[str, str] = {}
+    for raw in _iter_raw_entries(stream):
+        try:
+            entry = _parse_entry(raw, macros)
+        except Exception as e:
+            print(f"[ResearchSuite] Skipping malformed BibTeX entry: {e}")
+            continue
+        if entry is not None:
+            yield entry
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RIS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Tags that may repeat within an entry
+_RIS_MULTI = {"AU", "A1", "A2", "A3", "A4", "AE", "KW", "UR", "L1"}
+
+
+def iter_ris(source: Union[str, TextIO]) -> Iterator[BibEntry]:
+    """
+    Stream entries from RIS text or a file object.
+
+    Yields:
+        BibEntry with entry_type = TY code and fields keyed by tag;
+        repeating tags (AU, KW, ...) hold lists
+    """
+    stream = _open_source(source)
+    current: Optional[BibEntry] = None
+    last_tag = None
+
+    for line in stream:
+        line = line.rstrip("\r\n").lstrip("\ufeff")
+        match = _RIS_LINE_RE.match(line)
+        if not match:
+            # Continuation of a wrapped value
+            if current is not None and last_tag and line.strip():
+                value = current.fields.get(last_tag)
+                if isinstance(value, list):
+                    value[-1] = f"{value[-1]} {line.strip()}"
+                elif value is not None:
+                    current.fields[last_tag] = f"{value} {line.strip()}"
+            continue
+
+        tag, value = match.group(1), match.group(2).strip()
+        if tag == "TY":
+            current = BibEntry(value.upper(), "")
+            last_tag = None
+        elif tag == "ER":
+            if current is not None:
+                yield current
+            current = None
+            last_tag = None
+        elif current is not None:
+            if tag == "ID":
+                current.key = value
+            elif tag in _RIS_MULTI:
+                current.fields.setdefault(tag, []).append(value)
+            elif tag not in current.fields:
+                current.fields[tag] = value
+            last_tag = tag
+
+    if current is not None:
+        yield current
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FIELD MAPPING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def clean_latex(text: str) -> str:
+    """Strip braces and simple LaTeX commands, collapse whitespace."""
+    if "\\" in text:
+        # Keep escaped specials (\&, \%), drop commands and accents (\'e -> e)
+        text = _LATEX_CMD_RE.sub(
+            lambda m: m.group(1) if m.group(1) and m.group(1) in "&%$#_{}" else "", text
+        )
+    text = text.replace("{", "").replace("}", "").replace("~", " ")
+    return _WS_RE.sub(" ", text).strip()
+
+
+def _split_top_level(text: str, separator: str) -> List[str]:
+    """Split on a separator only at brace depth 0."""
+    parts, depth, start = [], 0, 0
+    for index, char in enumerate(text):
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(text[start:index])
+            start = index + 1
+    parts.append(text[start:])
+    return parts
+
+
+def parse_bibtex_authors(value: str) -> List[Dict[str, str]]:
+    """Parse a BibTeX author list ('Last, First and First Last ...')."""
+    authors = []
+    # Protect "and" inside braces, e.g. {Barnes and Noble}
+    depth, names, start = 0, [], 0
+    for match in re.finditer(r'[{}]|\s+and\s+', value, re.IGNORECASE):
+        token = match.group()
+        if token == "{":
+            depth += 1
+        elif token == "}":
+            depth -= 1
+        elif depth == 0:
+            names.append(value[start:match.start()])
+            start = match.end()
+    names.append(value[start:])
+
+    for name in names:
+        name = name.strip()
+        if not name:
+            continue
+        if name.startswith("{") and name.endswith("}") and _read_braced(name, 0)[1] == len(name):
+            authors.append({"first_name": "", "last_name": clean_latex(name)})
+            continue
+        parts = [clean_latex(p) for p in _split_top_level(name, ",")]
+        if len(parts) >= 2:
+            authors.append({"last_name": parts[0], "first_name": parts[-1]})
+        else:
+            words = parts[0].split()
+            if len(words) >= 2:
+                authors.append({"first_name": " ".join(words[:-1]), "last_name": words[-1]})
+            elif words:
+                authors.append({"first_name": "", "last_name": words[0]})
+    return authors
+
+
+def _parse_ris_author(value: str) -> Dict[str, str]:
+    parts = [p.strip() for p in value.split(",")]
+    if len(parts) >= 2:
+        return {"last_name": parts[0], "first_name": parts[1]}
+    words = value.split()
+    if len(words) >= 2:
+        return {"first_name": " ".join(words[:-1]), "last_name": words[-1]}
+    return {"first_name": "", "last_name": value.strip()}
+
+
+def _year(value: str) -> int:
+    match = _YEAR_RE.search(value or "")
+    return int(match.group()) if match else 0
+
+
+def _keywords(value: str) -> List[str]:
+    return [k.strip() for k in re.split(r'[,;]', value) if k.strip()]
+
+
+def bibtex_to_reference_fields(entry: BibEntry) -> Dict:
+    """Map a BibTeX/BibLaTeX entry onto ResearchSuite.add_reference arguments."""
+    f = {name: clean_latex(value) for name, value in entry.fields.items() if name != "author"}
+    pages = f.get("pages", "").replace("--", "-")
+    return {
+        "source_type": BIBTEX_TYPES.get(entry.entry_type, DEFAULT_SOURCE_TYPE),
+        "title": f.get("title") or "Untitled",
+        "authors": parse_bibtex_authors(entry.fields.get("author", "") or entry.fields.get("editor", "")),
+        "year": _year(f.get("year") or f.get("date", "")),
+        "journal": f.get("journal") or f.get("journaltitle") or f.get("booktitle", ""),
+        "volume": f.get("volume", ""),
+        "issue": f.get("number") or f.get("issue", ""),
+        "pages": pages,
+        "publisher": f.get("publisher") or f.get("institution") or f.get("school", ""),
+        "doi": normalize_doi(f.get("doi", "")),
+        "isbn": f.get("isbn", ""),
+        "url": f.get("url", ""),
+        "abstract": f.get("abstract", ""),
+        "keywords": _keywords(f.get("keywords", "")),
+    }
+
+
+def ris_to_reference_fields(entry: BibEntry) -> Dict:
+    """Map a RIS entry onto ResearchSuite.add_reference arguments."""
+    f = entry.fields
+
+    def first(*tags) -> str:
+        for tag in tags:
+            value = f.get(tag)
+            if isinstance(value, list):
+                value = value[0] if value else ""
+            if value:
+                return value
+        return ""
+
+    start, end = first("SP"), first("EP")
+    pages = f"{start}-{end}" if start and end else start
+    authors = f.get("AU") or f.get("A1") or []
+    return {
+        "source_type": RIS_TYPES.get(entry.entry_type, DEFAULT_SOURCE_TYPE),
+        "title": first("TI", "T1", "CT", "BT") or "Untitled",
+        "authors": [_parse_ris_author(a) for a in authors],
+        "year": _year(first("PY", "Y1", "DA")),
+        "journal": first("JO", "JF", "T2", "JA", "J2"),
+        "volume": first("VL"),
+        "issue": first("IS"),
+        "pages": pages,
+        "publisher": first("PB"),
+        "doi": normalize_doi(first("DO")),
+        "isbn": first("SN"),
+        "url": first("UR"),
+        "abstract": first("AB", "N2"),
+        "keywords": list(f.get("KW", [])),
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# DE-DUPLICATION KEYS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def normalize_doi(doi: str) -> str:
+    """Canonical DOI: lowercase, no resolver prefix."""
+    doi = (doi or "").strip()
+    doi = re.sub(r'^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)', '', doi, flags=re.IGNORECASE)
+    return doi.lower()
+
+
+def title_hash(title: str) -> str:
+    """Hash of a title with case, punctuation and markup removed."""
+    words = re.findall(r'[a-z0-9]+', clean_latex(title or "").lower())
+    return hashlib.md5(" ".join(words).encode()).hexdigest()
+
+
+def iter_reference_fields(source: Union[str, TextIO], fmt: str = "bibtex") -> Iterator[Dict]:
+    """Stream add_reference argument dicts from BibTeX/BibLaTeX or RIS input."""
+    if fmt == "ris":
+        for entry in iter_ris(source):
+            yield ris_to_reference_fields(entry)
+    else:
+        for entry in iter_bibtex(source):
+            yield bibtex_to_reference_fields(entry)
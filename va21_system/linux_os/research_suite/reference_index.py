@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+VA21 Research OS - Reference Index
+====================================
+
+Secondary indexes over the Research Suite library, kept up to date as
+references are added, edited and removed.
+
+Features:
+- DOI hash map (normalized DOI -> reference ID)
+- Title-hash map for duplicate detection
+- Inverted indexes: author names, title tokens, keywords/tags
+- Year -> reference IDs
+- Ranked multi-field query (field-weighted TF-IDF)
+
+Substring searches are answered by expanding query tokens over the
+index vocabulary (vocabulary size, not library size) and verifying
+only the resulting candidates.
+
+Om Vinayaka - Knowledge is the path to enlightenment.
+"""
+
+import re
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from .bib_parser import normalize_doi, title_hash
+except ImportError:
+    from bib_parser import normalize_doi, title_hash
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+FIELD_TITLE = "title"
+FIELD_AUTHOR = "author"
+FIELD_KEYWORD = "keyword"
+
+# Weight of a token match per field in ranked queries
+FIELD_WEIGHTS = {
+    FIELD_TITLE: 3.0,
+    FIELD_AUTHOR: 2.0,
+    FIELD_KEYWORD: 1.5,
+}
+
+# Stop narrowing candidates once this few remain (callers verify them)
+CANDIDATE_VERIFY_LIMIT = 256
+
+_TOKEN_RE = re.compile(r"\w+")
+# Missing titles (the parsers fill in "Untitled") never count as duplicates
+_UNTITLED_HASHES = {title_hash(""), title_hash("Untitled")}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# REFERENCE INDEX
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ReferenceIndex:
+    """
+    In-memory secondary indexes for references.
+
+    Works on Reference-like objects (id, title, authors, year, doi,
+    keywords, tags). Call add() after any change to a reference; the old
+    postings for that ID are replaced.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+
+        self.by_doi: Dict[str, str] = {}
+        self.by_title_hash: Dict[str, Set[str]] = {}
+        self.by_year: Dict[int, Set[str]] = {}
+
+        # field -> token -> ids
+        self._postings: Dict[str, Dict[str, Set[str]]] = {
+            FIELD_TITLE: {}, FIELD_AUTHOR: {}, FIELD_KEYWORD: {},
+        }
+        # Author last names only (exact last-name lookups)
+        self.by_last_name: Dict[str, Set[str]] = {}
+
+        # id -> what was indexed, so removal never needs the old object
+        self._entries: Dict[str, Dict] = {}
+
+        # id -> insertion sequence (kept across re-indexing, like dict order)
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Maintenance
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def rebuild(self, references: Iterable):
+        """Index a whole library from scratch."""
+        with self._lock:
+            self.__init__()
+            for ref in references:
+                self.add(ref)
+
+    def add(self, ref):
+        """Index (or re-index) a reference."""
+        entry = {
+            "doi": normalize_doi(ref.doi) if ref.doi else "",
+            "title_hash": title_hash(ref.title),
+            "year": ref.year,
+            "last_names": {a.last_name.lower() for a in ref.authors if a.last_name},
+            FIELD_TITLE: set(tokenize(ref.title)),
+            FIELD_AUTHOR: {
+                token for a in ref.authors for token in tokenize(a.full_name())
+            },
+            FIELD_KEYWORD: {
+                token for kw in list(ref.keywords) + list(ref.tags) for token in tokenize(kw)
+            },
+        }
+
+        with self._lock:
+            self._remove_locked(ref.id)
+            self._entries[ref.id] = entry
+            if ref.id not in self._order:
+                self._order[ref.id] = self._next_order
+                self._next_order += 1
+
+            if entry["doi"]:
+                self.by_doi[entry["doi"]] = ref.id
+            self.by_title_hash.setdefault(entry["title_hash"], set()).add(ref.id)
+            self.by_year.setdefault(entry["year"], set()).add(ref.id)
+            for name in entry["last_names"]:
+                self.by_last_name.setdefault(name, set()).add(ref.id)
+            for field_name, postings in self._postings.items():
+                for token in entry[field_name]:
+                    postings.setdefault(token, set()).add(ref.id)
+
+    def remove(self, ref_id: str):
+        """Drop a reference from every index."""
+        with self._lock:
+            self._remove_locked(ref_id)
+            self._order.pop(ref_id, None)
+
+    def _remove_locked(self, ref_id: str):
+        entry = self._entries.pop(ref_id, None)
+        if entry is None:
+            return
+
+        if entry["doi"] and self.by_doi.get(entry["doi"]) == ref_id:
+            del self.by_doi[entry["doi"]]
+        self._discard(self.by_title_hash, entry["title_hash"], ref_id)
+        self._discard(self.by_year, entry["year"], ref_id)
+        for name in entry["last_names"]:
+            self._discard(self.by_last_name, name, ref_id)
+        for field_name, postings in self._postings.items():
+            for token in entry[field_name]:
+                self._discard(postings, token, ref_id)
+
+    @staticmethod
+    def _discard(index: Dict, key, ref_id: str):
+        ids = index.get(key)
+        if ids is None:
+            return
+        ids.discard(ref_id)
+        if not ids:
+            del index[key]
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Lookups
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def get_by_doi(self, doi: str) -> Optional[str]:
+        """Reference ID for a DOI (any common DOI spelling)."""
+        return self.by_doi.get(normalize_doi(doi))
+
+    def find_duplicate(self, doi: str, title: str, year: int = 0,
+                       last_names: Iterable[str] = ()) -> Optional[str]:
+        """
+        ID of an existing reference that is the same work, or None.
+
+        A DOI match always counts. A normalized-title match counts only
+        when at most one side has a DOI (two different DOIs are two
+        works) and the year matches; if either year is unknown, an
+        author last name must match instead. Untitled entries never
+        match by title.
+        """
+        doi = normalize_doi(doi) if doi else ""
+        last_names = {name.lower() for name in last_names if name}
+        with self._lock:
+            if doi:
+                ref_id = self.by_doi.get(doi)
+                if ref_id:
+                    return ref_id
+            key = title_hash(title)
+            if key in _UNTITLED_HASHES:
+                return None
+            for ref_id in self.in_order(self.by_title_hash.get(key, ())):
+                entry = self._entries[ref_id]
+                if doi and entry["doi"]:
+                    continue
+                if year and entry["year"]:
+                    if year == entry["year"]:
+                        return ref_id
+                elif last_names & entry["last_names"]:
+                    return ref_id
+            return None
+
+    def in_order(self, ref_ids: Iterable[str]) -> List[str]:
+        """Sort IDs by library insertion order."""
+        order = self._order
+        return sorted((i for i in ref_ids if i in order), key=order.__getitem__)
+
+    def get_by_year(self, year: int) -> Set[str]:
+        return set(self.by_year.get(year, ()))
+
+    def get_by_last_name(self, last_name: str) -> Set[str]:
+        return set(self.by_last_name.get(last_name.lower(), ()))
+
+    def candidates(self, query: str, fields: Iterable[str]) -> Set[str]:
+        """
+        IDs whose fields may contain `query` as a substring.
+
+        Each query token is expanded to the vocabulary tokens containing
+        it. The result is a superset; callers verify the exact match.
+        """
+        tokens = tokenize(query)
+        result: Set[str] = set()
+        if not tokens:
+            return result
+        with self._lock:
+            for field_name in fields:
+                postings = self._postings[field_name]
+                field_ids = None
+                # Most selective (longest) tokens first; once the candidate
+                # set is small, verifying beats expanding more tokens
+                for token in sorted(set(tokens), key=len, reverse=True):
+                    if field_ids is not None and len(field_ids) <= CANDIDATE_VERIFY_LIMIT:
+                        break
+                    terms = [term for term in postings if token in term]
+                    if field_ids is not None and len(terms) > len(postings) // 4:
+                        continue  # Unselective token: leave it to verification
+                    ids = set()
+                    for term in terms:
+                        ids |= postings[term]
+                    field_ids = ids if field_ids is None else field_ids & ids
+                    if not field_ids:
+                        break
+                result |= field_ids or set()
+        return result
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Ranked query
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def query(self, text: str = "", author: str = None, title: str = None,
+              keyword: str = None, year: int = None,
+              year_range: Tuple[int, int] = None, tags: List[str] = None,
+              limit: int = 20) -> List[Tuple[str, float]]:
+        """
+        Ranked multi-field search.
+
+        Args:
+            text: Free text matched against title, authors and keywords
+            author / title / keyword: Text that must match that field
+            year: Exact year filter
+            year_range: Inclusive (start, end) year filter
+            tags: Keywords/tags that must all be present
+            limit: Maximum number of results
+
+        Returns:
+            (reference ID, score) pairs, best first
+        """
+        with self._lock:
+            total = len(self._entries) or 1
+            scores: Dict[str, float] = {}
+            allowed: Optional[Set[str]] = None
+
+            def restrict(ids: Set[str]):
+                nonlocal allowed
+                allowed = set(ids) if allowed is None else allowed & ids
+
+            # Hard filters
+            if year is not None:
+                restrict(self.by_year.get(year, set()))
+            if year_range is not None:
+                start, end = year_range
+                ids = set()
+                for y, y_ids in self.by_year.items():
+                    if start <= y <= end:
+                        ids |= y_ids
+                restrict(ids)
+            for tag in tags or []:
+                tag_ids = None
+                for token in tokenize(tag):
+                    ids = self._postings[FIELD_KEYWORD].get(token, set())
+                    tag_ids = set(ids) if tag_ids is None else tag_ids & ids
+                restrict(tag_ids or set())
+
+            # Field-specific text must match in that field
+            for field_name, value in ((FIELD_AUTHOR, author), (FIELD_TITLE, title),
+                                      (FIELD_KEYWORD, keyword)):
+                if value:
+                    matched = self._score_tokens(value, [field_name], total, scores, require_all=True)
+                    restrict(matched)
+
+            # Free text may match any field
+            if text:
+                matched = self._score_tokens(text, list(FIELD_WEIGHTS), total, scores, require_all=False)
+                restrict(matched)
+
+            if allowed is None:
+                return []
+
+            ranked = sorted(
+                ((ref_id, scores.get(ref_id, 0.0)) for ref_id in allowed),
+                key=lambda item: (-item[1], item[0])
+            )
+            return [(ref_id, round(score, 4)) for ref_id, score in ranked[:limit]]
+
+    def _score_tokens(self, text: str, fields: List[str], total: int,
+                      scores: Dict[str, float], require_all: bool) -> Set[str]:
+        """Add field-weighted IDF scores for text tokens; return matching IDs."""
+        matched: Optional[Set[str]] = None
+        for token in tokenize(text):
+            token_ids: Set[str] = set()
+            for field_name in fields:
+                postings = self._postings[field_name]
+                ids = postings.get(token)
+                exact = True
+                if not ids:
+                    # Prefix match ("neur" -> "neural")
+                    exact = False
+                    ids = set()
+                    for term, term_ids in postings.items():
+                        if term.startswith(token):
+                            ids |= term_ids
+                if not ids:
+                    continue
+                weight = FIELD_WEIGHTS[field_name] * math.log(1 + total / len(ids))
+                if not exact:
+                    weight *= 0.5
+                for ref_id in ids:
+                    scores[ref_id] = scores.get(ref_id, 0.0) + weight
+                token_ids |= ids
+
+            if require_all:
+                matched = token_ids if matched is None else matched & token_ids
+            else:
+                matched = token_ids if matched is None else matched | token_ids
+        return matched or set()
+
+    def get_stats(self) -> Dict:
+        """Index statistics."""
+        with self._lock:
+            return {
+                "references": len(self._entries),
+                "dois": len(self.by_doi),
+                "years": len(self.by_year),
+                "last_names": len(self.by_last_name),
+                "terms": {name: len(p) for name, p in self._postings.items()},
+            }
@@ -28,11 +28,34 @@ import os
 import json
 import re
 import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, field
 from enum import Enum
 
+try:
+    from .storage import ResearchStore
+    from .reference_index import ReferenceIndex
+    from .bib_parser import (
+        iter_reference_fields, open_bibliography, detect_format,
+    )
+except ImportError:
+    from storage import ResearchStore
+    from reference_index import ReferenceIndex
+    from bib_parser import (
+        iter_reference_fields, open_bibliography, detect_format,
+    )
+
+
+# References committed per transaction during bulk imports
+IMPORT_BATCH_SIZE = 1000
+
+# Rendered citations kept in memory, keyed by (ref_id, style, revision)
+CITATION_CACHE_SIZE = 4096
+
 
 class SourceType(Enum):
     """Types of research sources."""
@@ -272,50 +295,80 @@ class ResearchSuite:
         # Collections (folders for organizing refs)
         self.collections: Dict[str, List[str]] = {}
         
+        # Snapshot + change-log persistence
+        self.store = ResearchStore(data_path)
+        
+        # Secondary indexes (DOI, authors, title tokens, year, keywords)
+        self.index = ReferenceIndex()
+        
+        # Rendered citation cache; a reference's revision bumps on every change
+        self._revisions: Dict[str, int] = {}
+        self._citation_cache: OrderedDict = OrderedDict()
+        self._citation_lock = threading.RLock()
+        
         # Load existing data
         self._load_data()
         
         print(f"[ResearchSuite] Initialized with {len(self.references)} references, {len(self.projects)} projects")
     
     def _load_data(self):
-        """Load existing data from disk."""
-        # Load references
-        refs_file = os.path.join(self.data_path, "references.json")
-        if os.path.exists(refs_file):
+        """Load existing data from disk (snapshots + change log)."""
+        data = self.store.load()
+        
+        self.references.clear()
+        for ref_data in data.get("reference", {}).values():
             try:
-                with open(refs_file, 'r') as f:
-                    data = json.load(f)
-                for ref_data in data:
-                    ref = self._dict_to_reference(ref_data)
-                    self.references[ref.id] = ref
-            except:
-                pass
-        
-        # Load projects
-        projects_file = os.path.join(self.data_path, "projects.json")
-        if os.path.exists(projects_file):
+                ref = self._dict_to_reference(ref_data)
+                self.references[ref.id] = ref
+            except Exception as e:
+                print(f"[ResearchSuite] Skipping bad reference record: {e}")
+        self.index.rebuild(self.references.values())
+        with self._citation_lock:
+            self._citation_cache.clear()
+        
+        self.projects.clear()
+        for proj_data in data.get("project", {}).values():
             try:
-                with open(projects_file, 'r') as f:
-                    data = json.load(f)
-                for proj_data in data:
-                    proj = self._dict_to_project(proj_data)
-                    self.projects[proj.id] = proj
-            except:
-                pass
+                proj = self._dict_to_project(proj_data)
+                self.projects[proj.id] = proj
+            except Exception as e:
+                print(f"[ResearchSuite] Skipping bad project record: {e}")
     
     def _save_data(self):
-        """Save data to disk."""
-        # Save references
-        refs_file = os.path.join(self.data_path, "references.json")
-        refs_data = [self._reference_to_dict(ref) for ref in self.references.values()]
-        with open(refs_file, 'w') as f:
-            json.dump(refs_data, f, indent=2, default=str)
-        
-        # Save projects
-        projects_file = os.path.join(self.data_path, "projects.json")
-        projects_data = [self._project_to_dict(proj) for proj in self.projects.values()]
-        with open(projects_file, 'w') as f:
-            json.dump(projects_data, f, indent=2, default=str)
+        """Write full snapshots of all data and clear the change log."""
+        self.store.snapshot({
+            "reference": [self._reference_to_dict(ref) for ref in self.references.values()],
+            "project": [self._project_to_dict(proj) for proj in self.projects.values()],
+        })
+    
+    def _save_reference(self, ref: Reference):
+        """Persist one reference (appends to the change log)."""
+        self.store.put("reference", self._reference_to_dict(ref))
+    
+    def _save_project(self, proj: ResearchProject):
+        """Persist one project (appends to the change log)."""
+        self.store.put("project", self._project_to_dict(proj))
+    
+    @contextmanager
+    def batch(self):
+        """
+        Group changes into one atomic, crash-safe commit.
+        
+        Usage:
+            with suite.batch():
+                for entry in entries:
+                    suite.add_reference(...)
+        
+        If the block raises, nothing is written and in-memory state is
+        reloaded from disk.
+        """
+        try:
+            with self.store.batch():
+                yield self
+        except BaseException:
+            if not self.store.in_batch:
+                self._load_data()
+            raise
     
     def _reference_to_dict(self, ref: Reference) -> Dict:
         """Convert Reference to dict for serialization."""
@@ -422,7 +475,7 @@ class ResearchSuite:
     # ═══════════════════════════════════════════════════════════════════════════
     
     def add_reference(self, source_type: SourceType, title: str, authors: List[Dict],
-                      year: int, **kwargs) -> Reference:
+                      year: int, log: bool = True, **kwargs) -> Reference:
         """
         Add a new reference.
         
@@ -431,12 +484,13 @@ class ResearchSuite:
             title: Title of the work
             authors: List of author dicts with first_name, last_name
             year: Publication year
+            log: Print a confirmation line (bulk imports turn this off)
             **kwargs: Additional fields (journal, doi, etc.)
             
         Returns:
             Created Reference
         """
-        ref_id = f"ref_{hashlib.md5(f'{title}{year}'.encode()).hexdigest()[:10]}"
+        ref_id = self._new_reference_id(title, year)
         
         author_objects = [
             Author(
@@ -468,11 +522,74 @@ class ResearchSuite:
         )
         
         self.references[ref_id] = ref
-        self._save_data()
+        self.index.add(ref)
+        self._touch_reference(ref_id)
+        self._save_reference(ref)
         
-        print(f"[ResearchSuite] Added reference: {title}")
+        if log:
+            print(f"[ResearchSuite] Added reference: {title}")
         return ref
     
+    def _new_reference_id(self, title: str, year: int) -> str:
+        """
+        ID for a new reference.
+        
+        Distinct works can share a title and year (editorials, untitled
+        entries), so a numeric suffix keeps them from replacing each other.
+        """
+        base = f"ref_{hashlib.md5(f'{title}{year}'.encode()).hexdigest()[:10]}"
+        ref_id, n = base, 2
+        while ref_id in self.references:
+            ref_id = f"{base}_{n}"
+            n += 1
+        return ref_id
+    
+    def update_reference(self, ref_id: str, **fields) -> bool:
+        """
+        Update fields of a reference (title, doi, keywords, tags, ...).
+        
+        Returns:
+            Success status
+        """
+        ref = self.references.get(ref_id)
+        if ref is None:
+            return False
+        
+        for name, value in fields.items():
+            if name == "authors":
+                value = [
+                    a if isinstance(a, Author) else Author(
+                        first_name=a.get("first_name", ""),
+                        last_name=a.get("last_name", ""),
+                        middle_name=a.get("middle_name", ""),
+                        orcid=a.get("orcid", "")
+                    )
+                    for a in value
+                ]
+            if hasattr(ref, name) and name != "id":
+                setattr(ref, name, value)
+        
+        self.index.add(ref)
+        self._touch_reference(ref_id)
+        self._save_reference(ref)
+        return True
+    
+    def remove_reference(self, ref_id: str) -> bool:
+        """Remove a reference and unlink it from projects."""
+        if ref_id not in self.references:
+            return False
+        
+        with self.batch():
+            del self.references[ref_id]
+            self.index.remove(ref_id)
+            self._touch_reference(ref_id)
+            self.store.delete("reference", ref_id)
+            for proj in self.projects.values():
+                if ref_id in proj.references:
+                    proj.references.remove(ref_id)
+                    self._save_project(proj)
+        return True
+    
     def search_references(self, query: str, field: str = "all") -> List[Reference]:
         """
         Search references.
@@ -484,47 +601,77 @@ class ResearchSuite:
         Returns:
             List of matching references
         """
-        results = []
         query_lower = query.lower()
         
-        for ref in self.references.values():
-            match = False
-            
-            if field in ["all", "title"]:
-                if query_lower in ref.title.lower():
-                    match = True
-            
-            if field in ["all", "author"]:
-                for author in ref.authors:
-                    if query_lower in author.full_name().lower():
-                        match = True
-                        break
-            
-            if field in ["all", "year"]:
-                if query == str(ref.year):
-                    match = True
+        fields = {
+            "all": ["title", "author", "keyword"],
+            "title": ["title"],
+            "author": ["author"],
+            "keyword": ["keyword"],
+        }.get(field, [])
+        
+        # Candidates from the indexes, verified with the exact substring rule
+        if fields and re.search(r"\w", query_lower):
+            candidate_ids = self.index.candidates(query_lower, fields)
+        elif fields:
+            candidate_ids = set(self.references)
+        else:
+            candidate_ids = set()
+        
+        if field in ["all", "year"] and query.isdigit():
+            candidate_ids |= self.index.get_by_year(int(query))
+        
+        results = []
+        # Library order, as before
+        for ref_id in self.index.in_order(candidate_ids):
+            ref = self.references.get(ref_id)
+            if ref is None:
+                continue
             
-            if field in ["all", "keyword"]:
-                for kw in ref.keywords + ref.tags:
-                    if query_lower in kw.lower():
-                        match = True
-                        break
+            match = False
+            if field in ["all", "title"] and query_lower in ref.title.lower():
+                match = True
+            if not match and field in ["all", "author"]:
+                match = any(query_lower in a.full_name().lower() for a in ref.authors)
+            if not match and field in ["all", "year"]:
+                match = query == str(ref.year)
+            if not match and field in ["all", "keyword"]:
+                match = any(query_lower in kw.lower() for kw in ref.keywords + ref.tags)
             
             if match:
                 results.append(ref)
         
         return results
     
+    def query_references(self, text: str = "", limit: int = 20, **filters) -> List[Tuple[Reference, float]]:
+        """
+        Ranked multi-field reference search.
+        
+        Args:
+            text: Free text matched against titles, authors and keywords
+            limit: Maximum number of results
+            **filters: author, title, keyword, year, year_range, tags
+            
+        Returns:
+            List of (Reference, score), best first
+        
+        Example:
+            suite.query_references("graph neural", author="kipf", year_range=(2016, 2020))
+        """
+        return [
+            (self.references[ref_id], score)
+            for ref_id, score in self.index.query(text, limit=limit, **filters)
+            if ref_id in self.references
+        ]
+    
     def get_reference_by_doi(self, doi: str) -> Optional[Reference]:
         """Find reference by DOI."""
-        for ref in self.references.values():
-            if ref.doi == doi:
-                return ref
-        return None
+        ref_id = self.index.get_by_doi(doi)
+        return self.references.get(ref_id) if ref_id else None
     
     def import_from_bibtex(self, bibtex_content: str) -> List[Reference]:
         """
-        Import references from BibTeX.
+        Import references from BibTeX/BibLaTeX.
         
         Args:
             bibtex_content: BibTeX formatted string
@@ -532,61 +679,78 @@ class ResearchSuite:
         Returns:
             List of imported references
         """
-        imported = []
-        
-        # Simple BibTeX parser
-        entries = re.findall(r'@(\w+)\s*\{([^}]+),([^@]+)\}', bibtex_content, re.DOTALL)
+        return self.import_bibliography(bibtex_content, fmt="bibtex")
+    
+    def import_from_ris(self, ris_content: str) -> List[Reference]:
+        """Import references from RIS."""
+        return self.import_bibliography(ris_content, fmt="ris")
+    
+    def import_bibliography_file(self, filepath: str, fmt: str = None) -> List[Reference]:
+        """
+        Import a BibTeX/BibLaTeX/RIS file, streaming it from disk.
         
-        for entry_type, key, fields in entries:
-            # Parse fields
-            field_dict = {}
-            for match in re.finditer(r'(\w+)\s*=\s*[{"](.*?)[}"]', fields, re.DOTALL):
-                field_dict[match.group(1).lower()] = match.group(2).strip()
-            
-            # Map entry type
-            type_map = {
-                "article": SourceType.JOURNAL_ARTICLE,
-                "book": SourceType.BOOK,
-                "inproceedings": SourceType.CONFERENCE_PAPER,
-                "phdthesis": SourceType.DISSERTATION,
-                "mastersthesis": SourceType.THESIS,
-                "techreport": SourceType.REPORT,
-            }
-            source_type = type_map.get(entry_type.lower(), SourceType.JOURNAL_ARTICLE)
+        Args:
+            filepath: Path to the .bib/.ris file
+            fmt: "bibtex" or "ris" (detected from the extension if omitted)
             
-            # Parse authors
-            authors = []
-            author_str = field_dict.get("author", "")
-            for author_part in author_str.split(" and "):
-                parts = author_part.strip().split(",")
-                if len(parts) >= 2:
-                    authors.append({
-                        "last_name": parts[0].strip(),
-                        "first_name": parts[1].strip()
-                    })
-                elif parts:
-                    name_parts = parts[0].strip().split()
-                    if len(name_parts) >= 2:
-                        authors.append({
-                            "first_name": " ".join(name_parts[:-1]),
-                            "last_name": name_parts[-1]
-                        })
+        Returns:
+            List of imported references
+        """
+        with open_bibliography(filepath) as f:
+            return self.import_bibliography(f, fmt=fmt or detect_format(filepath))
+    
+    def import_bibliography(self, source, fmt: str = "bibtex",
+                            dedupe: bool = True) -> List[Reference]:
+        """
+        Stream-import references, skipping ones already in the library.
+        
+        Entries are parsed one at a time and committed in batches of
+        IMPORT_BATCH_SIZE, so memory stays bounded for large files.
+        Duplicates are detected by DOI, or by normalized title hash plus
+        year (or author) when the DOIs do not conflict.
+        
+        Args:
+            source: Bibliography text or an open file
+            fmt: "bibtex" (also BibLaTeX) or "ris"
+            dedupe: Skip entries matching an existing reference
             
-            try:
-                ref = self.add_reference(
-                    source_type=source_type,
-                    title=field_dict.get("title", "Untitled"),
-                    authors=authors,
-                    year=int(field_dict.get("year", 0)),
-                    journal=field_dict.get("journal", ""),
-                    volume=field_dict.get("volume", ""),
-                    pages=field_dict.get("pages", ""),
-                    doi=field_dict.get("doi", ""),
-                )
-                imported.append(ref)
-            except:
-                pass
+        Returns:
+            List of imported references
+        """
+        imported = []
+        skipped = 0
+        entries = iter_reference_fields(source, fmt)
+        
+        while True:
+            with self.batch():
+                count = 0
+                for fields in entries:
+                    if dedupe and self.index.find_duplicate(
+                            fields.get("doi", ""), fields["title"],
+                            fields.get("year", 0),
+                            [a.get("last_name", "") for a in fields.get("authors", ())]):
+                        skipped += 1
+                        continue
+                    
+                    try:
+                        fields["source_type"] = SourceType(fields["source_type"])
+                        ref = self.add_reference(log=False, **fields)
+                    except Exception as e:
+                        print(f"[ResearchSuite] Skipping entry '{fields.get('title')}': {e}")
+                        continue
+                    
+                    imported.append(ref)
+                    
+                    count += 1
+                    if count >= IMPORT_BATCH_SIZE:
+                        break
+            if count < IMPORT_BATCH_SIZE:
+                break
+        
+        # Report only references that ended up in the library
+        imported = [ref for ref in imported if self.references.get(ref.id) is ref]
         
+        print(f"[ResearchSuite] Imported {len(imported)} references ({skipped} duplicates skipped)")
         return imported
     
     def export_to_bibtex(self, ref_ids: List[str] = None) -> str:
@@ -651,6 +815,9 @@ class ResearchSuite:
         """
         Generate a citation in a specific style.
         
+        Rendered citations are cached by (ref_id, style, revision), so a
+        citation is only re-rendered after its reference changes.
+        
         Args:
             ref_id: Reference ID
             style: Citation style
@@ -661,8 +828,26 @@ class ResearchSuite:
         if ref_id not in self.references:
             return ""
         
-        ref = self.references[ref_id]
-        
+        with self._citation_lock:
+            key = (ref_id, style, self._revisions.get(ref_id, 0))
+            cached = self._citation_cache.get(key)
+            if cached is not None:
+                self._citation_cache.move_to_end(key)
+                return cached
+            
+            citation = self._render_citation(self.references[ref_id], style)
+            self._citation_cache[key] = citation
+            if len(self._citation_cache) > CITATION_CACHE_SIZE:
+                self._citation_cache.popitem(last=False)
+            return citation
+    
+    def _touch_reference(self, ref_id: str):
+        """Bump a reference's revision so cached citations go stale."""
+        with self._citation_lock:
+            self._revisions[ref_id] = self._revisions.get(ref_id, 0) + 1
+    
+    def _render_citation(self, ref: Reference, style: CitationStyle) -> str:
+        """Render a citation (uncached)."""
         if style in [CitationStyle.APA7, CitationStyle.APA6]:
             return self._cite_apa(ref)
         elif style in [CitationStyle.MLA9, CitationStyle.MLA8]:
@@ -853,25 +1038,30 @@ class ResearchSuite:
         
         return citation
     
-    def generate_bibliography(self, ref_ids: List[str], style: CitationStyle = CitationStyle.APA7) -> str:
+    def generate_bibliography(self, ref_ids: List[str], style: CitationStyle = CitationStyle.APA7,
+                              sort: bool = True) -> str:
         """
         Generate a bibliography from multiple references.
         
+        Duplicate IDs are rendered once; every entry goes through the
+        citation cache, and the list is sorted in a single pass.
+        
         Args:
             ref_ids: List of reference IDs
             style: Citation style
+            sort: Sort alphabetically (APA style); False keeps the given order
             
         Returns:
             Formatted bibliography
         """
         citations = []
-        for ref_id in ref_ids:
+        for ref_id in dict.fromkeys(ref_ids):
             cite = self.generate_citation(ref_id, style)
             if cite:
                 citations.append(cite)
         
-        # Sort alphabetically by author (APA style)
-        citations.sort()
+        if sort:
+            citations.sort()
         
         return "\n\n".join(citations)
     
@@ -892,7 +1082,7 @@ class ResearchSuite:
         )
         
         self.projects[proj_id] = project
-        self._save_data()
+        self._save_project(project)
         
         print(f"[ResearchSuite] Created project: {title}")
         return project
@@ -903,7 +1093,7 @@ class ResearchSuite:
             return False
         
         self.projects[project_id].status = status
-        self._save_data()
+        self._save_project(self.projects[project_id])
         return True
     
     def add_milestone(self, project_id: str, name: str, 
@@ -921,7 +1111,7 @@ class ResearchSuite:
         }
         
         self.projects[project_id].milestones.append(milestone)
-        self._save_data()
+        self._save_project(self.projects[project_id])
         return True
     
     def link_reference_to_project(self, project_id: str, ref_id: str) -> bool:
@@ -931,7 +1121,7 @@ class ResearchSuite:
         
         if ref_id not in self.projects[project_id].references:
             self.projects[project_id].references.append(ref_id)
-            self._save_data()
+            self._save_project(self.projects[project_id])
         return True
     
     # ═══════════════════════════════════════════════════════════════════════════
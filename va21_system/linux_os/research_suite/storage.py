@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+VA21 Research OS - Research Store
+===================================
+
+Crash-safe persistence for the Research Suite.
+
+Records live in JSON snapshot files (references.json, projects.json)
+plus an append-only change log. Every change appends one line to the
+log instead of rewriting the snapshots, so a change costs O(change),
+not O(library). The log is folded back into the snapshots
+(compaction) once it grows past a threshold.
+
+Features:
+- Append-only change log (JSON lines, fsync'd per commit)
+- Atomic batch transactions: one log line per batch, all or nothing
+- Periodic compaction with atomic renames (write temp, fsync, replace)
+- Torn trailing log lines from a crash are discarded on replay
+
+Om Vinayaka - Knowledge is the path to enlightenment.
+"""
+
+import os
+import json
+import threading
+from contextlib import contextmanager
+from typing import Dict, List
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+CHANGE_LOG_FILE = "changes.log"
+
+# Snapshot file per record kind
+SNAPSHOT_FILES = {
+    "reference": "references.json",
+    "project": "projects.json",
+}
+
+# Compact once the log holds this many changes...
+COMPACT_MIN_CHANGES = 500
+# ...and at least this many changes per stored record
+COMPACT_RATIO = 0.5
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RESEARCH STORE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ResearchStore:
+    """
+    Snapshot + change-log store for research records.
+
+    Records are plain dicts addressed by (kind, id). The store keeps the
+    current state in memory so compaction never has to re-read the log.
+    """
+
+    def __init__(self, data_path: str):
+        self.data_path = data_path
+        self.log_path = os.path.join(data_path, CHANGE_LOG_FILE)
+        os.makedirs(data_path, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._records: Dict[str, Dict[str, Dict]] = {kind: {} for kind in SNAPSHOT_FILES}
+        self._log_changes = 0
+
+        # Open batch state (per store; nested batches join the outer one)
+        self._batch_depth = 0
+        self._batch_ops: List[Dict] = []
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Loading
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def load(self) -> Dict[str, Dict[str, Dict]]:
+        """
+        Load snapshots and replay the change log.
+
+        Returns:
+            {kind: {id: record}} for every record kind
+        """
+        with self._lock:
+            self._records = {kind: {} for kind in SNAPSHOT_FILES}
+
+            for kind, filename in SNAPSHOT_FILES.items():
+                path = os.path.join(self.data_path, filename)
+                if not os.path.exists(path):
+                    continue
+                try:
+                    with open(path, 'r') as f:
+                        for record in json.load(f):
+                            self._records[kind][record["id"]] = record
+                except Exception as e:
+                    print(f"[ResearchStore] Error loading {filename}: {e}")
+
+            self._log_changes = 0
+            if os.path.exists(self.log_path):
+                committed = 0
+                with open(self.log_path, 'rb') as f:
+                    for line in f:
+                        if not line.endswith(b"\n"):
+                            break  # Torn write from a crash: never committed
+                        try:
+                            ops = json.loads(line)
+                        except ValueError:
+                            break
+                        for op in ops:
+                            self._apply(op)
+                        self._log_changes += len(ops)
+                        committed += len(line)
+
+                # Drop the torn tail so later appends start on a clean line
+                if committed < os.path.getsize(self.log_path):
+                    with open(self.log_path, 'r+b') as f:
+                        f.truncate(committed)
+
+            return {kind: dict(records) for kind, records in self._records.items()}
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Changes
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def put(self, kind: str, record: Dict):
+        """Insert or replace a record (must have an 'id')."""
+        self._submit({"op": "put", "kind": kind, "id": record["id"], "data": record})
+
+    def delete(self, kind: str, record_id: str):
+        """Delete a record."""
+        self._submit({"op": "delete", "kind": kind, "id": record_id})
+
+    @contextmanager
+    def batch(self):
+        """
+        Group changes into one atomic commit.
+
+        Changes are written as a single log line when the outermost
+        batch exits; if the block raises, nothing is written.
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._batch_ops = []
+            raise
+        else:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    ops, self._batch_ops = self._batch_ops, []
+                    self._commit(ops)
+
+    @property
+    def in_batch(self) -> bool:
+        return self._batch_depth > 0
+
+    def _submit(self, op: Dict):
+        with self._lock:
+            if self._batch_depth:
+                self._batch_ops.append(op)
+            else:
+                self._commit([op])
+
+    def _commit(self, ops: List[Dict]):
+        """Append ops to the log as one line, then apply them (caller holds lock)."""
+        if not ops:
+            return
+        line = json.dumps(ops, default=str, separators=(',', ':')) + "\n"
+        with open(self.log_path, 'a') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+        for op in ops:
+            self._apply(op)
+        self._log_changes += len(ops)
+
+        total = sum(len(records) for records in self._records.values())
+        if self._log_changes >= max(COMPACT_MIN_CHANGES, COMPACT_RATIO * total):
+            self.compact()
+
+    def _apply(self, op: Dict):
+        records = self._records.setdefault(op["kind"], {})
+        if op["op"] == "put":
+            records[op["id"]] = op["data"]
+        elif op["op"] == "delete":
+            records.pop(op["id"], None)
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Compaction
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def compact(self):
+        """
+        Fold the change log into the snapshots.
+
+        Snapshots are replaced atomically before the log is truncated;
+        a crash in between just replays idempotent changes on next load.
+        """
+        with self._lock:
+            for kind, filename in SNAPSHOT_FILES.items():
+                self._atomic_write_json(
+                    os.path.join(self.data_path, filename),
+                    list(self._records.get(kind, {}).values())
+                )
+            self._atomic_write_text(self.log_path, "")
+            self._log_changes = 0
+
+    def snapshot(self, records: Dict[str, List[Dict]]):
+        """Replace all records of the given kinds and compact."""
+        with self._lock:
+            for kind, items in records.items():
+                self._records[kind] = {record["id"]: record for record in items}
+            self.compact()
+
+    @classmethod
+    def _atomic_write_json(cls, path: str, data):
+        cls._atomic_write_text(path, json.dumps(data, indent=2, default=str))
+
+    @staticmethod
+    def _atomic_write_text(path: str, text: str):
+        """Write via a temp file, fsync, then rename over the target."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+        # Persist the rename itself
+        try:
+            dir_fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+
+    def get_stats(self) -> Dict:
+        """Store statistics."""
+        with self._lock:
+            return {
+                'records': {kind: len(records) for kind, records in self._records.items()},
+                'log_changes': self._log_changes,
+                'log_bytes': os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0,
+            }
@@ -3,4 +3,5 @@
 VA21 Security Toolkit - Advanced tools for security professionals.
 """
 from .security_toolkit import SecurityToolkit, get_security_toolkit
+from .log_analyzer import LogAnalyzer, CompiledLogMatcher
 __version__ = "1.0.0"
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+VA21 Research OS - Log Analysis Engine
+=======================================
+
+Fast, memory-bounded log analysis for the Security Toolkit.
+
+Features:
+- All patterns compiled into ONE alternation used as a line prefilter
+  (most lines are rejected in a single regex pass); only lines it
+  matches are checked against each pattern, so overlapping patterns
+  are all counted
+- Large files split into newline-aligned chunks and scanned in
+  parallel on a process pool
+- Rotated logs (auth.log, auth.log.1, auth.log.2.gz, ...) scanned
+  as independent tasks, gzip included
+- Exact per-pattern counts with bounded per-pattern samples
+- Bounded IP address tracking
+- Timestamps (syslog or ISO 8601) of matching lines, bounded
+- Tail/follow mode for live logs (survives rotation and truncation)
+
+Om Vinayaka - Shield of wisdom, sword of knowledge.
+"""
+
+import os
+import re
+import gzip
+import glob
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Iterator
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# DEFAULTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+DEFAULT_LOG_PATTERNS = [
+    r'failed\s+password',
+    r'authentication\s+failure',
+    r'invalid\s+user',
+    r'refused\s+connect',
+    r'connection\s+refused',
+    r'permission\s+denied',
+    r'access\s+denied',
+    r'error',
+    r'warning',
+    r'critical',
+    r'SQL\s+injection',
+    r'XSS',
+    r'command\s+injection',
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}',  # IP addresses
+]
+
+IP_PATTERN = r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}'
+
+# Leading line timestamp: syslog ("Jan  5 14:02:33") or ISO 8601
+TIMESTAMP_PATTERN = (
+    r'^\s*(?:[A-Z][a-z]{2}\s+\d{1,2}\s+\d{2}:\d{2}:\d{2}'
+    r'|\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?)'
+)
+
+CHUNK_SIZE = 64 * 1024 * 1024      # Bytes per parallel task
+MAX_SAMPLES = 100                  # Samples kept per pattern
+MAX_IPS = 10000                    # Distinct IPs tracked
+MAX_LINE_CHARS = 200               # Characters kept per sample line
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# COMPILED MATCHER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class CompiledLogMatcher:
+    """
+    Log patterns checked through a single case-insensitive prefilter.
+
+    The prefilter is one alternation of every pattern plus the IP
+    pattern; lines it rejects (usually most of them) cost one regex
+    pass. Lines it accepts are checked against each pattern on its own,
+    since an alternation reports only one alternative per position and
+    would miss patterns that overlap (e.g. "error" inside "SQL error").
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = list(patterns)
+        self.compiled = [re.compile(p, re.IGNORECASE) for p in self.patterns]
+        self.regex = re.compile(
+            "|".join(f"(?:{p})" for p in self.patterns + [IP_PATTERN]), re.IGNORECASE
+        )
+        self.ip_regex = re.compile(IP_PATTERN)
+        self.timestamp_regex = re.compile(TIMESTAMP_PATTERN)
+
+    def scan(self, line: str) -> Tuple[set, List[str]]:
+        """
+        Scan one line.
+
+        Returns:
+            (set of matched pattern indexes, list of IPs on the line)
+        """
+        if not self.regex.search(line):
+            return set(), []
+        hits = {i for i, pattern in enumerate(self.compiled) if pattern.search(line)}
+        return hits, self.ip_regex.findall(line)
+
+    def timestamp(self, line: str) -> Optional[str]:
+        """The line's leading timestamp, if it has one."""
+        match = self.timestamp_regex.match(line)
+        return match.group().strip() if match else None
+
+
+@lru_cache(maxsize=8)
+def _get_matcher(patterns: Tuple[str, ...]) -> CompiledLogMatcher:
+    """Compiled matcher cache (one per worker process)."""
+    return CompiledLogMatcher(list(patterns))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SCAN RESULTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class LogScanResult:
+    """
+    Bounded accumulator for one scanned range.
+
+    Counts are exact; samples and IPs are capped so memory stays fixed
+    no matter how large the log is.
+    """
+
+    def __init__(self, pattern_count: int, max_samples: int = MAX_SAMPLES,
+                 max_ips: int = MAX_IPS):
+        self.max_samples = max_samples
+        self.max_ips = max_ips
+        self.total_lines = 0
+        self.counts = [0] * pattern_count
+        self.samples: List[List[Dict]] = [[] for _ in range(pattern_count)]
+        self.ip_counts: Counter = Counter()
+        self.ips_truncated = False
+        self.timestamps: List[Dict] = []  # First max_samples matching lines
+
+    def add_line(self, line_num: int, line: str, hits: set, ips: List[str],
+                 source: str, timestamp: Optional[str] = None):
+        """Record a scanned line."""
+        if timestamp and hits and len(self.timestamps) < self.max_samples:
+            self.timestamps.append({"file": source, "line": line_num, "timestamp": timestamp})
+        for index in hits:
+            self.counts[index] += 1
+            if len(self.samples[index]) < self.max_samples:
+                self.samples[index].append({
+                    "file": source,
+                    "line": line_num,
+                    "content": line.strip()[:MAX_LINE_CHARS],
+                })
+        for ip in ips:
+            if ip in self.ip_counts or len(self.ip_counts) < self.max_ips:
+                self.ip_counts[ip] += 1
+            else:
+                self.ips_truncated = True
+
+    def merge(self, other: "LogScanResult", line_offset: int = 0):
+        """Merge a later range into this one, shifting its line numbers."""
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+            room = self.max_samples - len(self.samples[index])
+            for sample in other.samples[index][:max(room, 0)]:
+                shifted = dict(sample)
+                shifted["line"] += line_offset
+                self.samples[index].append(shifted)
+        for ip, count in other.ip_counts.items():
+            if ip in self.ip_counts or len(self.ip_counts) < self.max_ips:
+                self.ip_counts[ip] += count
+            else:
+                self.ips_truncated = True
+        self.ips_truncated = self.ips_truncated or other.ips_truncated
+        room = self.max_samples - len(self.timestamps)
+        for entry in other.timestamps[:max(room, 0)]:
+            shifted = dict(entry)
+            shifted["line"] += line_offset
+            self.timestamps.append(shifted)
+        self.total_lines += other.total_lines
+
+
+def _scan_range(path: str, start: int, end: Optional[int],
+                patterns: Tuple[str, ...], max_samples: int,
+                max_ips: int) -> LogScanResult:
+    """
+    Scan lines starting in [start, end) of a log file.
+
+    Runs inside pool workers, so it only takes picklable arguments.
+    ``end`` of None means "to end of file" and is used for gzip files,
+    which cannot be split.
+    """
+    matcher = _get_matcher(patterns)
+    result = LogScanResult(len(patterns), max_samples, max_ips)
+
+    if path.endswith(".gz"):
+        handle = gzip.open(path, "rb")
+    else:
+        handle = open(path, "rb")
+
+    with handle as f:
+        position = start
+        if start > 0:
+            # Align to the first line that *starts* inside this range
+            f.seek(start - 1)
+            if f.read(1) != b"\n":
+                position += len(f.readline())
+
+        line_num = 0
+        for raw in f:
+            if end is not None and position >= end:
+                break
+            position += len(raw)
+            line_num += 1
+            line = raw.decode("utf-8", errors="ignore")
+            hits, ips = matcher.scan(line)
+            if hits or ips:
+                timestamp = matcher.timestamp(line) if hits else None
+                result.add_line(line_num, line, hits, ips, path, timestamp)
+
+        result.total_lines = line_num
+
+    return result
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LOG ANALYZER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class LogAnalyzer:
+    """
+    VA21 Log Analysis Engine
+
+    Scans one or many (rotated, gzip'd) log files in parallel while
+    keeping memory bounded by ``max_samples`` and ``max_ips``.
+    """
+
+    def __init__(self, patterns: List[str] = None, workers: int = None,
+                 chunk_size: int = CHUNK_SIZE, max_samples: int = MAX_SAMPLES,
+                 max_ips: int = MAX_IPS):
+        self.patterns = list(patterns) if patterns is not None else list(DEFAULT_LOG_PATTERNS)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(chunk_size, 1)
+        self.max_samples = max_samples
+        self.max_ips = max_ips
+
+        # Compile eagerly so bad patterns fail before any worker starts
+        self.matcher = _get_matcher(tuple(self.patterns))
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Batch analysis
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def _plan_tasks(self, paths: List[str]) -> List[Tuple[str, int, Optional[int]]]:
+        """Split files into (path, start, end) scan tasks."""
+        tasks = []
+        for path in paths:
+            if path.endswith(".gz"):
+                tasks.append((path, 0, None))
+                continue
+            size = os.path.getsize(path)
+            if size <= self.chunk_size:
+                tasks.append((path, 0, None))
+                continue
+            for start in range(0, size, self.chunk_size):
+                tasks.append((path, start, min(start + self.chunk_size, size)))
+        return tasks
+
+    def _run_tasks(self, tasks: List[Tuple[str, int, Optional[int]]]) -> List[LogScanResult]:
+        """Run scan tasks, in-process when a pool would not pay off."""
+        args = (tuple(self.patterns), self.max_samples, self.max_ips)
+
+        if len(tasks) <= 1 or self.workers <= 1:
+            return [_scan_range(path, start, end, *args) for path, start, end in tasks]
+
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(tasks))) as pool:
+            futures = [
+                pool.submit(_scan_range, path, start, end, *args)
+                for path, start, end in tasks
+            ]
+            return [future.result() for future in futures]
+
+    def analyze(self, paths: List[str]) -> Dict:
+        """
+        Analyze one or more log files.
+
+        Args:
+            paths: Log files, in the order their lines should be numbered
+                   (line numbers restart for each file)
+
+        Returns:
+            Analysis dict with exact counts and bounded samples
+        """
+        tasks = self._plan_tasks(paths)
+        chunk_results = self._run_tasks(tasks)
+
+        total = LogScanResult(len(self.patterns), self.max_samples, self.max_ips)
+        current_path = None
+        line_offset = 0
+        for (path, _, _), chunk in zip(tasks, chunk_results):
+            if path != current_path:
+                current_path = path
+                line_offset = 0
+            total.merge(chunk, line_offset)
+            line_offset += chunk.total_lines
+
+        return self._format(paths, total)
+
+    def analyze_file(self, filepath: str, include_rotated: bool = False) -> Dict:
+        """
+        Analyze a log file, optionally with its rotated siblings.
+
+        With ``include_rotated`` the oldest rotation is scanned first
+        (auth.log.3.gz, auth.log.2.gz, auth.log.1, auth.log).
+        """
+        paths = [filepath]
+        if include_rotated:
+            paths = self.find_rotated(filepath) + paths
+        result = self.analyze(paths)
+        result["file"] = filepath
+        return result
+
+    @staticmethod
+    def find_rotated(filepath: str) -> List[str]:
+        """Find rotated copies of a log file, oldest first."""
+        rotated = []
+        for candidate in glob.glob(glob.escape(filepath) + ".*"):
+            suffix = candidate[len(filepath) + 1:]
+            number = suffix[:-3] if suffix.endswith(".gz") else suffix
+            if number.isdigit():
+                rotated.append((int(number), candidate))
+        return [path for _, path in sorted(rotated, reverse=True)]
+
+    def _format(self, paths: List[str], total: LogScanResult) -> Dict:
+        """Build the public result dict."""
+        return {
+            "file": paths[0] if len(paths) == 1 else paths,
+            "files": list(paths),
+            "total_lines": total.total_lines,
+            "pattern_matches": {
+                p: total.samples[i] for i, p in enumerate(self.patterns)
+            },
+            "ip_addresses": [ip for ip, _ in total.ip_counts.most_common()],
+            "ip_counts": dict(total.ip_counts.most_common(100)),
+            "ip_addresses_truncated": total.ips_truncated,
+            "timestamps": total.timestamps,
+            "summary": {
+                p: total.counts[i] for i, p in enumerate(self.patterns)
+                if total.counts[i]
+            },
+            "max_samples": self.max_samples,
+        }
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Tail / follow mode
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def follow(self, filepath: str, from_start: bool = False,
+               poll_interval: float = 0.5,
+               stop_event: Optional[threading.Event] = None) -> Iterator[Dict]:
+        """
+        Follow a live log and yield an event for every matching line.
+
+        Reopens the file when it is rotated (inode changes) or truncated.
+        Stops when ``stop_event`` is set.
+
+        Yields:
+            {"line", "content", "patterns", "ips", "timestamp"} dicts
+        """
+        stop_event = stop_event or threading.Event()
+        handle = None
+        inode = None
+        line_num = 0
+        pending = b""
+
+        while not stop_event.is_set():
+            if handle is None:
+                try:
+                    handle = open(filepath, "rb")
+                except OSError:
+                    stop_event.wait(poll_interval)
+                    continue
+                inode = os.fstat(handle.fileno()).st_ino
+                if not from_start:
+                    handle.seek(0, os.SEEK_END)
+                line_num = 0
+                pending = b""
+
+            chunk = handle.readline()
+            if chunk:
+                pending += chunk
+                if not pending.endswith(b"\n"):
+                    continue  # Partial line, wait for the writer
+                raw, pending = pending, b""
+                line_num += 1
+                line = raw.decode("utf-8", errors="ignore")
+                hits, ips = self.matcher.scan(line)
+                if hits or ips:
+                    yield {
+                        "line": line_num,
+                        "content": line.strip()[:MAX_LINE_CHARS],
+                        "patterns": [self.patterns[i] for i in sorted(hits)],
+                        "ips": ips,
+                        "timestamp": self.matcher.timestamp(line),
+                    }
+                continue
+
+            # No new data - check for rotation or truncation
+            try:
+                stat = os.stat(filepath)
+                rotated = stat.st_ino != inode
+                truncated = stat.st_size < handle.tell()
+            except OSError:
+                rotated, truncated = True, False
+
+            if rotated:
+                handle.close()
+                handle = None
+                from_start = True
+                continue
+            if truncated:
+                handle.seek(0)
+                line_num = 0
+                pending = b""
+                continue
+
+            stop_event.wait(poll_interval)
+
+        if handle is not None:
+            handle.close()
@@ -36,6 +36,8 @@ from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, field
 from enum import Enum
 
+from .log_analyzer import LogAnalyzer, DEFAULT_LOG_PATTERNS
+
 
 class SeverityLevel(Enum):
     """Vulnerability severity levels."""
@@ -542,65 +544,46 @@ class SecurityToolkit:
             size /= 1024
         return f"{size:.2f} PB"
     
-    def analyze_log_file(self, filepath: str, patterns: List[str] = None) -> Dict:
-        """Analyze a log file for security events."""
+    def analyze_log_file(self, filepath: str, patterns: List[str] = None,
+                         include_rotated: bool = False,
+                         workers: int = None) -> Dict:
+        """
+        Analyze a log file for security events.
+        
+        Uses the compiled, parallel LogAnalyzer: counts in "summary" are
+        exact, while "pattern_matches" keeps a bounded sample per pattern.
+        
+        Args:
+            filepath: Log file to analyze (plain or .gz)
+            patterns: Regex patterns (default: common security events)
+            include_rotated: Also scan rotated copies (file.1, file.2.gz, ...)
+            workers: Process pool size (default: CPU count)
+        """
         if not os.path.exists(filepath):
             return {"error": "File not found"}
         
-        # Default patterns to look for
-        if patterns is None:
-            patterns = [
-                r'failed\s+password',
-                r'authentication\s+failure',
-                r'invalid\s+user',
-                r'refused\s+connect',
-                r'connection\s+refused',
-                r'permission\s+denied',
-                r'access\s+denied',
-                r'error',
-                r'warning',
-                r'critical',
-                r'SQL\s+injection',
-                r'XSS',
-                r'command\s+injection',
-                r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}',  # IP addresses
-            ]
-        
-        results = {
-            "file": filepath,
-            "total_lines": 0,
-            "pattern_matches": {p: [] for p in patterns},
-            "ip_addresses": set(),
-            "timestamps": [],
-        }
-        
         try:
-            with open(filepath, 'r', errors='ignore') as f:
-                for line_num, line in enumerate(f, 1):
-                    results["total_lines"] += 1
-                    
-                    for pattern in patterns:
-                        if re.search(pattern, line, re.IGNORECASE):
-                            results["pattern_matches"][pattern].append({
-                                "line": line_num,
-                                "content": line.strip()[:200]
-                            })
-                    
-                    # Extract IPs
-                    ips = re.findall(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}', line)
-                    results["ip_addresses"].update(ips)
-            
-            results["ip_addresses"] = list(results["ip_addresses"])
-            
-            # Count matches
-            results["summary"] = {
-                p: len(m) for p, m in results["pattern_matches"].items() if m
-            }
-            
+            analyzer = LogAnalyzer(patterns=patterns, workers=workers)
+            return analyzer.analyze_file(filepath, include_rotated=include_rotated)
         except Exception as e:
-            results["error"] = str(e)
+            return {
+                "file": filepath,
+                "total_lines": 0,
+                "pattern_matches": {p: [] for p in (patterns or DEFAULT_LOG_PATTERNS)},
+                "ip_addresses": [],
+                "timestamps": [],
+                "error": str(e),
+            }
+    
+    def follow_log_file(self, filepath: str, patterns: List[str] = None,
+                        stop_event=None):
+        """
+        Follow a live log file, yielding matching lines as they are written.
         
-        return results
+        Set ``stop_event`` (a threading.Event) to stop following.
+        """
+        analyzer = LogAnalyzer(patterns=patterns, workers=1)
+        return analyzer.follow(filepath, stop_event=stop_event)
     
     # ═══════════════════════════════════════════════════════════════════════════
     # VULNERABILITY MANAGEMENT
@@ -29,6 +29,11 @@ try:
 except ImportError:
     from settings_center import get_settings, VA21SettingsCenter
 
+try:
+    from system_tools.command_matcher import CommandMatcher, CommandMatch, KeywordAutomaton
+except ImportError:
+    from command_matcher import CommandMatcher, CommandMatch, KeywordAutomaton
+
 try:
     from system_tools.system_suite import get_system_tools
 except ImportError:
@@ -115,6 +120,8 @@ class VA21CommandInterface:
         
         # Command registry
         self.commands: Dict[str, Command] = {}
+        self.matcher = CommandMatcher(extractors={"timezone_set": self._extract_timezone})
+        self._timezone_automaton: Optional[KeywordAutomaton] = None
         self._register_all_commands()
         
         # Shortcut mapping
@@ -713,6 +720,7 @@ class VA21CommandInterface:
     def _register(self, command: Command):
         """Register a command."""
         self.commands[command.id] = command
+        self.matcher.invalidate()
     
     def _build_shortcut_map(self):
         """Build shortcut to command ID mapping."""
@@ -756,86 +764,53 @@ class VA21CommandInterface:
         })
         
         # Try to match command
-        best_match = None
-        best_score = 0
-        extracted_params = {}
+        matches = self.match_commands(text, k=3)
+        best = matches[0] if matches else None
         
-        for cmd_id, cmd in self.commands.items():
-            if not cmd.enabled:
-                continue
-            
-            score, params = self._match_command(text, cmd)
-            if score > best_score:
-                best_score = score
-                best_match = cmd
-                extracted_params = params
-        
-        if best_match and best_score > 0.5:
-            params = {**best_match.parameters, **extracted_params}
-            result = self._execute_action(best_match.action, params)
+        if best and best.score > 0.5:
+            params = {**best.command.parameters, **best.params}
+            result = self._execute_action(best.command.action, params)
             
             # Update AI context
-            self.ai_context["last_command"] = best_match.id
+            self.ai_context["last_command"] = best.command.id
             self.ai_context["last_result"] = result
             
             return result
         
         # No match found
+        if matches:
+            suggestions = ", ".join(f"'{m.keyword}'" for m in matches)
+            return CommandResult(
+                False,
+                f"I didn't understand that command. Did you mean {suggestions}?",
+                data=[m.command.id for m in matches],
+                speak=True
+            )
         return CommandResult(
             False,
             "I didn't understand that command. Try saying something like 'turn on wifi' or 'set volume to 50'.",
             speak=True
         )
     
-    def _match_command(self, text: str, command: Command) -> Tuple[float, Dict]:
+    def match_commands(self, text: str, k: int = 5) -> List[CommandMatch]:
         """
-        Match text against a command.
-        Returns (score, extracted_parameters).
+        Rank enabled commands for natural language text.
+        Returns up to k matches, best first, with extracted parameters.
         """
-        score = 0.0
-        params = {}
-        
-        # Check exact keyword match
-        for keyword in command.keywords:
-            if keyword in text:
-                score = max(score, 0.9)
-                
-                # Extract parameters based on command type
-                if command.action == "wifi_connect":
-                    match = re.search(r'connect to ["\']?([^"\']+)["\']?', text)
-                    if match:
-                        params["ssid"] = match.group(1).strip()
-                        
-                elif command.action == "volume_set":
-                    match = re.search(r'(\d+)%?', text)
-                    if match:
-                        params["level"] = int(match.group(1))
-                        
-                elif command.action == "brightness_set":
-                    match = re.search(r'(\d+)%?', text)
-                    if match:
-                        params["level"] = int(match.group(1))
-                        
-                elif command.action == "timezone_set":
-                    # Try to extract timezone
-                    for tz in self.settings.datetime.get_available_timezones():
-                        if tz.lower() in text.lower():
-                            params["timezone"] = tz
-                            break
-                
-                break
-        
-        # Fuzzy matching for partial matches
-        if score == 0:
-            words = set(text.split())
-            for keyword in command.keywords:
-                keyword_words = set(keyword.split())
-                overlap = len(words & keyword_words)
-                if overlap > 0:
-                    partial_score = overlap / len(keyword_words)
-                    score = max(score, partial_score * 0.7)
-        
-        return score, params
+        if not self.matcher.is_built:
+            self.matcher.build(self.commands.values())
+        return self.matcher.match(text, k)
+    
+    def _extract_timezone(self, text: str) -> Dict:
+        """Find a timezone name in the text (longest match wins)."""
+        if self._timezone_automaton is None:
+            self._timezone_automaton = KeywordAutomaton(
+                (tz.lower(), tz) for tz in self.settings.datetime.get_available_timezones() if tz
+            )
+        found = self._timezone_automaton.search(text)
+        if not found:
+            return {}
+        return {"timezone": max(found, key=lambda item: len(item[1]))[0]}
     
     def _execute_action(self, action: str, params: Dict) -> CommandResult:
         """Execute an action and return the result."""
@@ -848,6 +823,7 @@ class VA21CommandInterface:
             if action == "wifi_toggle":
                 enable = params.get("enable", True)
                 success, msg = self.settings.wifi.toggle_wifi(enable)
+                self.settings.state.refresh("wifi")
                 return CommandResult(success, msg)
             
             elif action == "wifi_status":
@@ -874,10 +850,12 @@ class VA21CommandInterface:
                 if not ssid:
                     return CommandResult(False, "Please specify a network name")
                 success, msg = self.settings.wifi.connect(ssid, password)
+                self.settings.state.refresh("wifi")
                 return CommandResult(success, msg)
             
             elif action == "wifi_disconnect":
                 success, msg = self.settings.wifi.disconnect()
+                self.settings.state.refresh("wifi")
                 return CommandResult(success, msg)
             
             # ═══════════════════════════════════════════════════════════════════
@@ -889,15 +867,18 @@ class VA21CommandInterface:
                 current = self.settings.audio.get_volume()
                 new_level = max(0, min(100, current + delta))
                 success, msg = self.settings.audio.set_volume(new_level)
+                self.settings.state.refresh("audio")
                 return CommandResult(success, f"Volume: {new_level}%")
             
             elif action == "volume_set":
                 level = params.get("level", 50)
                 success, msg = self.settings.audio.set_volume(level)
+                self.settings.state.refresh("audio")
                 return CommandResult(success, msg)
             
             elif action == "mute_toggle":
                 success, msg = self.settings.audio.toggle_mute()
+                self.settings.state.refresh("audio")
                 return CommandResult(success, msg)
             
             elif action == "mute_set":
@@ -906,6 +887,7 @@ class VA21CommandInterface:
                 want_muted = params.get("mute", True)
                 if is_muted != want_muted:
                     success, msg = self.settings.audio.toggle_mute()
+                    self.settings.state.refresh("audio")
                 else:
                     msg = f"Audio is already {'muted' if is_muted else 'unmuted'}"
                     success = True
@@ -920,11 +902,13 @@ class VA21CommandInterface:
                 current = self.settings.display.get_brightness()
                 new_level = max(10, min(100, current + delta))
                 success, msg = self.settings.display.set_brightness(new_level)
+                self.settings.state.refresh("brightness")
                 return CommandResult(success, f"Brightness: {new_level}%")
             
             elif action == "brightness_set":
                 level = params.get("level", 50)
                 success, msg = self.settings.display.set_brightness(level)
+                self.settings.state.refresh("brightness")
                 return CommandResult(success, msg)
             
             elif action == "screenshot":
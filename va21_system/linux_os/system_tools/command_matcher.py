@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+VA21 Research OS - Compiled Command Matcher
+=============================================
+
+Matches natural-language text against every registered command in one
+pass, instead of testing each command's keywords in turn.
+
+- All keywords of all commands are compiled into one Aho-Corasick
+  automaton, so exact keyword hits cost one walk over the input text
+  no matter how many commands are registered
+- Partial (word-overlap) matches come from an inverted word index
+- Parameter-extraction regexes are compiled once per action
+- Results are ranked, so callers can ask for the top-k candidates to
+  disambiguate
+
+Scores keep the original scale: 0.9 for a keyword found in the text,
+up to 0.7 for partial word overlap.
+
+Om Vinayaka - One pass, every command.
+"""
+
+import re
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+EXACT_SCORE = 0.9
+PARTIAL_SCORE = 0.7
+
+ParamExtractor = Callable[[str], Dict[str, Any]]
+
+
+def _regex_extractor(pattern: str, name: str, convert: Callable = str.strip) -> ParamExtractor:
+    """Extractor that stores group 1 of a precompiled regex as `name`."""
+    compiled = re.compile(pattern)
+
+    def extract(text: str) -> Dict[str, Any]:
+        match = compiled.search(text)
+        return {name: convert(match.group(1))} if match else {}
+    return extract
+
+
+# Parameter extraction per action
+DEFAULT_EXTRACTORS: Dict[str, ParamExtractor] = {
+    "wifi_connect": _regex_extractor(r'connect to ["\']?([^"\']+)["\']?', "ssid"),
+    "volume_set": _regex_extractor(r'(\d+)%?', "level", int),
+    "brightness_set": _regex_extractor(r'(\d+)%?', "level", int),
+}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# KEYWORD AUTOMATON
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton: finds every pattern occurring in a text.
+
+    Each pattern carries a value; search() yields (value, pattern) for
+    every occurrence (substring semantics, like `pattern in text`).
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, Any]] = ()):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[Any, str]]] = [[]]
+        for pattern, value in patterns:
+            self.add(pattern, value)
+        self._compiled = False
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def add(self, pattern: str, value: Any):
+        if not pattern:
+            return
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append((value, pattern))
+        self._compiled = False
+
+    def compile(self):
+        """Compute failure links (breadth-first)."""
+        queue = deque(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                # Inherit matches that end at the fallback state
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+        self._compiled = True
+
+    def search(self, text: str) -> List[Tuple[Any, str]]:
+        if not self._compiled:
+            self.compile()
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        found = []
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.extend(out[state])
+        return found
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# COMMAND MATCHER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class CommandMatch:
+    """A ranked candidate command for some text."""
+    command: Any  # Command
+    score: float
+    keyword: str = ""
+    params: Dict = field(default_factory=dict)
+
+
+class CommandMatcher:
+    """
+    Ranks commands for a piece of text.
+
+    Built lazily from the command registry; call invalidate() after
+    registering commands or changing their keywords. Disabled commands
+    are skipped at match time, so toggling `enabled` needs no rebuild.
+    """
+
+    def __init__(self, extractors: Dict[str, ParamExtractor] = None):
+        self.extractors: Dict[str, ParamExtractor] = dict(DEFAULT_EXTRACTORS)
+        if extractors:
+            self.extractors.update(extractors)
+        self._commands: List[Any] = []
+        self._automaton: Optional[KeywordAutomaton] = None
+        # word -> [(command index, keyword index, keyword word count)]
+        self._word_index: Dict[str, List[Tuple[int, int, int]]] = {}
+
+    def invalidate(self):
+        self._automaton = None
+
+    def build(self, commands: Iterable[Any]):
+        """Compile the keyword automaton and word index."""
+        self._commands = list(commands)
+        automaton = KeywordAutomaton()
+        word_index = defaultdict(list)
+        for index, command in enumerate(self._commands):
+            for keyword_index, keyword in enumerate(command.keywords):
+                keyword = keyword.lower()
+                automaton.add(keyword, index)
+                keyword_words = set(keyword.split())
+                for word in keyword_words:
+                    word_index[word].append((index, keyword_index, len(keyword_words)))
+        automaton.compile()
+        self._word_index = dict(word_index)
+        self._automaton = automaton
+
+    @property
+    def is_built(self) -> bool:
+        return self._automaton is not None
+
+    def match(self, text: str, k: int = 5, min_score: float = 0.0) -> List[CommandMatch]:
+        """
+        Top-k commands for text, best first.
+
+        Ties are broken by the longer (more specific) keyword, then by
+        registration order.
+        """
+        text = text.lower().strip()
+        # index -> (score, keyword length, keyword)
+        best: Dict[int, Tuple[float, int, str]] = {}
+
+        for index, keyword in self._automaton.search(text):
+            current = best.get(index)
+            if current is None or len(keyword) > current[1]:
+                best[index] = (EXACT_SCORE, len(keyword), keyword)
+
+        overlaps: Dict[Tuple[int, int, int], int] = defaultdict(int)
+        for word in set(text.split()):
+            for entry in self._word_index.get(word, ()):
+                if entry[0] not in best:  # Partial scores only for non-exact commands
+                    overlaps[entry] += 1
+        for (index, keyword_index, size), overlap in overlaps.items():
+            score = overlap / size * PARTIAL_SCORE
+            current = best.get(index)
+            if current is None or score > current[0]:
+                keyword = self._commands[index].keywords[keyword_index]
+                best[index] = (score, len(keyword), keyword)
+
+        ranked = sorted(
+            (item for item in best.items()
+             if item[1][0] > min_score and self._commands[item[0]].enabled),
+            key=lambda item: (-item[1][0], -item[1][1], item[0])
+        )
+        results = []
+        for index, (score, _, keyword) in ranked[:k]:
+            command = self._commands[index]
+            extractor = self.extractors.get(command.action)
+            params = extractor(text) if extractor else {}
+            results.append(CommandMatch(command, score, keyword, params))
+        return results
+
+    def get_stats(self) -> Dict:
+        return {
+            'commands': len(self._commands),
+            'automaton_states': len(self._automaton) if self._automaton else 0,
+            'indexed_words': len(self._word_index),
+        }
@@ -19,6 +19,7 @@ Features:
 - Storage Management
 - User Accounts
 - System Updates
+- Cached status-bar state with event-driven backends
 
 Om Vinayaka - Complete control, elegant simplicity.
 """
@@ -40,6 +41,13 @@ try:
 except ImportError:
     PSUTIL_AVAILABLE = False
 
+try:
+    from .settings_state import (SettingsStateService, StateBackend, SysfsBrightnessBackend,
+                                 create_default_backends)
+except ImportError:
+    from settings_state import (SettingsStateService, StateBackend, SysfsBrightnessBackend,
+                                create_default_backends)
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # DATA CLASSES
@@ -536,6 +544,18 @@ class DisplayManager:
     
     def get_brightness(self) -> int:
         """Get current screen brightness (0-100)."""
+        # Read back from wherever set_brightness writes
+        device = SysfsBrightnessBackend.find_device(writable=True)
+        try:
+            if device:
+                with open(os.path.join(device, "brightness")) as f:
+                    current = int(f.read().strip())
+                with open(os.path.join(device, "max_brightness")) as f:
+                    maximum = int(f.read().strip())
+                return int((current / maximum) * 100)
+        except:
+            pass
+        
         try:
             # Try xrandr
             result = subprocess.run(
@@ -549,20 +569,6 @@ class DisplayManager:
         except:
             pass
         
-        try:
-            # Try backlight
-            brightness_file = "/sys/class/backlight/intel_backlight/brightness"
-            max_file = "/sys/class/backlight/intel_backlight/max_brightness"
-            
-            if os.path.exists(brightness_file) and os.path.exists(max_file):
-                with open(brightness_file) as f:
-                    current = int(f.read().strip())
-                with open(max_file) as f:
-                    maximum = int(f.read().strip())
-                return int((current / maximum) * 100)
-        except:
-            pass
-        
         return 100
     
     def set_brightness(self, level: int) -> Tuple[bool, str]:
@@ -570,7 +576,23 @@ class DisplayManager:
         level = max(10, min(100, level))  # Clamp between 10-100
         
         try:
-            # Try xrandr first - detect primary display dynamically
+            # Backlight first when it is writable: the settings state
+            # service reads the level back from sysfs in that case
+            device = SysfsBrightnessBackend.find_device(writable=True)
+            if device:
+                with open(os.path.join(device, "max_brightness")) as f:
+                    maximum = int(f.read().strip())
+                new_value = int((level / 100.0) * maximum)
+                with open(os.path.join(device, "brightness"), 'w') as f:
+                    f.write(str(new_value))
+                return True, f"Brightness set to {level}%"
+        except PermissionError:
+            return False, "Permission denied - need root access for brightness control"
+        except Exception:
+            pass
+        
+        try:
+            # Otherwise xrandr - detect primary display dynamically
             displays = self.get_displays()
             display_name = None
             for d in displays:
@@ -591,29 +613,6 @@ class DisplayManager:
         except Exception:
             pass
         
-        try:
-            # Try backlight - search for available backlight device
-            backlight_base = "/sys/class/backlight"
-            if os.path.exists(backlight_base):
-                devices = os.listdir(backlight_base)
-                for device in devices:
-                    brightness_file = os.path.join(backlight_base, device, "brightness")
-                    max_file = os.path.join(backlight_base, device, "max_brightness")
-                    
-                    if os.path.exists(brightness_file) and os.path.exists(max_file):
-                        # Check if writable
-                        if os.access(brightness_file, os.W_OK):
-                            with open(max_file) as f:
-                                maximum = int(f.read().strip())
-                            new_value = int((level / 100.0) * maximum)
-                            with open(brightness_file, 'w') as f:
-                                f.write(str(new_value))
-                            return True, f"Brightness set to {level}%"
-        except PermissionError:
-            return False, "Permission denied - need root access for brightness control"
-        except Exception:
-            pass
-        
         return False, "Could not set brightness"
 
 
@@ -874,7 +873,8 @@ class VA21SettingsCenter:
     
     VERSION = "1.0.0"
     
-    def __init__(self, config_path: str = "/va21/config"):
+    def __init__(self, config_path: str = "/va21/config",
+                 state_backends: List[StateBackend] = None):
         self.config_path = config_path
         
         # Initialize managers
@@ -884,6 +884,11 @@ class VA21SettingsCenter:
         self.audio = AudioManager()
         self.appearance = AppearanceSettings(config_path)
         
+        # Cached state for the status bar (started on first use)
+        if state_backends is None:
+            state_backends = create_default_backends(self.wifi, self.audio, self.display)
+        self.state = SettingsStateService(state_backends)
+        
         # General settings
         self.settings_file = os.path.join(config_path, "settings.json")
         self.general_settings = self._load_general_settings()
@@ -944,8 +949,14 @@ class VA21SettingsCenter:
         }
     
     def get_quick_settings(self) -> Dict:
-        """Get quick settings for the status bar / panel."""
-        wifi_status = self.wifi.get_status()
+        """Get quick settings for the status bar / panel (from the state cache)."""
+        if not self.state.started:
+            self.state.start()
+        state = self.state.snapshot()
+        wifi_status = state.get("wifi") or {}
+        audio = state.get("audio") or {}
+        brightness = state.get("brightness")
+        now = datetime.now()
         
         return {
             "wifi": {
@@ -953,15 +964,19 @@ class VA21SettingsCenter:
                 "ssid": wifi_status.get("ssid"),
                 "signal": wifi_status.get("signal", 0)
             },
-            "time": datetime.now().strftime("%H:%M"),
-            "date": datetime.now().strftime("%a %b %d"),
-            "volume": self.audio.get_volume(),
-            "muted": self.audio.is_muted(),
-            "brightness": self.display.get_brightness(),
+            "time": now.strftime("%H:%M"),
+            "date": now.strftime("%a %b %d"),
+            "volume": audio.get("volume", 50),
+            "muted": audio.get("muted", False),
+            "brightness": brightness if brightness is not None else 100,
             "battery": self._get_battery_status(),
             "theme": self.appearance.get_theme()
         }
     
+    def shutdown(self):
+        """Stop the state backends (monitor processes and pollers)."""
+        self.state.stop()
+    
     def _get_battery_status(self) -> Optional[Dict]:
         """Get battery status if available."""
         if PSUTIL_AVAILABLE:
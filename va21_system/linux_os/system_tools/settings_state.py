@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+VA21 Research OS - Settings State Service
+===========================================
+
+Cached system state for the status bar and quick settings panel.
+
+Reading volume, mute, brightness and WiFi status used to cost a
+handful of subprocesses on every panel refresh. Here each piece of
+state has a backend that keeps it up to date on its own, and the panel
+reads a snapshot dict that is swapped atomically on change.
+
+Backends:
+- SysfsBrightnessBackend: /sys/class/backlight, polled (file reads only);
+  used when the backlight is writable, since brightness is then set there
+- EventStreamBackend: one long-lived monitor process (`pactl subscribe`,
+  `nmcli monitor`); state is re-read only when it reports a change
+- PollingBackend: slow polling fallback when no event source exists
+- StaticStateBackend: fixed values, set by hand (headless runs, tests)
+
+Om Vinayaka - Know the state of the system without asking twice.
+"""
+
+import os
+import re
+import time
+import shutil
+import subprocess
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+SETTINGS_STATE_VERSION = "1.0.0"
+
+BACKLIGHT_PATH = "/sys/class/backlight"
+# Seconds between backlight reads (two small sysfs files, no processes)
+BRIGHTNESS_POLL_INTERVAL = 1.0
+# Seconds between reads when a value has no event source
+FALLBACK_POLL_INTERVAL = 5.0
+# Seconds between network re-reads while idle (signal strength has no event)
+NETWORK_RESYNC_INTERVAL = 30.0
+# Bursts of monitor events within this window cause a single re-read
+EVENT_DEBOUNCE = 0.1
+
+# `pactl subscribe` lines that can change the default sink's volume/mute
+PACTL_EVENT_RE = re.compile(r"Event '\w+' on (?:sink #|server)")
+
+PublishCallback = Callable[[str, Any], None]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BACKENDS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class StateBackend(ABC):
+    """
+    Keeps one snapshot key up to date.
+
+    start() publishes the initial value and then publishes again whenever
+    the value may have changed. Subclasses implement read().
+    """
+
+    name = "none"
+
+    def __init__(self, key: str):
+        self.key = key
+        self.running = False
+        self._publish: Optional[PublishCallback] = None
+
+    @abstractmethod
+    def read(self) -> Any:
+        """Current value of the key."""
+        pass
+
+    def start(self, publish: PublishCallback):
+        self._publish = publish
+        self.running = True
+        self.refresh()
+
+    def refresh(self):
+        """Re-read now (e.g. right after the value was changed by VA21)."""
+        if self._publish is None:
+            return
+        try:
+            value = self.read()
+        except Exception as e:
+            print(f"[SettingsState] {self.name} read failed: {e}")
+            return
+        self._publish(self.key, value)
+
+    def stop(self):
+        self.running = False
+
+
+class StaticStateBackend(StateBackend):
+    """A value set by hand; stands in for a real backend."""
+
+    name = "static"
+
+    def __init__(self, key: str, value: Any = None):
+        super().__init__(key)
+        self.value = value
+
+    def read(self) -> Any:
+        return self.value
+
+    def set(self, value: Any):
+        self.value = value
+        self.refresh()
+
+
+class PollingBackend(StateBackend):
+    """Re-reads a value on a fixed interval from a background thread."""
+
+    name = "poll"
+
+    def __init__(self, key: str, read_fn: Callable[[], Any],
+                 interval: float = FALLBACK_POLL_INTERVAL, name: str = None):
+        super().__init__(key)
+        self.read_fn = read_fn
+        self.interval = interval
+        if name:
+            self.name = name
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def read(self) -> Any:
+        return self.read_fn()
+
+    def start(self, publish: PublishCallback):
+        super().start(publish)
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name=f"va21-state-{self.key}")
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.refresh()
+
+    def stop(self):
+        super().stop()
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+
+class SysfsBrightnessBackend(PollingBackend):
+    """Backlight level (0-100) from /sys/class/backlight."""
+
+    name = "sysfs-backlight"
+
+    def __init__(self, backlight_path: str = BACKLIGHT_PATH,
+                 interval: float = BRIGHTNESS_POLL_INTERVAL):
+        super().__init__('brightness', self._read_level, interval)
+        self.device_path = self.find_device(backlight_path)
+        self._max = None
+
+    @staticmethod
+    def find_device(backlight_path: str = BACKLIGHT_PATH,
+                    writable: bool = False) -> Optional[str]:
+        """The backlight device with the finest control, or None."""
+        best, best_max = None, 0
+        try:
+            names = os.listdir(backlight_path)
+        except OSError:
+            return None
+        for name in names:
+            path = os.path.join(backlight_path, name)
+            if writable and not os.access(os.path.join(path, "brightness"), os.W_OK):
+                continue
+            try:
+                with open(os.path.join(path, "max_brightness")) as f:
+                    maximum = int(f.read().strip())
+            except (OSError, ValueError):
+                continue
+            if maximum > best_max:
+                best, best_max = path, maximum
+        return best
+
+    def _read_level(self) -> Optional[int]:
+        if self.device_path is None:
+            return None
+        if self._max is None:
+            with open(os.path.join(self.device_path, "max_brightness")) as f:
+                self._max = int(f.read().strip()) or 1
+        current_file = os.path.join(self.device_path, "actual_brightness")
+        if not os.path.exists(current_file):
+            current_file = os.path.join(self.device_path, "brightness")
+        with open(current_file) as f:
+            current = int(f.read().strip())
+        return int(round(current * 100 / self._max))
+
+
+class EventStreamBackend(StateBackend):
+    """
+    Re-reads a value when a long-lived monitor process reports a change.
+
+    Args:
+        key: Snapshot key
+        command: Monitor command (e.g. ["pactl", "subscribe"])
+        read_fn: Reads the current value
+        relevant: Only lines matching this regex trigger a re-read
+        resync_interval: Also re-read this often while idle (None = never)
+    """
+
+    name = "event-stream"
+
+    def __init__(self, key: str, command: List[str], read_fn: Callable[[], Any],
+                 relevant: re.Pattern = None, resync_interval: float = None,
+                 name: str = None):
+        super().__init__(key)
+        self.command = command
+        self.read_fn = read_fn
+        self.relevant = relevant
+        self.resync_interval = resync_interval
+        if name:
+            self.name = name
+        self._proc: Optional[subprocess.Popen] = None
+        self._dirty = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self.stats = {'events': 0, 'reads': 0}
+
+    def read(self) -> Any:
+        self.stats['reads'] += 1
+        return self.read_fn()
+
+    def start(self, publish: PublishCallback):
+        self._proc = subprocess.Popen(
+            self.command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, bufsize=1
+        )
+        super().start(publish)
+        self._threads = [
+            threading.Thread(target=self._read_events, daemon=True,
+                             name=f"va21-state-{self.key}-events"),
+            threading.Thread(target=self._refresh_loop, daemon=True,
+                             name=f"va21-state-{self.key}"),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _read_events(self):
+        for line in self._proc.stdout:
+            if not self.running:
+                return
+            if self.relevant is None or self.relevant.search(line):
+                self.stats['events'] += 1
+                self._dirty.set()
+        if self.running:
+            print(f"[SettingsState] {self.name} exited; polling every "
+                  f"{FALLBACK_POLL_INTERVAL:.0f}s instead")
+            self._dirty.set()
+
+    def _refresh_loop(self):
+        while self.running:
+            alive = self._proc is not None and self._proc.poll() is None
+            timeout = self.resync_interval if alive else FALLBACK_POLL_INTERVAL
+            if self._dirty.wait(timeout):
+                time.sleep(EVENT_DEBOUNCE)  # Let the rest of the burst arrive
+            self._dirty.clear()
+            if self.running:
+                self.refresh()
+
+    def stop(self):
+        super().stop()
+        self._dirty.set()
+        if self._proc:
+            self._proc.terminate()
+            try:
+                self._proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+            self._proc = None
+        for thread in self._threads:
+            thread.join(timeout=1)
+        self._threads = []
+
+
+def create_default_backends(wifi, audio, display) -> List[StateBackend]:
+    """Best backends for this machine, built on the settings managers."""
+    backends: List[StateBackend] = []
+
+    # DisplayManager writes the backlight only when it may; otherwise the
+    # level is set (and must be read back) through xrandr
+    if SysfsBrightnessBackend.find_device(writable=True):
+        backends.append(SysfsBrightnessBackend())
+    else:
+        backends.append(PollingBackend('brightness', display.get_brightness,
+                                       name="xrandr-poll"))
+
+    def read_audio():
+        return {"volume": audio.get_volume(), "muted": audio.is_muted()}
+
+    if audio.backend == "pulseaudio" and shutil.which("pactl"):
+        backends.append(EventStreamBackend('audio', ["pactl", "subscribe"], read_audio,
+                                           relevant=PACTL_EVENT_RE, name="pactl-subscribe"))
+    else:
+        backends.append(PollingBackend('audio', read_audio, name=f"{audio.backend}-poll"))
+
+    if wifi.backend == "nmcli" and shutil.which("nmcli"):
+        backends.append(EventStreamBackend('wifi', ["nmcli", "monitor"], wifi.get_status,
+                                           resync_interval=NETWORK_RESYNC_INTERVAL,
+                                           name="nmcli-monitor"))
+    else:
+        backends.append(PollingBackend('wifi', wifi.get_status,
+                                       interval=NETWORK_RESYNC_INTERVAL,
+                                       name=f"{wifi.backend}-poll"))
+    return backends
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# STATE SERVICE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class SettingsStateService:
+    """
+    Publishes a snapshot of system state assembled from backends.
+
+    snapshot() is a single attribute read; the dict it returns is never
+    mutated (a new one replaces it on every change), so callers can use
+    it without locking but must not modify it.
+    """
+
+    def __init__(self, backends: List[StateBackend]):
+        self.backends = list(backends)
+        self._snapshot: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self.started = False
+        self.stats = {'updates': 0, 'unchanged': 0}
+
+    def start(self):
+        """Start every backend (one failing does not stop the others)."""
+        with self._lock:
+            if self.started:
+                return
+            self.started = True
+        for backend in self.backends:
+            try:
+                backend.start(self._publish)
+            except Exception as e:
+                print(f"[SettingsState] Could not start {backend.name}: {e}")
+
+    def stop(self):
+        for backend in self.backends:
+            backend.stop()
+        self.started = False
+
+    def _publish(self, key: str, value: Any):
+        with self._lock:
+            if key in self._snapshot and self._snapshot[key] == value:
+                self.stats['unchanged'] += 1
+                return
+            snapshot = dict(self._snapshot)
+            snapshot[key] = value
+            self._snapshot = snapshot
+            self.stats['updates'] += 1
+            listeners = list(self._listeners)
+        for callback in listeners:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"[SettingsState] Listener error: {e}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """The current state (read-only)."""
+        return self._snapshot
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._snapshot.get(key, default)
+
+    def refresh(self, key: str = None):
+        """Re-read one key (or all) immediately."""
+        for backend in self.backends:
+            if key is None or backend.key == key:
+                backend.refresh()
+
+    def add_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """Called with the new snapshot whenever a value changes."""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def get_status(self) -> Dict:
+        return {
+            'started': self.started,
+            'backends': {b.key: {'name': b.name, 'running': b.running} for b in self.backends},
+            **self.stats,
+        }
@@ -2,5 +2,5 @@
 """
 VA21 Tiling Window Manager - Keyboard-driven window management.
 """
-from .tiling_wm import TilingWindowManager, get_window_manager
+from .tiling_wm import TilingWindowManager, GeometryDelta, get_window_manager
 __version__ = "1.0.0"
@@ -13,17 +13,28 @@ Features:
 - Workspaces/virtual desktops
 - Focus follows keyboard
 - Split and resize panes
+- Incremental layout with damage tracking and batched commits
 
 Om Vinayaka - Organized as the cosmos, efficient as thought.
 """
 
 import os
+import sys
 import json
+import time
+from collections import OrderedDict
+from contextlib import contextmanager, redirect_stdout
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+# (x, y, width, height)
+Rect = Tuple[int, int, int, int]
+
+# Computed layouts kept for reuse (shared by all workspaces)
+GEOMETRY_CACHE_SIZE = 64
+
 
 class Layout(Enum):
     """Window layout types."""
@@ -62,6 +73,16 @@ class Window:
     created_at: datetime = field(default_factory=datetime.now)
 
 
+@dataclass
+class GeometryDelta:
+    """A window whose geometry changed in a layout commit."""
+    window_id: str
+    x: int
+    y: int
+    width: int
+    height: int
+
+
 @dataclass
 class Workspace:
     """A virtual desktop/workspace."""
@@ -151,6 +172,26 @@ class TilingWindowManager:
         self.windows: Dict[str, Window] = {}
         self.focused_window: Optional[str] = None
         
+        # Called with the focused Window (or None) whenever focus changes
+        self._focus_listeners: List[Callable[[Optional[Window]], None]] = []
+        
+        # Incremental layout: last layout key per workspace, shared geometry
+        # cache, and listeners receiving the geometry deltas of each commit
+        self.incremental = True
+        self._layout_keys: Dict[int, tuple] = {}
+        self._geometry_cache: "OrderedDict[tuple, List[Rect]]" = OrderedDict()
+        self._layout_listeners: List[Callable[[List[GeometryDelta]], None]] = []
+        self._batch_depth = 0
+        self._dirty_workspaces: set = set()
+        self.layout_stats = {
+            "commits": 0,
+            "tiles": 0,
+            "unchanged": 0,
+            "geometry_hits": 0,
+            "geometry_misses": 0,
+            "deltas": 0,
+        }
+        
         # Workspaces (default 4)
         self.workspaces: Dict[int, Workspace] = {}
         self.current_workspace = 1
@@ -190,6 +231,10 @@ class TilingWindowManager:
             Created Window object
         """
         window_id = f"win_{datetime.now().strftime('%H%M%S%f')}"
+        suffix = 1
+        while window_id in self.windows:  # Created within the same microsecond
+            window_id = f"win_{datetime.now().strftime('%H%M%S%f')}_{suffix}"
+            suffix += 1
         
         window = Window(
             id=window_id,
@@ -243,6 +288,7 @@ class TilingWindowManager:
                 self.focus_window(workspace.windows[-1])
             else:
                 self.focused_window = None
+                self._notify_focus()
         
         # Re-tile
         self.tile()
@@ -263,6 +309,8 @@ class TilingWindowManager:
         if window_id not in self.windows:
             return False
         
+        previous = self.focused_window
+        
         # Unfocus current
         if self.focused_window and self.focused_window in self.windows:
             self.windows[self.focused_window].is_focused = False
@@ -276,8 +324,28 @@ class TilingWindowManager:
         if window.workspace != self.current_workspace:
             self.switch_workspace(window.workspace)
         
+        if self.focused_window != previous:
+            self._notify_focus()
+        
         return True
     
+    def add_focus_listener(self, callback: Callable[[Optional[Window]], None]):
+        """Register a callback for focus changes (receives the Window or None)."""
+        if callback not in self._focus_listeners:
+            self._focus_listeners.append(callback)
+    
+    def remove_focus_listener(self, callback: Callable[[Optional[Window]], None]):
+        if callback in self._focus_listeners:
+            self._focus_listeners.remove(callback)
+    
+    def _notify_focus(self):
+        window = self.windows.get(self.focused_window) if self.focused_window else None
+        for callback in list(self._focus_listeners):
+            try:
+                callback(window)
+            except Exception as e:
+                print(f"[WM] Focus listener error: {e}")
+    
     def focus_direction(self, direction: Direction) -> bool:
         """
         Focus the window in a direction.
@@ -493,8 +561,9 @@ class TilingWindowManager:
         # Focus first window if available
         if workspace.windows:
             self.focus_window(workspace.windows[0])
-        else:
+        elif self.focused_window is not None:
             self.focused_window = None
+            self._notify_focus()
         
         self.tile()
         print(f"[WM] Workspace: {workspace.name}")
@@ -534,148 +603,204 @@ class TilingWindowManager:
                 self.focus_window(current_ws.windows[-1])
             else:
                 self.focused_window = None
+                self._notify_focus()
         
         self.tile()
         return True
     
-    def tile(self):
-        """
-        Tile all windows according to the current layout.
+    def tile(self) -> List[GeometryDelta]:
         """
-        workspace = self.workspaces[self.current_workspace]
+        Tile the current workspace according to its layout.
         
-        # Get visible windows (not minimized, in current workspace)
-        visible_windows = [
-            self.windows[wid] for wid in workspace.windows
-            if wid in self.windows and not self.windows[wid].is_minimized
-        ]
+        Only windows whose geometry changed are updated and reported to
+        layout listeners. Inside batch() the work is deferred to the end
+        of the batch.
         
-        # Handle fullscreen
-        fullscreen_windows = [w for w in visible_windows if w.is_fullscreen]
-        if fullscreen_windows:
-            win = fullscreen_windows[0]
-            win.x = 0
-            win.y = 0
-            win.width = self.screen_width
-            win.height = self.screen_height
-            return
+        Returns:
+            Geometry deltas applied (empty when deferred or unchanged)
+        """
+        if self._batch_depth:
+            self._dirty_workspaces.add(self.current_workspace)
+            return []
+        return self._commit([self.current_workspace])
+    
+    @contextmanager
+    def batch(self):
+        """
+        Group several operations into one layout commit.
         
-        # Separate floating windows
-        tiled_windows = [w for w in visible_windows if not w.is_floating]
+        Example:
+            with wm.batch():
+                wm.move_window(window_id, Direction.LEFT)
+                wm.set_layout(Layout.COLUMNS)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._dirty_workspaces:
+                dirty = sorted(self._dirty_workspaces)
+                self._dirty_workspaces.clear()
+                self._commit(dirty)
+    
+    def add_layout_listener(self, callback: Callable[[List[GeometryDelta]], None]):
+        """Register a callback receiving the geometry deltas of each commit."""
+        if callback not in self._layout_listeners:
+            self._layout_listeners.append(callback)
+    
+    def remove_layout_listener(self, callback: Callable[[List[GeometryDelta]], None]):
+        if callback in self._layout_listeners:
+            self._layout_listeners.remove(callback)
+    
+    def _commit(self, workspace_ids: List[int]) -> List[GeometryDelta]:
+        """Lay out workspaces and publish the combined deltas."""
+        deltas = []
+        for workspace_id in workspace_ids:
+            if workspace_id in self.workspaces:
+                deltas.extend(self._tile_workspace(workspace_id))
+        
+        self.layout_stats["commits"] += 1
+        self.layout_stats["deltas"] += len(deltas)
+        if deltas:
+            for callback in list(self._layout_listeners):
+                try:
+                    callback(deltas)
+                except Exception as e:
+                    print(f"[WM] Layout listener error: {e}")
+        return deltas
+    
+    def _tile_workspace(self, workspace_id: int) -> List[GeometryDelta]:
+        """Lay out one workspace, skipping it if nothing that affects it changed."""
+        workspace = self.workspaces[workspace_id]
+        windows = self.windows
+        self.layout_stats["tiles"] += 1
+        
+        # Visible windows (not minimized); a fullscreen window hides the rest
+        visible = [wid for wid in workspace.windows
+                   if wid in windows and not windows[wid].is_minimized]
+        fullscreen = next((wid for wid in visible if windows[wid].is_fullscreen), None)
+        tiled = () if fullscreen else tuple(wid for wid in visible if not windows[wid].is_floating)
+        
+        area = (self.work_area["x"], self.work_area["y"],
+                self.work_area["width"], self.work_area["height"], self.gap)
+        key = (tiled, fullscreen, workspace.layout, workspace.master_ratio,
+               self.screen_width, self.screen_height, area)
+        if self.incremental and self._layout_keys.get(workspace_id) == key:
+            self.layout_stats["unchanged"] += 1
+            return []
+        self._layout_keys[workspace_id] = key
+        
+        if fullscreen:
+            placements = [(fullscreen, (0, 0, self.screen_width, self.screen_height))]
+        elif tiled:
+            placements = zip(tiled, self._geometry(workspace.layout, len(tiled),
+                                                   workspace.master_ratio, area))
+        else:
+            placements = []
         
-        if not tiled_windows:
-            return
+        deltas = []
+        for wid, rect in placements:
+            win = windows[wid]
+            if self.incremental and (win.x, win.y, win.width, win.height) == rect:
+                continue
+            win.x, win.y, win.width, win.height = rect
+            deltas.append(GeometryDelta(wid, *rect))
+        return deltas
+    
+    def _geometry(self, layout: Layout, count: int, ratio: float, area: tuple) -> List[Rect]:
+        """Window rectangles for a layout (cached; depends only on the count)."""
+        key = (layout, count, ratio, area)
+        rects = self._geometry_cache.get(key) if self.incremental else None
+        if rects is not None:
+            self._geometry_cache.move_to_end(key)
+            self.layout_stats["geometry_hits"] += 1
+            return rects
+        self.layout_stats["geometry_misses"] += 1
         
         # Calculate work area with gaps
-        x = self.work_area["x"] + self.gap
-        y = self.work_area["y"] + self.gap
-        w = self.work_area["width"] - (self.gap * 2)
-        h = self.work_area["height"] - (self.gap * 2)
+        x = area[0] + self.gap
+        y = area[1] + self.gap
+        w = area[2] - (self.gap * 2)
+        h = area[3] - (self.gap * 2)
         
         # Apply layout
-        if workspace.layout == Layout.MONOCLE:
-            self._layout_monocle(tiled_windows, x, y, w, h)
-        elif workspace.layout == Layout.TALL:
-            self._layout_tall(tiled_windows, x, y, w, h, workspace.master_ratio)
-        elif workspace.layout == Layout.WIDE:
-            self._layout_wide(tiled_windows, x, y, w, h, workspace.master_ratio)
-        elif workspace.layout == Layout.COLUMNS:
-            self._layout_columns(tiled_windows, x, y, w, h)
-        elif workspace.layout == Layout.ROWS:
-            self._layout_rows(tiled_windows, x, y, w, h)
-        elif workspace.layout == Layout.GRID:
-            self._layout_grid(tiled_windows, x, y, w, h)
-    
-    def _layout_monocle(self, windows: List[Window], x: int, y: int, w: int, h: int):
+        if layout == Layout.MONOCLE:
+            rects = self._layout_monocle(count, x, y, w, h)
+        elif layout == Layout.TALL:
+            rects = self._layout_tall(count, x, y, w, h, ratio)
+        elif layout == Layout.WIDE:
+            rects = self._layout_wide(count, x, y, w, h, ratio)
+        elif layout == Layout.COLUMNS:
+            rects = self._layout_columns(count, x, y, w, h)
+        elif layout == Layout.ROWS:
+            rects = self._layout_rows(count, x, y, w, h)
+        elif layout == Layout.GRID:
+            rects = self._layout_grid(count, x, y, w, h)
+        else:
+            rects = []  # Floating: windows keep their geometry
+        
+        self._geometry_cache[key] = rects
+        if len(self._geometry_cache) > GEOMETRY_CACHE_SIZE:
+            self._geometry_cache.popitem(last=False)
+        return rects
+    
+    def _layout_monocle(self, count: int, x: int, y: int, w: int, h: int) -> List[Rect]:
         """Full screen layout - only show focused window."""
-        for win in windows:
-            win.x = x
-            win.y = y
-            win.width = w
-            win.height = h
+        return [(x, y, w, h)] * count
     
-    def _layout_tall(self, windows: List[Window], x: int, y: int, w: int, h: int, ratio: float):
+    def _layout_tall(self, count: int, x: int, y: int, w: int, h: int, ratio: float) -> List[Rect]:
         """Master-stack layout (master on left)."""
-        if len(windows) == 1:
-            windows[0].x = x
-            windows[0].y = y
-            windows[0].width = w
-            windows[0].height = h
-            return
+        if count == 1:
+            return [(x, y, w, h)]
         
         master_width = int(w * ratio)
         stack_width = w - master_width - self.gap
         
         # Master window
-        windows[0].x = x
-        windows[0].y = y
-        windows[0].width = master_width
-        windows[0].height = h
+        rects = [(x, y, master_width, h)]
         
         # Stack windows
-        stack_count = len(windows) - 1
+        stack_count = count - 1
         stack_height = (h - (self.gap * (stack_count - 1))) // stack_count
         
-        for i, win in enumerate(windows[1:]):
-            win.x = x + master_width + self.gap
-            win.y = y + (stack_height + self.gap) * i
-            win.width = stack_width
-            win.height = stack_height
+        for i in range(stack_count):
+            rects.append((x + master_width + self.gap, y + (stack_height + self.gap) * i,
+                          stack_width, stack_height))
+        return rects
     
-    def _layout_wide(self, windows: List[Window], x: int, y: int, w: int, h: int, ratio: float):
+    def _layout_wide(self, count: int, x: int, y: int, w: int, h: int, ratio: float) -> List[Rect]:
         """Master-stack layout (master on top)."""
-        if len(windows) == 1:
-            windows[0].x = x
-            windows[0].y = y
-            windows[0].width = w
-            windows[0].height = h
-            return
+        if count == 1:
+            return [(x, y, w, h)]
         
         master_height = int(h * ratio)
         stack_height = h - master_height - self.gap
         
         # Master window
-        windows[0].x = x
-        windows[0].y = y
-        windows[0].width = w
-        windows[0].height = master_height
+        rects = [(x, y, w, master_height)]
         
         # Stack windows
-        stack_count = len(windows) - 1
+        stack_count = count - 1
         stack_width = (w - (self.gap * (stack_count - 1))) // stack_count
         
-        for i, win in enumerate(windows[1:]):
-            win.x = x + (stack_width + self.gap) * i
-            win.y = y + master_height + self.gap
-            win.width = stack_width
-            win.height = stack_height
+        for i in range(stack_count):
+            rects.append((x + (stack_width + self.gap) * i, y + master_height + self.gap,
+                          stack_width, stack_height))
+        return rects
     
-    def _layout_columns(self, windows: List[Window], x: int, y: int, w: int, h: int):
+    def _layout_columns(self, count: int, x: int, y: int, w: int, h: int) -> List[Rect]:
         """Equal columns layout."""
-        col_count = len(windows)
-        col_width = (w - (self.gap * (col_count - 1))) // col_count
-        
-        for i, win in enumerate(windows):
-            win.x = x + (col_width + self.gap) * i
-            win.y = y
-            win.width = col_width
-            win.height = h
+        col_width = (w - (self.gap * (count - 1))) // count
+        return [(x + (col_width + self.gap) * i, y, col_width, h) for i in range(count)]
     
-    def _layout_rows(self, windows: List[Window], x: int, y: int, w: int, h: int):
+    def _layout_rows(self, count: int, x: int, y: int, w: int, h: int) -> List[Rect]:
         """Equal rows layout."""
-        row_count = len(windows)
-        row_height = (h - (self.gap * (row_count - 1))) // row_count
-        
-        for i, win in enumerate(windows):
-            win.x = x
-            win.y = y + (row_height + self.gap) * i
-            win.width = w
-            win.height = row_height
+        row_height = (h - (self.gap * (count - 1))) // count
+        return [(x, y + (row_height + self.gap) * i, w, row_height) for i in range(count)]
     
-    def _layout_grid(self, windows: List[Window], x: int, y: int, w: int, h: int):
+    def _layout_grid(self, count: int, x: int, y: int, w: int, h: int) -> List[Rect]:
         """Automatic grid layout."""
-        count = len(windows)
-        
         # Calculate grid dimensions
         cols = 1
         while cols * cols < count:
@@ -685,14 +810,11 @@ class TilingWindowManager:
         cell_width = (w - (self.gap * (cols - 1))) // cols
         cell_height = (h - (self.gap * (rows - 1))) // rows
         
-        for i, win in enumerate(windows):
-            row = i // cols
-            col = i % cols
-            
-            win.x = x + (cell_width + self.gap) * col
-            win.y = y + (cell_height + self.gap) * row
-            win.width = cell_width
-            win.height = cell_height
+        return [
+            (x + (cell_width + self.gap) * (i % cols), y + (cell_height + self.gap) * (i // cols),
+             cell_width, cell_height)
+            for i in range(count)
+        ]
     
     def render_status_bar(self) -> str:
         """Render the status bar."""
@@ -736,6 +858,7 @@ class TilingWindowManager:
             "window_count": len([w for w in self.windows.values() 
                                  if w.workspace == self.current_workspace]),
             "focused_window": self.focused_window,
+            "layout_stats": dict(self.layout_stats),
             "workspaces": {
                 ws_id: {
                     "name": ws.name,
@@ -761,7 +884,71 @@ def get_window_manager() -> TilingWindowManager:
     return _wm_instance
 
 
-if __name__ == "__main__":
+# ═══════════════════════════════════════════════════════════════════════════════
+# BENCHMARK
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def benchmark_layout(workspace_count: int = 10, windows_per_workspace: int = 20,
+                     rounds: int = 20) -> Dict:
+    """
+    Compare incremental layout against full re-layout on every call.
+    
+    Builds workspace_count workspaces with windows_per_workspace windows
+    each, then replays the same operations (workspace switches, focus,
+    batched move + layout change, resize, fullscreen toggle) in both modes.
+    
+    Returns:
+        Per-mode timings, commits and geometry updates
+    """
+    layouts = [Layout.TALL, Layout.GRID, Layout.COLUMNS, Layout.WIDE]
+    results = {}
+    
+    for incremental in (False, True):
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            wm = TilingWindowManager(screen_width=1920, screen_height=1080)
+            wm.incremental = incremental
+            for ws_id in range(1, workspace_count + 1):
+                wm.workspaces.setdefault(ws_id, Workspace(id=ws_id, name=f"WS{ws_id}"))
+                wm.switch_workspace(ws_id)
+                with wm.batch():
+                    for i in range(windows_per_workspace):
+                        wm.create_window(f"Window {ws_id}.{i}", "terminal")
+            
+            updates = []
+            wm.add_layout_listener(updates.append)
+            for key in wm.layout_stats:
+                wm.layout_stats[key] = 0
+            
+            start = time.perf_counter()
+            for r in range(rounds):
+                for ws_id in range(1, workspace_count + 1):
+                    wm.switch_workspace(ws_id)
+                    wm.focus_next()
+                    with wm.batch():
+                        wm.move_window(wm.focused_window, Direction.RIGHT)
+                        wm.set_layout(layouts[(r + ws_id) % len(layouts)])
+                    wm.grow_main(0.05 if r % 2 else -0.05)
+                    wm.toggle_fullscreen()
+                    wm.toggle_fullscreen()
+                    wm.tile()
+            elapsed = time.perf_counter() - start
+        
+        results["incremental" if incremental else "full"] = {
+            "seconds": round(elapsed, 4),
+            "commits": wm.layout_stats["commits"],
+            "unchanged_tiles": wm.layout_stats["unchanged"],
+            "geometry_updates": sum(len(batch) for batch in updates),
+        }
+    
+    results["windows"] = workspace_count * windows_per_workspace
+    results["speedup"] = round(results["full"]["seconds"] / max(results["incremental"]["seconds"], 1e-9), 2)
+    return results
+
+
+if __name__ == "__main__" and "--benchmark" in sys.argv:
+    print(json.dumps(benchmark_layout(), indent=2))
+
+elif __name__ == "__main__":
     wm = get_window_manager()
     
     # Create some test windows
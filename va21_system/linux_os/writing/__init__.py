@@ -7,8 +7,14 @@ Features:
 - Citation management
 - Export to multiple formats
 - Templates for various document types
+- Local originality checking (MinHash/LSH)
+- Incremental document store (delta revisions, lazy bodies)
+- Streaming block exporter with cached paragraph rendering
 """
 
 from .writing_suite import WritingSuite, get_writing_suite, Document, DocumentType
+from .originality import OriginalityIndex
+from .document_store import DocumentStore
+from .exporter import BlockRenderer
 
 __version__ = "1.0.0"
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+VA21 Research OS - Document Store
+===================================
+
+Incremental storage for Writing Suite documents.
+
+Document metadata lives in one small index file; bodies live in
+per-document revision logs. Each save appends a compressed line delta
+against the previous revision, so autosaving a long manuscript writes
+the edit, not the manuscript. A full snapshot is written every
+SNAPSHOT_INTERVAL revisions (or when a delta would not be smaller) so
+loading a body never replays more than a few deltas.
+
+Layout (under the documents path):
+    store/index.json            metadata for every document
+    store/revisions/<id>.revs   length-prefixed zlib revision records
+    store/revisions/<id>.hist   revision history entries (JSON lines)
+
+Features:
+- Line-based deltas (common prefix/suffix trim + difflib on the rest)
+- Periodic full snapshots; the index points at the latest one
+- Bodies loaded on demand, not at startup
+- Every record carries a content hash; torn or corrupt tails are ignored
+- Any past revision can be reconstructed
+
+Om Vinayaka - Words flow with wisdom and integrity.
+"""
+
+import os
+import json
+import zlib
+import struct
+import difflib
+import hashlib
+import threading
+from typing import Dict, List, Optional, Tuple
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+INDEX_FILE = "index.json"
+REVISIONS_DIR = "revisions"
+
+# Full snapshot after this many deltas
+SNAPSHOT_INTERVAL = 20
+
+# Above this many line pairs the changed region is replaced wholesale
+# instead of running difflib on it
+MAX_DIFF_CELLS = 4_000_000
+
+_HEADER = struct.Struct(">I")
+
+
+def content_hash(text: str) -> str:
+    """Hash of a document body (same digest the originality index uses)."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LINE DELTAS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def compute_delta(old_lines: List[str], new_lines: List[str]) -> List:
+    """
+    Delta that turns old_lines into new_lines.
+
+    Ops are applied in order: a positive int copies that many old lines,
+    a negative int skips that many, a list inserts its lines.
+    """
+    ops: List = []
+
+    def copy(n):
+        if n:
+            ops.append(n)
+
+    def skip(n):
+        if n:
+            ops.append(-n)
+
+    def insert(lines):
+        if lines:
+            ops.append(list(lines))
+
+    # Edits are usually local: trim the shared head and tail first
+    limit = min(len(old_lines), len(new_lines))
+    prefix = 0
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while (suffix < limit - prefix
+           and old_lines[-1 - suffix] == new_lines[-1 - suffix]):
+        suffix += 1
+
+    old_mid = old_lines[prefix:len(old_lines) - suffix]
+    new_mid = new_lines[prefix:len(new_lines) - suffix]
+
+    copy(prefix)
+    if old_mid and new_mid and len(old_mid) * len(new_mid) <= MAX_DIFF_CELLS:
+        matcher = difflib.SequenceMatcher(None, old_mid, new_mid, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                copy(i2 - i1)
+            else:
+                skip(i2 - i1)
+                insert(new_mid[j1:j2])
+    else:
+        skip(len(old_mid))
+        insert(new_mid)
+    copy(suffix)
+    return ops
+
+
+def apply_delta(old_lines: List[str], ops: List) -> List[str]:
+    """Apply a delta from compute_delta()."""
+    result: List[str] = []
+    pos = 0
+    for op in ops:
+        if isinstance(op, list):
+            result.extend(op)
+        elif op > 0:
+            result.extend(old_lines[pos:pos + op])
+            pos += op
+        else:
+            pos -= op
+    return result
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# DOCUMENT STORE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class DocumentStore:
+    """
+    Metadata index + per-document delta revision logs.
+
+    Metadata entries are plain dicts supplied by the caller; the store
+    adds a '_store' section (head revision, snapshot offset, content
+    hash) that it manages itself.
+    """
+
+    def __init__(self, store_path: str):
+        self.store_path = store_path
+        self.index_path = os.path.join(store_path, INDEX_FILE)
+        self.revisions_path = os.path.join(store_path, REVISIONS_DIR)
+        os.makedirs(self.revisions_path, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._index: Dict[str, Dict] = {}
+
+        # doc_id -> last persisted body (lines) and log end, for loaded bodies
+        self._heads: Dict[str, List[str]] = {}
+        self._ends: Dict[str, int] = {}
+        self._history_counts: Dict[str, int] = {}
+
+        self._bytes_written = 0
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Index
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def load_index(self) -> Dict[str, Dict]:
+        """Read the metadata index (no document bodies are touched)."""
+        with self._lock:
+            self._index = {}
+            if os.path.exists(self.index_path):
+                try:
+                    with open(self.index_path, 'r', encoding='utf-8') as f:
+                        self._index = json.load(f)
+                except Exception as e:
+                    print(f"[DocumentStore] Error loading index: {e}")
+            return {doc_id: dict(entry) for doc_id, entry in self._index.items()}
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._index
+
+    def get_content_hash(self, doc_id: str) -> Optional[str]:
+        """Hash of the latest saved body, without loading it."""
+        entry = self._index.get(doc_id)
+        return entry["_store"]["hash"] if entry else None
+
+    def _write_index(self):
+        """Atomically replace the index file (caller holds the lock)."""
+        text = json.dumps(self._index, default=str, separators=(',', ':'))
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.index_path)
+        self._bytes_written += len(text)
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Bodies
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def _revs_file(self, doc_id: str) -> str:
+        return os.path.join(self.revisions_path, f"{doc_id}.revs")
+
+    def _hist_file(self, doc_id: str) -> str:
+        return os.path.join(self.revisions_path, f"{doc_id}.hist")
+
+    @staticmethod
+    def _read_records(f, offset: int = 0):
+        """Yield (offset, end, record) until EOF or the first bad record."""
+        f.seek(offset)
+        while True:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return
+            (length,) = _HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                return  # Torn write from a crash
+            try:
+                record = json.loads(zlib.decompress(payload))
+            except (zlib.error, ValueError):
+                return
+            end = offset + _HEADER.size + length
+            yield offset, end, record
+            offset = end
+
+    @staticmethod
+    def _replay(lines: List[str], record: Dict) -> List[str]:
+        if record["kind"] == "full":
+            return record["text"].splitlines(keepends=True)
+        return apply_delta(lines, record["ops"])
+
+    def load_body(self, doc_id: str) -> Tuple[str, List[Dict]]:
+        """
+        Load a document's latest body and revision history.
+
+        Returns:
+            (content, revision_history); ("", []) for unknown documents
+        """
+        with self._lock:
+            entry = self._index.get(doc_id)
+            if entry is None:
+                return "", []
+
+            lines: List[str] = []
+            end = 0
+            path = self._revs_file(doc_id)
+            if os.path.exists(path):
+                offset = entry["_store"].get("snapshot_offset", 0)
+                if offset > os.path.getsize(path):
+                    offset = 0
+                with open(path, 'rb') as f:
+                    for _, rec_end, record in self._read_records(f, offset):
+                        candidate = self._replay(lines, record)
+                        if content_hash("".join(candidate)) != record["hash"]:
+                            break
+                        lines, end = candidate, rec_end
+
+            history = []
+            hist_path = self._hist_file(doc_id)
+            if os.path.exists(hist_path):
+                with open(hist_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if not line.endswith("\n"):
+                            break
+                        try:
+                            history.append(json.loads(line))
+                        except ValueError:
+                            break
+
+            self._heads[doc_id] = lines
+            self._ends[doc_id] = end
+            self._history_counts[doc_id] = len(history)
+            return "".join(lines), history
+
+    def save(self, doc_id: str, meta: Dict, content: str,
+             revision_history: List[Dict]) -> bool:
+        """
+        Save metadata and, if the body changed, append a revision.
+
+        Args:
+            doc_id: Document ID
+            meta: JSON-serializable metadata (no body, no history)
+            content: Current body
+            revision_history: Full history; only new entries are written
+
+        Returns:
+            True if a new body revision was written
+        """
+        with self._lock:
+            entry = self._index.get(doc_id)
+            if entry is not None and doc_id not in self._heads:
+                self.load_body(doc_id)
+            state = dict(entry["_store"]) if entry else {
+                "head": 0, "snapshot_offset": 0, "since_snapshot": 0,
+                "hash": None,
+            }
+
+            new_hash = content_hash(content)
+            changed = new_hash != state["hash"]
+            if changed:
+                new_lines = content.splitlines(keepends=True)
+                old_lines = self._heads.get(doc_id, [])
+                record = {"rev": state["head"] + 1, "hash": new_hash}
+
+                ops = None
+                if entry is not None and state["since_snapshot"] < SNAPSHOT_INTERVAL:
+                    ops = compute_delta(old_lines, new_lines)
+                    inserted = sum(len(line) for op in ops if isinstance(op, list) for line in op)
+                    if inserted * 2 > len(content):
+                        ops = None  # Mostly new text: a snapshot is as cheap
+
+                if ops is None:
+                    record.update(kind="full", text=content)
+                else:
+                    record.update(kind="delta", ops=ops)
+
+                payload = zlib.compress(
+                    json.dumps(record, separators=(',', ':')).encode('utf-8')
+                )
+                offset = self._append_record(doc_id, payload)
+
+                state["head"] = record["rev"]
+                state["hash"] = new_hash
+                if ops is None:
+                    state["snapshot_offset"] = offset
+                    state["since_snapshot"] = 0
+                else:
+                    state["since_snapshot"] += 1
+                self._heads[doc_id] = new_lines
+
+            self._append_history(doc_id, revision_history)
+
+            new_entry = dict(meta)
+            new_entry["_store"] = state
+            self._index[doc_id] = new_entry
+            self._write_index()
+            return changed
+
+    def _append_record(self, doc_id: str, payload: bytes) -> int:
+        """Write one record at the end of the valid log; return its offset."""
+        path = self._revs_file(doc_id)
+        offset = self._ends.get(doc_id, 0)
+        with open(path, 'ab' if not os.path.exists(path) else 'r+b') as f:
+            # Overwrite any torn tail left by a crash
+            f.seek(offset)
+            f.write(_HEADER.pack(len(payload)))
+            f.write(payload)
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+        self._ends[doc_id] = offset + _HEADER.size + len(payload)
+        self._bytes_written += _HEADER.size + len(payload)
+        return offset
+
+    def _append_history(self, doc_id: str, revision_history: List[Dict]):
+        written = self._history_counts.get(doc_id, 0)
+        new_entries = revision_history[written:]
+        if not new_entries:
+            return
+        text = "".join(json.dumps(e, default=str) + "\n" for e in new_entries)
+        with open(self._hist_file(doc_id), 'a', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        self._history_counts[doc_id] = len(revision_history)
+        self._bytes_written += len(text)
+
+    def unload(self, doc_id: str):
+        """Forget a cached body (it will be re-read on next save)."""
+        with self._lock:
+            self._heads.pop(doc_id, None)
+            self._ends.pop(doc_id, None)
+            self._history_counts.pop(doc_id, None)
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # History
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def list_revisions(self, doc_id: str) -> List[Dict]:
+        """Revision numbers with their record kind and size on disk."""
+        path = self._revs_file(doc_id)
+        if not os.path.exists(path):
+            return []
+        revisions = []
+        with self._lock, open(path, 'rb') as f:
+            for offset, end, record in self._read_records(f):
+                revisions.append({
+                    'rev': record["rev"],
+                    'kind': record["kind"],
+                    'bytes': end - offset,
+                })
+        return revisions
+
+    def get_revision(self, doc_id: str, rev: int) -> Optional[str]:
+        """Reconstruct the body as of a given revision."""
+        path = self._revs_file(doc_id)
+        if not os.path.exists(path):
+            return None
+        lines: List[str] = []
+        with self._lock, open(path, 'rb') as f:
+            for _, _, record in self._read_records(f):
+                if record["rev"] > rev:
+                    break
+                lines = self._replay(lines, record)
+                if record["rev"] == rev:
+                    return "".join(lines)
+        return None
+
+    def get_stats(self) -> Dict:
+        """Store statistics."""
+        with self._lock:
+            return {
+                'documents': len(self._index),
+                'bodies_loaded': len(self._heads),
+                'index_bytes': os.path.getsize(self.index_path) if os.path.exists(self.index_path) else 0,
+                'bytes_written': self._bytes_written,
+            }
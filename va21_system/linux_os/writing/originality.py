@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+VA21 Research OS - Local Originality Checker
+==============================================
+
+Near-duplicate detection for the Writing Suite, fully offline.
+
+Every writing-suite document and Obsidian vault note is split into
+overlapping word windows ("passages"). Each passage is shingled and
+summarized by a MinHash signature; signatures are bucketed with
+Locality-Sensitive Hashing (LSH) in an on-disk SQLite index. Checking
+a draft only compares it against passages that share an LSH bucket,
+so the cost depends on the draft size, not on the library size.
+
+Features:
+- Word-shingle MinHash signatures (stable across runs)
+- Banded LSH index on disk, updated as sources change
+- Overlapping passages returned with similarity and source IDs
+- No network access, ever
+
+Om Vinayaka - Words flow with wisdom and integrity.
+"""
+
+import os
+import re
+import random
+import sqlite3
+import hashlib
+import threading
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+SHINGLE_SIZE = 5          # Words per shingle
+PASSAGE_STRIDE = 25       # Shingles per block; a passage spans two blocks
+NUM_PERM = 64             # MinHash permutations
+LSH_BANDS = 16            # NUM_PERM = LSH_BANDS * LSH_ROWS
+LSH_ROWS = 4
+MATCH_THRESHOLD = 0.5     # Estimated Jaccard reported as an overlap
+
+_WORD_RE = re.compile(r"\S+")
+_NORMALIZE_RE = re.compile(r"[^\w]+")
+
+# One XOR mask per permutation. Shingle hashes are already uniform, so
+# XOR-ing with a random mask is as good as a full affine permutation and
+# several times cheaper in Python. The seed is fixed so signatures on
+# disk stay comparable across runs.
+_rng = random.Random(2108)
+_PERMUTATION_MASKS = [_rng.getrandbits(64) for _ in range(NUM_PERM)]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MINHASH
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _stable_hash(data: bytes) -> int:
+    """64-bit hash that is identical in every process."""
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+
+def passage_signatures(text: str) -> List[Tuple[str, List[int]]]:
+    """
+    Split text into overlapping passages and MinHash each one.
+
+    Shingles are grouped into blocks of PASSAGE_STRIDE; a passage is two
+    consecutive blocks, so consecutive passages overlap by half. Block
+    minimums are computed once and shared by both passages that contain
+    the block, which keeps long drafts cheap to sign.
+
+    Returns:
+        List of (passage text, signature)
+    """
+    spans = [(m.start(), m.end(), _NORMALIZE_RE.sub('', m.group().lower()))
+             for m in _WORD_RE.finditer(text)]
+    spans = [s for s in spans if s[2]]
+    shingle_count = len(spans) - SHINGLE_SIZE + 1
+    if shingle_count < 1:
+        return []
+
+    words = [w for _, _, w in spans]
+    hashes = [
+        _stable_hash(" ".join(words[i:i + SHINGLE_SIZE]).encode())
+        for i in range(shingle_count)
+    ]
+    bounds = [(i, min(i + PASSAGE_STRIDE, shingle_count))
+              for i in range(0, shingle_count, PASSAGE_STRIDE)]
+
+    # block_mins[block][perm]
+    block_mins = [[0] * NUM_PERM for _ in bounds]
+    for perm, mask in enumerate(_PERMUTATION_MASKS):
+        values = [h ^ mask for h in hashes]
+        for block, (lo, hi) in enumerate(bounds):
+            block_mins[block][perm] = min(values[lo:hi])
+
+    pairs = [(k, k + 1) for k in range(len(bounds) - 1)] or [(0, 0)]
+    passages = []
+    for first, last in pairs:
+        signature = [min(x, y) for x, y in zip(block_mins[first], block_mins[last])]
+        lo, hi = bounds[first][0], bounds[last][1] - 1 + SHINGLE_SIZE - 1
+        passages.append((text[spans[lo][0]:spans[hi][1]], signature))
+    return passages
+
+
+def band_keys(signature: List[int]) -> List[int]:
+    """LSH bucket key for every band (63-bit, fits SQLite INTEGER)."""
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = array('Q', signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]).tobytes()
+        keys.append(int.from_bytes(hashlib.blake2b(rows, digest_size=8).digest(), 'big') >> 1)
+    return keys
+
+
+def estimate_similarity(sig_a: List[int], sig_b: List[int]) -> float:
+    """Estimated Jaccard similarity from two signatures."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ORIGINALITY INDEX
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class OriginalityIndex:
+    """
+    On-disk MinHash/LSH passage index.
+
+    Sources (documents, notes) are indexed by ID with a content
+    fingerprint, so re-indexing an unchanged source is a no-op and a
+    changed source only replaces its own passages.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS sources (
+                source_id TEXT PRIMARY KEY,
+                source_type TEXT NOT NULL,
+                title TEXT,
+                fingerprint TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS passages (
+                passage_id INTEGER PRIMARY KEY,
+                source_id TEXT NOT NULL,
+                snippet TEXT NOT NULL,
+                signature BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS buckets (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                passage_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_sources_fingerprint ON sources(fingerprint);
+            CREATE INDEX IF NOT EXISTS idx_passages_source ON passages(source_id);
+            CREATE INDEX IF NOT EXISTS idx_buckets_key ON buckets(band, bucket);
+            CREATE INDEX IF NOT EXISTS idx_buckets_passage ON buckets(passage_id);
+        """)
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _fingerprint(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get_fingerprint(self, source_id: str) -> Optional[str]:
+        """Content fingerprint of an indexed source (None if not indexed)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint FROM sources WHERE source_id = ?", (source_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def source_ids(self, source_type: Optional[str] = None) -> List[str]:
+        """IDs of indexed sources, optionally of one type."""
+        query = "SELECT source_id FROM sources"
+        params = []
+        if source_type:
+            query += " WHERE source_type = ?"
+            params.append(source_type)
+        with self._lock:
+            return [row[0] for row in self._conn.execute(query, params)]
+
+    def find_identical(self, text: str, source_type: Optional[str] = None) -> List[str]:
+        """IDs of indexed sources whose content is exactly text."""
+        query = "SELECT source_id FROM sources WHERE fingerprint = ?"
+        params = [self._fingerprint(text)]
+        if source_type:
+            query += " AND source_type = ?"
+            params.append(source_type)
+        with self._lock:
+            return [row[0] for row in self._conn.execute(query, params)]
+
+    def index_source(self, source_id: str, text: str, source_type: str = "document",
+                     title: str = "") -> bool:
+        """
+        Index (or re-index) a source.
+
+        Returns:
+            True if the index changed, False if the source was unchanged
+        """
+        fingerprint = self._fingerprint(text)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint FROM sources WHERE source_id = ?", (source_id,)
+            ).fetchone()
+            if row and row[0] == fingerprint:
+                return False
+
+        # Signatures are computed outside the lock
+        passages = [
+            (passage_text, signature, band_keys(signature))
+            for passage_text, signature in passage_signatures(text)
+        ]
+
+        with self._lock, self._conn:
+            self._delete_locked(source_id)
+            self._conn.execute(
+                "INSERT INTO sources (source_id, source_type, title, fingerprint) VALUES (?, ?, ?, ?)",
+                (source_id, source_type, title, fingerprint)
+            )
+            for passage_text, signature, keys in passages:
+                cursor = self._conn.execute(
+                    "INSERT INTO passages (source_id, snippet, signature) VALUES (?, ?, ?)",
+                    (source_id, passage_text[:500], array('Q', signature).tobytes())
+                )
+                passage_id = cursor.lastrowid
+                self._conn.executemany(
+                    "INSERT INTO buckets (band, bucket, passage_id) VALUES (?, ?, ?)",
+                    [(band, key, passage_id) for band, key in enumerate(keys)]
+                )
+        return True
+
+    def remove_source(self, source_id: str):
+        """Remove a source and its passages."""
+        with self._lock, self._conn:
+            self._delete_locked(source_id)
+
+    def _delete_locked(self, source_id: str):
+        """Delete a source's rows (caller holds the lock and transaction)."""
+        self._conn.execute(
+            "DELETE FROM buckets WHERE passage_id IN "
+            "(SELECT passage_id FROM passages WHERE source_id = ?)", (source_id,)
+        )
+        self._conn.execute("DELETE FROM passages WHERE source_id = ?", (source_id,))
+        self._conn.execute("DELETE FROM sources WHERE source_id = ?", (source_id,))
+
+    def query(self, text: str, exclude_sources: Optional[List[str]] = None,
+              threshold: float = MATCH_THRESHOLD) -> Dict:
+        """
+        Find stored passages overlapping the given text.
+
+        Returns:
+            Dict with 'matches' (best match per draft passage, sorted by
+            similarity), 'passages_checked' and 'overlap_ratio'
+        """
+        exclude = set(exclude_sources or [])
+        draft = [
+            (passage_text, signature, band_keys(signature))
+            for passage_text, signature in passage_signatures(text)
+        ]
+
+        if not draft:
+            return {'matches': [], 'passages_checked': 0, 'overlap_ratio': 0.0}
+
+        # (band, bucket) -> draft passage indexes
+        wanted: Dict[Tuple[int, int], List[int]] = {}
+        for index, (_, _, keys) in enumerate(draft):
+            for band, key in enumerate(keys):
+                wanted.setdefault((band, key), []).append(index)
+
+        # Candidate passage -> draft passages sharing a bucket with it
+        candidates: Dict[int, set] = {}
+        with self._lock:
+            for band in range(LSH_BANDS):
+                keys = [key for (b, key) in wanted if b == band]
+                for chunk_start in range(0, len(keys), 500):
+                    chunk = keys[chunk_start:chunk_start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        f"SELECT bucket, passage_id FROM buckets "
+                        f"WHERE band = ? AND bucket IN ({placeholders})",
+                        [band] + chunk
+                    ).fetchall()
+                    for key, passage_id in rows:
+                        candidates.setdefault(passage_id, set()).update(wanted[(band, key)])
+
+            stored = {}
+            ids = list(candidates)
+            for chunk_start in range(0, len(ids), 500):
+                chunk = ids[chunk_start:chunk_start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for row in self._conn.execute(
+                    f"SELECT p.passage_id, p.source_id, p.snippet, p.signature, "
+                    f"s.source_type, s.title FROM passages p "
+                    f"JOIN sources s ON s.source_id = p.source_id "
+                    f"WHERE p.passage_id IN ({placeholders})", chunk
+                ):
+                    stored[row[0]] = row[1:]
+
+        best: Dict[int, Dict] = {}
+        for passage_id, draft_indexes in candidates.items():
+            if passage_id not in stored:
+                continue
+            source_id, snippet, blob, source_type, title = stored[passage_id]
+            if source_id in exclude:
+                continue
+            signature = array('Q')
+            signature.frombytes(blob)
+            for index in draft_indexes:
+                similarity = estimate_similarity(draft[index][1], signature)
+                if similarity < threshold:
+                    continue
+                if index not in best or similarity > best[index]['similarity']:
+                    best[index] = {
+                        'passage': draft[index][0],
+                        'similarity': round(similarity, 3),
+                        'source_id': source_id,
+                        'source_type': source_type,
+                        'source_title': title,
+                        'matched_text': snippet,
+                    }
+
+        matches = sorted(best.values(), key=lambda m: m['similarity'], reverse=True)
+        return {
+            'matches': matches,
+            'passages_checked': len(draft),
+            'overlap_ratio': round(len(best) / len(draft), 3),
+        }
+
+    def get_stats(self) -> Dict:
+        """Index statistics."""
+        with self._lock:
+            sources = self._conn.execute("SELECT COUNT(*) FROM sources").fetchone()[0]
+            passages = self._conn.execute("SELECT COUNT(*) FROM passages").fetchone()[0]
+        return {'sources': sources, 'passages': passages}
@@ -22,11 +22,30 @@ Om Vinayaka - Words flow with wisdom and integrity.
 import os
 import re
 import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+try:
+    from .originality import OriginalityIndex
+    from .document_store import DocumentStore
+    from .exporter import BlockRenderer, escape_html
+except ImportError:
+    from originality import OriginalityIndex
+    from document_store import DocumentStore
+    from exporter import BlockRenderer, escape_html
+
+
+# Rendered citations kept in memory, keyed by (cite_id, style, revision)
+CITATION_CACHE_SIZE = 4096
+
+# Worker threads for batch exports
+EXPORT_WORKERS = 4
+
 
 class DocumentType(Enum):
     """Types of documents supported."""
@@ -145,6 +164,27 @@ class WritingSuite:
         # Settings
         self.default_citation_style = "apa"
         
+        # Rendered citation cache; a citation's revision bumps on every change
+        self._citation_revisions: Dict[str, int] = {}
+        self._citation_numbers: Dict[str, int] = {}   # IEEE numbering
+        self._citation_cache: OrderedDict = OrderedDict()
+        self._citation_lock = threading.RLock()
+        
+        # Block renderer for exports (caches rendered paragraphs)
+        self.renderer = BlockRenderer()
+        
+        # Local originality index (MinHash/LSH, on disk)
+        self.originality_index = OriginalityIndex(
+            os.path.join(documents_path, ".originality", "index.db")
+        )
+        self._originality_dirty: set = set()
+        self.vault = None
+        
+        # Metadata index + delta revision logs; bodies load on first use
+        self.store = DocumentStore(os.path.join(documents_path, "store"))
+        self._loaded_bodies: set = set()
+        self._body_lock = threading.RLock()   # export threads open/close bodies
+        
         # Load existing documents
         self._load_documents()
         self._create_default_templates()
@@ -152,38 +192,106 @@ class WritingSuite:
         print(f"[WritingSuite] Initialized with {len(self.documents)} documents")
     
     def _load_documents(self):
-        """Load existing documents from disk."""
+        """Load document metadata (bodies are read when first opened)."""
+        for doc_id, meta in self.store.load_index().items():
+            try:
+                doc = self._document_from_meta(meta)
+            except Exception as e:
+                print(f"[WritingSuite] Error loading document {doc_id}: {e}")
+                continue
+            self.documents[doc.id] = doc
+            if self.originality_index.get_fingerprint(doc.id) != self.store.get_content_hash(doc.id):
+                self._originality_dirty.add(doc.id)
+        
+        # One-time migration of whole-JSON drafts from older versions
         for root, dirs, files in os.walk(self.drafts_path):
             for filename in files:
                 if filename.endswith('.json'):
-                    self._load_document(os.path.join(root, filename))
+                    self._migrate_document(os.path.join(root, filename))
     
-    def _load_document(self, filepath: str):
-        """Load a document from JSON."""
+    def _migrate_document(self, filepath: str):
+        """Import a legacy JSON draft into the store and retire the file."""
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
-            doc = Document(
-                id=data['id'],
-                title=data['title'],
-                doc_type=DocumentType(data['doc_type']),
-                content=data['content'],
-                abstract=data.get('abstract', ''),
-                author=data.get('author', 'researcher'),
-                status=PublishStatus(data.get('status', 'draft')),
-                tags=data.get('tags', []),
-                citations=data.get('citations', []),
-                word_count=data.get('word_count', 0),
-                metadata=data.get('metadata', {}),
-                revision_history=data.get('revision_history', [])
-            )
+            if data['id'] not in self.store:
+                doc = self._document_from_meta(data)
+                doc.content = data['content']
+                doc.revision_history = data.get('revision_history', [])
+                self.store.save(doc.id, self._document_meta(doc), doc.content,
+                                doc.revision_history)
+                self.documents[doc.id] = doc
+                self._loaded_bodies.add(doc.id)
+                self._originality_dirty.add(doc.id)
             
-            self.documents[doc.id] = doc
+            os.replace(filepath, filepath + ".migrated")
             
         except Exception as e:
             print(f"[WritingSuite] Error loading {filepath}: {e}")
     
+    @staticmethod
+    def _document_meta(doc: Document) -> Dict:
+        """Index entry for a document (everything but body and history)."""
+        return {
+            'id': doc.id,
+            'title': doc.title,
+            'doc_type': doc.doc_type.value,
+            'abstract': doc.abstract,
+            'author': doc.author,
+            'status': doc.status.value,
+            'tags': doc.tags,
+            'citations': doc.citations,
+            'word_count': doc.word_count,
+            'created_at': doc.created_at.isoformat() if isinstance(doc.created_at, datetime) else doc.created_at,
+            'modified_at': doc.modified_at.isoformat() if isinstance(doc.modified_at, datetime) else doc.modified_at,
+            'metadata': doc.metadata,
+        }
+    
+    @staticmethod
+    def _document_from_meta(data: Dict) -> Document:
+        """Document shell from an index entry; content is filled in on open."""
+        doc = Document(
+            id=data['id'],
+            title=data['title'],
+            doc_type=DocumentType(data['doc_type']),
+            content="",
+            abstract=data.get('abstract', ''),
+            author=data.get('author', 'researcher'),
+            status=PublishStatus(data.get('status', 'draft')),
+            tags=data.get('tags', []),
+            citations=data.get('citations', []),
+            word_count=data.get('word_count', 0),
+            metadata=data.get('metadata', {})
+        )
+        for attr in ('created_at', 'modified_at'):
+            if data.get(attr):
+                try:
+                    setattr(doc, attr, datetime.fromisoformat(data[attr]))
+                except ValueError:
+                    pass
+        return doc
+    
+    def open_document(self, doc_id: str) -> Optional[Document]:
+        """Get a document with its body and revision history loaded."""
+        doc = self.documents.get(doc_id)
+        with self._body_lock:
+            if doc is not None and doc_id not in self._loaded_bodies:
+                doc.content, doc.revision_history = self.store.load_body(doc_id)
+                self._loaded_bodies.add(doc_id)
+        return doc
+    
+    def close_document(self, doc_id: str):
+        """Release a document's body from memory (it is already saved)."""
+        doc = self.documents.get(doc_id)
+        with self._body_lock:
+            if doc is None or doc_id not in self._loaded_bodies:
+                return
+            self._loaded_bodies.discard(doc_id)
+            doc.content = ""
+            doc.revision_history = []
+            self.store.unload(doc_id)
+    
     def _create_default_templates(self):
         """Create default document templates."""
         templates = {
@@ -361,36 +469,32 @@ Phone:
         )
         
         self.documents[doc_id] = doc
+        with self._body_lock:
+            self._loaded_bodies.add(doc_id)
         self._save_document(doc)
         
         print(f"[WritingSuite] Created {doc_type.value}: {title}")
         return doc
     
     def _save_document(self, doc: Document):
-        """Save a document to disk."""
+        """Save a document: metadata to the index, body as a delta revision."""
+        with self._body_lock:
+            if doc.id not in self._loaded_bodies:
+                # Content may have been assigned without opening the document:
+                # load the stored revision history first so it isn't lost
+                content = doc.content
+                self.open_document(doc.id)
+                if content:
+                    doc.content = content
+        
         doc.word_count = len(doc.content.split())
         doc.modified_at = datetime.now()
         
-        data = {
-            'id': doc.id,
-            'title': doc.title,
-            'doc_type': doc.doc_type.value,
-            'content': doc.content,
-            'abstract': doc.abstract,
-            'author': doc.author,
-            'status': doc.status.value,
-            'tags': doc.tags,
-            'citations': doc.citations,
-            'word_count': doc.word_count,
-            'created_at': doc.created_at.isoformat() if isinstance(doc.created_at, datetime) else doc.created_at,
-            'modified_at': doc.modified_at.isoformat() if isinstance(doc.modified_at, datetime) else doc.modified_at,
-            'metadata': doc.metadata,
-            'revision_history': doc.revision_history
-        }
+        self.store.save(doc.id, self._document_meta(doc), doc.content,
+                        doc.revision_history)
         
-        filepath = os.path.join(self.drafts_path, f"{doc.id}.json")
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        # Re-indexed lazily before the next originality check
+        self._originality_dirty.add(doc.id)
     
     def update_document(self, doc_id: str, content: str = None, 
                         title: str = None, status: PublishStatus = None) -> bool:
@@ -409,7 +513,7 @@ Phone:
         if doc_id not in self.documents:
             return False
         
-        doc = self.documents[doc_id]
+        doc = self.open_document(doc_id)
         
         # Save revision
         doc.revision_history.append({
@@ -463,9 +567,15 @@ Phone:
         )
         
         self.citations[cite_id] = citation
+        self._citation_numbers.setdefault(cite_id, len(self._citation_numbers) + 1)
+        self._touch_citation(cite_id)
+        self._save_citation(citation)
         
-        # Save citation
-        filepath = os.path.join(self.citations_path, f"{cite_id}.json")
+        return citation
+    
+    def _save_citation(self, citation: Citation):
+        """Save a citation to disk."""
+        filepath = os.path.join(self.citations_path, f"{citation.id}.json")
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump({
                 'id': citation.id,
@@ -482,13 +592,36 @@ Phone:
                 'doi': citation.doi,
                 'notes': citation.notes
             }, f, indent=2)
+    
+    def update_citation(self, cite_id: str, **fields) -> bool:
+        """
+        Update fields of a citation (title, authors, year, source, ...).
         
-        return citation
+        Returns:
+            Success status
+        """
+        citation = self.citations.get(cite_id)
+        if citation is None:
+            return False
+        
+        for name, value in fields.items():
+            if hasattr(citation, name) and name != 'id':
+                setattr(citation, name, value)
+        
+        self._touch_citation(cite_id)
+        self._save_citation(citation)
+        return True
+    
+    def _touch_citation(self, cite_id: str):
+        """Bump a citation's revision so cached renderings go stale."""
+        self._citation_revisions[cite_id] = self._citation_revisions.get(cite_id, 0) + 1
     
     def format_citation(self, cite_id: str, style: str = None) -> str:
         """
         Format a citation in a specific style.
         
+        Renderings are cached by (cite_id, style, revision).
+        
         Args:
             cite_id: Citation ID
             style: Citation style (apa, mla, chicago, etc.)
@@ -500,8 +633,21 @@ Phone:
             return ""
         
         style = style or self.default_citation_style
-        cite = self.citations[cite_id]
-        
+        with self._citation_lock:
+            key = (cite_id, style, self._citation_revisions.get(cite_id, 0))
+            cached = self._citation_cache.get(key)
+            if cached is not None:
+                self._citation_cache.move_to_end(key)
+                return cached
+            
+            text = self._render_citation(self.citations[cite_id], style)
+            self._citation_cache[key] = text
+            if len(self._citation_cache) > CITATION_CACHE_SIZE:
+                self._citation_cache.popitem(last=False)
+            return text
+    
+    def _render_citation(self, cite: Citation, style: str) -> str:
+        """Render a citation (uncached)."""
         if style == "apa":
             # APA format
             authors = " & ".join(cite.authors) if len(cite.authors) <= 2 else f"{cite.authors[0]} et al."
@@ -524,16 +670,47 @@ Phone:
         
         elif style == "ieee":
             # IEEE format
-            num = list(self.citations.keys()).index(cite_id) + 1
+            num = self._citation_numbers.get(cite.id, 0)
             authors = ", ".join([a.split()[-1] for a in cite.authors])
             return f"[{num}] {authors}, \"{cite.title},\" {cite.source}, {cite.year}."
         
         return f"{', '.join(cite.authors)} ({cite.year}). {cite.title}. {cite.source}."
     
+    def generate_bibliography(self, cite_ids: List[str], style: str = None,
+                              sort: bool = False) -> List[str]:
+        """
+        Render many citations in one pass.
+        
+        Duplicate IDs are rendered once and every entry goes through the
+        citation cache.
+        
+        Args:
+            cite_ids: Citation IDs
+            style: Citation style (default style if omitted)
+            sort: Sort entries alphabetically (False keeps the given order)
+            
+        Returns:
+            Formatted citations
+        """
+        style = style or self.default_citation_style
+        entries = [
+            text for text in (self.format_citation(cite_id, style)
+                              for cite_id in dict.fromkeys(cite_ids))
+            if text
+        ]
+        if sort:
+            entries.sort(key=str.lower)
+        return entries
+    
+    EXPORT_FORMATS = ["md", "html", "txt"]
+    
     def export_document(self, doc_id: str, format: str = "md") -> str:
         """
         Export a document to a specific format.
         
+        The body is rendered block by block straight into the output
+        file; unchanged paragraphs come from the renderer's cache.
+        
         Args:
             doc_id: Document ID
             format: Export format (md, html, txt)
@@ -541,36 +718,48 @@ Phone:
         Returns:
             Path to exported file
         """
-        if doc_id not in self.documents:
+        if doc_id not in self.documents or format not in self.EXPORT_FORMATS:
             return ""
         
-        doc = self.documents[doc_id]
+        doc = self.open_document(doc_id)
         safe_title = re.sub(r'[^\w\s-]', '', doc.title).strip().replace(' ', '_')
+        filepath = os.path.join(self.exports_path, f"{safe_title}.{format}")
+        
+        # Written aside and renamed, so concurrent exports never interleave
+        tmp_path = f"{filepath}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                self.write_export(doc, format, f)
+            os.replace(tmp_path, filepath)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        
+        print(f"[WritingSuite] Exported to {filepath}")
+        return filepath
+    
+    def write_export(self, doc: Document, format: str, f):
+        """Stream a document export into an open text file handle."""
+        references = self.generate_bibliography(doc.citations)
         
         if format == "md":
             # Markdown export
-            content = f"""---
+            f.write(f"""---
 title: {doc.title}
 author: {doc.author}
 date: {datetime.now().strftime('%Y-%m-%d')}
 type: {doc.doc_type.value}
 ---
 
-{doc.content}
-
-## References
-
-"""
-            for cite_id in doc.citations:
-                content += f"- {self.format_citation(cite_id)}\n"
-            
-            filepath = os.path.join(self.exports_path, f"{safe_title}.md")
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+""")
+            f.write(doc.content)
+            f.write("\n\n## References\n\n")
+            for entry in references:
+                f.write(f"- {entry}\n")
             
         elif format == "html":
             # HTML export
-            content = f"""<!DOCTYPE html>
+            f.write(f"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
@@ -587,91 +776,82 @@ type: {doc.doc_type.value}
     <p class="meta">By {doc.author} | {datetime.now().strftime('%B %d, %Y')}</p>
     
     <div class="content">
-        {self._markdown_to_html(doc.content)}
+        """)
+            for piece in self.renderer.iter_render(doc.content, "html"):
+                f.write(piece)
+            f.write("""
     </div>
     
     <div class="references">
         <h2>References</h2>
         <ul>
-"""
-            for cite_id in doc.citations:
-                content += f"            <li>{self.format_citation(cite_id)}</li>\n"
-            
-            content += """        </ul>
+""")
+            for entry in references:
+                f.write(f"            <li>{entry}</li>\n")
+            f.write("""        </ul>
     </div>
 </body>
-</html>"""
-            
-            filepath = os.path.join(self.exports_path, f"{safe_title}.html")
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+</html>""")
         
         elif format == "txt":
             # Plain text export
-            content = f"""{doc.title}
+            f.write(f"""{doc.title}
 {'=' * len(doc.title)}
 
 By {doc.author}
 {datetime.now().strftime('%Y-%m-%d')}
 
-{self._strip_markdown(doc.content)}
-
-References:
-"""
-            for cite_id in doc.citations:
-                content += f"- {self.format_citation(cite_id)}\n"
+""")
+            for piece in self.renderer.iter_render(doc.content, "txt"):
+                f.write(piece)
+            f.write("\n\nReferences:\n")
+            for entry in references:
+                f.write(f"- {entry}\n")
+    
+    def export_documents(self, doc_ids: List[str] = None, format: str = "md",
+                         max_workers: int = EXPORT_WORKERS) -> Dict[str, str]:
+        """
+        Export many documents in parallel.
+        
+        Bodies that were not open before are released again after their
+        export, so memory stays flat across a large batch.
+        
+        Args:
+            doc_ids: Documents to export (all documents if omitted)
+            format: Export format (md, html, txt)
+            max_workers: Worker threads
             
-            filepath = os.path.join(self.exports_path, f"{safe_title}.txt")
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+        Returns:
+            Dict of document ID -> exported file path ("" on failure)
+        """
+        doc_ids = list(self.documents) if doc_ids is None else list(dict.fromkeys(doc_ids))
         
-        else:
-            return ""
+        def export_one(doc_id: str) -> str:
+            with self._body_lock:
+                was_open = doc_id in self._loaded_bodies
+            try:
+                return self.export_document(doc_id, format)
+            except Exception as e:
+                print(f"[WritingSuite] Error exporting {doc_id}: {e}")
+                return ""
+            finally:
+                if not was_open:
+                    self.close_document(doc_id)
         
-        print(f"[WritingSuite] Exported to {filepath}")
-        return filepath
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            return dict(zip(doc_ids, pool.map(export_one, doc_ids)))
     
     def _escape_html(self, text: str) -> str:
         """Escape HTML special characters to prevent XSS."""
-        html_escape_table = {
-            "&": "&amp;",
-            '"': "&quot;",
-            "'": "&#x27;",
-            ">": "&gt;",
-            "<": "&lt;",
-        }
-        return "".join(html_escape_table.get(c, c) for c in text)
+        return escape_html(text)
     
     def _markdown_to_html(self, text: str) -> str:
         """Simple markdown to HTML conversion with XSS protection."""
-        # First escape HTML to prevent XSS
-        text = self._escape_html(text)
-        
-        # Headers
-        text = re.sub(r'^### (.+)$', r'<h3>\1</h3>', text, flags=re.MULTILINE)
-        text = re.sub(r'^## (.+)$', r'<h2>\1</h2>', text, flags=re.MULTILINE)
-        text = re.sub(r'^# (.+)$', r'<h1>\1</h1>', text, flags=re.MULTILINE)
-        
-        # Bold and italic
-        text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
-        text = re.sub(r'\*(.+?)\*', r'<em>\1</em>', text)
-        
-        # Links (safe - URLs are escaped)
-        text = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2">\1</a>', text)
-        
-        # Paragraphs
-        text = re.sub(r'\n\n', '</p><p>', text)
-        text = f'<p>{text}</p>'
-        
-        return text
+        return self.renderer.render(text, "html")
     
     def _strip_markdown(self, text: str) -> str:
         """Remove markdown formatting."""
-        text = re.sub(r'^#+\s*', '', text, flags=re.MULTILINE)
-        text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
-        text = re.sub(r'\*(.+?)\*', r'\1', text)
-        text = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', text)
-        return text
+        return self.renderer.render(text, "txt")
     
     def get_word_count(self, doc_id: str) -> Dict:
         """
@@ -686,7 +866,7 @@ References:
         if doc_id not in self.documents:
             return {}
         
-        doc = self.documents[doc_id]
+        doc = self.open_document(doc_id)
         content = doc.content
         
         words = content.split()
@@ -727,16 +907,95 @@ References:
         except:
             return text
     
-    def ai_check_originality(self, text: str) -> Dict:
-        """Check text for potential plagiarism/originality."""
-        # This is a placeholder - in real implementation,
-        # would check against a local database, not external
+    def ai_check_originality(self, text: str, exclude_doc_id: str = None) -> Dict:
+        """
+        Check text for overlap with local documents and vault notes.
+        
+        Uses the on-disk MinHash/LSH index only - nothing leaves the machine.
+        
+        Args:
+            text: Text to check
+            exclude_doc_id: Source to ignore (e.g. the document being checked).
+                By default, saved documents whose content is identical
+                to text are ignored, so a saved draft is not reported
+                as copying itself.
+            
+        Returns:
+            Dict with 'original', 'confidence', 'overlap_ratio' and
+            'matches' (overlapping passages with similarity and source IDs)
+        """
+        self._flush_originality_index()
+        
+        if exclude_doc_id:
+            exclude = [exclude_doc_id]
+        else:
+            exclude = self.originality_index.find_identical(text, source_type="document")
+        result = self.originality_index.query(text, exclude_sources=exclude)
+        overlap = result['overlap_ratio']
+        
         return {
-            'original': True,
-            'confidence': 0.95,
+            'original': not result['matches'],
+            'confidence': round(1.0 - overlap, 3),
+            'overlap_ratio': overlap,
+            'passages_checked': result['passages_checked'],
+            'matches': result['matches'],
             'note': 'Checked against local knowledge base only'
         }
     
+    def check_document_originality(self, doc_id: str) -> Optional[Dict]:
+        """Check a stored document against every other local source."""
+        doc = self.open_document(doc_id)
+        if not doc:
+            return None
+        return self.ai_check_originality(doc.content, exclude_doc_id=doc_id)
+    
+    def attach_vault(self, vault):
+        """
+        Include an Obsidian vault's notes in originality checks.
+        
+        Notes are indexed now, re-indexed whenever the vault saves them and
+        dropped when the vault deletes them.
+        """
+        if self.vault is vault:
+            return
+        self.vault = vault
+        # Notes removed while the suite wasn't listening
+        for note_id in self.originality_index.source_ids(source_type="note"):
+            if note_id not in vault.notes_index:
+                self.originality_index.remove_source(note_id)
+        for note in list(vault.notes_index.values()):
+            self._index_note(note)
+        vault.add_change_listener(self._index_note)
+        vault.add_delete_listener(self.originality_index.remove_source)
+    
+    def _index_note(self, note):
+        """Index (or re-index) an Obsidian note."""
+        try:
+            self.originality_index.index_source(
+                note.id, note.content, source_type="note", title=note.title
+            )
+        except Exception as e:
+            print(f"[WritingSuite] Error indexing note {note.id}: {e}")
+    
+    def _flush_originality_index(self):
+        """Re-index documents changed since the last check."""
+        while self._originality_dirty:
+            doc_id = self._originality_dirty.pop()
+            with self._body_lock:
+                was_open = doc_id in self._loaded_bodies
+            doc = self.open_document(doc_id)
+            if doc is None:
+                self.originality_index.remove_source(doc_id)
+                continue
+            try:
+                self.originality_index.index_source(
+                    doc.id, doc.content, source_type="document", title=doc.title
+                )
+            finally:
+                # Bodies opened only for indexing are released again
+                if not was_open:
+                    self.close_document(doc_id)
+    
     def list_documents(self, doc_type: DocumentType = None, 
                        status: PublishStatus = None) -> List[Document]:
         """List documents with optional filters."""
@@ -780,11 +1039,30 @@ References:
 
 _writing_suite_instance = None
 
+def _get_default_vault():
+    """The Obsidian vault singleton, or None when it is unavailable."""
+    try:
+        try:
+            from ..obsidian.vault_manager import get_vault
+        except ImportError:
+            from obsidian.vault_manager import get_vault
+    except ImportError:
+        return None
+    try:
+        return get_vault()
+    except OSError as e:
+        print(f"[WritingSuite] Obsidian vault unavailable: {e}")
+        return None
+
+
 def get_writing_suite(helper_ai=None) -> WritingSuite:
-    """Get the WritingSuite singleton."""
+    """Get the WritingSuite singleton (with the Obsidian vault attached)."""
     global _writing_suite_instance
     if _writing_suite_instance is None:
         _writing_suite_instance = WritingSuite(helper_ai=helper_ai)
+        vault = _get_default_vault()
+        if vault is not None:
+            _writing_suite_instance.attach_vault(vault)
     return _writing_suite_instance
 
 
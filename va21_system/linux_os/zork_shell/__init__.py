@@ -4,5 +4,6 @@ VA21 Zork-Style Interface - Text adventure shell for VA21 Research OS.
 """
 
 from .zork_interface import VA21ZorkInterface
+from .job_control import JobManager, Job
 
 __version__ = "1.1.0"
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+VA21 Research OS - Zork Shell Job Control
+==========================================
+
+Runs shell commands for the adventure interface without freezing it.
+
+- Commands run asynchronously; stdout and stderr are read line by line
+  and can be streamed to the screen while the process runs
+- Any job can be sent to the background and brought back later
+  (jobs / fg / kill), with no time limit
+- Each job keeps a bounded output buffer, so a chatty build or scan
+  cannot exhaust memory
+- Every command is vetted before it starts: by the Guardian's command
+  analysis when available, and always by the shell's own pattern list
+
+Om Vinayaka - Long spells need not hold the realm still.
+"""
+
+import os
+import signal
+import subprocess
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+JOB_CONTROL_VERSION = "1.0.0"
+
+# Output lines kept per job (older lines are dropped and counted)
+OUTPUT_BUFFER_LINES = 2000
+# Longer lines are truncated
+MAX_LINE_CHARS = 4096
+# Jobs that may run at once
+MAX_RUNNING_JOBS = 8
+# Finished jobs kept for `jobs` / `fg` after they were reported
+MAX_FINISHED_JOBS = 20
+# Seconds a killed job gets to exit before SIGKILL
+KILL_GRACE_PERIOD = 3.0
+
+# Always checked on top of the Guardian (which only blocks e.g. `rm -rf /`)
+SHELL_DANGEROUS_PATTERNS = ['rm -rf', 'mkfs', 'dd if=/dev/zero', '> /dev/sda', 'chmod -R 777 /']
+
+# (is_safe, action, message), as returned by GuardianAI.analyze_command
+VetResult = Tuple[bool, str, str]
+
+
+def shell_vet(command: str) -> VetResult:
+    """The shell's own conservative check (any recursive delete, mkfs, ...)."""
+    command_lower = command.lower()
+    for pattern in SHELL_DANGEROUS_PATTERNS:
+        if pattern.lower() in command_lower:
+            return False, "block", f"BLOCKED: Dangerous pattern detected - {pattern}"
+    return True, "allow", "Command approved"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# JOB
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class Job:
+    """
+    One shell command and its buffered output.
+
+    Output entries are (seq, stream, line) with seq counting from 1;
+    stream is "stdout" or "stderr".
+    """
+
+    def __init__(self, job_id: int, command: str, max_lines: int = OUTPUT_BUFFER_LINES):
+        self.id = job_id
+        self.command = command
+        self.process: Optional[subprocess.Popen] = None
+        self.output: deque = deque(maxlen=max_lines)
+        self.line_count = 0
+        self.displayed = 0  # Last seq shown to the user
+        self.status = "starting"  # running, done, failed, killed
+        self.returncode: Optional[int] = None
+        self.started_at = datetime.now()
+        self.ended_at: Optional[datetime] = None
+        self.reported = False
+        self._killed = False
+        self._cond = threading.Condition()
+
+    def start(self, cwd: str = None):
+        self.process = subprocess.Popen(
+            self.command, shell=True, cwd=cwd,
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            text=True, bufsize=1, errors='replace',
+            start_new_session=True  # Own process group, so kill reaches children
+        )
+        self.status = "running"
+        readers = [
+            threading.Thread(target=self._pump, args=(self.process.stdout, "stdout"), daemon=True),
+            threading.Thread(target=self._pump, args=(self.process.stderr, "stderr"), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+        threading.Thread(target=self._wait, args=(readers,), daemon=True,
+                         name=f"va21-job-{self.id}").start()
+
+    def _pump(self, pipe, stream: str):
+        for line in pipe:
+            line = line.rstrip('\n')
+            if len(line) > MAX_LINE_CHARS:
+                line = line[:MAX_LINE_CHARS] + " …"
+            with self._cond:
+                self.line_count += 1
+                self.output.append((self.line_count, stream, line))
+                self._cond.notify_all()
+        pipe.close()
+
+    def _wait(self, readers: List[threading.Thread]):
+        returncode = self.process.wait()
+        for reader in readers:
+            reader.join()
+        with self._cond:
+            self.returncode = returncode
+            self.ended_at = datetime.now()
+            if self._killed:
+                self.status = "killed"
+            else:
+                self.status = "done" if returncode == 0 else "failed"
+            self._cond.notify_all()
+
+    @property
+    def running(self) -> bool:
+        return self.status in ("starting", "running")
+
+    @property
+    def dropped(self) -> int:
+        """Lines no longer in the buffer."""
+        return self.line_count - len(self.output)
+
+    def lines_since(self, seq: int) -> List[Tuple[int, str, str]]:
+        with self._cond:
+            if not self.output or self.output[-1][0] <= seq:
+                return []
+            first = self.output[0][0]
+            return list(self.output)[max(0, seq + 1 - first):]
+
+    def wait_for_output(self, seq: int, timeout: float = None) -> List[Tuple[int, str, str]]:
+        """Lines after seq, waiting until some arrive or the job ends."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.line_count > seq or not self.running, timeout)
+        return self.lines_since(seq)
+
+    def kill(self, sig: int = signal.SIGTERM):
+        if not self.running or self.process is None:
+            return
+        self._killed = True
+        try:
+            os.killpg(self.process.pid, sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def describe(self) -> str:
+        if self.status == "failed":
+            state = f"Exit {self.returncode}"
+        else:
+            state = self.status.capitalize()
+        return f"[{self.id}] {state:<10} {self.command}"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# JOB MANAGER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class JobManager:
+    """
+    Starts, tracks and streams shell jobs.
+
+    Commands must pass both shell_vet and the optional vet callable;
+    either one blocking refuses the command.
+
+    Args:
+        vet: Command check returning (is_safe, action, message), e.g.
+             GuardianAI.analyze_command
+    """
+
+    def __init__(self, vet: Callable[[str], VetResult] = None,
+                 max_running: int = MAX_RUNNING_JOBS,
+                 max_lines: int = OUTPUT_BUFFER_LINES):
+        self.vet = vet
+        self.max_running = max_running
+        self.max_lines = max_lines
+        self.jobs: Dict[int, Job] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def start(self, command: str, cwd: str = None) -> Tuple[Optional[Job], str]:
+        """
+        Vet and start a command.
+
+        Returns:
+            (job, note): job is None if the command was refused; note
+            carries the refusal or a vetting warning ("" otherwise)
+        """
+        is_safe, action, message = shell_vet(command)
+        if not is_safe:
+            return None, message
+        if self.vet is not None:
+            try:
+                is_safe, action, message = self.vet(command)
+            except Exception as e:
+                is_safe, action, message = False, "block", f"Could not vet command: {e}"
+            if not is_safe:
+                return None, message
+        note = message if action == "warn" else ""
+
+        with self._lock:
+            if sum(1 for job in self.jobs.values() if job.running) >= self.max_running:
+                return None, f"Too many spells at once ({self.max_running}). Wait for one to finish or kill it."
+            job = Job(self._next_id, command, self.max_lines)
+            self._next_id += 1
+            self.jobs[job.id] = job
+        try:
+            job.start(cwd)
+        except OSError as e:
+            with self._lock:
+                del self.jobs[job.id]
+            return None, f"The spell failed: {e}"
+        return job, note
+
+    def get(self, ref) -> Optional[Job]:
+        """Job by number ("2", "%2"); no ref means the newest running job."""
+        if ref in (None, ""):
+            running = [job for job in self.jobs.values() if job.running]
+            return running[-1] if running else None
+        try:
+            return self.jobs.get(int(str(ref).lstrip('%')))
+        except ValueError:
+            return None
+
+    def list(self) -> List[Job]:
+        return list(self.jobs.values())
+
+    def kill(self, ref) -> Tuple[bool, str]:
+        job = self.get(ref)
+        if job is None:
+            return False, f"No such job: {ref}"
+        if not job.running:
+            return False, f"Job [{job.id}] has already ended."
+        job.kill()
+        # Escalate if it ignores SIGTERM
+        timer = threading.Timer(KILL_GRACE_PERIOD, job.kill, args=(signal.SIGKILL,))
+        timer.daemon = True
+        timer.start()
+        return True, f"Job [{job.id}] is being stopped."
+
+    def stream(self, job: Job, emit: Callable[[str, str], None]):
+        """
+        Emit the job's output from where the user last saw it until it
+        ends. KeyboardInterrupt propagates with the job still running.
+        """
+        while True:
+            entries = job.wait_for_output(job.displayed, timeout=0.5)
+            if entries and entries[0][0] > job.displayed + 1:
+                emit("info", f"… {entries[0][0] - job.displayed - 1} earlier lines were dropped …")
+            for seq, stream, line in entries:
+                emit(stream, line)
+                job.displayed = seq
+            if not job.running and job.displayed >= job.line_count:
+                job.reported = True
+                return
+
+    def reap(self) -> List[Job]:
+        """Jobs that finished since the last call (and prune old ones)."""
+        finished = []
+        with self._lock:
+            for job in self.jobs.values():
+                if not job.running and not job.reported:
+                    job.reported = True
+                    finished.append(job)
+            done = [job_id for job_id, job in self.jobs.items() if not job.running and job.reported]
+            for job_id in done[:-MAX_FINISHED_JOBS]:
+                del self.jobs[job_id]
+        return finished
+
+    def shutdown(self):
+        """Stop every running job."""
+        for job in self.jobs.values():
+            job.kill()
+        for job in self.jobs.values():
+            if job.process is not None:
+                try:
+                    job.process.wait(timeout=KILL_GRACE_PERIOD)
+                except subprocess.TimeoutExpired:
+                    job.kill(signal.SIGKILL)
@@ -66,6 +66,12 @@ except ImportError:
     pass
 
 
+try:
+    from .job_control import JobManager, Job
+except ImportError:
+    from job_control import JobManager, Job
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # HELPER AI - Conversational Task Assistant
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -1055,7 +1061,9 @@ class HintsSystem:
             "ask": "💡 Usage: ask guardian <topic> - Ask the Guardian AI about something",
             "search": "💡 Usage: search <query> - Search the internet for information",
             "scan": "💡 Usage: scan <path> - Scan a file or directory for threats",
-            "shell": "💡 Usage: shell <command> - Execute a shell command",
+            "shell": "💡 Usage: shell <command> - Execute a shell command (add & to run it in the background)",
+            "fg": "💡 Usage: fg <job> - Watch a background spell (see 'jobs')",
+            "kill": "💡 Usage: kill <job> - Stop a background spell (see 'jobs')",
         }
         
         # Find closest match
@@ -1152,6 +1160,25 @@ class VA21ZorkInterface:
             except ImportError:
                 pass
         
+        # Initialize Guardian (vets shell commands)
+        self.guardian = None
+        try:
+            from guardian.guardian_core import get_guardian
+            self.guardian = get_guardian()
+        except ImportError:
+            try:
+                import sys
+                sys.path.insert(0, '/va21/guardian')
+                from guardian_core import get_guardian
+                self.guardian = get_guardian()
+            except ImportError:
+                pass
+        except OSError:
+            pass
+        
+        # Shell job control (Guardian vetting plus the shell's own dangerous-pattern list)
+        self.jobs = JobManager(vet=self.guardian.analyze_command if self.guardian else None)
+        
         # Initialize Writing suite
         self.writing = None
         try:
@@ -1855,41 +1882,83 @@ blocked, what is allowed, and adjust the protective policies.""",
         return ""
     
     def cmd_shell(self, args: List[str]) -> str:
-        """Execute a shell command."""
+        """Execute a shell command (streamed; end with & to run in the background)."""
         if not args:
-            return "What command do you wish to cast? Usage: shell <command>"
+            return "What command do you wish to cast? Usage: shell <command> [&]"
         
         command = " ".join(args)
+        background = command.endswith("&") and not command.endswith("&&")
+        if background:
+            command = command[:-1].rstrip()
+        
+        # Security check (Guardian)
+        job, note = self.jobs.start(command)
+        if job is None:
+            self.print_guardian(f"I cannot allow that command. {note}")
+            return ""
+        if note:
+            self.print_guardian(note)
         
-        # Security check
-        dangerous = ['rm -rf', 'mkfs', 'dd if=/dev/zero', '> /dev/sda', 'chmod -R 777 /']
-        for pattern in dangerous:
-            if pattern in command.lower():
-                self.print_guardian(f"I cannot allow that command. It poses too great a risk to the realm.")
-                return ""
+        if background:
+            return f"[{job.id}] {job.process.pid} - The spell continues in the background. ('jobs', 'fg {job.id}', 'kill {job.id}')"
         
         self.print(f"\nCasting: {command}", "bold yellow")
         self.print("─" * 40, "dim")
-        
+        return self._attach_job(job)
+    
+    def _attach_job(self, job: Job) -> str:
+        """Stream a job's output until it ends; Ctrl+C leaves it running in the background."""
         try:
-            result = subprocess.run(
-                command, 
-                shell=True, 
-                capture_output=True, 
-                text=True,
-                timeout=30
-            )
-            if result.stdout:
-                print(result.stdout)
-            if result.stderr:
-                self.print(result.stderr, "red")
-        except subprocess.TimeoutExpired:
-            return "The spell took too long and was interrupted."
-        except Exception as e:
-            return f"The spell failed: {e}"
-        
+            self.jobs.stream(job, self._print_job_line)
+        except KeyboardInterrupt:
+            print()
+            return f"[{job.id}] The spell continues in the background. ('fg {job.id}' to watch, 'kill {job.id}' to end it)"
+        
+        if job.status == "killed":
+            return "The spell was interrupted."
+        if job.returncode:
+            return f"The spell ended with code {job.returncode}."
+        return ""
+    
+    def _print_job_line(self, stream: str, line: str):
+        if stream == "stderr":
+            self.print(line, "red")
+        elif stream == "info":
+            self.print(line, "dim")
+        else:
+            print(line)
+    
+    def _report_finished_jobs(self):
+        """Announce background jobs that ended since the last prompt."""
+        for job in self.jobs.reap():
+            self.print(job.describe(), "dim")
+    
+    def cmd_jobs(self, args: List[str]) -> str:
+        """List shell jobs."""
+        jobs = self.jobs.list()
+        if not jobs:
+            return "No spells are running."
+        for job in jobs:
+            extra = f"  ({job.dropped} lines dropped)" if job.dropped else ""
+            self.print(job.describe() + extra, "yellow" if job.running else "dim")
         return ""
     
+    def cmd_fg(self, args: List[str]) -> str:
+        """Bring a job to the foreground and show its output."""
+        job = self.jobs.get(args[0] if args else None)
+        if job is None:
+            return "No such job. Type 'jobs' to see your spells."
+        self.print(f"\nWatching [{job.id}]: {job.command}", "bold yellow")
+        self.print("─" * 40, "dim")
+        return self._attach_job(job)
+    
+    def cmd_kill(self, args: List[str]) -> str:
+        """Stop a job."""
+        if not args:
+            return "Which spell should end? Usage: kill <job>"
+        success, message = self.jobs.kill(args[0])
+        return message
+    
     def cmd_bash(self, args: List[str]) -> str:
         """Drop to bash shell."""
         self.print("\nEntering the Terminal Nexus directly...", "yellow")
@@ -1945,7 +2014,11 @@ RESEARCH (SearXNG):
   science <query> - Search scientific content
 
 SYSTEM:
-  shell <cmd>     - Execute a shell command
+  shell <cmd>     - Execute a shell command (output streams live)
+  shell <cmd> &   - Run a command in the background
+  jobs            - List background commands
+  fg <n>          - Watch job n (Ctrl+C sends it back to the background)
+  kill <n>        - Stop job n
   bash            - Enter bash shell directly
   processes       - View running processes
 
@@ -2481,6 +2554,9 @@ Thank you to all open-source contributors!
             'processes': self.cmd_processes,
             'shell': self.cmd_shell,
             'cast': self.cmd_shell,
+            'jobs': self.cmd_jobs,
+            'fg': self.cmd_fg,
+            'kill': self.cmd_kill,
             'bash': self.cmd_bash,
             'terminal': self.cmd_bash,
             'help': self.cmd_help,
@@ -2603,6 +2679,8 @@ and I shall protect you on your journey."
                     self.voice_command_pending = None
                     self.print(f"\n🎤 Voice: {command}", "cyan")
                 else:
+                    self._report_finished_jobs()
+                    
                     # Show prompt
                     room = self.rooms[self.state.current_room]
                     prompt = f"[{room.name}]> "
@@ -2624,6 +2702,9 @@ and I shall protect you on your journey."
                 print()
                 self.cmd_quit([])
         
+        # Stop background jobs
+        self.jobs.shutdown()
+        
         # Cleanup voice input
         if self.voice_input:
             self.voice_input.stop()